@@ -0,0 +1,101 @@
+"""Micro-benchmark for building, copying, scaling and filtering the cocktail catalog in memory.
+
+Covers the model work behind the cocktail list endpoint: mapping the recipes into
+``Cocktail``/``Ingredient`` objects, handing out copies from the catalog cache, scaling
+them to the default volume and filtering them for an NFC user. Run from the repository root:
+
+    uv run python -m benchmarks.catalog_models
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from src.catalog_cache import copy_cocktail
+from src.models import Cocktail, Ingredient
+from src.payment_utils import PriceIndex, filter_cocktails_by_user
+from src.service.nfc_payment_service import User
+
+_MACHINE_SLOTS = 12
+"""Ingredients with an id up to this are on a bottle, the others are hand-adds."""
+_VIRGIN_SHARE = 0.5
+
+
+def _build_catalog(recipes: int, ingredients: int, seed: int = 42) -> list[Cocktail]:
+    """Build a catalog like the database commander maps it, with random recipes over a shared ingredient pool."""
+    rng = random.Random(seed)
+    pool = [(i, f"Ingredient {i}", rng.choice([0, 0, 15, 40])) for i in range(1, ingredients + 1)]
+    catalog = []
+    for recipe_id in range(1, recipes + 1):
+        chosen = rng.sample(pool, rng.randint(2, 6))
+        catalog.append(
+            Cocktail(
+                id=recipe_id,
+                name=f"Cocktail {recipe_id}",
+                alcohol=10,
+                amount=250,
+                enabled=True,
+                price_per_100_ml=3.5,
+                virgin_available=rng.random() < _VIRGIN_SHARE,
+                ingredients=[
+                    Ingredient(
+                        id=ing_id,
+                        name=name,
+                        alcohol=alcohol,
+                        bottle_volume=700,
+                        fill_level=500,
+                        hand=False,
+                        pump_speed=100,
+                        amount=rng.randint(1, 10) * 10,
+                        bottle=ing_id if ing_id <= _MACHINE_SLOTS else None,
+                    )
+                    for ing_id, name, alcohol in chosen
+                ],
+            )
+        )
+    return catalog
+
+
+def _scale_all(cocktails: list[Cocktail]) -> None:
+    for cocktail in cocktails:
+        cocktail.scale_cocktail(250, 1.0)
+
+
+def _report(label: str, total: float, number: int) -> None:
+    print(f"{label:<32} {total / number * 1000:8.3f} ms/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=50, help="Calls per measurement")
+    parser.add_argument("--recipes", type=int, default=300, help="Recipes in the catalog")
+    parser.add_argument("--ingredients", type=int, default=60, help="Distinct ingredients of the catalog")
+    args = parser.parse_args()
+
+    catalog = _build_catalog(args.recipes, args.ingredients)
+    user = User(nfc_id="bench", balance=5.0, is_adult=False)
+
+    build = timeit.timeit(lambda: _build_catalog(args.recipes, args.ingredients), number=args.number)
+    copies = timeit.timeit(lambda: [copy_cocktail(x) for x in catalog], number=args.number)
+    scale = timeit.timeit(lambda: _scale_all([copy_cocktail(x) for x in catalog]), number=args.number)
+    possible = timeit.timeit(lambda: [x.is_possible([], 3) for x in catalog], number=args.number)
+    filtered = timeit.timeit(
+        lambda: filter_cocktails_by_user(user, [copy_cocktail(x) for x in catalog]), number=args.number
+    )
+    index = PriceIndex(catalog)
+    selection = timeit.timeit(lambda: index.select(user), number=args.number)
+    indexed = timeit.timeit(lambda: filter_cocktails_by_user(user, catalog, index), number=args.number)
+
+    _report("build catalog", build, args.number)
+    _report("copy catalog", copies, args.number)
+    _report("copy+scale catalog", scale, args.number)
+    _report("possibility check", possible, args.number)
+    _report("copy+filter for user", filtered, args.number)
+    _report("user selection (price index)", selection, args.number)
+    _report("filter for user (price index)", indexed, args.number)
+
+
+if __name__ == "__main__":
+    main()
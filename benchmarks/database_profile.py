@@ -0,0 +1,92 @@
+"""Micro-benchmark for the commit and concurrent read latency of the SQLite pragma profiles.
+
+Compares the "safe" profile (SQLite defaults: rollback journal, full sync) against the "tuned"
+one (WAL, synchronous=NORMAL, mmap). Small commits are measured like the event and resource
+logging does them, the reads are cocktail list queries while a second thread keeps committing.
+Run it on the target storage (e.g. the SD card of the Pi) for meaningful numbers, from the
+repository root:
+
+    uv run python -m benchmarks.database_profile --dir ~/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.database_commander import DatabaseCommander, dispose_engines, get_shared_database
+from src.database_tuning import PROFILES
+from src.models import EventType
+
+
+def _setup(db_path: Path, profile_name: str, recipes: int) -> DatabaseCommander:
+    db_url = f"sqlite:///{db_path}"
+    get_shared_database(db_url, PROFILES[profile_name])
+    dbc = DatabaseCommander(db_url=db_url)
+    for i in range(1, 11):
+        dbc.insert_new_ingredient(f"Ingredient {i}", 10 * (i % 4), 1000, False, 100, 100, "ml")
+    for i in range(recipes):
+        dbc.insert_new_recipe(
+            f"Recipe {i}", 10, 250, 5.0, True, False, [(1 + i % 10, 100, 1), (1 + (i + 3) % 10, 150, 2)]
+        )
+    return dbc
+
+
+def _commit_latency(dbc: DatabaseCommander, number: int) -> list[float]:
+    durations = []
+    for _ in range(number):
+        start = time.perf_counter()
+        dbc.save_event(EventType.COCKTAIL_CANCELED)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _concurrent_read_latency(dbc: DatabaseCommander, number: int) -> list[float]:
+    """Measure uncached cocktail reads while another thread commits as fast as it can."""
+    stop = threading.Event()
+
+    def _writer() -> None:
+        while not stop.is_set():
+            dbc.save_event(EventType.COCKTAIL_CANCELED)
+
+    writer = threading.Thread(target=_writer, daemon=True)
+    writer.start()
+    durations = []
+    try:
+        for _ in range(number):
+            start = time.perf_counter()
+            dbc._load_cocktails()
+            durations.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        writer.join()
+    return durations
+
+
+def _report(label: str, durations: list[float]) -> None:
+    ms = sorted(x * 1000 for x in durations)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{label:<28} median {statistics.median(ms):8.3f} ms   p95 {p95:8.3f} ms   max {ms[-1]:8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=200, help="Commits and reads per measurement")
+    parser.add_argument("-r", "--recipes", type=int, default=100, help="Recipes in the benchmark database")
+    parser.add_argument("--dir", type=Path, default=None, help="Folder for the databases, default is a temp folder")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for profile_name in ("safe", "tuned"):
+            dbc = _setup(Path(tmp) / f"{profile_name}.db", profile_name, args.recipes)
+            _report(f"commit ({profile_name})", _commit_latency(dbc, args.number))
+            _report(f"read while writing ({profile_name})", _concurrent_read_latency(dbc, args.number))
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
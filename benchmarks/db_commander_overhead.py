@@ -0,0 +1,61 @@
+"""Micro-benchmark for the per-call overhead of constructing a DatabaseCommander.
+
+Compares the previous behaviour (new engine, ``create_all`` and session factory per
+construction) against the shared engine registry. Run from the repository root:
+
+    uv run python -m benchmarks.db_commander_overhead
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from src.database_commander import DatabaseCommander, dispose_engines
+from src.db_models import Base
+
+
+def _legacy_construct(db_url: str) -> None:
+    """Replicate the construction cost before the engine registry existed."""
+    engine = create_engine(db_url, echo=False)
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+    session.remove()
+    engine.dispose()
+
+
+def _report(label: str, total: float, number: int) -> None:
+    print(f"{label:<32} {total / number * 1000:8.3f} ms/call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        DatabaseCommander(db_url=db_url)
+
+        legacy = timeit.timeit(lambda: _legacy_construct(db_url), number=args.number)
+        shared = timeit.timeit(lambda: DatabaseCommander(db_url=db_url), number=args.number)
+        legacy_query = timeit.timeit(
+            lambda: (_legacy_construct(db_url), DatabaseCommander(db_url=db_url).get_all_cocktails()),
+            number=args.number,
+        )
+        shared_query = timeit.timeit(lambda: DatabaseCommander(db_url=db_url).get_all_cocktails(), number=args.number)
+        dispose_engines()
+
+    _report("construct (engine per call)", legacy, args.number)
+    _report("construct (shared engine)", shared, args.number)
+    _report("construct+query (per call)", legacy_query, args.number)
+    _report("construct+query (shared)", shared_query, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,31 @@
+import os
 import platform
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from os import PathLike
 from typing import Any
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
 
 from src import PROJECT_NAME, __version__
 from src.api.api_config import DESCRIPTION, TAGS_METADATA, Tags
+from src.api.internal.latency import LatencyMiddleware
 from src.api.internal.log_config import log_config
 from src.api.internal.validation import ValidationError
+from src.api.internal.workers import shutdown_pools
 from src.api.models import AboutInfo, ApiMessage
 from src.api.routers import blacklist, bottles, cocktails, ingredients, options, roles, scale, waiters
 from src.config.config_manager import CONFIG as cfg
 from src.config.config_manager import shared
 from src.config.errors import ConfigError
-from src.database_commander import DatabaseTransactionError
-from src.filepath import CUSTOM_CONFIG_FILE, DEFAULT_IMAGE_FOLDER, USER_IMAGE_FOLDER
+from src.database_commander import DatabaseTransactionError, start_database_maintenance
+from src.filepath import CUSTOM_CONFIG_FILE, DEFAULT_IMAGE_FOLDER, IMAGE_VARIANT_FOLDER, USER_IMAGE_FOLDER
+from src.image_store import IMAGE_STORE, VARIANT_URL_PREFIX
 from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
 from src.programs.addons.addons import ADDONS, CouldNotInstallAddonError
@@ -27,6 +33,7 @@ from src.programs.addons.bootstrap import initialize_addon_configs
 from src.resource_stats import start_resource_tracker
 from src.service.nfc_payment_service import NFCPaymentService
 from src.service.waiter_service import WaiterService
+from src.service_handler import SERVICE_HANDLER
 from src.startup_checks import (
     can_update,
     check_payment_service,
@@ -64,6 +71,7 @@ def _startup_auto_update() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     start_resource_tracker()
+    start_database_maintenance()
     initialize_addon_configs()
     try:
         cfg.read_local_config(update_config=True)
@@ -93,6 +101,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
         shared.startup_waiter_issue.set_issue(message=waiter_check.reason)
     _startup_auto_update()
     ADDONS.start_trigger_loop()
+    SERVICE_HANDLER.outbox.start()
+    IMAGE_STORE.start_warm_up()
     if cfg.cocktailberry_payment:
         NFCPaymentService().start_continuous_sensing()
     if cfg.waiter_mode_active:
@@ -101,9 +111,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     # earlier startup steps (config, DB, addons).
     mc.find_carriage_reference()
     yield
+    shutdown_pools()
     mc.cleanup()
 
 
+class ImmutableStaticFiles(StaticFiles):
+    """Static files never changing under their name, like the content hashed image variants."""
+
+    def file_response(
+        self, full_path: PathLike, stat_result: os.stat_result, scope: Scope, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 app = FastAPI(
     title="CocktailBerry API",
     version=__version__,
@@ -121,9 +143,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(LatencyMiddleware)
 
 app.mount("/static/default", StaticFiles(directory=DEFAULT_IMAGE_FOLDER), name="default_images")
 app.mount("/static/user", StaticFiles(directory=USER_IMAGE_FOLDER), name="user_images")
+IMAGE_VARIANT_FOLDER.mkdir(parents=True, exist_ok=True)
+app.mount(VARIANT_URL_PREFIX, ImmutableStaticFiles(directory=IMAGE_VARIANT_FOLDER), name="image_variants")
 
 
 @app.exception_handler(DatabaseTransactionError)
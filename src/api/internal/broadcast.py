@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+
+class LoopBroadcaster[T]:
+    """Fans the values of a callback source out to all websocket subscribers of one event loop.
+
+    Registers a single callback at the source with the first subscriber, which hands each value
+    over to the loop, and drops it with the last one. Every subscriber queue only keeps the latest
+    payload, so a slow client skips intermediate values instead of piling them up.
+    """
+
+    _callback_name = "websocket_broadcaster"
+
+    def __init__(self, to_payload: Callable[[T], dict[str, Any]]) -> None:
+        self._to_payload = to_payload
+        self._subscribers: set[asyncio.Queue[dict[str, Any]]] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._remove_callback: Callable[[str], None] | None = None
+
+    def subscribe(
+        self,
+        add_callback: Callable[[str, Callable[[T], None]], None],
+        remove_callback: Callable[[str], None],
+        latest: T | None = None,
+    ) -> asyncio.Queue[dict[str, Any]]:
+        """Return a new queue receiving the values, must be called within the event loop.
+
+        The callback functions of the source are only used if this is the first subscriber.
+        The queue starts with the given latest value, if there is one.
+        """
+        if not self._subscribers:
+            self._loop = asyncio.get_running_loop()
+            self._remove_callback = remove_callback
+            add_callback(self._callback_name, self._on_value)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=1)
+        if latest is not None:
+            queue.put_nowait(self._to_payload(latest))
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """Remove the queue, the source callback is dropped with the last subscriber."""
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._remove_callback is not None:
+            self._remove_callback(self._callback_name)
+            self._remove_callback = None
+            self._loop = None
+
+    def _on_value(self, value: T) -> None:
+        """Schedule the fan out from the notifying thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._publish, self._to_payload(value))
+
+    def _publish(self, payload: dict[str, Any]) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
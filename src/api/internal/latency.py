@@ -0,0 +1,108 @@
+"""Response time histograms of the API routes.
+
+The middleware measures each HTTP request until its response is sent and files it under the
+route template (e.g. ``/cocktails/{cocktail_id}``), so the number of histograms stays bounded.
+Static files are filed under their mount, requests not matching any route are not recorded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.models import RouteLatencyMetrics
+
+_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+"""Upper bounds of the histogram buckets, slower requests go into the last "inf" bucket."""
+
+
+class LatencyHistogram:
+    """Counts of the response times per bucket, plus sum and maximum."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        self.counts[bisect_left(_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def buckets(self) -> dict[str, int]:
+        labels = [str(x) for x in _BUCKETS_MS] + ["inf"]
+        return dict(zip(labels, self.counts))
+
+
+class RouteLatency:
+    """Histograms of all routes, keyed by method and route template."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, duration_ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((method, route))
+            if histogram is None:
+                histogram = self._histograms[(method, route)] = LatencyHistogram()
+            histogram.record(duration_ms)
+
+    def metrics(self) -> list[RouteLatencyMetrics]:
+        with self._lock:
+            return [
+                RouteLatencyMetrics(
+                    method=method,
+                    route=route,
+                    count=histogram.count,
+                    total_ms=round(histogram.total_ms, 3),
+                    max_ms=round(histogram.max_ms, 3),
+                    buckets=histogram.buckets(),
+                )
+                for (method, route), histogram in sorted(self._histograms.items())
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+ROUTE_LATENCY = RouteLatency()
+
+
+class LatencyMiddleware:
+    """ASGI middleware recording the response time of each HTTP request into ``ROUTE_LATENCY``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        duration_ms: float | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal duration_ms
+            await send(message)
+            # background tasks run after the last body part within the same call, they are not part of the response
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                duration_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # the router sets the matched route into the scope, it is only known after the call
+            route = scope.get("route")
+            path = getattr(route, "path", None)
+            if path is not None:
+                if duration_ms is None:
+                    # no complete response was sent, e.g. an error or a disconnected client
+                    duration_ms = (time.perf_counter() - start) * 1000
+                ROUTE_LATENCY.record(scope["method"], path, duration_ms)
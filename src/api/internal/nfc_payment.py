@@ -9,6 +9,7 @@ from src.logger_handler import LoggerHandler
 from src.models import Cocktail, PrepareResult
 from src.service.booking import CocktailBooking
 from src.service.nfc_payment_service import NFCPaymentService, UserLookup
+from src.service.preparation_status import notify_preparation_status
 from src.tabs import maker
 
 _logger = LoggerHandler("nfc_payment")
@@ -34,6 +35,7 @@ class NFCPaymentHandler:
         booking = CocktailBooking.no_user_logged_in()
         shared.cocktail_status.message = booking.message
         shared.cocktail_status.status = PrepareResult.WAITING_FOR_PAYMENT
+        notify_preparation_status()
         self._payment_cancelled = False
 
         def nfc_callback(lookup: UserLookup) -> None:
@@ -60,12 +62,14 @@ class NFCPaymentHandler:
             _logger.debug("Payment cancelled by user")
             shared.cocktail_status.message = booking.message
             shared.cocktail_status.status = PrepareResult.CANCELED
+            notify_preparation_status()
             return
 
         if booking.result != CocktailBooking.Result.SUCCESS:
             _logger.debug(f"Payment failed: {booking.message}")
             shared.cocktail_status.status = PrepareResult.CANCELED
             shared.cocktail_status.message = booking.message
+            notify_preparation_status()
             return
 
         _logger.debug("Payment successful, starting cocktail preparation")
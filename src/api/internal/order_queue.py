@@ -0,0 +1,253 @@
+"""Queue of cocktail orders placed over the API, prepared one after another.
+
+Orders placed while the machine is busy wait in the queue instead of being rejected.
+Once it is the turn of an order, it is validated, paid (if payment is active) and prepared.
+Between two poured orders, the queue waits for the glass swap: with glass detection on the scale
+the old glass has to be removed first, without it the operator confirms the swap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+
+from src.api.internal.payment import get_payment_handler
+from src.api.internal.sumup_payment import requires_sumup_payment
+from src.config.config_manager import CONFIG as cfg
+from src.config.config_manager import shared
+from src.dialog_handler import DIALOG_HANDLER as DH
+from src.logger_handler import LoggerHandler
+from src.machine.controller import MachineController
+from src.models import Cocktail, CocktailStatus, PrepareResult
+from src.service.preparation_status import PreparationStatusService, notify_preparation_status
+from src.tabs import maker
+
+_logger = LoggerHandler("order_queue")
+
+_RETRY_INTERVAL = 0.5
+"""Seconds between re-checks while the next order waits for the machine or a glass."""
+
+_BUSY_STATES = (PrepareResult.IN_PROGRESS, PrepareResult.WAITING_FOR_PAYMENT)
+_WAITING_RESULTS = (PrepareResult.IN_PROGRESS, PrepareResult.NO_GLASS_DETECTED)
+"""Validation results an order waits out instead of failing."""
+
+_FINISHED_HISTORY = 20
+"""Number of done orders kept to answer status requests."""
+
+
+@dataclass
+class PreparationOrder:
+    """One cocktail order in the queue."""
+
+    cocktail: Cocktail
+    estimated_time: float
+    """Predicted preparation time in seconds."""
+    selected_team: str | None = None
+    team_member_name: str | None = None
+    validated: bool = False
+    """The order was validated when placed, it starts right away if the machine is still idle."""
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: PrepareResult = PrepareResult.QUEUED
+    message: str | None = None
+    needs_swap_confirmation: bool = False
+    """The order waits for the glass swap, which the machine cannot detect."""
+
+    @property
+    def done(self) -> bool:
+        return self.status in (PrepareResult.FINISHED, PrepareResult.CANCELED)
+
+
+class OrderQueue:
+    """FIFO of preparation orders, worked off by a single task in the API event loop."""
+
+    def __init__(self) -> None:
+        self.active: PreparationOrder | None = None
+        self._pending: deque[PreparationOrder] = deque()
+        self._finished: deque[PreparationOrder] = deque(maxlen=_FINISHED_HISTORY)
+        self._changed: asyncio.Event | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._swap_confirmed = False
+        self._needs_swap = False
+
+    @property
+    def is_idle(self) -> bool:
+        """True if no order is running or waiting and the machine is not busy."""
+        return self.active is None and not self._pending and shared.cocktail_status.status not in _BUSY_STATES
+
+    def enqueue(self, order: PreparationOrder) -> PreparationOrder:
+        """Add the order to the queue, must be called within the event loop."""
+        self._ensure_worker()
+        if order.validated:
+            # placed at an idle machine, the glass was just checked like for any direct preparation
+            self._needs_swap = False
+        self._pending.append(order)
+        _logger.info(f"Queued order {order.id} for {order.cocktail.name}, position {self.position(order)}")
+        self._notify()
+        return order
+
+    def get(self, order_id: str) -> PreparationOrder | None:
+        """Return the order with the given id, if it is known."""
+        return next((x for x in self.orders(include_done=True) if x.id == order_id), None)
+
+    def orders(self, include_done: bool = False) -> list[PreparationOrder]:
+        """Return the running and queued orders in their order, optionally with the recently done ones."""
+        orders = [self.active] if self.active is not None else []
+        orders.extend(self._pending)
+        if include_done:
+            orders.extend(self._finished)
+        return orders
+
+    def position(self, order: PreparationOrder) -> int:
+        """Return the position in the queue, 0 for the running order, -1 for done ones."""
+        if order is self.active:
+            return 0
+        if order in self._pending:
+            return self._pending.index(order) + 1
+        return -1
+
+    def eta(self, order: PreparationOrder) -> float:
+        """Return the estimated seconds until the order is finished."""
+        if order.done:
+            return 0.0
+        total = 0.0
+        if self.active is not None:
+            total += _remaining_time(self.active)
+        for pending in self._pending:
+            total += pending.estimated_time
+            if pending is order:
+                break
+        return round(total, 1)
+
+    def cancel(self, order_id: str) -> PreparationOrder | None:
+        """Cancel the order, only the running order stops the machine, the others stay queued."""
+        order = self.get(order_id)
+        if order is None or order.done:
+            return order
+        if order is self.active:
+            if order.status == PrepareResult.WAITING_FOR_PAYMENT:
+                get_payment_handler().cancel_payment()
+            if order.status in _BUSY_STATES:
+                shared.cocktail_status.status = PrepareResult.CANCELED
+                notify_preparation_status()
+        else:
+            self._pending.remove(order)
+            self._finished.append(order)
+        order.status = PrepareResult.CANCELED
+        _logger.info(f"Canceled order {order.id} for {order.cocktail.name}")
+        self._notify()
+        return order
+
+    def confirm_glass_swap(self) -> None:
+        """Let the next order start, used if the glass change cannot be detected by the scale."""
+        self._swap_confirmed = True
+        self._notify()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        self._changed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def on_status(_status: CocktailStatus) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._notify)
+
+        service = PreparationStatusService()
+        service.remove_callback("order_queue")
+        service.add_callback("order_queue", on_status)
+        self._worker = loop.create_task(self._run())
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+
+    async def _wait_for_change(self, timeout: float = _RETRY_INTERVAL) -> None:
+        assert self._changed is not None
+        self._changed.clear()
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._changed.wait(), timeout)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                await self._wait_for_change(timeout=60)
+                continue
+            order = self._pending.popleft()
+            self.active = order
+            try:
+                await self._process(order)
+            except Exception as e:
+                _logger.error(f"Error preparing order {order.id}: {e}")
+                order.status = PrepareResult.CANCELED
+                order.message = str(e)
+            finally:
+                self.active = None
+                self._finished.append(order)
+
+    async def _process(self, order: PreparationOrder) -> None:
+        if not await self._wait_until_ready(order):
+            return
+        shared.selected_team = order.selected_team or "No Team"
+        shared.team_member_name = order.team_member_name
+        order.status = PrepareResult.IN_PROGRESS
+        self._needs_swap = False
+        status_before = shared.cocktail_status
+        if cfg.payment_enabled and not (cfg.sumup_payment and not requires_sumup_payment(order.cocktail)):
+            order.status = PrepareResult.WAITING_FOR_PAYMENT
+            await get_payment_handler().start_payment_flow(order.cocktail)
+        else:
+            await asyncio.to_thread(maker.prepare_cocktail, order.cocktail)
+        status = shared.cocktail_status
+        # a preparation replaces the status object, payment flows only pour (and need a new glass) after paying
+        self._needs_swap = status is not status_before
+        order.status = PrepareResult.FINISHED if status.status == PrepareResult.FINISHED else PrepareResult.CANCELED
+        order.message = status.message
+        self._swap_confirmed = False
+
+    async def _wait_until_ready(self, order: PreparationOrder) -> bool:
+        """Wait for a free machine, the glass swap and a successful validation, False if the order dropped out."""
+        while not order.done:
+            if shared.cocktail_status.status in _BUSY_STATES or not await self._glass_swapped(order):
+                await self._wait_for_change()
+                continue
+            if order.validated and not self._needs_swap:
+                return True
+            result, message, _ = await asyncio.to_thread(maker.validate_cocktail, order.cocktail)
+            if result == PrepareResult.VALIDATION_OK:
+                return True
+            order.message = message
+            if result not in _WAITING_RESULTS:
+                order.status = PrepareResult.CANCELED
+                return False
+            await self._wait_for_change()
+        return False
+
+    async def _glass_swapped(self, order: PreparationOrder) -> bool:
+        """Return True if no glass swap is needed, the old glass was removed or the operator confirmed the swap."""
+        if not self._needs_swap or self._swap_confirmed:
+            if order.needs_swap_confirmation:
+                order.needs_swap_confirmation = False
+                order.message = None
+            return True
+        mc = MachineController()
+        if not mc.can_detect_glass:
+            order.needs_swap_confirmation = True
+            order.message = DH.get_translation("waiting_for_glass_swap")
+            return False
+        # the new glass is checked by the validation, here it is only about the removal of the old one
+        self._swap_confirmed = not await asyncio.to_thread(mc.is_glass_present)
+        return self._swap_confirmed
+
+
+def _remaining_time(order: PreparationOrder) -> float:
+    """Return the estimated remaining seconds of the running order."""
+    status = shared.cocktail_status
+    if order.status == PrepareResult.IN_PROGRESS and status.status == PrepareResult.IN_PROGRESS:
+        return order.estimated_time * (100 - status.progress) / 100
+    return order.estimated_time
+
+
+ORDER_QUEUE = OrderQueue()
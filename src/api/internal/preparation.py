@@ -1,5 +1,9 @@
+from dataclasses import asdict
+from typing import Any
+
+from src.api.internal.broadcast import LoopBroadcaster
 from src.config.config_manager import shared
-from src.models import Cocktail, PrepareResult
+from src.models import Cocktail, CocktailStatus, PrepareResult
 from src.tabs import maker
 
 
@@ -12,3 +16,17 @@ def api_addon_prepare_flow(cocktail: Cocktail) -> tuple[bool, str]:
     shared.selected_team = "No Team"
     _, message = maker.prepare_cocktail(cocktail)
     return True, message
+
+
+def status_payload(status: CocktailStatus) -> dict[str, Any]:
+    """Return the json payload of the status as sent over the websocket."""
+    return {
+        "progress": status.progress,
+        "message": status.message,
+        "status": status.status.value,
+        "predicted_finish": status.predicted_finish,
+        "hand_adds": [asdict(x) for x in status.hand_adds],
+    }
+
+
+STATUS_BROADCASTER = LoopBroadcaster(status_payload)
@@ -0,0 +1,7 @@
+from dataclasses import asdict
+
+from src.api.internal.broadcast import LoopBroadcaster
+from src.machine.scale.stream import ScaleReading
+
+SCALE_BROADCASTER = LoopBroadcaster[ScaleReading](asdict)
+"""Readings of the shared scale stream, the stream only reads the scale while someone is subscribed."""
@@ -8,6 +8,7 @@ from src.config.config_manager import shared
 from src.logger_handler import LoggerHandler
 from src.models import Cocktail, PrepareResult
 from src.service.booking import CocktailBooking
+from src.service.preparation_status import notify_preparation_status
 from src.service.sumup_payment_service import Err, SumupPaymentService
 from src.tabs import maker
 
@@ -48,6 +49,7 @@ class SumupPaymentHandler:
         _logger.info("Starting SumUp payment flow")
         shared.cocktail_status.message = CocktailBooking.sumup_waiting_for_payment().message
         shared.cocktail_status.status = PrepareResult.WAITING_FOR_PAYMENT
+        notify_preparation_status()
         self._payment_cancelled = False
 
         price_in_cents = _get_price_in_cents(cocktail)
@@ -57,6 +59,7 @@ class SumupPaymentHandler:
             _logger.error("No SumUp terminal ID configured")
             shared.cocktail_status.status = PrepareResult.CANCELED
             shared.cocktail_status.message = CocktailBooking.sumup_no_terminal().message
+            notify_preparation_status()
             return
 
         # Trigger checkout on terminal
@@ -70,6 +73,7 @@ class SumupPaymentHandler:
             _logger.error(f"Failed to trigger checkout: {checkout_result.error}")
             shared.cocktail_status.status = PrepareResult.CANCELED
             shared.cocktail_status.message = CocktailBooking.sumup_checkout_failed().message
+            notify_preparation_status()
             return
 
         client_transaction_id: str = checkout_result.data
@@ -87,6 +91,7 @@ class SumupPaymentHandler:
             _logger.debug("Payment cancelled by user")
             shared.cocktail_status.message = CocktailBooking.canceled().message
             shared.cocktail_status.status = PrepareResult.CANCELED
+            notify_preparation_status()
             return
 
         # Check transaction result
@@ -95,6 +100,7 @@ class SumupPaymentHandler:
             _logger.error(f"Failed to get transaction: {transaction_result.error}")
             shared.cocktail_status.status = PrepareResult.CANCELED
             shared.cocktail_status.message = CocktailBooking.sumup_checkout_failed().message
+            notify_preparation_status()
             return
 
         transaction = transaction_result.data
@@ -102,6 +108,7 @@ class SumupPaymentHandler:
             _logger.warning(f"Transaction not successful: {transaction.status}")
             shared.cocktail_status.status = PrepareResult.CANCELED
             shared.cocktail_status.message = CocktailBooking.sumup_payment_declined().message
+            notify_preparation_status()
             return
 
         _logger.debug("Payment successful, starting cocktail preparation")
@@ -7,6 +7,7 @@ from src.config.config_manager import CONFIG as cfg
 from src.database_commander import DB_COMMANDER as DBC
 from src.database_commander import ElementNotFoundError
 from src.filepath import DEFAULT_IMAGE_FOLDER
+from src.image_store import IMAGE_STORE, ImageSize
 from src.image_utils import find_cocktail_image, find_default_cocktail_image
 from src.models import Cocktail as DBCocktail
 from src.models import Ingredient as DBIngredient
@@ -50,6 +51,7 @@ def map_cocktail(cocktail: DBCocktail | None, scale: bool = True) -> Cocktail |
             for i in cocktail.adjusted_ingredients
         ],
         image=create_image_url(cocktail),
+        image_thumbnail=create_image_url(cocktail, size="thumbnail"),
         default_image=create_image_url(cocktail, default=True),
     )
 
@@ -96,10 +98,13 @@ def calculate_cocktail_volume_and_concentration(cocktail: CocktailInput) -> tupl
     return recipe_volume, recipe_alcohol_level
 
 
-def create_image_url(cocktail: DBCocktail, default: bool = False) -> str:
+def create_image_url(cocktail: DBCocktail, default: bool = False, size: ImageSize = "detail") -> str:
+    image_path = find_default_cocktail_image(cocktail.id) if default else find_cocktail_image(cocktail.id)
+    # prefer the resized web variant, fall back to the original image until it is created
+    if (variant_url := IMAGE_STORE.url(image_path, size)) is not None:
+        return variant_url
     # get the folder name of the path
     default_folder_name = DEFAULT_IMAGE_FOLDER.name
-    image_path = find_default_cocktail_image(cocktail.id) if default else find_cocktail_image(cocktail.id)
     # check if the image is in the default folder
     if default_folder_name in image_path.parts:
         return f"/static/default/{image_path.name}"
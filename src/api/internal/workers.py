@@ -0,0 +1,133 @@
+"""Bounded, named thread pools for the blocking work of the API handlers.
+
+Everything running on the event loop stalls all other clients, including the status websockets.
+Handlers doing database, file, hardware or network work are therefore plain functions decorated
+with ``blocking``, which runs them on one of the pools. The hardware pool has a single thread,
+so scale and pump access is serialized, and long admin tasks have their own pool, so they can
+never use up the workers of the everyday requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import StrEnum
+from typing import Any
+
+from src.models import WorkerPoolMetrics
+
+
+class WorkerPool(StrEnum):
+    DEFAULT = "api-worker"
+    """Database and file work of the regular requests."""
+    HARDWARE = "api-hardware"
+    """Scale and other bus access, one request at a time."""
+    ADMIN = "api-admin"
+    """Long running tasks like backups, updates, system settings or the ingredient optimization."""
+
+
+_POOL_SIZES = {
+    WorkerPool.DEFAULT: 6,
+    WorkerPool.HARDWARE: 1,
+    WorkerPool.ADMIN: 2,
+}
+
+
+class _Pool:
+    """Thread pool executor counting the waiting, running and done calls."""
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    def submit[T](self, func: Callable[[], T]) -> Future[T]:
+        with self._lock:
+            self._queued += 1
+
+        def run() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return func()
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return self.executor.submit(run)
+
+    def metrics(self) -> WorkerPoolMetrics:
+        with self._lock:
+            return WorkerPoolMetrics(
+                name=self.name,
+                max_workers=self.max_workers,
+                running=self._running,
+                queued=self._queued,
+                completed=self._completed,
+            )
+
+
+_POOLS: dict[WorkerPool, _Pool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(pool: WorkerPool) -> _Pool:
+    with _POOLS_LOCK:
+        if pool not in _POOLS:
+            _POOLS[pool] = _Pool(pool.value, _POOL_SIZES[pool])
+        return _POOLS[pool]
+
+
+async def run_blocking[**P, T](pool: WorkerPool, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run the function on the given pool and wait for its result without blocking the event loop.
+
+    The context variables of the caller are copied into the worker thread.
+    """
+    context = contextvars.copy_context()
+    future = _get_pool(pool).submit(functools.partial(context.run, func, *args, **kwargs))
+    return await asyncio.wrap_future(future)
+
+
+def blocking[**P, T](
+    pool: WorkerPool = WorkerPool.DEFAULT,
+) -> Callable[[Callable[P, T]], Callable[P, Coroutine[Any, Any, T]]]:
+    """Run the decorated handler on the given pool.
+
+    Use it below the route decorator, the signature is kept so FastAPI still resolves
+    parameters, dependencies and the response model from the plain function.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await run_blocking(pool, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def pool_metrics() -> list[WorkerPoolMetrics]:
+    """Return the load of all pools used so far."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [x.metrics() for x in pools]
+
+
+def shutdown_pools() -> None:
+    """Let the running calls finish and drop all waiting ones, pools are created again on the next use."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.executor.shutdown(wait=True, cancel_futures=True)
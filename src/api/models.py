@@ -50,6 +50,7 @@ class Cocktail(BaseModel):
     is_naturally_virgin: bool
     ingredients: list[CocktailIngredient]
     image: str
+    image_thumbnail: str
     default_image: str
 
 
@@ -105,6 +106,14 @@ class PrepareCocktailRequest(BaseModel):
     team_member_name: str | None = None
 
 
+class PreparationEstimate(BaseModel):
+    cocktail_id: int
+    amount: int
+    alcohol: float
+    estimated_time: float
+    """Planned seconds the machine needs for the cocktail."""
+
+
 class WifiData(BaseModel):
     ssid: str
     password: str
@@ -136,6 +145,23 @@ class DateTimeInput(BaseModel):
     time: str
 
 
+class PreparationOrderStatus(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    order_id: str
+    cocktail_id: int
+    cocktail_name: str
+    status: PrepareResult
+    message: str | None = None
+    progress: int = 0
+    position: int
+    """Position in the queue, 0 for the running order, -1 for done orders."""
+    eta: float
+    """Estimated seconds until the order is finished."""
+    needs_swap_confirmation: bool = False
+    """The order waits for the operator to confirm the glass swap, the machine cannot detect it."""
+
+
 class ApiMessage(BaseModel):
     message: str
 
@@ -3,6 +3,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from src.api.api_config import Tags
 from src.api.internal.utils import map_bottles
 from src.api.internal.validation import raise_when_cocktail_is_in_progress
+from src.api.internal.workers import blocking
 from src.api.middleware import maker_protected, master_protected_dependency
 from src.api.models import ApiMessage, Bottle, BottleConfigUpdate
 from src.config.config_manager import CONFIG as cfg
@@ -23,14 +24,16 @@ protected_router = APIRouter(
 
 
 @router.get("", summary="Get all bottles with their ingredients.")
-async def get_bottles() -> list[Bottle]:
+@blocking()
+def get_bottles() -> list[Bottle]:
     DBC = DatabaseCommander()
     ingredients = DBC.get_ingredients_at_bottles()[: cfg.MAKER_NUMBER_BOTTLES]
     return [map_bottles(i) for i in ingredients]
 
 
 @protected_router.post("/refill", summary="Refill all given bottles to maximum.")
-async def refill_bottle(bottle_numbers: list[int], background_tasks: BackgroundTasks) -> ApiMessage:
+@blocking()
+def refill_bottle(bottle_numbers: list[int], background_tasks: BackgroundTasks) -> ApiMessage:
     raise_when_cocktail_is_in_progress()
     if any(num < 1 or num > cfg.MAKER_NUMBER_BOTTLES for num in bottle_numbers):
         raise HTTPException(
@@ -57,7 +60,8 @@ async def refill_bottle(bottle_numbers: list[int], background_tasks: BackgroundT
 
 
 @protected_router.put("/{bottle_id}", summary="Update bottle to ingredient and fill level.")
-async def update_bottle(bottle_id: int, ingredient_id: int, amount: int | None = None) -> ApiMessage:
+@blocking()
+def update_bottle(bottle_id: int, ingredient_id: int, amount: int | None = None) -> ApiMessage:
     DBC = DatabaseCommander()
     ingredients = DBC.get_ingredients_at_bottles()[: cfg.MAKER_NUMBER_BOTTLES]
     # cannot assign the same ingredient to multiple bottles
@@ -85,7 +89,8 @@ async def update_bottle(bottle_id: int, ingredient_id: int, amount: int | None =
         Depends(master_protected_dependency),
     ],
 )
-async def update_bottle_config(bottle_id: int, data: BottleConfigUpdate) -> ApiMessage:
+@blocking()
+def update_bottle_config(bottle_id: int, data: BottleConfigUpdate) -> ApiMessage:
     raise_when_cocktail_is_in_progress()
     if bottle_id < 1 or bottle_id > cfg.MAKER_NUMBER_BOTTLES:
         raise HTTPException(
@@ -111,6 +116,7 @@ async def update_bottle_config(bottle_id: int, data: BottleConfigUpdate) -> ApiM
         Depends(master_protected_dependency),
     ],
 )
+@blocking()
 def calibrate_bottle(bottle_id: int, amount: int, background_tasks: BackgroundTasks) -> ApiMessage:
     raise_when_cocktail_is_in_progress()
     background_tasks.add_task(maker.calibrate, bottle_id, amount)
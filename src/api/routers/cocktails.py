@@ -4,7 +4,6 @@ from typing import Annotated, Literal
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Depends,
     File,
     HTTPException,
@@ -16,7 +15,9 @@ from fastapi import (
 
 from src.api.api_config import Tags
 from src.api.internal.nfc_payment import get_nfc_payment_handler
+from src.api.internal.order_queue import ORDER_QUEUE, PreparationOrder
 from src.api.internal.payment import PaymentHandler, get_payment_handler
+from src.api.internal.preparation import STATUS_BROADCASTER, status_payload
 from src.api.internal.sumup_payment import requires_sumup_payment
 from src.api.internal.utils import (
     calculate_cocktail_volume_and_concentration,
@@ -25,6 +26,7 @@ from src.api.internal.utils import (
     not_on_demo,
 )
 from src.api.internal.validation import raise_on_validation_not_okay
+from src.api.internal.workers import WorkerPool, blocking, run_blocking
 from src.api.middleware import maker_protected
 from src.api.models import (
     ApiMessage,
@@ -33,6 +35,8 @@ from src.api.models import (
     CocktailInput,
     CocktailsAndIngredients,
     ErrorDetail,
+    PreparationEstimate,
+    PreparationOrderStatus,
     PrepareCocktailRequest,
 )
 from src.config.config_manager import CONFIG as cfg
@@ -40,13 +44,16 @@ from src.config.config_manager import Tab, shared
 from src.data_utils import select_optimal
 from src.database_commander import DatabaseCommander
 from src.dialog_handler import DIALOG_HANDLER as DH
-from src.image_utils import find_user_cocktail_image, process_image, save_image
+from src.filepath import USER_IMAGE_FOLDER
+from src.image_store import IMAGE_STORE
+from src.image_utils import delete_user_image, find_user_cocktail_image, process_image, save_image
 from src.logger_handler import LoggerHandler
+from src.machine.controller import MachineController
 from src.models import Cocktail as DbCocktail
 from src.models import CocktailStatus, PrepareResult
-from src.payment_utils import filter_cocktails_by_user
-from src.service.nfc_payment_service import UserLookup
-from src.tabs import maker
+from src.payment_utils import filter_cocktails_by_user, get_price_index
+from src.service.nfc_payment_service import User, UserLookup
+from src.service.preparation_status import PreparationStatusService, notify_preparation_status
 
 _logger = LoggerHandler("cocktails_router")
 
@@ -69,7 +76,8 @@ protected_recipes_router = APIRouter(
 
 
 @router.get("", summary="Get all cocktails, limited to possible cocktails by default")
-async def get_cocktails(
+@blocking()
+def get_cocktails(
     only_possible: bool = True,
     max_hand_add: int = 3,
     scale: bool = True,
@@ -80,14 +88,15 @@ async def get_cocktails(
     if cfg.cocktailberry_payment:
         nfc_handler = get_nfc_payment_handler()
         user = nfc_handler.get_current_user()
-        cocktails = filter_cocktails_by_user(user.user, cocktails)
+        cocktails = filter_cocktails_by_user(user.user, cocktails, get_price_index())
 
     mapped_cocktails = [map_cocktail(c, scale) for c in cocktails]
     return [c for c in mapped_cocktails if c is not None]
 
 
 @router.get("/{cocktail_id:int}", summary="Get a cocktail by ID")
-async def get_cocktail(cocktail_id: int) -> Cocktail:
+@blocking()
+def get_cocktail(cocktail_id: int) -> Cocktail:
     DBC = DatabaseCommander()
     cocktail = DBC.get_cocktail(cocktail_id)
     if cocktail is None:
@@ -96,32 +105,78 @@ async def get_cocktail(cocktail_id: int) -> Cocktail:
     return map_cocktail(cocktail)
 
 
+@router.get("/{cocktail_id:int}/estimate", summary="Get the scaled size and preparation time of a cocktail")
+@blocking()
+def get_preparation_estimate(
+    cocktail_id: int,
+    volume: Annotated[int, Query(gt=0)],
+    alcohol_factor: Annotated[float, Query(ge=0)] = 1.0,
+    is_virgin: bool = False,
+) -> PreparationEstimate:
+    cocktail = DatabaseCommander().get_cocktail(cocktail_id)
+    if cocktail is None:
+        message = DH.get_translation("element_not_found", element_name=f"Cocktail (id={cocktail_id})")
+        raise HTTPException(status_code=404, detail=message)
+    factor = alcohol_factor if not is_virgin else 0
+    plan = MachineController().plan_cocktail(cocktail, volume, factor)
+    return PreparationEstimate(
+        cocktail_id=cocktail_id,
+        amount=plan.adjusted_amount,
+        alcohol=plan.adjusted_alcohol,
+        estimated_time=plan.estimated_time,
+    )
+
+
 @protected_maker_router.post(
     "/prepare/{cocktail_id:int}",
     tags=[Tags.PREPARATION],
     responses={
-        200: {"description": "Cocktail preparation started", "model": CocktailStatus},
+        200: {"description": "Cocktail preparation started or queued", "model": PreparationOrderStatus},
         400: {"description": "Validation error", "model": ErrorDetail},
         404: {
             "description": "Cocktail not found",
             "content": {"application/json": {"example": {"detail": "Cocktail not found"}}},
         },
     },
-    summary="Prepare a cocktail by ID and defined properties",
+    summary="Prepare a cocktail by ID and defined properties, queued if the machine is busy",
 )
 async def prepare_cocktail(
     cocktail_id: int,
     request: PrepareCocktailRequest,
-    background_tasks: BackgroundTasks,
-    payment_handler: Annotated[PaymentHandler, Depends(get_payment_handler)],
-) -> CocktailStatus:
+) -> PreparationOrderStatus:
+    # the queue lives on the event loop, only the database and machine work runs on the pools
+    cocktail, estimated_time = await run_blocking(WorkerPool.DEFAULT, _plan_order, cocktail_id, request)
+    # at an idle machine validate right away, queued orders are validated once it is their turn
+    idle = ORDER_QUEUE.is_idle
+    if idle:
+        await run_blocking(WorkerPool.HARDWARE, raise_on_validation_not_okay, cocktail)
+    # if another order took the machine while validating, this one is validated again on its turn
+    validated = idle and ORDER_QUEUE.is_idle
+    order = ORDER_QUEUE.enqueue(
+        PreparationOrder(
+            cocktail=cocktail,
+            estimated_time=estimated_time,
+            selected_team=request.selected_team,
+            team_member_name=request.team_member_name if request.selected_team is not None else None,
+            validated=validated,
+        )
+    )
+    status = _order_status(order)
+    if validated:
+        needs_payment = cfg.payment_enabled and not (cfg.sumup_payment and not requires_sumup_payment(cocktail))
+        status.status = PrepareResult.WAITING_FOR_PAYMENT if needs_payment else PrepareResult.IN_PROGRESS
+    return status
+
+
+def _plan_order(cocktail_id: int, request: PrepareCocktailRequest) -> tuple[DbCocktail, float]:
+    """Load and scale the requested cocktail, return it with its estimated preparation time."""
     DBC = DatabaseCommander()
     factor = request.alcohol_factor if not request.is_virgin else 0
     cocktail = DBC.get_cocktail(cocktail_id)
     if cocktail is None:
         message = DH.get_translation("element_not_found", element_name=f"Cocktail (id={cocktail_id})")
         raise HTTPException(status_code=404, detail=message)
-    cocktail.scale_cocktail(request.volume, factor)
+    plan = MachineController().plan_cocktail(cocktail, request.volume, factor)
     # need to check if the cocktail is possible
     # this can happen if there is no ui guidance, e.g. only a direct post of an id
     # the cocktail might only be possible in the virgin version, but the user requested a non-virgin version
@@ -130,22 +185,60 @@ async def prepare_cocktail(
         cocktail.only_virgin and not cocktail.is_virgin
     ):
         raise HTTPException(status_code=400, detail=DH.get_translation("cocktail_not_possible"))
-    raise_on_validation_not_okay(cocktail)
-    # handle team data
-    shared.team_member_name = None
-    shared.selected_team = "No Team"
-    if request.selected_team is not None:
-        shared.selected_team = request.selected_team
-        shared.team_member_name = request.team_member_name
-    if cfg.payment_enabled:
-        # SumUp cannot be called with 0 price
-        if cfg.sumup_payment and not requires_sumup_payment(cocktail):
-            background_tasks.add_task(maker.prepare_cocktail, cocktail)
-            return CocktailStatus(status=PrepareResult.IN_PROGRESS)
-        background_tasks.add_task(payment_handler.start_payment_flow, cocktail)
-        return CocktailStatus(status=PrepareResult.WAITING_FOR_PAYMENT)
-    background_tasks.add_task(maker.prepare_cocktail, cocktail)
-    return CocktailStatus(status=PrepareResult.IN_PROGRESS)
+    return cocktail, plan.estimated_time
+
+
+@router.get("/prepare/queue", tags=["preparation"], summary="Get the running and queued orders")
+async def get_order_queue() -> list[PreparationOrderStatus]:
+    return [_order_status(order) for order in ORDER_QUEUE.orders()]
+
+
+@router.get("/prepare/queue/{order_id}", tags=["preparation"], summary="Get the status of an order")
+async def get_order(order_id: str) -> PreparationOrderStatus:
+    order = ORDER_QUEUE.get(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail=DH.get_translation("element_not_found", element_name="Order"))
+    return _order_status(order)
+
+
+@protected_maker_router.delete("/prepare/queue/{order_id}", tags=["preparation"], summary="Cancel an order")
+async def cancel_order(order_id: str) -> PreparationOrderStatus:
+    order = ORDER_QUEUE.cancel(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail=DH.get_translation("element_not_found", element_name="Order"))
+    return _order_status(order)
+
+
+@protected_maker_router.post(
+    "/prepare/queue/confirm-swap",
+    tags=["preparation"],
+    summary="Confirm the glass swap, needed between queued orders without glass detection",
+)
+async def confirm_glass_swap() -> ApiMessage:
+    ORDER_QUEUE.confirm_glass_swap()
+    return ApiMessage(message=DH.get_translation("done"))
+
+
+def _order_status(order: PreparationOrder) -> PreparationOrderStatus:
+    """Map the order to its API status, the running order reports the live progress."""
+    # the active order may still wait for the machine or the glass swap, then its own message applies
+    is_running = order is ORDER_QUEUE.active and order.status in (
+        PrepareResult.IN_PROGRESS,
+        PrepareResult.WAITING_FOR_PAYMENT,
+    )
+    return PreparationOrderStatus(
+        order_id=order.id,
+        cocktail_id=order.cocktail.id,
+        cocktail_name=order.cocktail.name,
+        status=order.status,
+        message=shared.cocktail_status.message if is_running else order.message,
+        progress=shared.cocktail_status.progress
+        if is_running
+        else (100 if order.status == PrepareResult.FINISHED else 0),
+        position=ORDER_QUEUE.position(order),
+        eta=ORDER_QUEUE.eta(order),
+        needs_swap_confirmation=order.needs_swap_confirmation,
+    )
 
 
 @router.get("/prepare/status", tags=["preparation"], summary="Get the current cocktail preparation status")
@@ -155,23 +248,44 @@ async def get_cocktail_status() -> CocktailStatus:
 
 @router.websocket("/ws/prepare/status")
 async def websocket_endpoint(websocket: WebSocket) -> None:
+    """WebSocket endpoint for real-time preparation status updates.
+
+    Sends the current status on connect, then pushes every change (progress, cancel, finish)
+    until the client disconnects.
+    """
     await websocket.accept()
-    while shared.cocktail_status == "IN_PREPARATION":
-        status = shared.cocktail_status
-        await websocket.send_json(
-            {
-                "progress": status.progress,
-                "message": status.message,
-                "status": status.status,
-            }
-        )
-        await asyncio.sleep(0.2)
-    await websocket.close()
+    service = PreparationStatusService()
+    queue = STATUS_BROADCASTER.subscribe(service.add_callback, service.remove_callback)
+    disconnect = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        await websocket.send_json(status_payload(shared.cocktail_status))
+        while True:
+            next_status = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({next_status, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if next_status not in done:
+                next_status.cancel()
+                break
+            await websocket.send_json(next_status.result())
+    except Exception as e:
+        _logger.debug(f"Error sending preparation status via websocket: {e}")
+    finally:
+        disconnect.cancel()
+        STATUS_BROADCASTER.unsubscribe(queue)
+        with contextlib.suppress(Exception):
+            await websocket.close()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client closed the websocket."""
+    with contextlib.suppress(WebSocketDisconnect):
+        while True:
+            await websocket.receive_text()
 
 
 @protected_maker_router.post("/prepare/stop", tags=["preparation"], summary="Stop the current cocktail preparation")
 async def stop_cocktail() -> ApiMessage:
     shared.cocktail_status.status = PrepareResult.CANCELED
+    notify_preparation_status()
     _logger.info("Cocktail Canceled over the API!")
     return ApiMessage(message=DH.get_translation("preparation_cancelled"))
 
@@ -181,18 +295,21 @@ async def stop_cocktail() -> ApiMessage:
     tags=["preparation", "payment"],
     summary="Cancel the current payment flow",
 )
-async def cancel_payment(
+@blocking()
+def cancel_payment(
     payment_handler: Annotated[PaymentHandler, Depends(get_payment_handler)],
 ) -> ApiMessage:
     booking = payment_handler.cancel_payment()
     shared.cocktail_status.status = PrepareResult.CANCELED
     shared.cocktail_status.message = booking.message
+    notify_preparation_status()
     _logger.info("Payment canceled over the API!")
     return ApiMessage(message=DH.get_translation("payment_canceled"))
 
 
 @protected_recipes_router.post("", summary="Create a new cocktail", dependencies=[not_on_demo])
-async def create_cocktail(cocktail: CocktailInput) -> ApiMessageWithData[Cocktail]:
+@blocking()
+def create_cocktail(cocktail: CocktailInput) -> ApiMessageWithData[Cocktail]:
     DBC = DatabaseCommander()
     recipe_volume, recipe_alcohol_level = calculate_cocktail_volume_and_concentration(cocktail)
     ingredient_data = [(i.id, i.amount, i.recipe_order) for i in cocktail.ingredients]
@@ -212,7 +329,8 @@ async def create_cocktail(cocktail: CocktailInput) -> ApiMessageWithData[Cocktai
 
 
 @protected_recipes_router.put("/{cocktail_id}", summary="Update a cocktail by ID", dependencies=[not_on_demo])
-async def update_cocktail(cocktail_id: int, cocktail: CocktailInput) -> ApiMessageWithData[Cocktail]:
+@blocking()
+def update_cocktail(cocktail_id: int, cocktail: CocktailInput) -> ApiMessageWithData[Cocktail]:
     DBC = DatabaseCommander()
     recipe_volume, recipe_alcohol_level = calculate_cocktail_volume_and_concentration(cocktail)
     ingredient_data = [(i.id, i.amount, i.recipe_order) for i in cocktail.ingredients]
@@ -233,7 +351,8 @@ async def update_cocktail(cocktail_id: int, cocktail: CocktailInput) -> ApiMessa
 
 
 @protected_recipes_router.delete("/{cocktail_id}", summary="Delete a cocktail by ID", dependencies=[not_on_demo])
-async def delete_cocktail(cocktail_id: int) -> ApiMessage:
+@blocking()
+def delete_cocktail(cocktail_id: int) -> ApiMessage:
     DBC = DatabaseCommander()
     DBC.delete_recipe(cocktail_id)
     return ApiMessage(message=DH.get_translation("recipe_deleted", recipe_name=cocktail_id))
@@ -243,26 +362,31 @@ async def delete_cocktail(cocktail_id: int) -> ApiMessage:
     "/{cocktail_id}/image", summary="Upload an image for a cocktail", dependencies=[not_on_demo]
 )
 async def upload_cocktail_image(cocktail_id: int, file: Annotated[UploadFile, File(...)]) -> ApiMessage:
-    DBC = DatabaseCommander()
-    cocktail = DBC.get_cocktail(cocktail_id)
+    cocktail = await run_blocking(WorkerPool.DEFAULT, DatabaseCommander().get_cocktail, cocktail_id)
     if cocktail is None:
         message = DH.get_translation("element_not_found", element_name=f"Cocktail (id={cocktail_id})")
         raise HTTPException(status_code=404, detail=message)
     try:
         contents = await file.read()
-        image = process_image(contents)
-        if image is None:
-            raise HTTPException(status_code=400, detail="Image processing failed.")
-        save_image(image, cocktail_id)
+        await run_blocking(WorkerPool.DEFAULT, _store_cocktail_image, contents, cocktail_id)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to upload image: {e!s}")
     return ApiMessage(message=DH.get_translation("image_uploaded"))
 
 
+def _store_cocktail_image(contents: bytes, cocktail_id: int) -> None:
+    image = process_image(contents)
+    if image is None:
+        raise HTTPException(status_code=400, detail="Image processing failed.")
+    save_image(image, cocktail_id)
+    IMAGE_STORE.create_variants(USER_IMAGE_FOLDER / f"{cocktail_id}.jpg")
+
+
 @protected_recipes_router.delete(
     "/{cocktail_id}/image", summary="Delete an image for a cocktail", dependencies=[not_on_demo]
 )
-async def delete_cocktail_image(cocktail_id: int) -> ApiMessage:
+@blocking()
+def delete_cocktail_image(cocktail_id: int) -> ApiMessage:
     DBC = DatabaseCommander()
     cocktail = DBC.get_cocktail(cocktail_id)
     if cocktail is None:
@@ -273,21 +397,24 @@ async def delete_cocktail_image(cocktail_id: int) -> ApiMessage:
         message = DH.get_translation("element_not_found", element_name=f"Cocktail Image (id={cocktail_id})")
         raise HTTPException(status_code=404, detail=message)
     try:
-        user_image_path.unlink()
+        delete_user_image(cocktail_id)
+        IMAGE_STORE.remove_variants(USER_IMAGE_FOLDER / f"{cocktail_id}.jpg")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to delete image: {e!s}")
     return ApiMessage(message=DH.get_translation("image_deleted"))
 
 
 @protected_recipes_router.post("/enable", summary="Enable all recipes")
-async def enable_all_recipes() -> ApiMessage:
+@blocking()
+def enable_all_recipes() -> ApiMessage:
     DBC = DatabaseCommander()
     DBC.set_all_recipes_enabled()
     return ApiMessage(message=DH.get_translation("all_recipes_enabled"))
 
 
 @router.get("/calculate", summary="Calculate optimal ingredient selection for given n and algorithm")
-async def calculate_optimal_ingredient_selection(
+@blocking(WorkerPool.ADMIN)
+def calculate_optimal_ingredient_selection(
     number_ingredients: Annotated[int, Query(ge=1)] = 10,
     algorithm: Literal["greedy", "local", "ilp"] = "ilp",
 ) -> CocktailsAndIngredients:
@@ -298,6 +425,14 @@ async def calculate_optimal_ingredient_selection(
     )
 
 
+def _user_cocktails(user: User | None) -> list[Cocktail]:
+    cocktails = filter_cocktails_by_user(
+        user, DatabaseCommander().get_possible_cocktails(cfg.MAKER_MAX_HAND_INGREDIENTS), get_price_index()
+    )
+    mapped_cocktails = [map_cocktail(c, True) for c in cocktails]
+    return [c for c in mapped_cocktails if c is not None]
+
+
 @router.websocket("/ws/payment/user")
 async def websocket_payment_user(
     websocket: WebSocket,
@@ -320,11 +455,7 @@ async def websocket_payment_user(
         """Send user and filtered cocktails to websocket."""
         user = user_lookup.user
         try:
-            cocktails = filter_cocktails_by_user(
-                user, DatabaseCommander().get_possible_cocktails(cfg.MAKER_MAX_HAND_INGREDIENTS)
-            )
-            mapped_cocktails = [map_cocktail(c, True) for c in cocktails]
-            mapped_cocktails = [c for c in mapped_cocktails if c is not None]
+            mapped_cocktails = await run_blocking(WorkerPool.DEFAULT, _user_cocktails, user)
 
             await websocket.send_json(
                 {
@@ -3,6 +3,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from src.api.api_config import Tags
 from src.api.internal.utils import map_ingredient, not_on_demo
 from src.api.internal.validation import raise_on_validation_not_okay
+from src.api.internal.workers import WorkerPool, blocking
 from src.api.middleware import maker_protected
 from src.api.models import ApiMessage, ApiMessageWithData, ErrorDetail, Ingredient, IngredientInput
 from src.config.config_manager import Tab
@@ -22,14 +23,16 @@ protected_router = APIRouter(
 
 
 @router.get("", summary="Get all ingredients, filtered by machine and hand")
-async def get_ingredients(machine: bool = True, hand: bool = True) -> list[Ingredient]:
+@blocking()
+def get_ingredients(machine: bool = True, hand: bool = True) -> list[Ingredient]:
     DBC = DatabaseCommander()
     ingredients = DBC.get_all_ingredients(get_machine=machine, get_hand=hand)
     return [map_ingredient(i) for i in ingredients]
 
 
 @router.get("/{ingredient_id:int}", summary="Get ingredient by ID")
-async def get_ingredient(ingredient_id: int) -> Ingredient:
+@blocking()
+def get_ingredient(ingredient_id: int) -> Ingredient:
     DBC = DatabaseCommander()
     ingredient = DBC.get_ingredient(ingredient_id)
     if ingredient is None:
@@ -39,7 +42,8 @@ async def get_ingredient(ingredient_id: int) -> Ingredient:
 
 
 @protected_router.post("", summary="Add new ingredient", dependencies=[not_on_demo])
-async def add_ingredient(ingredient: IngredientInput) -> ApiMessageWithData[Ingredient]:
+@blocking()
+def add_ingredient(ingredient: IngredientInput) -> ApiMessageWithData[Ingredient]:
     DBC = DatabaseCommander()
     DBC.insert_new_ingredient(
         ingredient_name=ingredient.name,
@@ -61,7 +65,8 @@ async def add_ingredient(ingredient: IngredientInput) -> ApiMessageWithData[Ingr
 
 
 @protected_router.put("/{ingredient_id:int}", summary="Update ingredient by ID", dependencies=[not_on_demo])
-async def update_ingredient(ingredient_id: int, ingredient: IngredientInput) -> ApiMessageWithData[Ingredient]:
+@blocking()
+def update_ingredient(ingredient_id: int, ingredient: IngredientInput) -> ApiMessageWithData[Ingredient]:
     DBC = DatabaseCommander()
     DBC.set_ingredient_data(
         ingredient_name=ingredient.name,
@@ -87,20 +92,23 @@ async def update_ingredient(ingredient_id: int, ingredient: IngredientInput) ->
 
 
 @protected_router.delete("/{ingredient_id:int}", summary="Delete ingredient by ID", dependencies=[not_on_demo])
-async def delete_ingredients(ingredient_id: int) -> ApiMessage:
+@blocking()
+def delete_ingredients(ingredient_id: int) -> ApiMessage:
     DBC = DatabaseCommander()
     DBC.delete_ingredient(ingredient_id)
     return ApiMessage(message=DH.get_translation("ingredient_deleted", ingredient_name=ingredient_id))
 
 
 @router.get("/available", summary="Get available ingredients IDs")
-async def get_available_ingredients() -> list[int]:
+@blocking()
+def get_available_ingredients() -> list[int]:
     DBC = DatabaseCommander()
     return DBC.get_available_ids()
 
 
 @protected_router.post("/available")
-async def post_available_ingredients(available: list[int]) -> ApiMessage:
+@blocking()
+def post_available_ingredients(available: list[int]) -> ApiMessage:
     DBC = DatabaseCommander()
     DBC.delete_existing_handadd_ingredient()
     DBC.insert_multiple_existing_handadd_ingredients(available)
@@ -121,7 +129,8 @@ async def post_available_ingredients(available: list[int]) -> ApiMessage:
     summary="Prepare given amount of ingredient by ID",
     dependencies=[Depends(maker_protected(Tab.MAKER))],
 )
-async def prepare_ingredient(ingredient_id: int, amount: int, background_tasks: BackgroundTasks) -> CocktailStatus:
+@blocking(WorkerPool.HARDWARE)
+def prepare_ingredient(ingredient_id: int, amount: int, background_tasks: BackgroundTasks) -> CocktailStatus:
     DBC = DatabaseCommander()
     ingredient = DBC.get_ingredient(ingredient_id)
     if ingredient is None:
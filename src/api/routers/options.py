@@ -17,8 +17,10 @@ from fastapi.responses import FileResponse
 
 from src.api.api_config import Tags
 from src.api.internal.dependencies import SumupServiceDep
+from src.api.internal.latency import ROUTE_LATENCY
 from src.api.internal.utils import not_on_demo, only_change_theme_on_demo
 from src.api.internal.validation import raise_when_cocktail_is_in_progress
+from src.api.internal.workers import WorkerPool, blocking, pool_metrics, run_blocking
 from src.api.middleware import master_protected_dependency
 from src.api.models import (
     ApiMessage,
@@ -39,14 +41,33 @@ from src.config.config_manager import shared
 from src.data_utils import generate_consume_data
 from src.database_commander import DatabaseCommander
 from src.dialog_handler import DIALOG_HANDLER as DH
-from src.image_utils import RANDOM_IMAGE_NAME, find_user_cocktail_image, process_image, save_image
+from src.filepath import DATABASE_PATH
+from src.image_store import IMAGE_STORE
+from src.image_utils import (
+    RANDOM_IMAGE_NAME,
+    delete_user_image,
+    find_user_cocktail_image,
+    process_image,
+    refresh_image_index,
+    save_image,
+)
 from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
 from src.migration.backup import BACKUP_FILES, FILE_SELECTION_MAPPER, NEEDED_BACKUP_FILES
-from src.models import AddonData, ConsumeData, EventType, ResourceInfo, ResourceStats
+from src.models import (
+    AddonData,
+    ApiMetrics,
+    ConsumeData,
+    DatabaseStats,
+    EventType,
+    OutboxMetrics,
+    ResourceInfo,
+    ResourceStats,
+)
 from src.programs.addons.addons import ADDONS
 from src.save_handler import SAVE_HANDLER
 from src.service.sumup_payment_service import Err
+from src.service_handler import SERVICE_HANDLER
 from src.shared import NEWS_KEYS
 from src.updater import UpdateInfo, Updater
 from src.utils import (
@@ -95,7 +116,8 @@ def _restart_task() -> None:
 
 
 @protected_router.post("", summary="Update the options", dependencies=[Depends(only_change_theme_on_demo)])
-async def update_options(options: dict, background_tasks: BackgroundTasks) -> ApiMessage:
+@blocking()
+def update_options(options: dict, background_tasks: BackgroundTasks) -> ApiMessage:
     cfg.set_config(options, True)
     cfg.sync_config_to_file()
     # resolve the issue, when we get here, there was no error in the config and we can resolve potential issues
@@ -114,32 +136,38 @@ async def update_options(options: dict, background_tasks: BackgroundTasks) -> Ap
 async def upload_random_image(file: Annotated[UploadFile, File(...)]) -> ApiMessage:
     try:
         contents = await file.read()
-        image = process_image(contents)
-        if image is None:
-            raise HTTPException(status_code=400, detail="Image processing failed.")
-        save_image(image, RANDOM_IMAGE_NAME)
+        await run_blocking(WorkerPool.DEFAULT, _store_random_image, contents)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to upload image: {e!s}")
     return ApiMessage(message=DH.get_translation("image_uploaded"))
 
 
+def _store_random_image(contents: bytes) -> None:
+    image = process_image(contents)
+    if image is None:
+        raise HTTPException(status_code=400, detail="Image processing failed.")
+    save_image(image, RANDOM_IMAGE_NAME)
+
+
 @protected_router.delete(
     "/random-image", summary="Delete the image for the random cocktail tile", dependencies=[not_on_demo]
 )
-async def delete_random_image() -> ApiMessage:
+@blocking()
+def delete_random_image() -> ApiMessage:
     user_image_path = find_user_cocktail_image(RANDOM_IMAGE_NAME)
     if user_image_path is None or not user_image_path.exists():
         message = DH.get_translation("element_not_found", element_name="Random Cocktail Image")
         raise HTTPException(status_code=404, detail=message)
     try:
-        user_image_path.unlink()
+        delete_user_image(RANDOM_IMAGE_NAME)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to delete image: {e!s}")
     return ApiMessage(message=DH.get_translation("image_deleted"))
 
 
 @protected_router.post("/clean", tags=[Tags.PREPARATION], summary="Start the machine cleaning")
-async def clean_machine(background_tasks: BackgroundTasks, revert_pumps: bool = False) -> ApiMessage:
+@blocking()
+def clean_machine(background_tasks: BackgroundTasks, revert_pumps: bool = False) -> ApiMessage:
     raise_when_cocktail_is_in_progress()
     _logger.info("Cleaning started by user request")
     # Reversion only honored when machine is configured for it; ignore the flag otherwise.
@@ -150,7 +178,8 @@ async def clean_machine(background_tasks: BackgroundTasks, revert_pumps: bool =
 
 
 @protected_router.post("/initialize-bottles", tags=[Tags.PREPARATION], summary="Prime all pump tubes")
-async def initialize_bottles_endpoint(background_tasks: BackgroundTasks) -> ApiMessage:
+@blocking()
+def initialize_bottles_endpoint(background_tasks: BackgroundTasks) -> ApiMessage:
     raise_when_cocktail_is_in_progress()
     _logger.info("Bottle initialization started by user request")
     background_tasks.add_task(MachineController().initialize_bottles, None)
@@ -161,7 +190,7 @@ async def initialize_bottles_endpoint(background_tasks: BackgroundTasks) -> ApiM
 async def reboot_system() -> ApiMessage:
     if _platform_data.system == "Windows":
         raise HTTPException(status_code=400, detail="Cannot reboot on Windows")
-    DatabaseCommander().save_event(EventType.REBOOT)
+    await run_blocking(WorkerPool.DEFAULT, DatabaseCommander().save_event, EventType.REBOOT)
     atexit._run_exitfuncs()  # pylint: disable=protected-access
     await asyncio.create_subprocess_exec("sudo", "reboot")
     return ApiMessage(message="System rebooting")
@@ -171,25 +200,28 @@ async def reboot_system() -> ApiMessage:
 async def shutdown_system() -> ApiMessage:
     if _platform_data.system == "Windows":
         raise HTTPException(status_code=400, detail="Cannot shutdown on Windows")
-    DatabaseCommander().save_event(EventType.SHUTDOWN)
+    await run_blocking(WorkerPool.DEFAULT, DatabaseCommander().save_event, EventType.SHUTDOWN)
     atexit._run_exitfuncs()  # pylint: disable=protected-access
     await asyncio.create_subprocess_exec("sudo", "shutdown", "now")
     return ApiMessage(message="System shutting down")
 
 
 @protected_router.get("/data", summary="Get the data insights")
-async def data_insights() -> DataResponse[dict[str, ConsumeData]]:
+@blocking()
+def data_insights() -> DataResponse[dict[str, ConsumeData]]:
     return DataResponse(data=generate_consume_data())
 
 
 @protected_router.post("/data/reset", summary="Reset the data insights", dependencies=[not_on_demo])
-async def reset_data_insights() -> ApiMessage:
+@blocking()
+def reset_data_insights() -> ApiMessage:
     SAVE_HANDLER.export_data()
     return ApiMessage(message=DH.get_translation("all_data_exported"))
 
 
 @protected_router.get("/backup", summary="Create a backup of CocktailBerry data", dependencies=[not_on_demo])
-async def create_backup() -> FileResponse:
+@blocking(WorkerPool.ADMIN)
+def create_backup() -> FileResponse:
     backup_folder_name = f"CocktailBerry_backup_{datetime.datetime.now().strftime('%Y-%m-%d')}"
     zip_file_name = f"{backup_folder_name}.zip"
     zip_file_path = Path(tempfile.gettempdir()) / zip_file_name  # Store in the system's temp folder
@@ -199,6 +231,10 @@ async def create_backup() -> FileResponse:
         backup_folder.mkdir()
 
         for _file in BACKUP_FILES:
+            # the database may have recent changes in its write ahead log, which a file copy would miss
+            if _file == DATABASE_PATH:
+                DatabaseCommander().backup_database(backup_folder / _file.name)
+                continue
             if _file.is_file():
                 shutil.copy(_file, backup_folder)
             if _file.is_dir():
@@ -229,8 +265,25 @@ def parse_restored_file(
     return data  # type: ignore
 
 
+def _restore_backup_files(extracted_root: Path, backup_files: list[Path]) -> None:
+    """Copy the files of the extracted backup to their places."""
+    for _file in backup_files:
+        source_path = extracted_root / _file.name
+        target_path = _file
+        # replacing the file under the open connections would mix it with the old write ahead log
+        if _file == DATABASE_PATH:
+            DatabaseCommander().restore_database(source_path)
+            continue
+        # Differentiate between files and folders
+        if source_path.is_file():
+            shutil.copy(source_path, target_path)
+        elif source_path.is_dir():
+            shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+
+
 @protected_router.post("/backup", summary="Restore a backup of CocktailBerry data", dependencies=[not_on_demo])
-async def upload_backup(
+@blocking(WorkerPool.ADMIN)
+def upload_backup(
     file: Annotated[UploadFile, File(...)],
     restored_file: Annotated[list[Literal["style", "config", "images", "database"]], Depends(parse_restored_file)],
 ) -> ApiMessage:
@@ -266,20 +319,17 @@ async def upload_backup(
             if not (extracted_root / needed_file.name).exists():
                 raise HTTPException(status_code=400, detail=DH.get_translation("backup_failed", file=needed_file.name))
 
-        for _file in backup_files:
-            source_path = extracted_root / _file.name
-            target_path = _file
-            # Differentiate between files and folders
-            if source_path.is_file():
-                shutil.copy(source_path, target_path)
-            elif source_path.is_dir():
-                shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+        _restore_backup_files(extracted_root, backup_files)
+    # restored user images are not known to the image index yet, nor have web variants
+    refresh_image_index()
+    IMAGE_STORE.start_warm_up()
 
     return ApiMessage(message="Backup restored successfully")
 
 
 @protected_router.get("/logs", summary="Get the logs")
-async def get_logs(warning_and_higher: bool = False) -> DataResponse[dict[str, list[str]]]:
+@blocking(WorkerPool.ADMIN)
+def get_logs(warning_and_higher: bool = False) -> DataResponse[dict[str, list[str]]]:
     log_data: dict[str, list[str]] = {}
     for _file in get_log_files():
         log_data[_file] = read_log_file(_file, warning_and_higher)
@@ -287,7 +337,8 @@ async def get_logs(warning_and_higher: bool = False) -> DataResponse[dict[str, l
 
 
 @protected_router.get("/events", summary="Get system events")
-async def get_events() -> DataResponse[EventsData]:
+@blocking()
+def get_events() -> DataResponse[EventsData]:
     return DataResponse(
         data=EventsData(
             events=DatabaseCommander().get_events(),
@@ -305,14 +356,16 @@ async def rfid_writer() -> ApiMessage:
 
 
 @protected_router.get("/wifi", summary="Get available WiFi SSIDs")
-async def get_available_ssids() -> list[str]:
+@blocking(WorkerPool.ADMIN)
+def get_available_ssids() -> list[str]:
     if _platform_data.system == "Windows":
         raise HTTPException(status_code=400, detail="Cannot scan WiFi on Windows")
     return list_available_ssids()
 
 
 @protected_router.post("/wifi", summary="Set WiFi SSID and password", dependencies=[not_on_demo])
-async def update_wifi_data(wifi_data: WifiData) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def update_wifi_data(wifi_data: WifiData) -> ApiMessage:
     if _platform_data.system == "Windows":
         raise HTTPException(status_code=400, detail="Cannot set WiFi on Windows")
     success = setup_wifi(wifi_data.ssid, wifi_data.password)
@@ -322,12 +375,14 @@ async def update_wifi_data(wifi_data: WifiData) -> ApiMessage:
 
 
 @protected_router.get("/addon", summary="Get installed and available addons")
-async def addon_data() -> list[AddonData]:
+@blocking(WorkerPool.ADMIN)
+def addon_data() -> list[AddonData]:
     return ADDONS.get_addon_data()
 
 
 @protected_router.post("/addon", summary="Install addon")
-async def add_addon(addon: AddonData) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def add_addon(addon: AddonData) -> ApiMessage:
     possible_addons = ADDONS.get_addon_data()
     matched_addon = next((a for a in possible_addons if a.name == addon.name and a.official), None)
     if matched_addon:
@@ -337,13 +392,15 @@ async def add_addon(addon: AddonData) -> ApiMessage:
 
 
 @protected_router.delete("/addon/remove", summary="Remove addon")
-async def delete_addon(addon: AddonData) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def delete_addon(addon: AddonData) -> ApiMessage:
     ADDONS.remove_addon(addon)
     return ApiMessage(message=f"Addon {addon.name} removed")
 
 
 @protected_router.post("/addon/update", summary="Update addon")
-async def update_addon(addon: AddonData) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def update_addon(addon: AddonData) -> ApiMessage:
     possible_addons = ADDONS.get_addon_data()
     matched_addon = next((a for a in possible_addons if a.name == addon.name and a.official), None)
     if not matched_addon:
@@ -355,7 +412,8 @@ async def update_addon(addon: AddonData) -> ApiMessage:
 
 
 @protected_router.get("/connection", summary="Check internet connection")
-async def check_internet_connection() -> dict[str, str | bool]:
+@blocking(WorkerPool.ADMIN)
+def check_internet_connection() -> dict[str, str | bool]:
     is_connected = has_connection()
     return {
         "is_connected": is_connected,
@@ -366,7 +424,8 @@ async def check_internet_connection() -> dict[str, str | bool]:
 
 
 @protected_router.post("/update/system", summary="Update the system", dependencies=[not_on_demo])
-async def update_system(background_tasks: BackgroundTasks) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def update_system(background_tasks: BackgroundTasks) -> ApiMessage:
     if _platform_data.system == "Windows":
         raise HTTPException(status_code=400, detail="Cannot update system on Windows")
     background_tasks.add_task(update_os)
@@ -374,7 +433,8 @@ async def update_system(background_tasks: BackgroundTasks) -> ApiMessage:
 
 
 @protected_router.get("/update/software", summary="List available CocktailBerry software updates")
-async def list_software_updates() -> UpdateAvailability:
+@blocking(WorkerPool.ADMIN)
+def list_software_updates() -> UpdateAvailability:
     info = Updater().check_for_updates()
     return UpdateAvailability(
         status=info.status.value,
@@ -386,7 +446,8 @@ async def list_software_updates() -> UpdateAvailability:
 
 
 @protected_router.post("/update/software", summary="Update CocktailBerry software", dependencies=[not_on_demo])
-async def update_software(update: UpdateRequest) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def update_software(update: UpdateRequest) -> ApiMessage:
     updater = Updater()
     info = updater.check_for_updates()
     if info.status == UpdateInfo.Status.UP_TO_DATE:
@@ -437,7 +498,8 @@ async def ignore_issues() -> ApiMessage:
 
 
 @router.post("/datetime", summary="Update the system date and time", dependencies=[not_on_demo])
-async def update_datetime(data: DateTimeInput) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def update_datetime(data: DateTimeInput) -> ApiMessage:
     # need YYYY-MM-DD HH:MM:SS format, time from web is "just" HH:MM
     # users might also add ms, so remove them as well
     time_string = data.time.split(".")[0]
@@ -456,7 +518,8 @@ async def update_datetime(data: DateTimeInput) -> ApiMessage:
     "/resource_tracker/{session_number:int}",
     summary="Get system resource usage statistics",
 )
-async def get_resource_stats_endpoint(session_number: int) -> ResourceStats:
+@blocking()
+def get_resource_stats_endpoint(session_number: int) -> ResourceStats:
     """Get system resource usage statistics and timeline for the current session."""
     return DatabaseCommander().get_resource_stats(session_number)
 
@@ -465,13 +528,34 @@ async def get_resource_stats_endpoint(session_number: int) -> ResourceStats:
     "/resource_tracker/sessions",
     summary="Get start date and session number of all sessions",
 )
-async def get_resource_stats_all_sessions_endpoint() -> list[ResourceInfo]:
+@blocking()
+def get_resource_stats_all_sessions_endpoint() -> list[ResourceInfo]:
     """Get system resource usage statistics and timeline for all sessions."""
     return DatabaseCommander().get_resource_session_numbers()
 
 
+@router.get("/outbox", summary="Get the state of the team and webhook outbox")
+async def get_outbox_metrics() -> OutboxMetrics:
+    """Get the waiting, sent and dropped posts and the backoff state of each destination."""
+    return SERVICE_HANDLER.outbox.metrics()
+
+
+@router.get("/api_metrics", summary="Get the response times of the API routes and the load of the worker pools")
+async def get_api_metrics() -> ApiMetrics:
+    """Get a latency histogram per route and the running and queued calls of each worker pool."""
+    return ApiMetrics(routes=ROUTE_LATENCY.metrics(), pools=pool_metrics())
+
+
+@router.get("/database_stats", summary="Get the pragma profile and size of the database")
+@blocking()
+def get_database_stats() -> DatabaseStats:
+    """Get the journal mode, sync level and the size of the database and its write ahead log."""
+    return DatabaseCommander().get_database_stats()
+
+
 @router.get("/news", summary="Get all unacknowledged news items")
-async def get_news() -> DataResponse[dict[str, str]]:
+@blocking()
+def get_news() -> DataResponse[dict[str, str]]:
     """Get all news items that haven't been acknowledged yet.
 
     Returns a dictionary mapping news keys to their translated content.
@@ -487,7 +571,8 @@ async def get_news() -> DataResponse[dict[str, str]]:
 
 
 @protected_router.post("/news/{news_key}", summary="Acknowledge a specific news item", dependencies=[not_on_demo])
-async def acknowledge_news(news_key: str) -> ApiMessage:
+@blocking()
+def acknowledge_news(news_key: str) -> ApiMessage:
     """Mark a news item as acknowledged so it won't be shown again."""
     db_commander = DatabaseCommander()
     db_commander.acknowledge_news(news_key)
@@ -496,14 +581,16 @@ async def acknowledge_news(news_key: str) -> ApiMessage:
 
 # SumUp Reader Management
 @protected_router.get("/sumup/readers", summary="Get all SumUp readers")
-async def get_sumup_readers(service: SumupServiceDep) -> list[SumupReaderResponse]:
+@blocking(WorkerPool.ADMIN)
+def get_sumup_readers(service: SumupServiceDep) -> list[SumupReaderResponse]:
     """Get all configured SumUp readers."""
     readers = service.get_all_readers()
     return [SumupReaderResponse(id=r.id, name=r.name) for r in readers]
 
 
 @protected_router.post("/sumup/readers", summary="Create a new SumUp reader", dependencies=[not_on_demo])
-async def create_sumup_reader(
+@blocking(WorkerPool.ADMIN)
+def create_sumup_reader(
     reader_data: SumupReaderCreate,
     service: SumupServiceDep,
 ) -> SumupReaderResponse:
@@ -515,7 +602,8 @@ async def create_sumup_reader(
 
 
 @protected_router.delete("/sumup/readers/{reader_id}", summary="Delete a SumUp reader", dependencies=[not_on_demo])
-async def delete_sumup_reader(
+@blocking(WorkerPool.ADMIN)
+def delete_sumup_reader(
     reader_id: str,
     service: SumupServiceDep,
 ) -> ApiMessage:
@@ -533,7 +621,8 @@ async def delete_sumup_reader(
 @protected_router.post(
     "/sumup/readers/{reader_id}/use", summary="Set a SumUp reader as active", dependencies=[not_on_demo]
 )
-async def use_sumup_reader(reader_id: str) -> ApiMessage:
+@blocking(WorkerPool.ADMIN)
+def use_sumup_reader(reader_id: str) -> ApiMessage:
     """Set a SumUp reader as the active terminal."""
     cfg.PAYMENT_SUMUP_TERMINAL_ID = reader_id
     cfg.sync_config_to_file()
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from src.api.api_config import Tags
 from src.api.internal.utils import not_on_demo
+from src.api.internal.workers import blocking
 from src.api.middleware import master_protected_dependency
 from src.api.models import ApiMessage, RoleCreate, RoleResponse, RoleUpdate
 from src.database_commander import DatabaseCommander, ElementNotFoundError, RoleInUseError
@@ -16,14 +17,16 @@ router = APIRouter(
 
 
 @router.get("", summary="List all roles")
-async def get_roles() -> list[RoleResponse]:
+@blocking()
+def get_roles() -> list[RoleResponse]:
     """Get all defined roles."""
     DBC = DatabaseCommander()
     return [RoleResponse.from_db(r) for r in DBC.get_all_roles()]
 
 
 @router.post("", summary="Create a new role", dependencies=[not_on_demo])
-async def create_role(data: RoleCreate) -> RoleResponse:
+@blocking()
+def create_role(data: RoleCreate) -> RoleResponse:
     """Create a new role with tab and tile permissions."""
     DBC = DatabaseCommander()
     role = DBC.create_role(
@@ -35,7 +38,8 @@ async def create_role(data: RoleCreate) -> RoleResponse:
 
 
 @router.put("/{role_id}", summary="Update a role", dependencies=[not_on_demo])
-async def update_role(role_id: int, data: RoleUpdate) -> RoleResponse:
+@blocking()
+def update_role(role_id: int, data: RoleUpdate) -> RoleResponse:
     """Update a role's name, tab permissions, and/or tile permissions."""
     DBC = DatabaseCommander()
     role = DBC.update_role(
@@ -48,7 +52,8 @@ async def update_role(role_id: int, data: RoleUpdate) -> RoleResponse:
 
 
 @router.delete("/{role_id}", summary="Delete a role", dependencies=[not_on_demo])
-async def delete_role(role_id: int) -> ApiMessage:
+@blocking()
+def delete_role(role_id: int) -> ApiMessage:
     """Delete a role. Fails with 409 if any waiter still references it."""
     DBC = DatabaseCommander()
     try:
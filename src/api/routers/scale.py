@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import contextlib
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 
 from src.api.api_config import Tags
+from src.api.internal.scale_stream import SCALE_BROADCASTER
+from src.api.internal.workers import WorkerPool, blocking
 from src.api.middleware import master_protected_dependency
 from src.api.models import ApiMessageWithData
+from src.config.config_manager import CONFIG as cfg
 from src.dialog_handler import DIALOG_HANDLER as DH
+from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
 
+_logger = LoggerHandler("scale_router")
+
 router = APIRouter(tags=[Tags.SCALE], prefix="/scale")
 protected_router = APIRouter(
     tags=[Tags.SCALE, Tags.MASTER_PROTECTED],
@@ -31,21 +41,71 @@ async def get_scale_status() -> ApiMessageWithData[bool]:
 # tare/read are non-destructive live reads (like status), used by both the hand-add guidance and the
 # calibration screen, so they are left open; only the config-mutating calibrate is master-protected.
 @router.post("/tare", summary="Tare (zero) the scale.")
-async def tare_scale(samples: int = 3) -> ApiMessageWithData[float]:
+@blocking(WorkerPool.HARDWARE)
+def tare_scale(samples: int = 3) -> ApiMessageWithData[float]:
     mc = _require_scale()
     offset = mc.scale_tare(samples)
     return ApiMessageWithData(message=DH.get_translation("scale_tared"), data=offset)
 
 
 @router.get("/read", summary="Read current weight in grams.")
-async def read_scale() -> ApiMessageWithData[float]:
+@blocking(WorkerPool.HARDWARE)
+def read_scale() -> ApiMessageWithData[float]:
     mc = _require_scale()
     weight = mc.scale_read_grams()
     return ApiMessageWithData(message="Scale reading", data=round(weight, 1))
 
 
+@router.websocket("/ws")
+async def websocket_scale(
+    websocket: WebSocket,
+    rate: Annotated[float | None, Query(gt=0)] = None,
+) -> None:
+    """WebSocket endpoint for the live weight of the scale.
+
+    All viewers share one acquisition loop, which median and EMA filters the readings.
+    Pushes ``{"grams": float, "stable": bool, "paused": bool}`` on every change, at most with the
+    configured stream rate, or the lower given ``rate`` (updates per second) for this viewer.
+    ``paused`` is set while a preparation or calibration uses the scale.
+    """
+    await websocket.accept()
+    mc = MachineController()
+    if not mc.has_scale:
+        await websocket.close()
+        return
+    interval = 1 / min(rate or cfg.SCALE_CONFIG.stream_rate, cfg.SCALE_CONFIG.stream_rate)
+    stream = mc.scale_stream
+    queue = SCALE_BROADCASTER.subscribe(stream.add_callback, stream.remove_callback, stream.latest)
+    disconnect = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_reading = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait({next_reading, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if next_reading not in done:
+                next_reading.cancel()
+                break
+            await websocket.send_json(next_reading.result())
+            # the queue keeps the newest reading meanwhile, a slower viewer skips the ones in between
+            await asyncio.sleep(interval)
+    except Exception as e:
+        _logger.debug(f"Error sending scale readings via websocket: {e}")
+    finally:
+        disconnect.cancel()
+        SCALE_BROADCASTER.unsubscribe(queue)
+        with contextlib.suppress(Exception):
+            await websocket.close()
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """Return once the client closed the websocket."""
+    with contextlib.suppress(WebSocketDisconnect):
+        while True:
+            await websocket.receive_text()
+
+
 @protected_router.post("/calibrate", summary="Calibrate the scale using a known weight.")
-async def calibrate_scale(known_weight_grams: float, zero_raw_offset: int) -> ApiMessageWithData[float]:
+@blocking(WorkerPool.HARDWARE)
+def calibrate_scale(known_weight_grams: float, zero_raw_offset: int) -> ApiMessageWithData[float]:
     mc = _require_scale()
     if known_weight_grams <= 0:
         raise HTTPException(status_code=400, detail=DH.get_translation("scale_known_weight_positive"))
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
 from src.api.api_config import Tags
 from src.api.internal.utils import not_on_demo
+from src.api.internal.workers import blocking
 from src.api.middleware import master_protected_dependency
 from src.api.models import ApiMessage, CurrentWaiterState, WaiterCreate, WaiterLogEntry, WaiterResponse, WaiterUpdate
 from src.config.config_manager import CONFIG as cfg
@@ -33,7 +34,8 @@ async def get_current_waiter() -> WaiterResponse | None:
 
 
 @router.post("/logout", summary="Log out the current waiter")
-async def logout_current_waiter() -> ApiMessage:
+@blocking()
+def logout_current_waiter() -> ApiMessage:
     """Log out the current waiter by clearing shared state and notifying clients."""
     WaiterService().logout_waiter()
     _notify_waiter_callbacks()
@@ -41,7 +43,8 @@ async def logout_current_waiter() -> ApiMessage:
 
 
 @protected_router.get("", summary="List all registered waiters")
-async def get_waiters() -> list[WaiterResponse]:
+@blocking()
+def get_waiters() -> list[WaiterResponse]:
     """Get all registered waiters."""
     DBC = DatabaseCommander()
     waiters = DBC.get_all_waiters()
@@ -49,7 +52,8 @@ async def get_waiters() -> list[WaiterResponse]:
 
 
 @protected_router.post("", summary="Register a new waiter", dependencies=[not_on_demo])
-async def create_waiter(data: WaiterCreate) -> WaiterResponse:
+@blocking()
+def create_waiter(data: WaiterCreate) -> WaiterResponse:
     """Register a new waiter with NFC ID, name, and assigned role."""
     DBC = DatabaseCommander()
     waiter = DBC.create_waiter(data.nfc_id, data.name, role_id=data.role_id)
@@ -62,7 +66,8 @@ async def create_waiter(data: WaiterCreate) -> WaiterResponse:
 
 
 @protected_router.put("/{nfc_id}", summary="Update a waiter", dependencies=[not_on_demo])
-async def update_waiter(nfc_id: str, data: WaiterUpdate) -> WaiterResponse:
+@blocking()
+def update_waiter(nfc_id: str, data: WaiterUpdate) -> WaiterResponse:
     """Update a waiter's name and/or assigned role."""
     DBC = DatabaseCommander()
     waiter = DBC.update_waiter(nfc_id, name=data.name, role_id=data.role_id)
@@ -75,7 +80,8 @@ async def update_waiter(nfc_id: str, data: WaiterUpdate) -> WaiterResponse:
 
 
 @protected_router.delete("/{nfc_id}", summary="Delete a waiter", dependencies=[not_on_demo])
-async def delete_waiter(nfc_id: str) -> ApiMessage:
+@blocking()
+def delete_waiter(nfc_id: str) -> ApiMessage:
     """Delete a waiter by NFC ID. Unsets current waiter if it matches."""
     DBC = DatabaseCommander()
     DBC.delete_waiter(nfc_id)
@@ -87,7 +93,8 @@ async def delete_waiter(nfc_id: str) -> ApiMessage:
 
 
 @protected_router.get("/logs", summary="Get waiter cocktail logs")
-async def get_waiter_logs() -> list[WaiterLogEntry]:
+@blocking()
+def get_waiter_logs() -> list[WaiterLogEntry]:
     """Get all waiter cocktail logs with waiter and recipe names."""
     DBC = DatabaseCommander()
     logs = DBC.get_waiter_logs()
@@ -0,0 +1,244 @@
+"""In-memory snapshot of the cocktail catalog, shared by all DatabaseCommanders of one database.
+
+The DatabaseCommander fills the cache on the first read and invalidates or patches it on every write.
+Readers always get copies, so the cached objects are never changed by the callers.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from src.models import Cocktail, Ingredient
+
+
+def copy_ingredient(ingredient: Ingredient) -> Ingredient:
+    """Return an independent copy of the ingredient, all fields are immutable values."""
+    return copy.copy(ingredient)
+
+
+def copy_cocktail(cocktail: Cocktail) -> Cocktail:
+    """Return an independent copy of the cocktail without deep copying it."""
+    return cocktail.copy()
+
+
+def _to_mask(ingredient_ids: Iterable[int]) -> int:
+    """Build a bitset with one bit set per ingredient id."""
+    mask = 0
+    for ingredient_id in ingredient_ids:
+        mask |= 1 << ingredient_id
+    return mask
+
+
+@dataclass(frozen=True)
+class RecipeMask:
+    """Bitsets of the hand-add ingredients of one recipe, in normal and virgin version.
+
+    The machine counts are needed, since a recipe needs at least one machine-add to be possible.
+    """
+
+    enabled: bool
+    virgin_available: bool
+    naturally_virgin: bool
+    machine_count: int
+    hand_mask: int
+    virgin_machine_count: int
+    virgin_hand_mask: int
+
+    @classmethod
+    def from_cocktail(cls, cocktail: Cocktail) -> RecipeMask:
+        return cls(
+            enabled=cocktail.enabled,
+            virgin_available=cocktail.virgin_available,
+            naturally_virgin=cocktail.is_naturally_virgin,
+            machine_count=len(cocktail.machineadds),
+            hand_mask=_to_mask(x.id for x in cocktail.handadds),
+            virgin_machine_count=len(cocktail.virgin_machineadds),
+            virgin_hand_mask=_to_mask(x.id for x in cocktail.virgin_handadds),
+        )
+
+
+class PossibilityIndex:
+    """Precomputed possibility of all enabled recipes for the current bottles and available hand-adds.
+
+    For each recipe, the number of hand-adds needed for the normal and the virgin version is stored,
+    or None if the version is not possible at all with the current bottles and available ingredients.
+    Lookups for a given number of max hand ingredients are memoized, since there are only few used values.
+    Results are the same as ``Cocktail.is_possible`` on each cocktail.
+    """
+
+    def __init__(self, cocktails: dict[int, Cocktail], available_ids: Iterable[int]) -> None:
+        self.cocktails = cocktails
+        available_mask = _to_mask(available_ids)
+        self._needed_hand: list[tuple[int, int | None, int | None, bool]] = []
+        for cocktail_id, cocktail in cocktails.items():
+            mask = RecipeMask.from_cocktail(cocktail)
+            if not mask.enabled:
+                continue
+            normal = None
+            if mask.machine_count >= 1 and not mask.hand_mask & ~available_mask:
+                normal = mask.hand_mask.bit_count()
+            virgin = None
+            if mask.virgin_available and mask.virgin_machine_count >= 1 and not mask.virgin_hand_mask & ~available_mask:
+                virgin = mask.virgin_hand_mask.bit_count()
+            if normal is None and virgin is None:
+                continue
+            self._needed_hand.append((cocktail_id, normal, virgin, mask.naturally_virgin))
+        self._lookups: dict[int, list[tuple[int, bool]]] = {}
+
+    def possible(self, max_hand_ingredients: int) -> list[tuple[int, bool]]:
+        """Return the (cocktail id, only virgin) pairs of all possible cocktails."""
+        result = self._lookups.get(max_hand_ingredients)
+        if result is not None:
+            return result
+        result = []
+        for cocktail_id, normal, virgin, naturally_virgin in self._needed_hand:
+            if normal is not None and normal <= max_hand_ingredients:
+                result.append((cocktail_id, naturally_virgin))
+            elif virgin is not None and virgin <= max_hand_ingredients:
+                result.append((cocktail_id, True))
+        self._lookups[max_hand_ingredients] = result
+        return result
+
+
+class CatalogCache:
+    """Versioned cache of the mapped cocktails, ingredients and available hand-add ids.
+
+    Each part is loaded lazily with the given loader function.
+    A load that raced with an invalidation is returned to the caller but not stored,
+    so a stale snapshot can never outlive a write.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self.version = 0
+        self.recipe_version = 0
+        """Only changes with the recipes, ingredients or bottles, not with fill levels or available hand-adds."""
+        self._cocktails: dict[int, Cocktail] | None = None
+        self._ingredients: dict[int, Ingredient] | None = None
+        self._available_ids: list[int] | None = None
+        self._possibility: PossibilityIndex | None = None
+        self._derived: dict[Hashable, Any] = {}
+
+    def invalidate(self) -> None:
+        """Drop all cached data, next read will load it again from the database."""
+        with self._lock:
+            self.version += 1
+            self.recipe_version += 1
+            self._cocktails = None
+            self._ingredients = None
+            self._available_ids = None
+            self._possibility = None
+            self._derived = {}
+
+    def invalidate_available(self) -> None:
+        """Drop only the available hand-add ids and the possibility index depending on them."""
+        with self._lock:
+            self.version += 1
+            self._available_ids = None
+            self._possibility = None
+
+    def patch_fill_level(self, ingredient_id: int, fill_level: int) -> None:
+        """Update the fill level of the ingredient in all cached objects without reloading."""
+        with self._lock:
+            self.version += 1
+            if self._ingredients is not None and ingredient_id in self._ingredients:
+                self._ingredients[ingredient_id] = self._with_fill_level(self._ingredients[ingredient_id], fill_level)
+            if self._cocktails is None:
+                return
+            for cocktail in self._cocktails.values():
+                for ing_list in (cocktail.ingredients, cocktail.adjusted_ingredients):
+                    for i, ing in enumerate(ing_list):
+                        if ing.id == ingredient_id:
+                            ing_list[i] = self._with_fill_level(ing, fill_level)
+
+    def _cocktail_map(self, loader: Callable[[], list[Cocktail]]) -> dict[int, Cocktail]:
+        return self._load("_cocktails", lambda: {x.id: x for x in loader()})
+
+    def _with_fill_level(self, ingredient: Ingredient, fill_level: int) -> Ingredient:
+        new_ingredient = copy_ingredient(ingredient)
+        new_ingredient.fill_level = max(0, min(fill_level, ingredient.bottle_volume))
+        return new_ingredient
+
+    def _load[T](self, attribute: str, loader: Callable[[], T]) -> T:
+        """Return the cached attribute, or load it and store it if no write happened meanwhile."""
+        with self._lock:
+            cached = getattr(self, attribute)
+            version = self.version
+        if cached is not None:
+            return cached
+        data = loader()
+        with self._lock:
+            if self.version == version:
+                setattr(self, attribute, data)
+        return data
+
+    def cocktails(self, loader: Callable[[], list[Cocktail]]) -> list[Cocktail]:
+        """Return copies of all cached cocktails."""
+        data = self._cocktail_map(loader)
+        return [copy_cocktail(x) for x in data.values()]
+
+    def cocktail(self, search: str | int, loader: Callable[[], list[Cocktail]]) -> Cocktail | None:
+        """Return a copy of the cocktail with the given id or name."""
+        data = self._cocktail_map(loader)
+        if isinstance(search, int):
+            cocktail = data.get(search)
+        else:
+            cocktail = next((x for x in data.values() if x.name == search), None)
+        return None if cocktail is None else copy_cocktail(cocktail)
+
+    def possible_cocktails(
+        self,
+        max_hand_ingredients: int,
+        cocktail_loader: Callable[[], list[Cocktail]],
+        available_loader: Callable[[], list[int]],
+    ) -> list[Cocktail]:
+        """Return copies of all cocktails possible with the current bottles and available hand-adds."""
+        index = self._load(
+            "_possibility",
+            lambda: PossibilityIndex(self._cocktail_map(cocktail_loader), self.available_ids(available_loader)),
+        )
+        result = []
+        for cocktail_id, only_virgin in index.possible(max_hand_ingredients):
+            cocktail = copy_cocktail(index.cocktails[cocktail_id])
+            cocktail.only_virgin = only_virgin
+            result.append(cocktail)
+        return result
+
+    def derived[T](
+        self, key: Hashable, builder: Callable[[list[Cocktail]], T], loader: Callable[[], list[Cocktail]]
+    ) -> T:
+        """Return a structure built from all cocktails (e.g. an index), kept until the recipes change.
+
+        The builder gets the cached cocktails and must not change them.
+        """
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+            version = self.recipe_version
+        data = builder(list(self._cocktail_map(loader).values()))
+        with self._lock:
+            if self.recipe_version == version:
+                self._derived[key] = data
+        return data
+
+    def ingredients(self, loader: Callable[[], list[Ingredient]]) -> list[Ingredient]:
+        """Return copies of all cached ingredients."""
+        data = self._load("_ingredients", lambda: {x.id: x for x in loader()})
+        return [copy_ingredient(x) for x in data.values()]
+
+    def ingredient(self, search: str | int, loader: Callable[[], list[Ingredient]]) -> Ingredient | None:
+        """Return a copy of the ingredient with the given id or name."""
+        data = self._load("_ingredients", lambda: {x.id: x for x in loader()})
+        if isinstance(search, int):
+            ingredient = data.get(search)
+        else:
+            ingredient = next((x for x in data.values() if x.name == search), None)
+        return None if ingredient is None else copy_ingredient(ingredient)
+
+    def available_ids(self, loader: Callable[[], list[int]]) -> list[int]:
+        """Return the ids of the available hand-add ingredients."""
+        return list(self._load("_available_ids", loader))
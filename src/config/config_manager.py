@@ -106,6 +106,8 @@ SHARED_SCALE_FIELDS: dict[str, ConfigInterface[Any]] = {
     "calibration_factor": FloatType(prefix="cali:", allow_negative=True),
     "zero_raw_offset": IntType(prefix="offset:", allow_negative=True),
     "minimal_weight": IntType([build_number_limiter(0)], prefix="min:", suffix="g"),
+    "continuous_weighing": BoolType(check_name="Continuous Weighing", default=False),
+    "stream_rate": IntType([build_number_limiter(1, 20)], prefix="live:", suffix="Hz", default=10),
 }
 
 SHARED_CARRIAGE_FIELDS: dict[str, ConfigInterface[Any]] = {
@@ -745,6 +745,8 @@ class BaseScaleConfig(ConfigClass):
     calibration_factor: float
     zero_raw_offset: int
     minimal_weight: int
+    continuous_weighing: bool
+    stream_rate: int
 
     def __init__(
         self,
@@ -753,6 +755,8 @@ class BaseScaleConfig(ConfigClass):
         calibration_factor: float = 1.0,
         zero_raw_offset: int = 0,
         minimal_weight: int = 0,
+        continuous_weighing: bool = False,
+        stream_rate: int = 10,
         **kwargs: Any,
     ) -> None:
         self.scale_type = scale_type
@@ -760,6 +764,8 @@ class BaseScaleConfig(ConfigClass):
         self.calibration_factor = calibration_factor
         self.zero_raw_offset = zero_raw_offset
         self.minimal_weight = minimal_weight
+        self.continuous_weighing = continuous_weighing
+        self.stream_rate = stream_rate
 
     def to_config(self) -> dict[str, Any]:
         return {
@@ -768,6 +774,8 @@ class BaseScaleConfig(ConfigClass):
             "calibration_factor": self.calibration_factor,
             "zero_raw_offset": self.zero_raw_offset,
             "minimal_weight": self.minimal_weight,
+            "continuous_weighing": self.continuous_weighing,
+            "stream_rate": self.stream_rate,
         }
 
 
@@ -784,6 +792,8 @@ class HX711ScaleConfig(BaseScaleConfig):
         calibration_factor: float = 1.0,
         zero_raw_offset: int = 0,
         minimal_weight: int = 0,
+        continuous_weighing: bool = False,
+        stream_rate: int = 10,
         data_pin: int = 5,
         clock_pin: int = 6,
     ) -> None:
@@ -793,6 +803,8 @@ class HX711ScaleConfig(BaseScaleConfig):
             calibration_factor=calibration_factor,
             zero_raw_offset=zero_raw_offset,
             minimal_weight=minimal_weight,
+            continuous_weighing=continuous_weighing,
+            stream_rate=stream_rate,
         )
         self.data_pin = data_pin
         self.clock_pin = clock_pin
@@ -820,6 +832,8 @@ class NAU7802ScaleConfig(BaseScaleConfig):
         calibration_factor: float = 1.0,
         zero_raw_offset: int = 0,
         minimal_weight: int = 0,
+        continuous_weighing: bool = False,
+        stream_rate: int = 10,
         i2c_address: str = "2A",
     ) -> None:
         super().__init__(
@@ -828,6 +842,8 @@ class NAU7802ScaleConfig(BaseScaleConfig):
             calibration_factor=calibration_factor,
             zero_raw_offset=zero_raw_offset,
             minimal_weight=minimal_weight,
+            continuous_weighing=continuous_weighing,
+            stream_rate=stream_rate,
         )
         self.i2c_address = i2c_address.upper()
 
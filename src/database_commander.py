@@ -3,14 +3,29 @@ from __future__ import annotations
 import datetime
 import shutil
 import sqlite3
-from collections.abc import Generator
-from contextlib import contextmanager
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator, Hashable, Iterable, Sequence
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
 import sqlalchemy
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import Session, joinedload, scoped_session, sessionmaker
-
+from sqlalchemy import Engine, create_engine, event, func, insert
+from sqlalchemy.orm import Session, joinedload, scoped_session, selectinload, sessionmaker
+
+from src.catalog_cache import CatalogCache
+from src.database_tuning import (
+    CheckpointMode,
+    SqliteProfile,
+    apply_profile,
+    checkpoint,
+    database_stats,
+    optimize,
+    selected_profile,
+)
 from src.db_models import (
     Base,
     DbAvailable,
@@ -21,6 +36,8 @@ from src.db_models import (
     DbIngredient,
     DbIngredientExport,
     DbNews,
+    DbOutbox,
+    DbPourHistory,
     DbRecipe,
     DbResourceUsage,
     DbRole,
@@ -28,10 +45,20 @@ from src.db_models import (
     DbWaiter,
     DbWaiterLog,
 )
-from src.dialog_handler import DialogHandler
+from src.dialog_handler import DIALOG_HANDLER as DH
 from src.filepath import DATABASE_PATH, DEFAULT_DATABASE_PATH, HOME_PATH
 from src.logger_handler import LoggerHandler
-from src.models import Cocktail, ConsumeData, Event, EventType, Ingredient, ResourceInfo, ResourceStats
+from src.models import (
+    Cocktail,
+    ConsumeData,
+    DatabaseStats,
+    Event,
+    EventType,
+    Ingredient,
+    PourRecord,
+    ResourceInfo,
+    ResourceStats,
+)
 
 if TYPE_CHECKING:
     from src.dialog_handler import allowed_keys
@@ -39,6 +66,127 @@ if TYPE_CHECKING:
 _logger = LoggerHandler("database_module")
 
 VIRGIN_NAME_TEMPLATE = "(V) {}"
+_IMPORT_BATCH_SIZE = 500
+"""Recipes inserted per executemany statement of the bulk import."""
+_MAINTENANCE_INTERVAL_S = 300
+_OPTIMIZE_EVERY = 12
+"""Maintenance runs between two optimize calls, so the planner statistics are refreshed about hourly."""
+
+
+@dataclass
+class SharedDatabase:
+    """Engine, session factory and catalog cache shared by all commanders of one database."""
+
+    engine: Engine
+    session_factory: sessionmaker[Session]
+    profile: SqliteProfile
+    catalog: CatalogCache = field(default_factory=CatalogCache)
+
+
+@dataclass
+class RecipeImport:
+    """Recipe for the bulk import, the ingredients are referenced by name."""
+
+    name: str
+    ingredients: list[tuple[str, int]]
+    """Ingredient name and amount in ml, in recipe order."""
+    alcohol: int = 0
+    price: float = 0.0
+    enabled: bool = True
+    virgin: bool = False
+
+
+# Process-wide databases keyed by db url, so every DatabaseCommander shares one connection pool
+# and catalog cache and the schema is only created once per database.
+_ENGINE_REGISTRY: dict[str, SharedDatabase] = {}
+_ENGINE_REGISTRY_LOCK = threading.Lock()
+
+
+def _is_memory_url(db_url: str) -> bool:
+    """Return if the url points to an in-memory database, which is private to its engine."""
+    return db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url
+
+
+def _create_shared_database(db_url: str, profile: SqliteProfile) -> SharedDatabase:
+    """Create the engine and session factory for the url and make sure the schema exists."""
+    engine = create_engine(db_url, echo=False)
+    apply_profile(engine, profile)
+    Base.metadata.create_all(engine)
+    return SharedDatabase(engine, sessionmaker(bind=engine, expire_on_commit=False), profile)
+
+
+def get_shared_database(db_url: str, profile: SqliteProfile | None = None) -> SharedDatabase:
+    """Return the shared engine, session factory and catalog cache for the given db url.
+
+    In-memory databases only live as long as their engine, so they get a fresh engine each time.
+    The pragma profile (default: selected by the environment) is only used when the engine is created.
+    """
+    if profile is None:
+        profile = selected_profile()
+    if _is_memory_url(db_url):
+        return _create_shared_database(db_url, profile)
+    with _ENGINE_REGISTRY_LOCK:
+        shared = _ENGINE_REGISTRY.get(db_url)
+        if shared is None:
+            shared = _create_shared_database(db_url, profile)
+            _ENGINE_REGISTRY[db_url] = shared
+        return shared
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Generator[list[str]]:
+    """Record every SQL statement executed on the engine while the context is active.
+
+    Used to check that read paths issue a fixed number of queries (no lazy loads per row).
+    """
+    statements: list[str] = []
+
+    def _record(*args: Any) -> None:
+        # before_cursor_execute(conn, cursor, statement, parameters, context, executemany)
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def dispose_engines() -> None:
+    """Dispose all shared engines, next access will create them (and the schema) again."""
+    with _ENGINE_REGISTRY_LOCK:
+        for shared in _ENGINE_REGISTRY.values():
+            shared.engine.dispose()
+        _ENGINE_REGISTRY.clear()
+
+
+def _import_ingredient_row(name: str) -> dict[str, Any]:
+    return {
+        "name": name,
+        "alcohol": 0,
+        "volume": 1000,
+        "consumption_lifetime": 0,
+        "consumption": 0,
+        "cost_consumption_lifetime": 0,
+        "cost_consumption": 0,
+        "fill_level": 0,
+        "hand": False,
+        "pump_speed": 100,
+        "cost": 0,
+        "unit": "ml",
+        "disallow_pump_back": False,
+    }
+
+
+def _import_recipe_row(recipe: RecipeImport) -> dict[str, Any]:
+    return {
+        "name": recipe.name,
+        "alcohol": recipe.alcohol,
+        "amount": sum(amount for _, amount in recipe.ingredients),
+        "price": recipe.price,
+        "enabled": recipe.enabled,
+        "virgin": recipe.virgin,
+    }
 
 
 class DatabaseTransactionError(Exception):
@@ -48,7 +196,6 @@ class DatabaseTransactionError(Exception):
     """
 
     def __init__(self, translation_key: allowed_keys, language_args: dict | None = None) -> None:
-        DH = DialogHandler()
         self.language_args = language_args if language_args is not None else {}
         messsage = DH.get_translation(translation_key, **self.language_args)
         super().__init__(messsage)
@@ -90,14 +237,15 @@ class DatabaseCommander:
             self.db_url = f"sqlite:///{self.database_path_default if use_default else self.database_path}"
         else:
             self.db_url = db_url
-        self.engine = create_engine(self.db_url, echo=False)
-        Base.metadata.create_all(self.engine)
-        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        shared = get_shared_database(self.db_url)
+        self.engine = shared.engine
+        self.profile = shared.profile
+        self.catalog = shared.catalog
+        self.Session = scoped_session(shared.session_factory)
 
     def __del__(self) -> None:
-        """Close the session when the object is deleted."""
+        """Close the session when the object is deleted, the engine is shared and stays alive."""
         self.Session.remove()
-        self.engine.dispose()
 
     @contextmanager
     def session_scope(self) -> Generator[Session]:
@@ -127,6 +275,7 @@ class DatabaseCommander:
                 data_dicts = [dict(row._mapping) for row in data]
                 with self.session_scope() as session:
                     session.execute(table.insert(), data_dicts)
+        self.catalog.invalidate()
 
     def create_backup(self) -> None:
         """Create a backup locally in the same folder, used before migrations."""
@@ -136,7 +285,47 @@ class DatabaseCommander:
         backup_path = HOME_PATH / full_backup_name
         _logger.log_event("INFO", f"Creating backup with name: {full_backup_name}")
         _logger.log_event("INFO", f"Use this to overwrite: {DATABASE_PATH.name} in case of failure")
-        shutil.copy(DATABASE_PATH, backup_path)
+        self.backup_database(backup_path)
+
+    def backup_database(self, target: Path) -> None:
+        """Write a consistent copy of the database to the target file.
+
+        Uses the SQLite backup API, so the content of the write ahead log is included.
+        """
+        with self.engine.connect() as connection, closing(sqlite3.connect(target)) as target_connection:
+            connection.connection.driver_connection.backup(target_connection)  # type: ignore[union-attr]
+
+    def restore_database(self, source: Path) -> None:
+        """Overwrite the database content with the one of the source file.
+
+        The data is written through the own connection, so open connections and the write ahead log
+        stay consistent, which is not the case when the database file is replaced.
+        """
+        with self.engine.connect() as connection, tempfile.TemporaryDirectory() as tmp_dirname:
+            target: sqlite3.Connection = connection.connection.driver_connection  # type: ignore[assignment]
+            page_size = target.execute("PRAGMA page_size").fetchone()[0]
+            staged = Path(tmp_dirname) / source.name
+            shutil.copy(source, staged)
+            with closing(sqlite3.connect(staged)) as source_connection:
+                # a database in WAL mode cannot change its page size, so the copy takes the one of the target
+                if source_connection.execute("PRAGMA page_size").fetchone()[0] != page_size:
+                    source_connection.execute("PRAGMA journal_mode=DELETE")
+                    source_connection.execute(f"PRAGMA page_size={page_size}")
+                    source_connection.execute("VACUUM")
+                source_connection.backup(target)
+        self.catalog.invalidate()
+
+    def checkpoint(self, mode: CheckpointMode = "PASSIVE") -> tuple[int, int, int]:
+        """Move the write ahead log into the database file, see database_tuning.checkpoint."""
+        return checkpoint(self.engine, mode)
+
+    def optimize(self) -> None:
+        """Refresh the query planner statistics where needed."""
+        optimize(self.engine)
+
+    def get_database_stats(self) -> DatabaseStats:
+        """Return the active pragma profile and the size of the database and its write ahead log."""
+        return database_stats(self.engine, self.profile)
 
     def _map_cocktail(self, recipe: DbRecipe) -> Cocktail:
         """Map the Recipe database class to the Cocktail dataclass."""
@@ -193,20 +382,22 @@ class DatabaseCommander:
 
     def get_cocktail(self, search: str | int) -> Cocktail | None:
         """Get all needed data for the cocktail from ID or name."""
+        return self.catalog.cocktail(search, self._load_cocktails)
+
+    def _load_cocktails(self) -> list[Cocktail]:
+        """Load and map all cocktails from the database, used to fill the catalog cache."""
         with self.session_scope() as session:
-            if isinstance(search, str):
-                recipe = session.query(DbRecipe).filter(DbRecipe.name == search).one_or_none()
-            else:
-                recipe = session.query(DbRecipe).filter(DbRecipe.id == search).one_or_none()
-            if recipe is None:
-                return None
-            return self._map_cocktail(recipe)
+            return [self._map_cocktail(x) for x in self._get_db_cocktails(session)]
 
     def _get_db_cocktails(
         self, session: Session, status: Literal["all", "enabled", "disabled"] = "all"
     ) -> list[DbRecipe]:
-        """Get all cocktails from the database."""
-        stmt = session.query(DbRecipe)
+        """Get all cocktails from the database, with ingredients and bottles loaded eagerly."""
+        stmt = session.query(DbRecipe).options(
+            selectinload(DbRecipe.ingredient_associations)
+            .joinedload(DbCocktailIngredient.ingredient)
+            .joinedload(DbIngredient.bottle)
+        )
         if status == "enabled":
             stmt = stmt.filter(DbRecipe.enabled.is_(True))
         elif status == "disabled":
@@ -215,15 +406,20 @@ class DatabaseCommander:
 
     def get_all_cocktails(self, status: Literal["all", "enabled", "disabled"] = "all") -> list[Cocktail]:
         """Build a list of all cocktails, option to filter by enabled status."""
-        with self.session_scope() as session:
-            cocktails = self._get_db_cocktails(session, status)
-            return [self._map_cocktail(x) for x in cocktails]
+        cocktails = self.catalog.cocktails(self._load_cocktails)
+        if status == "enabled":
+            return [x for x in cocktails if x.enabled]
+        if status == "disabled":
+            return [x for x in cocktails if not x.enabled]
+        return cocktails
 
     def get_possible_cocktails(self, max_hand_ingredients: int) -> list[Cocktail]:
         """Return a list of currently possible cocktails with the current bottles."""
-        all_cocktails = self.get_all_cocktails(status="enabled")
-        handadds_ids = self.get_available_ids()
-        return [x for x in all_cocktails if x.is_possible(handadds_ids, max_hand_ingredients)]
+        return self.catalog.possible_cocktails(max_hand_ingredients, self._load_cocktails, self._load_available_ids)
+
+    def get_cocktail_index[T](self, key: Hashable, builder: Callable[[list[Cocktail]], T]) -> T:
+        """Return a structure built from all cocktails, only rebuilt when the recipes change or for a new key."""
+        return self.catalog.derived(key, builder, self._load_cocktails)
 
     def get_ingredient_names_at_bottles(self) -> list[str]:
         """Return ingredient name for all bottles, including empty ones as empty strings."""
@@ -242,23 +438,22 @@ class DatabaseCommander:
         """Return ingredient name for all bottles."""
         with self.session_scope() as session:
             data = (
-                session.query(DbBottle, DbIngredient)
-                .outerjoin(DbIngredient, DbBottle.id == DbIngredient.id)
+                session.query(DbBottle)
+                .options(joinedload(DbBottle.ingredient).joinedload(DbIngredient.bottle))
                 .order_by(DbBottle.number)
                 .all()
             )
-            result = []
-            for bottle, ingredient in data:
-                if ingredient is None:
-                    result.append(self._empty_ingredient(bottle.number))
-                else:
-                    result.append(self._map_ingredient(ingredient))
-            return result
+            return [
+                self._empty_ingredient(bottle.number)
+                if bottle.ingredient is None
+                else self._map_ingredient(bottle.ingredient)
+                for bottle in data
+            ]
 
     def get_bottle_fill_levels(self) -> list[int]:
         """Return percentage of fill level, limited to [0, 100]."""
         with self.session_scope() as session:
-            data = session.query(DbBottle).order_by(DbBottle.number).all()
+            data = session.query(DbBottle).options(joinedload(DbBottle.ingredient)).order_by(DbBottle.number).all()
             return [
                 round(min(max(x.ingredient.fill_level / x.ingredient.volume * 100, 0), 100))
                 if x.ingredient is not None
@@ -268,14 +463,12 @@ class DatabaseCommander:
 
     def get_ingredient(self, search: str | int) -> Ingredient | None:
         """Get all needed data for the ingredient from ID or name."""
+        return self.catalog.ingredient(search, self._load_ingredients)
+
+    def _load_ingredients(self) -> list[Ingredient]:
+        """Load and map all ingredients from the database, used to fill the catalog cache."""
         with self.session_scope() as session:
-            if isinstance(search, str):
-                ingredient = session.query(DbIngredient).filter(DbIngredient.name == search).one_or_none()
-            else:
-                ingredient = session.query(DbIngredient).filter(DbIngredient.id == search).one_or_none()
-            if ingredient is None:
-                return None
-            return self._map_ingredient(ingredient)
+            return [self._map_ingredient(x) for x in self._get_all_db_ingredients(session)]
 
     def _get_all_db_ingredients(
         self, session: Session, get_machine: bool = True, get_hand: bool = True
@@ -283,7 +476,7 @@ class DatabaseCommander:
         """Get all ingredients from the database."""
         if not get_machine and not get_hand:
             return []
-        stmt = session.query(DbIngredient)
+        stmt = session.query(DbIngredient).options(joinedload(DbIngredient.bottle))
         if not get_machine:
             stmt = stmt.filter(DbIngredient.hand.is_(True))
         elif not get_hand:
@@ -292,9 +485,14 @@ class DatabaseCommander:
 
     def get_all_ingredients(self, get_machine: bool = True, get_hand: bool = True) -> list[Ingredient]:
         """Build a list of all ingredients, option to filter by add status."""
-        with self.session_scope() as session:
-            ingredients = self._get_all_db_ingredients(session, get_machine, get_hand)
-            return [self._map_ingredient(x) for x in ingredients]
+        if not get_machine and not get_hand:
+            return []
+        ingredients = self.catalog.ingredients(self._load_ingredients)
+        if not get_machine:
+            return [x for x in ingredients if x.hand]
+        if not get_hand:
+            return [x for x in ingredients if not x.hand]
+        return ingredients
 
     def get_bottle_usage(self, ingredient_id: int) -> bool:
         """Return if the ingredient id is currently used at a bottle."""
@@ -357,6 +555,9 @@ class DatabaseCommander:
 
     def get_available_ids(self) -> list[int]:
         """Return a list of the IDs of all available defined ingredients."""
+        return self.catalog.available_ids(self._load_available_ids)
+
+    def _load_available_ids(self) -> list[int]:
         with self.session_scope() as session:
             data = session.query(DbAvailable.id).all()
             return [x[0] for x in data]
@@ -382,6 +583,7 @@ class DatabaseCommander:
                 bottle = DbBottle(number=bottle_number, _id=ingredient_id)
                 session.add(bottle)
             bottle.id = ingredient_id
+        self.catalog.invalidate()
 
     def set_bottle_volumelevel_to_max(self, bottle_number_list: list[int]) -> None:
         """Set the each i-th bottle to max level if arg is true."""
@@ -390,6 +592,7 @@ class DatabaseCommander:
                 bottle = session.query(DbBottle).filter(DbBottle.number == bottle_number).one_or_none()
                 if bottle and bottle.ingredient:
                     bottle.ingredient.fill_level = bottle.ingredient.volume
+        self.catalog.invalidate()
 
     def set_ingredient_data(
         self,
@@ -419,25 +622,55 @@ class DatabaseCommander:
             ingredient.cost = cost
             ingredient.unit = unit
             ingredient.disallow_pump_back = disallow_pump_back
+        self.catalog.invalidate()
 
     def increment_recipe_counter(self, recipe_name: str, virgin: bool) -> None:
         """Increase the recipe counter by one of given recipe name."""
         with self.session_scope() as session:
-            recipe = session.query(DbRecipe).filter(DbRecipe.name == recipe_name).one_or_none()
-            if recipe is None:
-                raise ElementNotFoundError(f"Recipe with name {recipe_name}")
+            self._increment_recipe_counter(session, recipe_name, virgin)
 
-            if virgin:
-                recipe.counter_lifetime_virgin += 1
-                recipe.counter_virgin += 1
-            else:
-                recipe.counter_lifetime += 1
-                recipe.counter += 1
+    def _increment_recipe_counter(self, session: Session, recipe_name: str, virgin: bool) -> None:
+        recipe = session.query(DbRecipe).filter(DbRecipe.name == recipe_name).one_or_none()
+        if recipe is None:
+            raise ElementNotFoundError(f"Recipe with name {recipe_name}")
+
+        if virgin:
+            recipe.counter_lifetime_virgin += 1
+            recipe.counter_virgin += 1
+        else:
+            recipe.counter_lifetime += 1
+            recipe.counter += 1
 
     def increment_ingredient_consumption(self, ingredient_name: str, ingredient_consumption: int) -> None:
         """Increase the consumption of given ingredient name by a given amount."""
+        self.set_multiple_ingredient_consumption([ingredient_name], [ingredient_consumption])
+
+    def set_multiple_ingredient_consumption(
+        self,
+        ingredient_name_list: list[str],
+        ingredient_consumption_list: list[int],
+    ) -> None:
+        """Increase multiple ingredients by the according given consumption."""
         with self.session_scope() as session:
-            ingredient = session.query(DbIngredient).filter(DbIngredient.name == ingredient_name).one_or_none()
+            fill_levels = self._increment_ingredient_consumption(
+                session, ingredient_name_list, ingredient_consumption_list
+            )
+        for ingredient_id, fill_level in fill_levels.items():
+            self.catalog.patch_fill_level(ingredient_id, fill_level)
+
+    def _increment_ingredient_consumption(
+        self,
+        session: Session,
+        ingredient_name_list: list[str],
+        ingredient_consumption_list: list[int],
+    ) -> dict[int, int]:
+        """Book the consumption of the ingredients, return the new fill level by ingredient id."""
+        ingredients = {
+            x.name: x for x in session.query(DbIngredient).filter(DbIngredient.name.in_(ingredient_name_list)).all()
+        }
+        fill_levels: dict[int, int] = {}
+        for ingredient_name, ingredient_consumption in zip(ingredient_name_list, ingredient_consumption_list):
+            ingredient = ingredients.get(ingredient_name)
             if ingredient is None:
                 raise ElementNotFoundError(ingredient_name)
 
@@ -450,20 +683,45 @@ class DatabaseCommander:
             occurred_cost = int(round(ingredient.cost / ingredient.volume * ingredient_consumption, 0))
             ingredient.cost_consumption += occurred_cost
             ingredient.cost_consumption_lifetime += occurred_cost
+            fill_levels[ingredient.id] = ingredient.fill_level
+        return fill_levels
 
-    def set_multiple_ingredient_consumption(
+    def save_preparation(
         self,
+        recipe_name: str | None,
+        virgin: bool,
         ingredient_name_list: list[str],
         ingredient_consumption_list: list[int],
+        event_type: EventType,
+        event_info: str | None = None,
+        waiter_log: tuple[str, int, int] | None = None,
     ) -> None:
-        """Increase multiple ingredients by the according given consumption."""
-        for ingredient_name, ingredient_consumption in zip(ingredient_name_list, ingredient_consumption_list):
-            self.increment_ingredient_consumption(ingredient_name, ingredient_consumption)
+        """Book all data of a finished preparation in one transaction.
+
+        Increments the recipe counter (skipped without recipe name), books the ingredient consumption,
+        saves the event and the waiter log, given as (waiter nfc id, recipe id, volume).
+        Either everything is saved or nothing.
+        """
+        with self.session_scope() as session:
+            if recipe_name is not None:
+                self._increment_recipe_counter(session, recipe_name, virgin)
+            fill_levels = self._increment_ingredient_consumption(
+                session, ingredient_name_list, ingredient_consumption_list
+            )
+            session.add(DbEvent(event_type=event_type.value, additional_info=event_info))
+            if waiter_log is not None:
+                waiter_nfc_id, recipe_id, volume = waiter_log
+                session.add(
+                    DbWaiterLog(waiter_nfc_id=waiter_nfc_id, recipe_id=recipe_id, volume=volume, is_virgin=virgin)
+                )
+        for ingredient_id, fill_level in fill_levels.items():
+            self.catalog.patch_fill_level(ingredient_id, fill_level)
 
     def set_all_recipes_enabled(self) -> None:
         """Enable all recipes."""
         with self.session_scope() as session:
             session.query(DbRecipe).update({DbRecipe.enabled: True})
+        self.catalog.invalidate()
 
     def set_recipe(
         self,
@@ -476,10 +734,23 @@ class DatabaseCommander:
         virgin: bool,
         ingredient_data: list[tuple[int, int, int]],
     ) -> Cocktail:
-        """Update the given recipe id to new properties."""
-        self.delete_recipe_ingredient_data(recipe_id)
+        """Update the given recipe id to new properties.
+
+        The ingredient data (id, amount, order) is compared to the existing rows, only changed
+        rows are updated, inserted or deleted, all within one transaction. Amounts of an ingredient
+        listed twice are added up. Returns the updated cocktail, mapped within the same session.
+        """
         with self.session_scope() as session:
-            recipe = session.query(DbRecipe).filter(DbRecipe.id == recipe_id).one_or_none()
+            recipe = (
+                session.query(DbRecipe)
+                .options(
+                    selectinload(DbRecipe.ingredient_associations)
+                    .joinedload(DbCocktailIngredient.ingredient)
+                    .joinedload(DbIngredient.bottle)
+                )
+                .filter(DbRecipe.id == recipe_id)
+                .one_or_none()
+            )
             if recipe is None:
                 raise ElementNotFoundError(f"Recipe ID {recipe_id}")
 
@@ -490,10 +761,51 @@ class DatabaseCommander:
             recipe.virgin = virgin
             recipe.price = price
 
-            for _id, amount, order in ingredient_data:
-                self.insert_recipe_data(recipe_id, _id, amount, order)
-            session.commit()
-            return self.get_cocktail(recipe_id)  # type: ignore
+            # flush once at the end, so a name collision is raised as such
+            with session.no_autoflush:
+                self._sync_recipe_data(session, recipe, ingredient_data)
+            try:
+                session.flush()
+            except sqlalchemy.exc.IntegrityError as e:
+                raise ElementAlreadyExistsError(name) from e
+            cocktail = self._map_cocktail(recipe)
+        self.catalog.invalidate()
+        return cocktail
+
+    def _sync_recipe_data(
+        self, session: Session, recipe: DbRecipe, ingredient_data: list[tuple[int, int, int]]
+    ) -> None:
+        """Bring the loaded ingredient rows of the recipe to the given (id, amount, order) data.
+
+        Unchanged rows issue no statement, rows of removed ingredients are deleted.
+        """
+        wanted: dict[int, tuple[int, int]] = {}
+        for _id, amount, order in ingredient_data:
+            previous_amount, previous_order = wanted.get(_id, (0, order))
+            wanted[_id] = (previous_amount + amount, previous_order)
+        for association in list(recipe.ingredient_associations):
+            if association.ingredient_id not in wanted:
+                # delete-orphan cascade removes the row
+                recipe.ingredient_associations.remove(association)
+                continue
+            # the unit of work only updates attributes whose value actually changed
+            association.amount, association.recipe_order = wanted.pop(association.ingredient_id)
+        if not wanted:
+            return
+        new_ingredients = (
+            session.query(DbIngredient)
+            .options(joinedload(DbIngredient.bottle))
+            .filter(DbIngredient.id.in_(wanted))
+            .all()
+        )
+        unknown = wanted.keys() - {x.id for x in new_ingredients}
+        if unknown:
+            raise ElementNotFoundError(f"Ingredient IDs {sorted(unknown)}")
+        for ingredient in new_ingredients:
+            amount, order = wanted[ingredient.id]
+            association = DbCocktailIngredient(recipe.id, ingredient.id, amount, order)
+            association.ingredient = ingredient
+            recipe.ingredient_associations.append(association)
 
     def set_ingredient_level_to_value(self, ingredient_id: int, value: int) -> None:
         """Set the given ingredient id to a defined level."""
@@ -502,6 +814,7 @@ class DatabaseCommander:
             if ingredient is None:
                 raise ElementNotFoundError(f"Ingredient ID {ingredient_id}")
             ingredient.fill_level = value
+        self.catalog.patch_fill_level(ingredient_id, value)
 
     # insert commands
     def insert_new_ingredient(
@@ -538,6 +851,7 @@ class DatabaseCommander:
                 if isinstance(e, sqlite3.IntegrityError | sqlalchemy.exc.IntegrityError):  # type: ignore
                     raise ElementAlreadyExistsError(ingredient_name)
                 raise e
+        self.catalog.invalidate()
 
     def insert_new_recipe(
         self,
@@ -570,6 +884,7 @@ class DatabaseCommander:
                     raise ElementAlreadyExistsError(name)
                 raise e
 
+            self.catalog.invalidate()
             cocktail: Cocktail = self.get_cocktail(name)  # type: ignore
             for _id, amount, order in ingredient_data:
                 self.insert_recipe_data(cocktail.id, _id, amount, order)
@@ -585,6 +900,64 @@ class DatabaseCommander:
                 recipe_order=order_number,
             )
             session.add(new_cocktail_ingredient)
+        self.catalog.invalidate()
+
+    def insert_recipes_bulk(
+        self,
+        recipes: Sequence[RecipeImport],
+        new_ingredients: Iterable[str] = (),
+        batch_size: int = _IMPORT_BATCH_SIZE,
+        progress: Callable[[int], None] | None = None,
+    ) -> None:
+        """Insert the recipes and the not yet existing ingredients in a single transaction.
+
+        New ingredients get no alcohol, a 1000 ml bottle and are no hand ingredients.
+        Names are resolved to ids in memory and the rows are inserted batch wise (executemany),
+        the catalog is refreshed once at the end. The progress callback gets the number of inserted
+        recipes after each batch. Amounts of an ingredient used twice in a recipe are added up.
+        Raises ElementAlreadyExistsError for existing or duplicate recipe names and ElementNotFoundError
+        for unknown ingredients, nothing is inserted then.
+        """
+        with self.session_scope() as session:
+            taken_names = {x[0] for x in session.query(DbRecipe.name).all()}
+            for recipe in recipes:
+                if recipe.name in taken_names:
+                    raise ElementAlreadyExistsError(recipe.name)
+                taken_names.add(recipe.name)
+            ingredient_ids: dict[str, int] = dict(session.query(DbIngredient.name, DbIngredient.id).all())
+            missing = [x for x in dict.fromkeys(new_ingredients) if x not in ingredient_ids]
+            if missing:
+                session.execute(insert(DbIngredient), [_import_ingredient_row(x) for x in missing])
+                ingredient_ids = dict(session.query(DbIngredient.name, DbIngredient.id).all())
+            unknown = {name for recipe in recipes for name, _ in recipe.ingredients} - ingredient_ids.keys()
+            if unknown:
+                raise ElementNotFoundError(f"Ingredients {', '.join(sorted(unknown))}")
+            for start in range(0, len(recipes), batch_size):
+                batch = recipes[start : start + batch_size]
+                session.execute(insert(DbRecipe), [_import_recipe_row(x) for x in batch])
+                recipe_ids = dict(
+                    session.query(DbRecipe.name, DbRecipe.id).filter(DbRecipe.name.in_([x.name for x in batch])).all()
+                )
+                recipe_data = []
+                for recipe in batch:
+                    amounts: dict[int, int] = {}
+                    for name, amount in recipe.ingredients:
+                        ingredient_id = ingredient_ids[name]
+                        amounts[ingredient_id] = amounts.get(ingredient_id, 0) + amount
+                    recipe_data.extend(
+                        {
+                            "cocktail_id": recipe_ids[recipe.name],
+                            "ingredient_id": _id,
+                            "amount": amount,
+                            "recipe_order": 1,
+                        }
+                        for _id, amount in amounts.items()
+                    )
+                if recipe_data:
+                    session.execute(insert(DbCocktailIngredient), recipe_data)
+                if progress is not None:
+                    progress(start + len(batch))
+        self.catalog.invalidate()
 
     def insert_multiple_existing_handadd_ingredients(self, ingredient_list: list[str] | list[int]) -> None:
         """Insert the IDS of the given ingredient list into the available table."""
@@ -599,6 +972,7 @@ class DatabaseCommander:
                 ingredient_id = ingredient_list  # pyright: ignore[reportAssignmentType] # ty:ignore[invalid-assignment]
             for _id in ingredient_id:
                 session.add(DbAvailable(_id=_id))
+        self.catalog.invalidate_available()
 
     # delete
     def delete_ingredient(self, ingredient_id: int) -> None:
@@ -616,6 +990,7 @@ class DatabaseCommander:
             if ingredient is None:
                 raise ElementNotFoundError(f"Ingredient ID {ingredient_id}")
             session.delete(ingredient)
+        self.catalog.invalidate()
 
     def delete_recipe(self, recipe_name: str | int) -> None:
         """Delete the given recipe by name and all according ingredient_data."""
@@ -627,16 +1002,19 @@ class DatabaseCommander:
             if recipe is None:
                 raise ElementNotFoundError(f"Recipe {recipe_name}")
             session.delete(recipe)
+        self.catalog.invalidate()
 
     def delete_recipe_ingredient_data(self, recipe_id: int) -> None:
         """Delete ingredient_data by given ID."""
         with self.session_scope() as session:
             session.query(DbCocktailIngredient).filter(DbCocktailIngredient.cocktail_id == recipe_id).delete()
+        self.catalog.invalidate()
 
     def delete_existing_handadd_ingredient(self) -> None:
         """Delete all ingredient in the available table."""
         with self.session_scope() as session:
             session.query(DbAvailable).delete()
+        self.catalog.invalidate_available()
 
     def delete_database_data(self) -> None:
         """Remove all the data from the db for a local reset."""
@@ -646,28 +1024,120 @@ class DatabaseCommander:
             session.query(DbCocktailIngredient).delete()
             session.query(DbRecipe).delete()
             session.query(DbIngredient).delete()
+        self.catalog.invalidate()
+
+    def add_outbox_item(self, destination: str, payload: str) -> None:
+        """Save the payload to the outbox of the given destination."""
+        with self.session_scope() as session:
+            session.add(DbOutbox(destination=destination, payload=payload))
+
+    def get_outbox_items(self, destination: str, limit: int) -> list[tuple[int, str]]:
+        """Return the oldest outbox items of the destination as (id, payload)."""
+        with self.session_scope() as session:
+            rows = (
+                session.query(DbOutbox.id, DbOutbox.payload)
+                .filter(DbOutbox.destination == destination)
+                .order_by(DbOutbox.id.asc())
+                .limit(limit)
+                .all()
+            )
+            return [(row.id, row.payload) for row in rows]
 
-    def save_failed_teamdata(self, payload: str) -> None:
-        """Save the failed payload into the db to buffer."""
+    def delete_outbox_items(self, item_ids: list[int]) -> None:
+        """Delete the given outbox items by id."""
         with self.session_scope() as session:
-            new_teamdata = DbTeamdata(payload=payload)
-            session.add(new_teamdata)
+            session.query(DbOutbox).filter(DbOutbox.id.in_(item_ids)).delete(synchronize_session=False)
 
-    def get_failed_teamdata(self) -> tuple[int, str] | None:
-        """Return one failed teamdata payload."""
+    def count_outbox_items(self) -> dict[str, int]:
+        """Return the number of waiting outbox items by destination."""
+        with self.session_scope() as session:
+            rows = session.query(DbOutbox.destination, func.count(DbOutbox.id)).group_by(DbOutbox.destination).all()
+            return dict(rows)
+
+    def prune_outbox(self, max_items: int, max_age: datetime.timedelta) -> dict[str, int]:
+        """Delete outbox items older than max_age and the oldest ones above max_items per destination.
+
+        Returns the number of deleted items by destination.
+        """
+        deleted: dict[str, int] = {}
+        with self.session_scope() as session:
+            oldest_allowed = datetime.datetime.now() - max_age
+            for (destination,) in session.query(DbOutbox.destination).distinct().all():
+                query = session.query(DbOutbox).filter(DbOutbox.destination == destination)
+                removed = query.filter(DbOutbox.created < oldest_allowed).delete(synchronize_session=False)
+                # id of the newest item not fitting into the limit, this one and all older are removed
+                cutoff_id = (
+                    session.query(DbOutbox.id)
+                    .filter(DbOutbox.destination == destination)
+                    .order_by(DbOutbox.id.desc())
+                    .offset(max_items)
+                    .limit(1)
+                    .scalar()
+                )
+                if cutoff_id is not None:
+                    removed += query.filter(DbOutbox.id <= cutoff_id).delete(synchronize_session=False)
+                if removed:
+                    deleted[destination] = removed
+        return deleted
+
+    def move_failed_teamdata_to_outbox(self, destination: str) -> int:
+        """Move the failed teamdata of former versions into the outbox, return the number of moved items."""
+        with self.session_scope() as session:
+            teamdata = session.query(DbTeamdata).order_by(DbTeamdata.id.asc()).all()
+            session.add_all(DbOutbox(destination=destination, payload=x.payload) for x in teamdata)
+            session.query(DbTeamdata).delete(synchronize_session=False)
+            return len(teamdata)
+
+    def save_pour_history(self, pours: list[PourRecord], max_items: int) -> None:
+        """Save the pours and remove the oldest ones above max_items per slot."""
+        if not pours:
+            return
         with self.session_scope() as session:
-            data = session.query(DbTeamdata).order_by(DbTeamdata.id.asc()).first()
-            if data:
-                return (data.id, data.payload)
-            return None
+            session.add_all(
+                DbPourHistory(
+                    slot=x.slot,
+                    ingredient_id=x.ingredient_id,
+                    target=x.target,
+                    cutoff=x.cutoff,
+                    settled=x.settled,
+                    lead=x.lead,
+                    gradient=x.gradient,
+                    pump_speed=x.pump_speed,
+                )
+                for x in pours
+            )
+            session.flush()
+            for slot in {x.slot for x in pours}:
+                cutoff_id = (
+                    session.query(DbPourHistory.id)
+                    .filter(DbPourHistory.slot == slot)
+                    .order_by(DbPourHistory.id.desc())
+                    .offset(max_items)
+                    .limit(1)
+                    .scalar()
+                )
+                if cutoff_id is not None:
+                    session.query(DbPourHistory).filter(
+                        DbPourHistory.slot == slot, DbPourHistory.id <= cutoff_id
+                    ).delete(synchronize_session=False)
 
-    def delete_failed_teamdata(self, data_id: int) -> None:
-        """Delete the given teamdata by id."""
+    def get_pour_history(self) -> list[PourRecord]:
+        """Return all saved pours, oldest first."""
         with self.session_scope() as session:
-            teamdata = session.query(DbTeamdata).filter(DbTeamdata.id == data_id).one_or_none()
-            if teamdata is None:
-                raise ElementNotFoundError(f"Teamdata ID {data_id} not found")
-            session.delete(teamdata)
+            rows = session.query(DbPourHistory).order_by(DbPourHistory.id.asc()).all()
+            return [
+                PourRecord(
+                    slot=x.slot,
+                    ingredient_id=x.ingredient_id,
+                    target=x.target,
+                    cutoff=x.cutoff,
+                    settled=x.settled,
+                    lead=x.lead,
+                    gradient=x.gradient,
+                    pump_speed=x.pump_speed,
+                )
+                for x in rows
+            ]
 
     def export_recipe_data(self) -> None:
         """Save the recipe consumption data to the database and reset counters."""
@@ -1127,4 +1597,30 @@ class DatabaseCommander:
             )
 
 
+def _maintenance_thread(interval: int, optimize_every: int) -> None:
+    DBC = DatabaseCommander()
+    runs = 0
+    while True:
+        time.sleep(interval)
+        runs += 1
+        try:
+            DBC.checkpoint()
+            if runs % optimize_every == 0:
+                DBC.optimize()
+        except Exception as e:
+            _logger.error(f"Could not run the database maintenance: {e}")
+
+
+def start_database_maintenance() -> None:
+    """Start a thread that checkpoints the write ahead log and refreshes the planner statistics periodically.
+
+    SQLite only checkpoints on commits once the log got large, so an idle machine would otherwise keep it.
+    """
+    DatabaseCommander().optimize()
+    maintenance_thread = threading.Thread(
+        target=_maintenance_thread, args=(_MAINTENANCE_INTERVAL_S, _OPTIMIZE_EVERY), daemon=True
+    )
+    maintenance_thread.start()
+
+
 DB_COMMANDER = DatabaseCommander()
@@ -0,0 +1,131 @@
+"""Connection setup and maintenance of the SQLite databases.
+
+By default the database runs in WAL mode with synchronous=NORMAL: a commit only appends to the
+write ahead log, which is synced at checkpoints, instead of syncing the rollback journal and the
+database on each commit. This matters on the SD card of the Pi, where many small commits are done
+(events, resource usage, consumption). Readers also keep reading while a write is committed.
+The profile is chosen by the ``COCKTAILBERRY_DB_PROFILE`` environment variable, "tuned" (default)
+or "safe", which keeps the SQLite defaults (rollback journal, full sync).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import Engine, event, text
+
+from src.logger_handler import LoggerHandler
+from src.models import DatabaseStats
+
+_logger = LoggerHandler("database_tuning")
+
+PROFILE_ENV = "COCKTAILBERRY_DB_PROFILE"
+
+CheckpointMode = Literal["PASSIVE", "FULL", "RESTART", "TRUNCATE"]
+
+
+@dataclass(frozen=True)
+class SqliteProfile:
+    """Pragmas applied to each new connection."""
+
+    name: str
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 64 * 1024 * 1024
+    """Bytes of the database file read via memory mapping instead of read calls."""
+    cache_size: int = -8000
+    """Page cache per connection, negative values are KiB."""
+    temp_store: str = "MEMORY"
+
+    def pragmas(self) -> list[str]:
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA mmap_size={self.mmap_size}",
+            f"PRAGMA cache_size={self.cache_size}",
+            f"PRAGMA temp_store={self.temp_store}",
+        ]
+
+
+PROFILES = {
+    "tuned": SqliteProfile("tuned"),
+    "safe": SqliteProfile(
+        "safe", journal_mode="DELETE", synchronous="FULL", mmap_size=0, cache_size=-2000, temp_store="DEFAULT"
+    ),
+}
+
+
+def selected_profile() -> SqliteProfile:
+    """Return the profile set by the environment, unknown names fall back to the tuned one."""
+    name = os.getenv(PROFILE_ENV, "tuned").lower()
+    profile = PROFILES.get(name)
+    if profile is None:
+        _logger.warning(f"Unknown database profile {name}, using tuned. Possible are: {', '.join(PROFILES)}")
+        return PROFILES["tuned"]
+    return profile
+
+
+def apply_profile(engine: Engine, profile: SqliteProfile) -> None:
+    """Run the pragmas of the profile on every new connection of the engine."""
+
+    def _on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in profile.pragmas():
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    event.listen(engine, "connect", _on_connect)
+
+
+def checkpoint(engine: Engine, mode: CheckpointMode = "PASSIVE") -> tuple[int, int, int]:
+    """Copy the content of the write ahead log into the database.
+
+    PASSIVE does not wait for readers or writers, TRUNCATE also empties the log file,
+    which is needed before the database file is copied (e.g. for backups).
+    Returns (busy, pages in log, pages checkpointed), see the SQLite docs of wal_checkpoint.
+    """
+    with engine.connect() as connection:
+        row = connection.execute(text(f"PRAGMA wal_checkpoint({mode})")).one()
+    return (row[0], row[1], row[2])
+
+
+def optimize(engine: Engine) -> None:
+    """Let SQLite refresh the statistics of the query planner, where it thinks it is worth it."""
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA optimize"))
+
+
+def database_stats(engine: Engine, profile: SqliteProfile) -> DatabaseStats:
+    """Return the active pragmas and the size of the database and its write ahead log."""
+    with engine.connect() as connection:
+
+        def pragma(name: str) -> Any:
+            return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+        journal_mode = str(pragma("journal_mode"))
+        synchronous = int(pragma("synchronous"))
+        page_size = int(pragma("page_size"))
+        page_count = int(pragma("page_count"))
+        freelist_count = int(pragma("freelist_count"))
+        mmap_size = int(pragma("mmap_size") or 0)
+    database_file = engine.url.database
+    wal_bytes = 0
+    if database_file and database_file != ":memory:":
+        wal_file = Path(f"{database_file}-wal")
+        wal_bytes = wal_file.stat().st_size if wal_file.exists() else 0
+    return DatabaseStats(
+        profile=profile.name,
+        journal_mode=journal_mode,
+        synchronous=["OFF", "NORMAL", "FULL", "EXTRA"][synchronous],
+        mmap_size=mmap_size,
+        page_size=page_size,
+        page_count=page_count,
+        freelist_count=freelist_count,
+        database_bytes=page_size * page_count,
+        wal_bytes=wal_bytes,
+    )
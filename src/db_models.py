@@ -157,6 +157,33 @@ class DbTeamdata(Base):
         self.payload = payload
 
 
+class DbOutbox(Base):
+    __tablename__ = "Outbox"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, nullable=False, name="ID")
+    destination: Mapped[str] = mapped_column(nullable=False, name="Destination", index=True)
+    payload: Mapped[str] = mapped_column(nullable=False, name="Payload")
+    created: Mapped[datetime.datetime] = mapped_column(nullable=False, name="Created", default=datetime.datetime.now)
+
+    def __init__(self, destination: str, payload: str, created: datetime.datetime | None = None) -> None:
+        self.destination = destination
+        self.payload = payload
+        self.created = created or datetime.datetime.now()
+
+
+class DbPourHistory(Base):
+    __tablename__ = "PourHistory"
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, nullable=False, name="ID")
+    slot: Mapped[int] = mapped_column(nullable=False, name="Slot", index=True)
+    ingredient_id: Mapped[int | None] = mapped_column(nullable=True, name="Ingredient_ID")
+    target: Mapped[float] = mapped_column(nullable=False, name="Target")
+    cutoff: Mapped[float] = mapped_column(nullable=False, name="Cutoff")
+    settled: Mapped[float] = mapped_column(nullable=False, name="Settled")
+    lead: Mapped[float | None] = mapped_column(nullable=True, name="Lead")
+    gradient: Mapped[float | None] = mapped_column(nullable=True, name="Gradient")
+    pump_speed: Mapped[int] = mapped_column(nullable=False, name="Pump_Speed")
+    created: Mapped[datetime.datetime] = mapped_column(nullable=False, name="Created", default=datetime.datetime.now)
+
+
 class DbCocktailExport(Base):
     __tablename__ = "CocktailExport"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, name="ID")
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import functools
+import marshal
 import platform
 from collections.abc import Callable
 from pathlib import Path
@@ -20,7 +22,7 @@ except ModuleNotFoundError:
 
 from src import __version__
 from src.config.config_manager import CONFIG as cfg
-from src.filepath import APP_ICON_FILE, LANGUAGE_FILE, STYLE_FOLDER
+from src.filepath import APP_ICON_FILE, LANGUAGE_CACHE_FILE, LANGUAGE_FILE, STYLE_FOLDER
 from src.logger_handler import LoggerHandler
 from src.utils import get_platform_data
 
@@ -135,6 +137,7 @@ allowed_keys = Literal[
     "no_ingredient_selected",
     "no_waiter_logged_in",
     "no_glass_detected",
+    "waiting_for_glass_swap",
     "no_recipe_selected",
     "no_scale_available",
     "not_enough_ingredient_volume",
@@ -183,14 +186,55 @@ allowed_keys = Literal[
 SUPPORTED_IMAGE_EXTENSIONS = ("*.jpg", "*.jpeg", "*.png", "*.gif", "*.bmp", "*.webp")
 IMAGE_FILTER = f"Images ({' '.join(SUPPORTED_IMAGE_EXTENSIONS)})"
 
+# use the libyaml parser if available, it is a lot faster than the pure python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def load_language_file() -> dict[str, Any]:
+    """Return the content of the language file, parsed once and shared by the whole process.
+
+    The parsed content is also saved as marshal snapshot, keyed on modification time and size
+    of the language file, so following starts skip the slow yaml parsing.
+    """
+    stat = LANGUAGE_FILE.stat()
+    file_key = [stat.st_mtime_ns, stat.st_size]
+    try:
+        with LANGUAGE_CACHE_FILE.open("rb") as stream:
+            cached_key, content = marshal.load(stream)
+        if cached_key == file_key:
+            return content
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    with LANGUAGE_FILE.open(encoding="UTF-8") as stream:
+        content = yaml.load(stream, Loader=_YAML_LOADER)
+    try:
+        temp_file = LANGUAGE_CACHE_FILE.with_suffix(".tmp")
+        with temp_file.open("wb") as stream:
+            marshal.dump([file_key, content], stream)
+        temp_file.replace(LANGUAGE_CACHE_FILE)
+    except (OSError, ValueError) as e:
+        _logger.warning(f"Could not write language cache: {e}")
+    return content
+
+
+@functools.cache
+def _dialog_templates(language: str) -> dict[str, str]:
+    """Return the dialog templates in the language, falling back to english if not translated."""
+    templates: dict[str, str] = {}
+    for key, element in load_language_file()["dialog"].items():
+        template = element.get(language, element.get("en"))
+        if template is not None:
+            templates[key] = template
+    return templates
+
 
 class DialogHandler:
     """Class to hold all the dialogues for the popups and language settings."""
 
     def __init__(self) -> None:
         self.icon_path = str(APP_ICON_FILE)
-        with LANGUAGE_FILE.open(encoding="UTF-8") as stream:
-            self.dialogs: dict[str, dict[str, str]] = yaml.safe_load(stream)["dialog"]
+        self.dialogs: dict[str, dict[str, str]] = load_language_file()["dialog"]
 
     def get_translation(self, dialog_key: allowed_keys, **kwargs: Any) -> str:
         try:
@@ -201,9 +245,7 @@ class DialogHandler:
 
     def _choose_language(self, dialog_name: str, **kwargs: Any) -> str:
         """Choose either the given language if exists, or english if not piping additional info into template."""
-        language = cfg.UI_LANGUAGE
-        element = self.dialogs[dialog_name]
-        tmpl = element.get(language, element["en"])
+        tmpl = _dialog_templates(cfg.UI_LANGUAGE)[dialog_name]
         return tmpl.format(**kwargs)
 
     def standard_box(
@@ -695,8 +737,7 @@ class UiLanguage:
     """Class to set the UI language to the appropriate Language."""
 
     def __init__(self) -> None:
-        with LANGUAGE_FILE.open(encoding="UTF-8") as stream:
-            self.dialogs: dict[str, dict[str, dict[str, str]]] = yaml.safe_load(stream)["ui"]
+        self.dialogs: dict[str, dict[str, dict[str, str]]] = load_language_file()["ui"]
 
     def _choose_language(self, element_name: str, ui_element_name: str = "generics", **kwargs: Any) -> str:
         """Choose either the given language if exists, or english if not piping additional info into template."""
@@ -13,6 +13,7 @@ PYPROJECT_FILE = ROOT_PATH / "pyproject.toml"
 CUSTOM_CONFIG_FILE = ROOT_PATH / "custom_config.yaml"
 BLACKLIST_FILE = ROOT_PATH / "blacklist.json"
 VERSION_FILE = ROOT_PATH / ".version.ini"
+LANGUAGE_CACHE_FILE = ROOT_PATH / ".language.cache"
 LOG_FOLDER = ROOT_PATH / "logs"
 SAVE_FOLDER = ROOT_PATH / "saves"
 ADDON_FOLDER = ROOT_PATH / "addons"
@@ -25,6 +26,7 @@ LED_ADDON_FOLDER = ADDON_FOLDER / "leds"
 SCRIPTS_FOLDER = ROOT_PATH / "scripts"
 USER_IMAGE_FOLDER = ROOT_PATH / "display_images_user"
 DEFAULT_IMAGE_FOLDER = ROOT_PATH / "default_cocktail_images"
+IMAGE_VARIANT_FOLDER = ROOT_PATH / "display_images_web"
 DEFAULT_COCKTAIL_IMAGE = DEFAULT_IMAGE_FOLDER / "default.jpg"
 INGREDIENT_IMAGE = DEFAULT_IMAGE_FOLDER / "ingredient.jpg"
 DATABASE_PATH = ROOT_PATH / "Cocktail_database.db"
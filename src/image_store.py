@@ -0,0 +1,164 @@
+"""Web variants of the cocktail images, resized and WebP encoded under content hashed names.
+
+The web client loads the images in the size it shows them, instead of the full size JPEGs.
+Since the file names contain a hash of the source image, clients can cache them forever.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Literal
+
+from PIL import Image, UnidentifiedImageError
+
+from src.filepath import DEFAULT_IMAGE_FOLDER, IMAGE_VARIANT_FOLDER, USER_IMAGE_FOLDER
+from src.image_utils import IMAGE_INDEX
+from src.logger_handler import LoggerHandler
+
+_logger = LoggerHandler("image_store")
+
+ImageSize = Literal["thumbnail", "detail"]
+IMAGE_SIZES: dict[ImageSize, int] = {"thumbnail": 240, "detail": 500}
+VARIANT_URL_PREFIX = "/static/images"
+_WEBP_QUALITY = 80
+_MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class _ManifestEntry:
+    mtime: int
+    """Modification time in ns of the source image the variants were created from."""
+    digest: str
+
+
+class ImageStore:
+    """Create and look up the web variants of the images.
+
+    The manifest of created variants is kept in memory (and saved next to the variants),
+    together with the image index this resolves urls without any disk access.
+    Variants are created on upload and by the warm up at start, which also replaces outdated ones.
+    """
+
+    def __init__(self, folder: Path = IMAGE_VARIANT_FOLDER) -> None:
+        self.folder = folder
+        self._manifest: dict[str, _ManifestEntry] | None = None
+        self._lock = threading.RLock()
+
+    def url(self, image_path: Path, size: ImageSize = "detail") -> str | None:
+        """Return the url of the image variant, None if there is no up to date variant (yet).
+
+        This never creates variants, so listing many cocktails stays fast.
+        """
+        mtime = IMAGE_INDEX.mtime(image_path)
+        with self._lock:
+            entry = self._load_manifest().get(_manifest_key(image_path))
+        if mtime is None or entry is None or entry.mtime != mtime:
+            return None
+        return f"{VARIANT_URL_PREFIX}/{_variant_name(image_path, entry.digest, size)}"
+
+    def create_variants(self, image_path: Path) -> None:
+        """Create the variants of the image if they are missing or outdated."""
+        self._entry(image_path)
+
+    def remove_variants(self, image_path: Path) -> None:
+        """Remove the variants of a deleted image."""
+        with self._lock:
+            entry = self._load_manifest().pop(_manifest_key(image_path), None)
+            if entry is None:
+                return
+            self._save_manifest()
+        for size_name in IMAGE_SIZES:
+            (self.folder / _variant_name(image_path, entry.digest, size_name)).unlink(missing_ok=True)
+
+    def start_warm_up(self) -> None:
+        """Run the warm up in a background thread."""
+        threading.Thread(target=self.warm_up, daemon=True, name="image_store_warm_up").start()
+
+    def warm_up(self) -> None:
+        """Create all missing variants and remove the ones no longer needed."""
+        sources = [
+            image_path
+            for folder in (DEFAULT_IMAGE_FOLDER, USER_IMAGE_FOLDER)
+            for image_path in sorted(folder.glob("*.jpg"))
+        ]
+        needed: set[str] = set()
+        for image_path in sources:
+            entry = self._entry(image_path)
+            if entry is not None:
+                needed.update(_variant_name(image_path, entry.digest, size) for size in IMAGE_SIZES)
+        with self._lock:
+            manifest = self._load_manifest()
+            source_keys = {_manifest_key(x) for x in sources}
+            for key in set(manifest) - source_keys:
+                del manifest[key]
+            self._save_manifest()
+            for variant in self.folder.glob("*.webp"):
+                if variant.name not in needed:
+                    variant.unlink(missing_ok=True)
+
+    def _entry(self, image_path: Path) -> _ManifestEntry | None:
+        mtime = IMAGE_INDEX.mtime(image_path)
+        if mtime is None:
+            return None
+        with self._lock:
+            entry = self._load_manifest().get(_manifest_key(image_path))
+            if entry is not None and entry.mtime == mtime:
+                return entry
+            return self._create_variants(image_path, mtime)
+
+    def _create_variants(self, image_path: Path, mtime: int) -> _ManifestEntry | None:
+        try:
+            data = image_path.read_bytes()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with Image.open(BytesIO(data)) as source:
+                image = source.convert("RGB")
+            for size_name, size in IMAGE_SIZES.items():
+                variant = image.copy()
+                variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+                variant.save(self.folder / _variant_name(image_path, digest, size_name), "WEBP", quality=_WEBP_QUALITY)
+        except (OSError, UnidentifiedImageError) as e:
+            _logger.error(f"Could not create web variants of {image_path.name}: {e}")
+            return None
+        manifest = self._load_manifest()
+        outdated = manifest.get(_manifest_key(image_path))
+        entry = _ManifestEntry(mtime, digest)
+        manifest[_manifest_key(image_path)] = entry
+        self._save_manifest()
+        if outdated is not None and outdated.digest != digest:
+            for size_name in IMAGE_SIZES:
+                (self.folder / _variant_name(image_path, outdated.digest, size_name)).unlink(missing_ok=True)
+        return entry
+
+    def _load_manifest(self) -> dict[str, _ManifestEntry]:
+        if self._manifest is None:
+            self._manifest = {}
+            with contextlib.suppress(OSError, ValueError, TypeError):
+                content = json.loads((self.folder / _MANIFEST_FILE).read_text())
+                self._manifest = {key: _ManifestEntry(**value) for key, value in content.items()}
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        manifest = {key: asdict(value) for key, value in self._load_manifest().items()}
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            (self.folder / _MANIFEST_FILE).write_text(json.dumps(manifest))
+        except OSError as e:
+            _logger.warning(f"Could not save the image manifest: {e}")
+
+
+def _manifest_key(image_path: Path) -> str:
+    return f"{image_path.parent.name}/{image_path.name}"
+
+
+def _variant_name(image_path: Path, digest: str, size: ImageSize) -> str:
+    return f"{image_path.parent.name}-{image_path.stem}-{digest}-{size}.webp"
+
+
+IMAGE_STORE = ImageStore()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import threading
 from io import BytesIO
 from pathlib import Path
 
@@ -11,6 +13,52 @@ from src.filepath import DEFAULT_COCKTAIL_IMAGE, DEFAULT_IMAGE_FOLDER, USER_IMAG
 RANDOM_IMAGE_NAME = "random"
 
 
+class ImageIndex:
+    """In-memory index of the existing image files and their modification time.
+
+    Saves the stat calls of the image lookups, which run for every tile of the cocktail grid.
+    The folders are scanned on first use, changes done over the image functions refresh the index.
+    """
+
+    def __init__(self) -> None:
+        self._folders: dict[Path, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def mtime(self, image_path: Path) -> int | None:
+        """Return the modification time in ns of the image, None if it does not exist."""
+        folder = image_path.parent
+        with self._lock:
+            files = self._folders.get(folder)
+            if files is None:
+                files = _scan_folder(folder)
+                self._folders[folder] = files
+            return files.get(image_path.name)
+
+    def exists(self, image_path: Path) -> bool:
+        return self.mtime(image_path) is not None
+
+    def refresh(self) -> None:
+        """Forget the scanned folders, they are scanned again on the next lookup."""
+        with self._lock:
+            self._folders.clear()
+
+
+def _scan_folder(folder: Path) -> dict[str, int]:
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name: entry.stat().st_mtime_ns for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+IMAGE_INDEX = ImageIndex()
+
+
+def refresh_image_index() -> None:
+    """Refresh the image index, needs to be called if image files were changed outside of this module."""
+    IMAGE_INDEX.refresh()
+
+
 def find_cocktail_image(identifier: int | str) -> Path:
     """Find the image for the given cocktail id (or reserved name)."""
     # setting default cocktail image
@@ -29,7 +77,7 @@ def find_default_cocktail_image(identifier: int | str) -> Path:
     # then try to get system cocktail image
     # provided cocktails will have a default image, user added will not
     specific_image_path = DEFAULT_IMAGE_FOLDER / f"{identifier}.jpg"
-    if specific_image_path.exists():
+    if IMAGE_INDEX.exists(specific_image_path):
         cocktail_image = specific_image_path
     return cocktail_image
 
@@ -40,7 +88,7 @@ def find_user_cocktail_image(identifier: int | str) -> Path | None:
     Returns None if not set.
     """
     image_path = USER_IMAGE_FOLDER / f"{identifier}.jpg"
-    return image_path if image_path.exists() else None
+    return image_path if IMAGE_INDEX.exists(image_path) else None
 
 
 def process_image(image_data: str | bytes | Path, resize_size: int = 500) -> Image.Image | None:
@@ -104,3 +152,12 @@ def check_picture_orientation(img: Image.Image) -> Image.Image:
 def save_image(image: Image.Image, save_id: int | str) -> None:
     """Save the given image to the user folder."""
     image.save(USER_IMAGE_FOLDER / f"{save_id}.jpg", "JPEG")
+    IMAGE_INDEX.refresh()
+
+
+def delete_user_image(identifier: int | str) -> None:
+    """Delete the user defined image for the given cocktail id (or reserved name)."""
+    try:
+        (USER_IMAGE_FOLDER / f"{identifier}.jpg").unlink()
+    finally:
+        IMAGE_INDEX.refresh()
@@ -1,31 +1,41 @@
 from __future__ import annotations
 
 import atexit
-import contextlib
+import time
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, Self, TypeGuard
 
-from src.logger_handler import LoggerHandler
-
-# Only needed in v1
-with contextlib.suppress(ModuleNotFoundError):
-    from PyQt6.QtWidgets import QApplication
-
 from src.config.config_manager import CONFIG as cfg
 from src.config.config_manager import shared
 from src.database_commander import DatabaseCommander
 from src.dialog_handler import DIALOG_HANDLER
+from src.logger_handler import LoggerHandler
 from src.machine.carriage import create_carriage
 from src.machine.dispensers import create_dispenser
 from src.machine.dispensers.base import BaseDispenser
+from src.machine.dispensers.pool import DispenserPool
+from src.machine.dispensers.pour_model import POUR_MODEL
 from src.machine.dispensers.scheduler import CleaningItem, CleaningScheduler, DispenserScheduler, PreparationItem
+from src.machine.dispensers.weighing import WeighingSession
 from src.machine.hardware import HardwareContext
 from src.machine.leds import LedController, create_led_controller
 from src.machine.pin_controller import PinController
+from src.machine.plan_cache import CocktailPlan, PlanCache
 from src.machine.reverter import create_reverter
 from src.machine.rfid import RFIDReader, create_rfid
 from src.machine.scale import create_scale
-from src.models import CocktailStatus, EventType, HandAddMeasure, Ingredient, PreparationResult, PrepareResult
+from src.machine.scale.stream import ScaleStream
+from src.models import (
+    Cocktail,
+    CocktailStatus,
+    EventType,
+    HandAddMeasure,
+    Ingredient,
+    PreparationResult,
+    PrepareResult,
+)
 from src.programs.addons.hardware_extensions import HARDWARE_ADDONS
+from src.service.preparation_status import notify_preparation_status
 
 if TYPE_CHECKING:
     from src.machine.scale.base import ScaleInterface
@@ -33,6 +43,13 @@ if TYPE_CHECKING:
 
 _logger = LoggerHandler("MachineController")
 
+_POUR_HISTORY_PER_SLOT = 200
+"""Saved pours per slot, older ones barely count for the pour model anyway."""
+
+
+def _is_cancelled() -> bool:
+    return shared.cocktail_status.status == PrepareResult.CANCELED
+
 
 class MachineController:
     """Controller Class for all Machine related Pin routines."""
@@ -48,8 +65,27 @@ class MachineController:
         if getattr(self, "_initialized", False):
             return
         self.dispensers: dict[int, BaseDispenser] = {}
+        self._dispenser_pool: DispenserPool | None = None
+        self._plan_cache = PlanCache()
+        self._dispenser_version = 0
+        """Changes whenever the dispensers change, so cached plans of the old setup are not used."""
+        self._scale_stream: ScaleStream | None = None
         self._initialized = True
 
+    @property
+    def dispenser_pool(self) -> DispenserPool:
+        """Long-lived worker pool for all dispensers, sized by MAKER_SIMULTANEOUSLY_PUMPS.
+
+        Gets replaced if the configured number of simultaneous pumps changed.
+        """
+        size = cfg.MAKER_SIMULTANEOUSLY_PUMPS
+        if self._dispenser_pool is not None and self._dispenser_pool.max_workers != size:
+            self._dispenser_pool.shutdown()
+            self._dispenser_pool = None
+        if self._dispenser_pool is None:
+            self._dispenser_pool = DispenserPool(size)
+        return self._dispenser_pool
+
     def init_machine(self) -> None:
         _logger.log_header("INFO", "Initializing machine")
         # Stage 1: core hardware + extensions (no dependencies)
@@ -65,6 +101,8 @@ class MachineController:
         create_led_controller(cfg.LED_CONFIG, self.hardware)
         # Stage 2: scale can access pins, leds, extra
         self.hardware.scale = create_scale(cfg.SCALE_CONFIG, self.hardware)
+        if self.hardware.scale is not None:
+            POUR_MODEL.seed(DatabaseCommander().get_pour_history())
         # Stage 3: carriage can access pins, leds, extra, AND scale
         # Note: referencing (find_reference()) can take seconds and is deliberately deferred —
         # call :meth:`find_carriage_reference` from the caller after the GUI/API is ready,
@@ -86,6 +124,7 @@ class MachineController:
         pin flips all pumps, so disallowed slots cannot run forward in parallel).
         """
         shared.cocktail_status = CocktailStatus(0, status=PrepareResult.IN_PROGRESS)
+        notify_preparation_status()
         items = self._build_cleaning_items(revert=revert_pumps)
         if w is not None:
             w.open_progression_window("Cleaning")
@@ -96,24 +135,17 @@ class MachineController:
             self.hardware.reverter.revert_on()
         use_carriage = cfg.CARRIAGE_CONFIG.move_during_cleaning and not revert_pumps
         carriage = self.hardware.carriage if use_carriage else None
-        scheduler = CleaningScheduler(cfg.MAKER_SIMULTANEOUSLY_PUMPS, carriage=carriage)
-
-        def on_progress(progress: int) -> None:
-            shared.cocktail_status.progress = progress
-            if w is not None:
-                w.change_progression_window(progress)
-                QApplication.processEvents()
-
-        def is_cancelled() -> bool:
-            return shared.cocktail_status.status == PrepareResult.CANCELED
-
-        scheduler.run(items, on_progress, is_cancelled)
+        pool = self.dispenser_pool
+        scheduler = CleaningScheduler(cfg.MAKER_SIMULTANEOUSLY_PUMPS, carriage=carriage, pool=pool)
+        self._run_with_progress(w, lambda on_progress: scheduler.run(items, on_progress, _is_cancelled))
+        _logger.debug(f"Dispenser pool: {pool.metrics()}")
         if revert_pumps and self.hardware.reverter is not None:
             self.hardware.reverter.revert_off()
         _logger.log_header("INFO", "Done Cleaning")
         if w is not None:
             w.close_progression_window()
         shared.cocktail_status.status = PrepareResult.FINISHED
+        notify_preparation_status()
         DatabaseCommander().save_event(EventType.CLEANING)
 
     @staticmethod
@@ -161,6 +193,7 @@ class MachineController:
         (pump calibration must measure the pump, not the scale).
         """
         shared.cocktail_status = CocktailStatus(0, status=PrepareResult.IN_PROGRESS)
+        notify_preparation_status()
         if w is not None:
             w.open_progression_window(recipe)
         items = self._build_preparation_items(ingredient_list, use_scale=use_scale)
@@ -170,6 +203,7 @@ class MachineController:
         self._run_scheduler(w, items, use_carriage=use_carriage)
         if is_cocktail:
             self.hardware.led_controller.preparation_end()
+        self._save_pour_history()
         # Write consumption back to ingredient objects
         for item in items:
             if item.ingredient is not None:
@@ -191,10 +225,22 @@ class MachineController:
             shared.cocktail_status.message = finish_message
             shared.cocktail_status.hand_adds = hand_adds or []
             shared.cocktail_status.status = PrepareResult.FINISHED
+            notify_preparation_status()
         return PreparationResult(
             ingredients=machine_ingredients,
         )
 
+    @staticmethod
+    def _save_pour_history() -> None:
+        """Save the pours of the last preparation, the pour model already learned from them."""
+        pours = POUR_MODEL.take_pending()
+        if not pours:
+            return
+        try:
+            DatabaseCommander().save_pour_history(pours, max_items=_POUR_HISTORY_PER_SLOT)
+        except Exception as e:
+            _logger.error(f"Could not save the pour history: {e}")
+
     def _run_scheduler(
         self,
         w: MainScreen | None,
@@ -203,21 +249,49 @@ class MachineController:
     ) -> None:
         """Create a scheduler and run the given items."""
         carriage = self.hardware.carriage if use_carriage else None
+        pool = self.dispenser_pool
+        weighing = None
+        if self.hardware.scale is not None and cfg.SCALE_CONFIG.continuous_weighing:
+            weighing = WeighingSession(self.hardware.scale)
         scheduler = DispenserScheduler(
             cfg.MAKER_SIMULTANEOUSLY_PUMPS,
             carriage=carriage,
+            pool=pool,
+            weighing=weighing,
         )
+        plan = scheduler.plan(items)
+        shared.cocktail_status.predicted_finish = time.time() + plan.makespan
+        notify_preparation_status()
+        _logger.debug(f"Planned preparation time: {plan.makespan:.1f} s")
+        self._run_with_progress(w, lambda on_progress: scheduler.run(items, on_progress, _is_cancelled, plan=plan))
+        _logger.debug(f"Dispenser pool: {pool.metrics()}")
+
+    def _run_with_progress(self, w: MainScreen | None, run: Callable[[Callable[[int], None]], None]) -> None:
+        """Run the dispensing, publishing the progress to the cocktail status and the progress window.
+
+        In v1 (w given) the dispensing runs on a worker thread while the GUI thread keeps its event loop,
+        so the pump timing does not depend on repaints and the progress window gets the progress by signal.
+        """
 
         def on_progress(progress: int) -> None:
             shared.cocktail_status.progress = progress
-            if w is not None:
-                w.change_progression_window(progress)
-                QApplication.processEvents()
+            notify_preparation_status()
+
+        if w is None:
+            run(on_progress)
+            return
+        # Only available in v1, Qt is not installed for v2
+        from src.ui.qt_worker import run_blocking_with_progress
 
-        def is_cancelled() -> bool:
-            return shared.cocktail_status.status == PrepareResult.CANCELED
+        def run_on_worker(report_to_gui: Callable[[int], None]) -> None:
+            def report(progress: int) -> None:
+                # the status is set on the worker thread, only the window update is passed to the GUI thread
+                on_progress(progress)
+                report_to_gui(progress)
 
-        scheduler.run(items, on_progress, is_cancelled)
+            run(report)
+
+        run_blocking_with_progress(run_on_worker, w.change_progression_window)
 
     def set_up_pumps(self) -> None:
         """Initialize dispensers for all configured pump slots."""
@@ -227,6 +301,7 @@ class MachineController:
         for slot, pump_cfg in enumerate(used_config, start=1):
             dispenser = create_dispenser(slot, pump_cfg, self.hardware)
             self.dispensers[slot] = dispenser
+        self._dispenser_version += 1
         if self.hardware.reverter is not None:
             self.hardware.reverter.initialize_pin()
 
@@ -235,6 +310,7 @@ class MachineController:
         dispenser = self.dispensers.get(slot)
         if dispenser is not None:
             dispenser.volume_flow = volume_flow
+            self._dispenser_version += 1
 
     def close_all_pumps(self) -> None:
         """Stop all active dispensers."""
@@ -244,6 +320,11 @@ class MachineController:
     def cleanup(self) -> None:
         """Cleanup for shutdown the machine."""
         self.close_all_pumps()
+        if self._scale_stream is not None:
+            self._scale_stream.stop()
+        if self._dispenser_pool is not None:
+            self._dispenser_pool.shutdown()
+            self._dispenser_pool = None
         HARDWARE_ADDONS.cleanup_all()
         self.hardware.cleanup()
 
@@ -272,6 +353,21 @@ class MachineController:
             )
         return items
 
+    def estimate_preparation_time(self, ingredient_list: list[Ingredient]) -> float:
+        """Return the planned preparation time in seconds of the given machine ingredients."""
+        items = self._build_preparation_items(ingredient_list)
+        scheduler = DispenserScheduler(cfg.MAKER_SIMULTANEOUSLY_PUMPS, carriage=self.hardware.carriage)
+        return scheduler.plan(items).makespan
+
+    def plan_cocktail(self, cocktail: Cocktail, volume: int, alcohol_factor: float) -> CocktailPlan:
+        """Scale the cocktail to the volume and alcohol factor (0 for virgin) and estimate its preparation time.
+
+        Plans are memoized until the recipes, bottles or dispensers change.
+        """
+        catalog = DatabaseCommander().catalog
+        setup_version = (catalog.recipe_version, self._dispenser_version, cfg.MAKER_SIMULTANEOUSLY_PUMPS)
+        return self._plan_cache.plan(cocktail, volume, alcohol_factor, setup_version, self.estimate_preparation_time)
+
     def _build_preparation_items(
         self, ingredient_list: list[Ingredient], use_scale: bool = True
     ) -> list[PreparationItem]:
@@ -331,11 +427,31 @@ class MachineController:
         Returns the raw offset value captured during tare.
         Raises RuntimeError if no scale is available.
         """
-        return self._assure_scale().tare(samples)
+        scale = self._assure_scale()
+        with scale.bus_lock:
+            offset = scale.tare(samples)
+        if self._scale_stream is not None:
+            self._scale_stream.reset()
+        return offset
 
     def scale_read_grams(self) -> float:
         """Read the calibrated weight in grams from the scale. Raises RuntimeError if no scale."""
-        return self._assure_scale().read_grams()
+        scale = self._assure_scale()
+        with scale.bus_lock:
+            return scale.read_grams()
+
+    @property
+    def scale_stream(self) -> ScaleStream:
+        """Shared live reading of the scale for any number of viewers, raises RuntimeError if no scale."""
+        scale = self._assure_scale()
+        if self._scale_stream is None or self._scale_stream.scale is not scale:
+            self._scale_stream = ScaleStream(scale, cfg.SCALE_CONFIG.stream_rate)
+        return self._scale_stream
+
+    @property
+    def can_detect_glass(self) -> bool:
+        """Return True if a scale is configured to detect whether a glass is placed."""
+        return self.hardware.scale is not None and cfg.SCALE_CONFIG.minimal_weight > 0
 
     def is_glass_present(self) -> bool:
         """Return whether a glass is present on the scale.
@@ -349,7 +465,9 @@ class MachineController:
         minimal_weight = cfg.SCALE_CONFIG.minimal_weight
         if minimal_weight == 0:
             return True
-        return self.hardware.scale.get_gross_grams() + _GLASS_WEIGHT_TOLERANCE >= minimal_weight
+        with self.hardware.scale.bus_lock:
+            gross_grams = self.hardware.scale.get_gross_grams()
+        return gross_grams + _GLASS_WEIGHT_TOLERANCE >= minimal_weight
 
     def scale_calibrate(self, known_weight_grams: float, zero_raw_offset: int, samples: int = 20) -> float:
         """Calibrate the scale using a known reference weight.
@@ -362,7 +480,10 @@ class MachineController:
         scale = self._assure_scale()
         if known_weight_grams <= 0:
             raise ValueError("Known weight must be positive")
-        factor = round(scale.calibrate_with_known_weight(known_weight_grams, zero_raw_offset, samples), 1)
+        with scale.bus_lock:
+            factor = round(scale.calibrate_with_known_weight(known_weight_grams, zero_raw_offset, samples), 1)
+        if self._scale_stream is not None:
+            self._scale_stream.reset()
         cfg.SCALE_CONFIG.calibration_factor = factor
         cfg.SCALE_CONFIG.zero_raw_offset = zero_raw_offset
         cfg.sync_config_to_file()
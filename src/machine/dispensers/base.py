@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import time
 from abc import ABC, abstractmethod
-from collections import deque
 from collections.abc import Callable, Generator
 from dataclasses import dataclass
 from threading import Event
 from typing import TYPE_CHECKING
 
 from src.logger_handler import LoggerHandler
+from src.machine.dispensers.pour_model import POUR_MODEL, PourEstimate
+from src.machine.dispensers.weighing import WeighingSession
+from src.machine.scale.sampler import ScaleSample, ScaleSampler
+from src.models import PourRecord
 
 if TYPE_CHECKING:
     from src.config.config_types import BasePumpConfig
@@ -48,6 +51,8 @@ to cover the 1-2s unprimed start; raise if field priming times demand it.
 """
 _SETTLE_POLL_S = 0.05
 """Poll interval while waiting for the reading to settle."""
+_LEARNED_SETTLE_WINDOW_S = 0.25
+"""Shorter stable span ending the settle wait once the weight reached the learned in-flight volume."""
 
 
 class _StopPredictor:
@@ -56,42 +61,41 @@ class _StopPredictor:
     Stopping a pump at the moment the scale reads the target overshoots: the liquid
     already falling still adds weight. The start transient mirrors the stop transient,
     so the time between pump activation and the first reliable weight increase
-    ("start latency") is used as the stop lead. The flow gradient (ml/s) is estimated
-    over a sliding window that starts only after liquid arrived - including the dead
-    time would drag the gradient down and stop too late. Until both latency and a
-    trustworthy gradient exist (small amounts, blocked tube, revert), nothing happens
-    and the caller's own target check applies unchanged.
+    ("start latency") is used as the stop lead. The flow gradient (ml/s) is the slope
+    of the sampled weight over a sliding window that starts only after liquid arrived -
+    including the dead time would drag the gradient down and stop too late. The age of
+    the latest sample is accounted for, the weight kept rising since it was taken.
+    Until both latency and a trustworthy gradient exist (small amounts, blocked tube,
+    revert), nothing happens and the caller's own target check applies unchanged.
+    With a lead learned from the former pours of the slot (``seed``), this one replaces
+    the measured start latency, which is noisy for a single pour.
     """
 
-    def __init__(self, target_ml: float) -> None:
+    def __init__(self, target_ml: float, sampler: ScaleSampler, seed: PourEstimate | None = None) -> None:
         self._target = target_ml
+        self._sampler = sampler
+        self.seed = seed
         self._start: float | None = None
+        self._arrival: float | None = None
         self.lead_s: float | None = None
         self.gradient: float | None = None
-        self._samples: deque[tuple[float, float]] = deque()
 
-    def should_stop(self, consumption: float) -> bool:
+    def should_stop(self, sample: ScaleSample) -> bool:
         now = time.monotonic()
         if self._start is None:
             self._start = now
-        if self.lead_s is None:
-            if consumption <= _SCALE_JITTER_G:
+        if self._arrival is None:
+            if sample.grams <= _SCALE_JITTER_G:
                 return False
-            self.lead_s = min(now - self._start, _MAX_STOP_LEAD_S)
-        self._samples.append((now, consumption))
-        # keep the window just above _GRADIENT_WINDOW_S: drop the oldest sample only
-        # while the second-oldest still spans the full window
-        while len(self._samples) >= _MIN_GRADIENT_SAMPLES and now - self._samples[1][0] >= _GRADIENT_WINDOW_S:
-            self._samples.popleft()
-        first_t, first_w = self._samples[0]
-        span = now - first_t
-        if span < _GRADIENT_WINDOW_S or len(self._samples) < _MIN_GRADIENT_SAMPLES:
-            return False
-        gradient = (consumption - first_w) / span
-        if gradient <= 0:
+            self._arrival = sample.timestamp
+            measured = min(max(sample.timestamp - self._start, 0.0), _MAX_STOP_LEAD_S)
+            self.lead_s = self.seed.lead_s if self.seed is not None else measured
+        gradient = self._sampler.slope(_GRADIENT_WINDOW_S, since=self._arrival, min_samples=_MIN_GRADIENT_SAMPLES)
+        if gradient is None or gradient <= 0 or self.lead_s is None:
             return False
         self.gradient = gradient
-        return (self._target - consumption) / gradient <= self.lead_s
+        sample_age = max(now - sample.timestamp, 0.0)
+        return (self._target - sample.grams) / gradient - sample_age <= self.lead_s
 
 
 class _StallWatchdog:
@@ -105,13 +109,12 @@ class _StallWatchdog:
         self._high = 0.0
         self._last_rise = time.monotonic()
 
-    def tripped(self, consumption: float) -> bool:
-        now = time.monotonic()
-        if consumption > self._high + _SCALE_JITTER_G:
-            self._high = consumption
-            self._last_rise = now
+    def tripped(self, sample: ScaleSample) -> bool:
+        if sample.grams > self._high + _SCALE_JITTER_G:
+            self._high = sample.grams
+            self._last_rise = sample.timestamp
             return False
-        return now - self._last_rise > _STALL_TIMEOUT_S
+        return time.monotonic() - self._last_rise > _STALL_TIMEOUT_S
 
 
 @dataclass
@@ -137,6 +140,12 @@ class BaseDispenser(ABC):
 
     last_dispense_stalled = False
     """True when the previous dispense was aborted by the stall watchdog (e.g. empty bottle)."""
+    _sampler: ScaleSampler | None = None
+    """Samples the scale in the background while a scale-based dispense runs."""
+    _baseline = 0.0
+    """Weight on the scale before this pour, non zero within a weighing session."""
+    last_pour: PourRecord | None = None
+    """Outcome of the previous scale-based dispense, None if it was time-based or stalled."""
 
     def __init__(
         self,
@@ -170,6 +179,8 @@ class BaseDispenser(ABC):
         revert: bool,
         callback: ProgressCallback,
         use_scale: bool = True,
+        ingredient_id: int | None = None,
+        weighing: WeighingSession | None = None,
     ) -> float:
         """Dispense the given amount at the given pump speed.
 
@@ -181,12 +192,18 @@ class BaseDispenser(ABC):
         pump_speed is the percentage of the pump's configured volume_flow
         (100 = full speed). Returns actual consumption in ml.
 
-        With a scale, a _StopPredictor cuts the pump early so falling liquid
+        With a scale, a ScaleSampler reads it in the background at the rate of
+        its ADC, so the loop never waits on the hardware. A _StopPredictor cuts the pump early so falling liquid
         lands on target instead of overshooting, the final consumption is
         read after the scale settled (single-shot: a small undershoot is
         accepted, there is no top-up pass), and a stall watchdog aborts the
         pour when the weight makes no progress (empty bottle, blocked tube),
-        flagging it via ``last_dispense_stalled``.
+        flagging it via ``last_dispense_stalled``. Each pour is recorded in the
+        pour model, which learns the in-flight volume per slot and ingredient
+        (``ingredient_id``) and seeds the predictor and settle wait of the next pours.
+
+        Within a ``weighing`` session the scale is not tared, the pour is measured
+        against the session baseline and may skip the settle wait (see WeighingSession).
 
         ``use_scale=False`` runs the whole dispense time-based even when a
         scale is configured — no tare, reads, watchdog or settle. Cleaning
@@ -195,36 +212,107 @@ class BaseDispenser(ABC):
         """
         self._stop_event.clear()
         self.last_dispense_stalled = False
+        self.last_pour = None
         self._active_scale = self._scale if use_scale else None
-        if self._active_scale is not None:
-            self._active_scale.tare()
+        self._baseline = 0.0
+        if weighing is not None and self._active_scale is not None:
+            weighing.prepare()
+            self._sampler = weighing.sampler
+            self._baseline = weighing.baseline
+        elif self._active_scale is not None:
+            with self._active_scale.bus_lock:
+                self._active_scale.tare()
+            # taring needs the scale bus, so the sampling only starts afterwards
+            self._sampler = ScaleSampler(self._active_scale)
+            self._sampler.start()
+        try:
+            consumption = self._run_dispense(amount_ml, pump_speed, revert, callback, ingredient_id, weighing)
+        except Exception:
+            if weighing is not None:
+                weighing.invalidate()
+            raise
+        finally:
+            # the sampler of a weighing session keeps running for the next pour
+            if self._sampler is not None and weighing is None:
+                self._sampler.stop()
+            self._sampler = None
+        if weighing is not None:
+            if self._active_scale is not None:
+                weighing.add(consumption)
+            else:
+                weighing.invalidate()
+        return consumption
+
+    def _run_dispense(
+        self,
+        amount_ml: float,
+        pump_speed: int,
+        revert: bool,
+        callback: ProgressCallback,
+        ingredient_id: int | None,
+        weighing: WeighingSession | None,
+    ) -> float:
         consumption = 0.0
         ctx = DispenseContext(revert=revert)
         self._before_dispense(ctx)
         callback(consumption, False)
-        predictor = _StopPredictor(amount_ml) if self._active_scale is not None else None
-        watchdog = _StallWatchdog() if self._active_scale is not None else None
+        sampler = self._sampler
+        predictor = None
+        if sampler is not None:
+            predictor = _StopPredictor(amount_ml, sampler, POUR_MODEL.estimate(self.slot, ingredient_id))
+        watchdog = _StallWatchdog() if sampler is not None else None
         steps = self._dispense_steps(amount_ml, pump_speed)
         for consumption in steps:
             if self._stop_event.is_set():
                 break
-            if predictor is not None and predictor.should_stop(consumption):
-                break
-            if watchdog is not None and watchdog.tripped(consumption):
-                self._mark_stalled(consumption, amount_ml)
-                break
+            if sampler is not None and predictor is not None and watchdog is not None:
+                sample = self._latest_sample()
+                if predictor.should_stop(sample):
+                    break
+                if watchdog.tripped(sample):
+                    self._mark_stalled(consumption, amount_ml)
+                    break
             callback(consumption, False)
         # close explicitly so the dispenser's finally block shuts the hardware off
         # before the settle reading starts
         steps.close()
         # If a scale was used, wait for the reading to settle and log the final consumption.
         # This is important since otherwise we cannot know how much liquid still fell after a stop
-        if self._active_scale is not None and predictor is not None:
-            consumption = self._settle_and_log(consumption, amount_ml, predictor, callback)
+        if predictor is not None:
+            cutoff = consumption
+            in_flight = self._pipelined_in_flight(predictor, weighing)
+            if in_flight is not None:
+                # the next pour starts right away, the learned in-flight volume is attributed to this one
+                consumption = cutoff + in_flight
+                _logger.debug(
+                    f"Slot {self.slot} | target {amount_ml:.1f}ml | stopped at {cutoff:.1f}ml | "
+                    f"attributed {in_flight:.1f}ml in flight without settling"
+                )
+            else:
+                consumption = self._settle_and_log(cutoff, amount_ml, predictor, callback)
+                self._record_pour(cutoff, consumption, amount_ml, predictor, pump_speed, ingredient_id)
         callback(consumption, True)
         self._after_dispense(ctx)
         return consumption
 
+    def _pipelined_in_flight(self, predictor: _StopPredictor, weighing: WeighingSession | None) -> float | None:
+        """Return the expected in-flight volume if the settle can be skipped, else None.
+
+        Only within a weighing session with a following pour, for a regular cut with a learned lead.
+        """
+        if weighing is None or not weighing.can_pipeline or self._stop_event.is_set() or self.last_dispense_stalled:
+            return None
+        if predictor.seed is None or predictor.gradient is None:
+            return None
+        return predictor.seed.in_flight(predictor.gradient)
+
+    def _latest_sample(self) -> ScaleSample:
+        """Return the latest scale sample relative to the weight before this pour."""
+        if self._sampler is None:
+            raise RuntimeError("No scale is sampled in this dispense")
+        sample = self._sampler.latest()
+        return sample._replace(grams=sample.grams - self._baseline)
+
     def _mark_stalled(self, consumption: float, amount_ml: float) -> None:
         """Flag the current dispense as stalled and log the abort."""
         self.last_dispense_stalled = True
@@ -241,8 +329,13 @@ class BaseDispenser(ABC):
         callback: ProgressCallback,
     ) -> float:
         """Wait for the settled scale reading and log how the pour landed."""
-        settled = self._read_settled_consumption(cutoff, callback)
+        expected = None
+        if predictor.seed is not None and predictor.gradient is not None:
+            expected = cutoff + predictor.seed.in_flight(predictor.gradient)
+        settled = self._read_settled_consumption(cutoff, callback, expected)
         lead = f"{predictor.lead_s:.2f}s" if predictor.lead_s is not None else "n/a"
+        if predictor.seed is not None:
+            lead = f"{lead} (learned from {predictor.seed.pours} pours)"
         gradient = f"{predictor.gradient:.1f}ml/s" if predictor.gradient is not None else "n/a"
         _logger.debug(
             f"Slot {self.slot} | target {amount_ml:.1f}ml | lead {lead} | gradient {gradient} | "
@@ -250,35 +343,64 @@ class BaseDispenser(ABC):
         )
         return settled
 
-    def _read_settled_consumption(self, at_cutoff: float, callback: ProgressCallback) -> float:
+    def _record_pour(
+        self,
+        cutoff: float,
+        settled: float,
+        amount_ml: float,
+        predictor: _StopPredictor,
+        pump_speed: int,
+        ingredient_id: int | None,
+    ) -> None:
+        """Keep the outcome of the pour and let the pour model learn from it, stalled pours are skipped."""
+        if self.last_dispense_stalled:
+            return
+        self.last_pour = PourRecord(
+            slot=self.slot,
+            ingredient_id=ingredient_id,
+            target=amount_ml,
+            cutoff=cutoff,
+            settled=settled,
+            lead=predictor.lead_s,
+            gradient=predictor.gradient,
+            pump_speed=pump_speed,
+        )
+        POUR_MODEL.record(self.last_pour)
+
+    def _read_settled_consumption(
+        self, at_cutoff: float, callback: ProgressCallback, expected: float | None = None
+    ) -> float:
         """Wait until the scale reading stops changing (no more falling liquid), return it.
 
         Runs after every scale-based dispense ending (early stop, target reached,
         cancel) so the reported consumption is the weight that actually landed in
-        the glass. Settled means the reading moved at most _SCALE_JITTER_G over a
-        _GRADIENT_WINDOW_S span; _SETTLE_TIMEOUT_S bounds the wait. A cancel
-        arriving during the wait aborts it (a dispense already canceled before the
-        wait still settles normally). Each reading is emitted through the progress
-        callback so the progress bar keeps moving while in-flight liquid lands.
+        the glass. Settled means the samples taken after the cutoff spread at most
+        _SCALE_JITTER_G over a _GRADIENT_WINDOW_S span; _SETTLE_TIMEOUT_S bounds the
+        wait. A cancel arriving during the wait aborts it (a dispense already canceled
+        before the wait still settles normally). Each new reading is emitted through
+        the progress callback so the progress bar keeps moving while in-flight liquid lands.
+        Once the reading reached the ``expected`` weight of the learned in-flight volume,
+        a stable _LEARNED_SETTLE_WINDOW_S span is enough.
         """
-        scale = self._active_scale
-        if scale is None:
+        sampler = self._sampler
+        if sampler is None:
             return at_cutoff
         start = time.monotonic()
         was_stopped = self._stop_event.is_set()
-        stable_since = start
         reading = at_cutoff
         while time.monotonic() - start < _SETTLE_TIMEOUT_S:
             if not was_stopped and self._stop_event.is_set():
                 break
-            previous = reading
-            reading = scale.read_grams()
+            reading = self._latest_sample().grams
             callback(reading, False)
-            now = time.monotonic()
-            if abs(reading - previous) > _SCALE_JITTER_G:
-                stable_since = now
-            if now - stable_since >= _GRADIENT_WINDOW_S:
-                break
+            span = _GRADIENT_WINDOW_S
+            if expected is not None and reading >= expected - _SCALE_JITTER_G:
+                span = _LEARNED_SETTLE_WINDOW_S
+            window = sampler.window(span, since=start)
+            if window and window[-1].timestamp - window[0].timestamp >= span:
+                weights = [x.grams for x in window]
+                if max(weights) - min(weights) <= _SCALE_JITTER_G:
+                    break
             time.sleep(_SETTLE_POLL_S)
         return reading
 
@@ -337,10 +459,10 @@ class BaseDispenser(ABC):
     def _get_consumption(self, current_estimate: float) -> float:
         """Return current consumption in ml.
 
-        When a scale is present and in use for this dispense, reads grams
-        directly (density assumed ~1 g/ml). Otherwise returns the caller's
-        time/step-based estimate.
+        When a scale is present and in use for this dispense, returns the
+        latest sampled grams (density assumed ~1 g/ml) without waiting for the
+        ADC. Otherwise returns the caller's time/step-based estimate.
         """
-        if self._active_scale is not None:
-            return self._active_scale.read_grams()
+        if self._sampler is not None:
+            return self._latest_sample().grams
         return current_estimate
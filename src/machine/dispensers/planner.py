@@ -0,0 +1,154 @@
+"""Planning of the dispenser timeline for one preparation.
+
+Within a recipe_order group, pours that do not need the scale run in parallel lanes (one lane per
+concurrent dispenser), scale-controlled pours run one-by-one after them, since any other pour
+into the glass would falsify the scale reading. Groups run sequentially.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.machine.dispensers.scheduler import PreparationItem
+
+_EXACT_PLAN_LIMIT = 12
+"""Up to this many parallel items per group, the lane assignment is solved exactly (branch and bound)."""
+
+
+def is_exclusive(item: PreparationItem) -> bool:
+    """Return True if the item needs the glass for itself, because it is measured by the scale.
+
+    Weight-mode dispensers told to run time-based (``use_scale=False``, e.g. calibration)
+    do not touch the scale and can run in parallel with the others.
+    """
+    return item.dispenser.needs_exclusive and item.use_scale
+
+
+@dataclass(frozen=True)
+class PlannedStep:
+    """One dispense in the predicted timeline, times in seconds from the preparation start."""
+
+    item: PreparationItem
+    start: float
+    end: float
+    lane: int | None = None
+    """Parallel lane running the item, None for exclusive or carriage items."""
+
+
+@dataclass
+class GroupPlan:
+    """Execution plan of one recipe_order group."""
+
+    lanes: list[list[PreparationItem]] = field(default_factory=list)
+    """Parallel items per lane, each lane runs its items back to back."""
+    sequential: list[PreparationItem] = field(default_factory=list)
+    """Items running one-by-one after all lanes are done."""
+
+
+@dataclass
+class PreparationPlan:
+    """Execution plan and predicted timeline of a whole preparation."""
+
+    groups: list[GroupPlan] = field(default_factory=list)
+    timeline: list[PlannedStep] = field(default_factory=list)
+    makespan: float = 0.0
+    """Predicted total time in seconds, including carriage travel if used."""
+
+
+def plan_group(group: list[PreparationItem], max_concurrent: int, offset: float) -> tuple[GroupPlan, list[PlannedStep]]:
+    """Plan one group starting at the given offset, return the plan and its timeline steps."""
+    parallel = [x for x in group if not is_exclusive(x)]
+    exclusive = [x for x in group if is_exclusive(x)]
+    assignment, _ = assign_lanes([x.estimated_time for x in parallel], max_concurrent)
+    plan = GroupPlan(lanes=[[parallel[i] for i in lane] for lane in assignment], sequential=exclusive)
+    steps: list[PlannedStep] = []
+    parallel_end = offset
+    for lane_number, lane in enumerate(plan.lanes):
+        start = offset
+        for item in lane:
+            steps.append(PlannedStep(item=item, start=start, end=start + item.estimated_time, lane=lane_number))
+            start += item.estimated_time
+        parallel_end = max(parallel_end, start)
+    start = parallel_end
+    for item in exclusive:
+        steps.append(PlannedStep(item=item, start=start, end=start + item.estimated_time))
+        start += item.estimated_time
+    return plan, steps
+
+
+def assign_lanes(durations: list[float], max_concurrent: int) -> tuple[list[list[int]], float]:
+    """Distribute the durations on at most max_concurrent lanes minimizing the makespan.
+
+    Returns the indices per lane (longest first within each lane) and the makespan.
+    Small inputs are solved exactly, larger ones with the LPT heuristic.
+    """
+    if not durations:
+        return [], 0.0
+    order = sorted(range(len(durations)), key=lambda i: durations[i], reverse=True)
+    n_lanes = min(max(max_concurrent, 1), len(durations))
+    best_loads, best_lanes = _lpt(order, durations, n_lanes)
+    best = max(best_loads)
+    if len(durations) <= _EXACT_PLAN_LIMIT and n_lanes > 1:
+        lower_bound = max(durations[order[0]], sum(durations) / n_lanes)
+        if best > lower_bound:
+            best, best_lanes = _branch_and_bound(order, durations, n_lanes, best, best_lanes, lower_bound)
+    return [lane for lane in best_lanes if lane], best
+
+
+def _lpt(order: list[int], durations: list[float], n_lanes: int) -> tuple[list[float], list[list[int]]]:
+    """Longest processing time first: each item goes to the currently least loaded lane."""
+    heap = [(0.0, lane) for lane in range(n_lanes)]
+    lanes: list[list[int]] = [[] for _ in range(n_lanes)]
+    loads = [0.0] * n_lanes
+    for i in order:
+        load, lane = heapq.heappop(heap)
+        lanes[lane].append(i)
+        loads[lane] = load + durations[i]
+        heapq.heappush(heap, (loads[lane], lane))
+    return loads, lanes
+
+
+def _branch_and_bound(
+    order: list[int],
+    durations: list[float],
+    n_lanes: int,
+    best: float,
+    best_lanes: list[list[int]],
+    lower_bound: float,
+) -> tuple[float, list[list[int]]]:
+    """Exact minimal makespan by depth first search over lane assignments, seeded with the LPT result."""
+    loads = [0.0] * n_lanes
+    lanes: list[list[int]] = [[] for _ in range(n_lanes)]
+
+    def search(position: int, current_max: float) -> bool:
+        """Return True once the lower bound is reached, no better solution can exist then."""
+        nonlocal best, best_lanes
+        if position == len(order):
+            best = current_max
+            best_lanes = [list(x) for x in lanes]
+            return best <= lower_bound
+        duration = durations[order[position]]
+        tried_loads: set[float] = set()
+        for lane in range(n_lanes):
+            # lanes with the same load are interchangeable, trying one of them is enough
+            old_load = loads[lane]
+            if old_load in tried_loads:
+                continue
+            tried_loads.add(old_load)
+            new_load = old_load + duration
+            if new_load >= best:
+                continue
+            loads[lane] = new_load
+            lanes[lane].append(order[position])
+            done = search(position + 1, max(current_max, new_load))
+            lanes[lane].pop()
+            loads[lane] = old_load
+            if done:
+                return True
+        return False
+
+    search(0, 0.0)
+    return best, best_lanes
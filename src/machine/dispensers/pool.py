@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+_START_DELAY_HISTORY = 100
+"""Number of most recent time-to-start samples kept for the metrics."""
+
+
+@dataclass(frozen=True)
+class DispenserPoolMetrics:
+    """Snapshot of the dispenser pool load."""
+
+    max_workers: int
+    queue_depth: int
+    """Submitted tasks still waiting for a free worker."""
+    active_workers: int
+    completed: int
+    last_start_delay: float
+    """Seconds between submit and start of the most recent task."""
+    mean_start_delay: float
+    max_start_delay: float
+
+    def __str__(self) -> str:
+        return (
+            f"workers={self.active_workers}/{self.max_workers}, queued={self.queue_depth}, "
+            f"completed={self.completed}, start delay ms: last={self.last_start_delay * 1000:.2f}, "
+            f"mean={self.mean_start_delay * 1000:.2f}, max={self.max_start_delay * 1000:.2f}"
+        )
+
+
+class DispenserPool:
+    """Long-lived worker threads running dispensers, shared by all schedulers.
+
+    Threads are created on demand by the underlying executor and then kept alive,
+    so consecutive preparations do not pay thread spawn and join costs before each pour.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dispenser")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._start_delays: deque[float] = deque(maxlen=_START_DELAY_HISTORY)
+
+    def submit[**P, T](self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        """Schedule the function on a pool worker and track its queue and run time."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def run() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._start_delays.append(time.perf_counter() - submitted)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        return self._executor.submit(run)
+
+    def metrics(self) -> DispenserPoolMetrics:
+        """Return the current load and the time-to-start statistics of the recent tasks."""
+        with self._lock:
+            delays = list(self._start_delays)
+            return DispenserPoolMetrics(
+                max_workers=self.max_workers,
+                queue_depth=self._queued,
+                active_workers=self._active,
+                completed=self._completed,
+                last_start_delay=delays[-1] if delays else 0.0,
+                mean_start_delay=sum(delays) / len(delays) if delays else 0.0,
+                max_start_delay=max(delays, default=0.0),
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks and release the worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
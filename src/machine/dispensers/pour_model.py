@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from src.models import PourRecord
+
+_DECAY = 0.8
+"""Weight of the history against the newest pour, lower values follow changes (new tube, other bottle) faster."""
+_MIN_POURS = 3
+"""Pours needed before the learned lead replaces the per pour measurement."""
+_MIN_GRADIENT = 1.0
+"""Pours with a lower flow (ml/s) carry no information about the in-flight volume."""
+_MAX_LEAD_S = 1.0
+"""Upper bound of a learned lead, guards against pours disturbed by hand (e.g. a moved glass)."""
+
+
+@dataclass
+class PourEstimate:
+    """Learned stop behavior of a slot (and ingredient)."""
+
+    lead_s: float
+    """Seconds of flow still in the air when the pump stops."""
+    pours: int
+
+    def in_flight(self, gradient: float) -> float:
+        """Return the expected in-flight volume in ml at the given flow in ml/s."""
+        return self.lead_s * gradient
+
+
+class _WeightedRegression:
+    """Exponentially weighted least squares fit of y = k * x (through the origin).
+
+    Older observations fade with the decay factor, so the fit follows slow changes of the setup.
+    """
+
+    def __init__(self, decay: float = _DECAY) -> None:
+        self.decay = decay
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.count = 0
+
+    def update(self, x: float, y: float) -> None:
+        self.sxx = self.decay * self.sxx + x * x
+        self.sxy = self.decay * self.sxy + x * y
+        self.count += 1
+
+    @property
+    def slope(self) -> float | None:
+        if self.sxx <= 0:
+            return None
+        return self.sxy / self.sxx
+
+
+class PourModel:
+    """Online estimator of the in-flight volume of each slot, learned from the pour history.
+
+    The in-flight volume (settled - cutoff) grows linear with the flow at the cutoff, the
+    factor is the effective stop lead. It is fitted per slot and ingredient (viscosity differs)
+    and per slot alone, the latter is used for ingredients new to the slot.
+    New pours are kept until they are saved to the database with ``take_pending()``.
+    """
+
+    def __init__(self) -> None:
+        self._fits: dict[tuple[int, int | None], _WeightedRegression] = {}
+        self._pending: list[PourRecord] = []
+        self._lock = threading.Lock()
+
+    def estimate(self, slot: int, ingredient_id: int | None = None) -> PourEstimate | None:
+        """Return the learned lead of the slot and ingredient, None if there are too few pours."""
+        with self._lock:
+            for key in ((slot, ingredient_id), (slot, None)):
+                fit = self._fits.get(key)
+                if fit is None or fit.count < _MIN_POURS or fit.slope is None:
+                    continue
+                return PourEstimate(lead_s=min(max(fit.slope, 0.0), _MAX_LEAD_S), pours=fit.count)
+        return None
+
+    def record(self, pour: PourRecord) -> None:
+        """Learn from the finished pour and keep it for saving."""
+        with self._lock:
+            self._learn(pour)
+            self._pending.append(pour)
+
+    def seed(self, history: list[PourRecord]) -> None:
+        """Replay the saved pours (oldest first), e.g. at program start."""
+        with self._lock:
+            self._fits.clear()
+            for pour in history:
+                self._learn(pour)
+
+    def take_pending(self) -> list[PourRecord]:
+        """Return and forget the pours not saved yet."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def _learn(self, pour: PourRecord) -> None:
+        if pour.gradient is None or pour.gradient < _MIN_GRADIENT or pour.in_flight < 0:
+            return
+        for key in dict.fromkeys([(pour.slot, pour.ingredient_id), (pour.slot, None)]):
+            self._fits.setdefault(key, _WeightedRegression()).update(pour.gradient, pour.in_flight)
+
+
+POUR_MODEL = PourModel()
@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-import heapq
+import threading
 import time
-from collections.abc import Callable, Sequence
-from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from src.logger_handler import LoggerHandler
 from src.machine.dispensers.base import BaseDispenser
+from src.machine.dispensers.planner import (
+    GroupPlan,
+    PlannedStep,
+    PreparationPlan,
+    assign_lanes,
+    is_exclusive,
+    plan_group,
+)
+from src.machine.dispensers.pool import DispenserPool
 
 if TYPE_CHECKING:
     from src.machine.carriage import CarriageInterface
+    from src.machine.dispensers.weighing import WeighingSession
     from src.models import Ingredient
 
 _logger = LoggerHandler("DispenserScheduler")
@@ -25,6 +36,12 @@ CancelCheck = Callable[[], bool]
 _POLL_INTERVAL = 0.05
 """How often (seconds) the schedulers' inner loops check elapsed time and cancellation."""
 
+_PROGRESS_INTERVAL = 0.1
+"""Longest time (seconds) the parallel run waits for a finished dispenser before emitting progress.
+
+A finished dispenser wakes the scheduler immediately, so the next item starts without delay.
+"""
+
 _PROGRESS_COMPLETE = 100
 """Maximum progress value emitted via on_progress callbacks (100 = done)."""
 
@@ -66,6 +83,31 @@ class CleaningItem:
     revert: bool = False
 
 
+class PreparationProgress:
+    """Running consumption totals of one preparation, updated with deltas by the dispenser threads.
+
+    Keeps the aggregated progress O(1) instead of summing over all items on every update.
+    """
+
+    def __init__(self, items: list[PreparationItem]) -> None:
+        self.items = items
+        self.required = sum(x.amount_ml for x in items)
+        self.consumed = sum(x.consumption for x in items)
+        self._lock = threading.Lock()
+
+    def update(self, item: PreparationItem, consumption: float) -> None:
+        """Set the item consumption and apply the change to the running total."""
+        with self._lock:
+            self.consumed += consumption - item.consumption
+            item.consumption = consumption
+
+    @property
+    def percent(self) -> int:
+        if self.required <= 0:
+            return 0
+        return min(int(self.consumed / self.required * _PROGRESS_COMPLETE), _PROGRESS_COMPLETE)
+
+
 CarriageItem = PreparationItem | CleaningItem
 """Either kind of scheduler item — both expose ``dispenser.carriage_position``."""
 
@@ -73,17 +115,61 @@ CarriageRunOne = Callable[[CarriageItem, int, int], None]
 """``(item, index, total) -> None`` callback invoked once per carriage-positioned item."""
 
 
+class _LaneQueues:
+    """Items waiting in each planned lane, with the planned finish of the running item of each lane."""
+
+    def __init__(self, lanes: list[list[PreparationItem]]) -> None:
+        self.queues = [list(lane) for lane in lanes]
+        self.planned_end = [0.0] * len(lanes)
+        """Seconds since the start of the lanes."""
+
+    def take(self, lane: int, busy: set[int], elapsed: float) -> PreparationItem | None:
+        """Return the next item of the idle lane, or of the busy lane furthest past its planned finish."""
+        source = lane
+        if not self.queues[lane]:
+            overdue = [x for x in busy if self.queues[x] and elapsed > self.planned_end[x]]
+            if not overdue:
+                return None
+            source = max(overdue, key=lambda x: elapsed - self.planned_end[x])
+        item = self.queues[source].pop(0)
+        # a taken over item starts now instead of after the planned items of its lane
+        begin = self.planned_end[lane] if source == lane else elapsed
+        self.planned_end[lane] = begin + item.estimated_time
+        return item
+
+
 class BaseScheduler:
     """Shared infrastructure for both schedulers.
 
     Owns the constructor and the carriage-sequence template method
     (``move_to → on_each → sleep wait_after_dispense``). Does NOT call
     ``home()`` — each subclass's ``run()`` owns when to home.
+
+    Dispensers run on the given long-lived ``pool`` (owned by the MachineController).
+    Without a pool, a temporary one is created for each parallel run.
     """
 
-    def __init__(self, max_concurrent: int, carriage: CarriageInterface | None = None) -> None:
+    def __init__(
+        self,
+        max_concurrent: int,
+        carriage: CarriageInterface | None = None,
+        pool: DispenserPool | None = None,
+    ) -> None:
         self.max_concurrent = max_concurrent
         self._carriage = carriage
+        self._pool = pool
+
+    @contextmanager
+    def _dispenser_pool(self, max_workers: int) -> Iterator[DispenserPool]:
+        """Yield the shared pool, or a temporary one shut down after use."""
+        if self._pool is not None:
+            yield self._pool
+            return
+        pool = DispenserPool(max_workers)
+        try:
+            yield pool
+        finally:
+            pool.shutdown()
 
     def _run_carriage_sequence(
         self,
@@ -107,75 +193,126 @@ class BaseScheduler:
 
 
 class DispenserScheduler(BaseScheduler):
-    """Schedules and runs dispenser tasks with greedy slot-filling.
+    """Schedules and runs dispenser tasks with planned slot-filling.
 
     Responsibilities:
     - Groups items by recipe_order (sequential across groups)
-    - Within each group: parallel dispensers run with greedy scheduling (longest first),
-      then exclusive dispensers run one-by-one
+    - Within each group: parallel dispensers run in planned lanes with minimal makespan,
+      then exclusive (scale-controlled) dispensers run one-by-one
     - Manages threading, progress aggregation, and cancellation
+
+    Dispensers report their consumption as deltas into a shared ``PreparationProgress``,
+    the parallel run waits on dispenser completion instead of polling.
+    The execution order comes from ``plan``, which also predicts the timeline.
+    With a ``weighing`` session, the scale-based items are weighed continuously instead
+    of taring before each one, consecutive ones may overlap with the settling of the former.
     """
 
-    def __init__(self, max_concurrent: int, carriage: CarriageInterface | None = None) -> None:
-        super().__init__(max_concurrent, carriage)
+    def __init__(
+        self,
+        max_concurrent: int,
+        carriage: CarriageInterface | None = None,
+        pool: DispenserPool | None = None,
+        weighing: WeighingSession | None = None,
+    ) -> None:
+        super().__init__(max_concurrent, carriage, pool)
+        self._weighing = weighing
         self._next_log_time = 0.0
         self._last_progress = 0
+        self._progress = PreparationProgress([])
+
+    def plan(self, items: list[PreparationItem]) -> PreparationPlan:
+        """Plan the preparation and predict its timeline.
+
+        Without carriage, parallel items of each group are assigned to lanes with minimal makespan,
+        followed by the scale-controlled items. With carriage, everything runs sequentially
+        in carriage sweep order, including travel and wait times.
+        """
+        groups = _group_by_recipe_order(items)
+        plan = PreparationPlan()
+        if self._carriage is None:
+            for group in groups:
+                group_plan, steps = plan_group(group, self.max_concurrent, plan.makespan)
+                plan.groups.append(group_plan)
+                plan.timeline.extend(steps)
+                plan.makespan = max((x.end for x in steps), default=plan.makespan)
+            return plan
+        position = self._carriage.home_position
+        elapsed = 0.0
+        for group in groups:
+            ordered = _order_by_carriage_position(group, self._carriage.home_position)
+            plan.groups.append(GroupPlan(sequential=ordered))
+            for item in ordered:
+                elapsed += self._carriage.travel_time(position, item.dispenser.carriage_position)
+                plan.timeline.append(PlannedStep(item=item, start=elapsed, end=elapsed + item.estimated_time))
+                elapsed += item.estimated_time + self._carriage.wait_after_dispense
+                position = item.dispenser.carriage_position
+        plan.makespan = elapsed + self._carriage.travel_time(position, self._carriage.home_position)
+        return plan
 
     def run(
         self,
         items: list[PreparationItem],
         on_progress: SchedulerProgressCallback,
         is_cancelled: CancelCheck,
+        plan: PreparationPlan | None = None,
     ) -> None:
-        """Execute all preparation items respecting scheduling constraints."""
+        """Execute all preparation items respecting scheduling constraints.
+
+        Follows the given plan of the items, or plans them first.
+        """
         if not items:
             return
 
         self._next_log_time = 0.0
         self._last_progress = 0
+        self._progress = PreparationProgress(items)
         # Emit initial 0% so the UI refreshes before any long blocking step
         # (notably the carriage moving to the first position).
         on_progress(0)
-        groups = _group_by_recipe_order(items)
-        if self._carriage is not None:
-            groups = [_order_by_carriage_position(g, self._carriage.home_position) for g in groups]
+        if plan is None:
+            plan = self.plan(items)
 
-        for group in groups:
-            if is_cancelled():
-                break
-            if self._carriage is not None:
-                self._run_group_with_carriage(group, items, on_progress, is_cancelled)
-            else:
-                self._run_group(group, items, on_progress, is_cancelled)
+        try:
+            for group_plan in plan.groups:
+                if is_cancelled():
+                    break
+                if self._carriage is not None:
+                    self._run_group_with_carriage(group_plan.sequential, on_progress, is_cancelled)
+                else:
+                    self._run_group(group_plan, on_progress, is_cancelled)
+        finally:
+            if self._weighing is not None:
+                self._weighing.close()
 
         if self._carriage is not None:
             self._carriage.home()
 
     def _run_group(
         self,
-        group: list[PreparationItem],
-        all_items: list[PreparationItem],
+        group_plan: GroupPlan,
         on_progress: SchedulerProgressCallback,
         is_cancelled: CancelCheck,
     ) -> None:
         """Run a single recipe_order group.
 
-        Order: parallel dispensers first (greedy), then exclusive dispensers one-by-one.
+        Order: parallel lanes first, then exclusive dispensers one-by-one.
         """
-        parallel = [item for item in group if not item.dispenser.needs_exclusive]
-        exclusive = [item for item in group if item.dispenser.needs_exclusive]
-
-        if parallel:
-            self._run_parallel(parallel, all_items, on_progress, is_cancelled)
-        for item in exclusive:
+        if group_plan.lanes:
+            self._run_lanes(group_plan.lanes, on_progress, is_cancelled)
+            if self._weighing is not None:
+                # the parallel pumps poured into the glass without the scale
+                self._weighing.invalidate()
+        for idx, item in enumerate(group_plan.sequential):
             if is_cancelled():
                 break
-            self._run_exclusive(item, all_items, on_progress, is_cancelled)
+            if self._weighing is not None:
+                self._weighing.can_pipeline = idx < len(group_plan.sequential) - 1
+            self._run_exclusive(item, on_progress, is_cancelled)
 
     def _run_group_with_carriage(
         self,
-        group: list[PreparationItem],
-        all_items: list[PreparationItem],
+        ordered_items: list[PreparationItem],
         on_progress: SchedulerProgressCallback,
         is_cancelled: CancelCheck,
     ) -> None:
@@ -183,52 +320,67 @@ class DispenserScheduler(BaseScheduler):
 
         def on_each(item: CarriageItem, _idx: int, _total: int) -> None:
             assert isinstance(item, PreparationItem)
-            self._run_exclusive(item, all_items, on_progress, is_cancelled)
+            if self._weighing is not None:
+                # the carriage moves the glass after each item, so every pour has to settle
+                self._weighing.can_pipeline = False
+            self._run_exclusive(item, on_progress, is_cancelled)
 
-        self._run_carriage_sequence(group, on_each=on_each, is_cancelled=is_cancelled)
+        self._run_carriage_sequence(ordered_items, on_each=on_each, is_cancelled=is_cancelled)
 
-    def _run_parallel(
+    def _run_lanes(
         self,
-        items: list[PreparationItem],
-        all_items: list[PreparationItem],
+        lanes: list[list[PreparationItem]],
         on_progress: SchedulerProgressCallback,
         is_cancelled: CancelCheck,
     ) -> None:
-        """Run parallel dispensers with greedy scheduling (longest first, fill freed slots)."""
-        queue = list(items)  # Already sorted by estimated_time desc
-        active: dict[Future[None], PreparationItem] = {}
-
-        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
-            while queue and len(active) < self.max_concurrent:
-                data = queue.pop(0)
-                future = executor.submit(_dispense_item, data)
-                active[future] = data
+        """Run the planned lanes in parallel, each lane starts its next item once the previous is done.
 
+        Waits on dispenser completion, so a lane continues right away. The wait is
+        bounded by ``_PROGRESS_INTERVAL`` to emit progress and check for cancellation.
+        The real pour times may differ from the estimates (pump speed drift, weight-mode pours):
+        a lane without items left takes the next item of the lane running furthest past its
+        planned finish, like a greedy dispatch would, instead of idling until that lane is done.
+        """
+        lane_queues = _LaneQueues(lanes)
+        active: dict[Future[None], tuple[int, PreparationItem]] = {}
+        start = time.monotonic()
+
+        with self._dispenser_pool(len(lanes)) as pool:
+
+            def fill_idle_lanes() -> None:
+                busy = {lane for lane, _ in active.values()}
+                for lane in range(len(lanes)):
+                    if lane in busy:
+                        continue
+                    data = lane_queues.take(lane, busy, time.monotonic() - start)
+                    if data is not None:
+                        active[pool.submit(_dispense_item, data, None, self._progress)] = (lane, data)
+                        busy.add(lane)
+
+            fill_idle_lanes()
             while active:
                 if is_cancelled():
-                    for data in active.values():
+                    for _, data in active.values():
                         data.dispenser.stop()
                     break
 
-                done_futures = [f for f in active if f.done()]
+                done_futures, _ = wait(active, timeout=_PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
                 for f in done_futures:
                     try:
                         f.result()
                     except Exception:
                         _logger.error(f"Dispenser error: {f.exception()}")
-                    del active[f]
-                    if queue:
-                        next_data = queue.pop(0)
-                        new_future = executor.submit(_dispense_item, next_data)
-                        active[new_future] = next_data
+                    active.pop(f)
+                fill_idle_lanes()
 
-                self._emit_progress(all_items, on_progress)
-                time.sleep(_POLL_INTERVAL)
+                self._emit_progress(on_progress)
+
+            # stopped dispensers still have to finish before the next group may start
+            wait(active)
 
     def _run_exclusive(
         self,
         item: PreparationItem,
-        all_items: list[PreparationItem],
         on_progress: SchedulerProgressCallback,
         is_cancelled: CancelCheck,
     ) -> None:
@@ -239,60 +391,63 @@ class DispenserScheduler(BaseScheduler):
         def on_step() -> None:
             if is_cancelled():
                 item.dispenser.stop()
-            self._emit_progress(all_items, on_progress)
+            self._emit_progress(on_progress)
 
-        _dispense_item(item, on_step=on_step)
+        _dispense_item(item, on_step=on_step, progress=self._progress, weighing=self._weighing)
 
-    def _emit_progress(
-        self,
-        all_items: list[PreparationItem],
-        on_progress: SchedulerProgressCallback,
-    ) -> None:
-        total_required = sum(x.amount_ml for x in all_items)
-        total_consumed = sum(x.consumption for x in all_items)
-        progress = (
-            min(int(total_consumed / total_required * _PROGRESS_COMPLETE), _PROGRESS_COMPLETE)
-            if total_required > 0
-            else 0
-        )
+    def _emit_progress(self, on_progress: SchedulerProgressCallback) -> None:
         # A lifted glass makes the scale read negative; never let displayed progress go back
-        progress = max(progress, self._last_progress)
+        progress = max(self._progress.percent, self._last_progress)
         self._last_progress = progress
-        consumption = [x.consumption for x in all_items]
         on_progress(progress)
-        self._log_consumption(consumption, progress)
+        self._log_consumption(progress)
 
-    def _log_consumption(self, consumption: list[float], progress: int) -> None:
+    def _log_consumption(self, progress: int) -> None:
         now = time.perf_counter()
         if now < self._next_log_time:
             return
         self._next_log_time = now + 1.0
-        pretty = [round(x) for x in consumption]
+        pretty = [round(x.consumption) for x in self._progress.items]
         _logger.debug(f"{progress:>2}% | Volumes: {pretty}")
 
 
-def _dispense_item(item: PreparationItem, on_step: Callable[[], None] | None = None) -> None:
+def _dispense_item(
+    item: PreparationItem,
+    on_step: Callable[[], None] | None = None,
+    progress: PreparationProgress | None = None,
+    weighing: WeighingSession | None = None,
+) -> None:
     """Run one dispenser; mutate item.consumption/done; log and swallow exceptions.
 
     Shared by the parallel pool path (``on_step=None``; aggregate progress is
-    emitted by the outer polling loop) and the exclusive/carriage path
+    emitted by the outer waiting loop) and the exclusive/carriage path
     (``on_step`` emits aggregate progress on every consumption update).
+    Consumption changes go through ``progress`` when given, keeping its running total.
     """
 
+    def set_consumption(consumption_ml: float) -> None:
+        if progress is None:
+            item.consumption = consumption_ml
+        else:
+            progress.update(item, consumption_ml)
+
     def callback(consumption_ml: float, is_done: bool) -> None:
-        item.consumption = consumption_ml
+        set_consumption(consumption_ml)
         item.done = is_done
         if on_step is not None:
             on_step()
 
     try:
-        item.consumption = item.dispenser.dispense(
+        consumption = item.dispenser.dispense(
             amount_ml=item.amount_ml,
             pump_speed=item.pump_speed,
             revert=item.revert,
             callback=callback,
             use_scale=item.use_scale,
+            ingredient_id=item.ingredient.id if item.ingredient is not None else None,
+            weighing=weighing,
         )
+        set_consumption(consumption)
         item.stalled = item.dispenser.last_dispense_stalled
         item.done = True
     except Exception as exc:
@@ -314,25 +469,17 @@ def estimate_total_time(groups: list[list[PreparationItem]], max_concurrent: int
     """Estimate total preparation time across all recipe_order groups."""
     total = 0.0
     for group in groups:
-        parallel_times = [x.estimated_time for x in group if not x.dispenser.needs_exclusive]
-        exclusive_times = [x.estimated_time for x in group if x.dispenser.needs_exclusive]
+        parallel_times = [x.estimated_time for x in group if not is_exclusive(x)]
+        exclusive_times = [x.estimated_time for x in group if is_exclusive(x)]
         total += _estimate_group_time(parallel_times, max_concurrent)
         total += sum(exclusive_times)
     return round(total, 2)
 
 
 def _estimate_group_time(estimated_times: list[float], max_concurrent: int) -> float:
-    """Estimate makespan for parallel items using LPT (Longest Processing Time) scheduling."""
-    if not estimated_times:
-        return 0.0
-    sorted_times = sorted(estimated_times, reverse=True)
-    num_slots = min(max_concurrent, len(sorted_times))
-    slots = [0.0] * num_slots
-    heapq.heapify(slots)
-    for t in sorted_times:
-        earliest = heapq.heappop(slots)
-        heapq.heappush(slots, earliest + t)
-    return max(slots)
+    """Estimate makespan for parallel items with the planned lane assignment."""
+    _, makespan = assign_lanes(estimated_times, max_concurrent)
+    return makespan
 
 
 def estimate_carriage_time(
@@ -476,9 +623,9 @@ class CleaningScheduler(BaseScheduler):
         the scheduler drives the stop after the wall-clock duration elapses.
         """
         duration = batch[0].duration_seconds
-        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+        with self._dispenser_pool(len(batch)) as pool:
             futures = [
-                executor.submit(
+                pool.submit(
                     item.dispenser.dispense,
                     _CLEANING_LARGE_AMOUNT,
                     _PROGRESS_COMPLETE,
@@ -503,5 +650,7 @@ class CleaningScheduler(BaseScheduler):
                     f.result(timeout=2.0)
                 except Exception as exc:
                     _logger.error(f"Cleaning dispenser error: {exc}")
+            # a dispenser exceeding the timeout above must still be done before the next batch starts
+            wait(futures)
         if not is_cancelled():
             on_progress(max_progress)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.machine.scale.sampler import ScaleSampler
+
+if TYPE_CHECKING:
+    from src.machine.scale.base import ScaleInterface
+
+
+class WeighingSession:
+    """Continuous weighing over several scale-based pours into the same glass.
+
+    Instead of taring before every pour, the scale is tared once and keeps being sampled.
+    Each pour is measured against the ``baseline``, the weight expected once all former
+    pours landed. If another scale-based pour follows (``can_pipeline``), a dispenser with
+    a learned in-flight volume does not wait for the settle: the next pour starts right
+    after the cut and the expected in-flight liquid is attributed to the cut pour.
+    A deviation of this estimate shows up in the following pour, the total stays exact.
+
+    Liquid not measured by the scale (e.g. parallel time-based pumps) invalidates the
+    baseline, the next pour tares again.
+    """
+
+    def __init__(self, scale: ScaleInterface) -> None:
+        self.scale = scale
+        self.sampler = ScaleSampler(scale)
+        self.baseline = 0.0
+        self.can_pipeline = False
+        """Set by the scheduler if the next pour directly follows on the scale."""
+        self._tared = False
+
+    def prepare(self) -> None:
+        """Make the session ready for the next pour, tares the scale if the baseline is not valid."""
+        if self._tared:
+            return
+        self.sampler.stop()
+        with self.scale.bus_lock:
+            self.scale.tare()
+        self.sampler.start()
+        self.baseline = 0.0
+        self._tared = True
+
+    def add(self, consumption: float) -> None:
+        """Account the (settled or attributed) consumption of the finished pour."""
+        self.baseline += consumption
+
+    def invalidate(self) -> None:
+        """Mark the baseline as unknown, e.g. after liquid was poured without the scale."""
+        self._tared = False
+
+    def close(self) -> None:
+        """Stop the sampling, the next use tares again."""
+        self.sampler.stop()
+        self._tared = False
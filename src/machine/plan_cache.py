@@ -0,0 +1,105 @@
+"""Memoized preparation plans of the cocktails, keyed by the requested size and the machine setup.
+
+The UI asks for the same cocktails at the same few volumes over and over. Scaling the recipe
+and planning the dispensers only depends on the recipe, the bottles and the dispenser setup,
+so the result is kept until one of them changes. Only the scaled amounts are kept, the
+ingredients themselves (e.g. their fill level) are always taken from the given cocktail.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from src.catalog_cache import copy_ingredient
+from src.models import Cocktail, Ingredient
+
+_MAX_PLANS = 256
+"""Kept plans, the least recently used one is dropped first."""
+
+
+@dataclass(frozen=True)
+class PlanKey:
+    cocktail_id: int
+    volume: int
+    alcohol_factor: float
+    """0 for the virgin version."""
+    setup_version: Hashable
+    """Changes with the recipes, bottles or dispensers, old plans are never hit again."""
+
+
+@dataclass
+class CocktailPlan:
+    """Scaled ingredients and estimated preparation time of a cocktail at a given size."""
+
+    amounts: dict[int, int]
+    """Scaled amount per ingredient id."""
+    adjusted_alcohol: float
+    adjusted_amount: int
+    estimated_time: float
+    """Planned preparation time of the machine ingredients in seconds."""
+
+    def apply(self, cocktail: Cocktail) -> None:
+        """Set the scaling to the cocktail, like ``Cocktail.scale_cocktail`` does."""
+        adjusted = [copy_ingredient(x) for x in cocktail.ingredients]
+        for ingredient in adjusted:
+            ingredient.amount = self.amounts[ingredient.id]
+        # same stable sort on the same order as scale_cocktail, so the order matches as well
+        adjusted.sort()
+        cocktail.adjusted_ingredients = adjusted
+        cocktail.adjusted_alcohol = self.adjusted_alcohol
+        cocktail.adjusted_amount = self.adjusted_amount
+
+
+class PlanCache:
+    """LRU cache of the cocktail plans, shared by all threads."""
+
+    def __init__(self, max_plans: int = _MAX_PLANS) -> None:
+        self.max_plans = max_plans
+        self._plans: OrderedDict[PlanKey, CocktailPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def plan(
+        self,
+        cocktail: Cocktail,
+        volume: int,
+        alcohol_factor: float,
+        setup_version: Hashable,
+        estimate: Callable[[list[Ingredient]], float],
+    ) -> CocktailPlan:
+        """Scale the cocktail to the volume and alcohol factor and return its plan.
+
+        The estimate function gets the machine ingredients of the scaled cocktail.
+        Cocktails without id (single ingredients) are not cached.
+        """
+        key = PlanKey(cocktail.id, volume, alcohol_factor, setup_version)
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None:
+                self._plans.move_to_end(key)
+        if cached is not None:
+            cached.apply(cocktail)
+            return cached
+        cocktail.scale_cocktail(volume, alcohol_factor)
+        plan = CocktailPlan(
+            amounts={x.id: x.amount for x in cocktail.adjusted_ingredients},
+            adjusted_alcohol=cocktail.adjusted_alcohol,
+            adjusted_amount=cocktail.adjusted_amount,
+            estimated_time=estimate([x for x in cocktail.machineadds if x.amount > 0]),
+        )
+        if cocktail.id == 0:
+            return plan
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
 from collections import deque
 from typing import TYPE_CHECKING
@@ -35,6 +36,8 @@ class ScaleInterface(ABC):
     def __init__(self, config: BaseScaleConfig, hardware: HardwareContext) -> None:
         self.config = config
         self.hardware = hardware
+        self.bus_lock = threading.RLock()
+        """Held while using the scale, the drivers do not share their bus between threads."""
         self._calibration_factor = config.calibration_factor
         self._zero_raw_offset = config.zero_raw_offset
 
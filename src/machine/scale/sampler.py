@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+from src.logger_handler import LoggerHandler
+
+if TYPE_CHECKING:
+    from src.machine.scale.base import ScaleInterface
+
+_logger = LoggerHandler("ScaleSampler")
+
+_BUFFER_SIZE = 256
+"""Number of kept samples, several seconds even at 80 SPS."""
+_FIRST_SAMPLE_TIMEOUT_S = 2.0
+"""Upper bound to wait for the first reading after the start."""
+_MIN_SAMPLE_INTERVAL_S = 0.005
+"""Pause between reads if a driver returns without waiting for the ADC, keeps the thread from spinning."""
+_STOP_TIMEOUT_S = 1.0
+
+
+class ScaleSample(NamedTuple):
+    timestamp: float
+    """time.monotonic() at the moment the reading was available."""
+    grams: float
+
+
+class ScaleSampler:
+    """Reads the scale in a background thread at the native rate of its ADC.
+
+    Every ``read_grams()`` call blocks until the ADC has a new conversion (10-80 SPS),
+    so reading the scale inside the dispense loop would set the loop rate. The sampler
+    puts the timestamped readings into a ring buffer instead, consumers get the latest
+    sample, a time window or its slope without waiting on the hardware.
+    The buffer has a single writer and uses the atomic deque operations, so no lock is needed.
+
+    The sampling thread holds the bus lock of the scale while it runs, others using the scale
+    (e.g. for taring) wait until it is stopped, the drivers do not share their bus between threads.
+    """
+
+    def __init__(self, scale: ScaleInterface, capacity: int = _BUFFER_SIZE) -> None:
+        self.scale = scale
+        self._samples: deque[ScaleSample] = deque(maxlen=capacity)
+        self._has_sample = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._error: Exception | None = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start sampling with an empty buffer."""
+        self.stop()
+        self._samples.clear()
+        self._has_sample.clear()
+        self._stop_event.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="scale_sampler")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, the buffered samples are kept."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=_STOP_TIMEOUT_S)
+        self._thread = None
+
+    def poll(self) -> ScaleSample:
+        """Take one reading from the scale and add it to the buffer."""
+        grams = self.scale.read_grams()
+        sample = ScaleSample(time.monotonic(), grams)
+        self._samples.append(sample)
+        self._has_sample.set()
+        return sample
+
+    def latest(self) -> ScaleSample:
+        """Return the newest sample, only waits if there is none yet.
+
+        Raises the error of the sampling thread if reading the scale failed.
+        """
+        if not self._has_sample.wait(_FIRST_SAMPLE_TIMEOUT_S):
+            raise TimeoutError(f"Scale delivered no reading within {_FIRST_SAMPLE_TIMEOUT_S}s")
+        if self._error is not None:
+            raise self._error
+        return self._samples[-1]
+
+    def window(self, span_s: float, since: float = 0.0) -> list[ScaleSample]:
+        """Return the samples of the last span_s seconds, but none older than since.
+
+        The window starts at the newest sample still covering the full span,
+        so it spans at least span_s as soon as there are enough samples.
+        """
+        samples = [x for x in self._samples.copy() if x.timestamp >= since]
+        if not samples:
+            return []
+        newest = samples[-1].timestamp
+        start = 0
+        for i, sample in enumerate(samples):
+            if newest - sample.timestamp < span_s:
+                break
+            start = i
+        return samples[start:]
+
+    def slope(self, span_s: float, since: float = 0.0, min_samples: int = 2) -> float | None:
+        """Return the weight change in g/s over the window, None if the window is too short."""
+        samples = self.window(span_s, since)
+        if len(samples) < max(min_samples, 2):
+            return None
+        first, last = samples[0], samples[-1]
+        span = last.timestamp - first.timestamp
+        if span < span_s:
+            return None
+        return (last.grams - first.grams) / span
+
+    def _run(self) -> None:
+        with self.scale.bus_lock:
+            self._sample_until_stopped()
+
+    def _sample_until_stopped(self) -> None:
+        while not self._stop_event.is_set():
+            start = time.monotonic()
+            try:
+                self.poll()
+            except Exception as e:
+                _logger.error(f"Could not read the scale: {e}")
+                self._error = e
+                # wake up consumers still waiting for the first sample
+                self._has_sample.set()
+                return
+            remaining = _MIN_SAMPLE_INTERVAL_S - (time.monotonic() - start)
+            if remaining > 0:
+                self._stop_event.wait(remaining)
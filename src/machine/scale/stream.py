@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.logger_handler import LoggerHandler
+
+if TYPE_CHECKING:
+    from src.machine.scale.base import ScaleInterface
+
+_logger = LoggerHandler("ScaleStream")
+
+_MEDIAN_SAMPLES = 5
+"""Raw readings of the median filter, removes single spikes of the ADC."""
+_EMA_ALPHA = 0.3
+"""Weight of the newest median in the exponential moving average."""
+_STABLE_WINDOW_S = 0.6
+"""The reading is stable if the smoothed weight stayed within the spread for this long."""
+_STABLE_SPREAD_G = 1.0
+_BUSY_RETRY_S = 0.2
+"""Pause before the next try while someone else (e.g. a dispenser) uses the scale."""
+_ERROR_RETRY_S = 1.0
+_MIN_SAMPLE_INTERVAL_S = 0.005
+_STOP_TIMEOUT_S = 1.0
+
+ReadingCallback = Callable[["ScaleReading"], None]
+"""Callback signature: (reading) -> None"""
+
+
+@dataclass(frozen=True)
+class ScaleReading:
+    grams: float
+    """Median and EMA filtered weight relative to the last tare, rounded to 0.1 g."""
+    stable: bool
+    """The weight did not change noticeably over the last fraction of a second."""
+    paused: bool = False
+    """The scale is used by a preparation or calibration, grams is the last reading before."""
+
+
+class _Smoother:
+    """Median over the last raw readings, followed by an exponential moving average."""
+
+    def __init__(self) -> None:
+        self._raw: deque[float] = deque(maxlen=_MEDIAN_SAMPLES)
+        self._history: deque[tuple[float, float]] = deque()
+        self.value: float | None = None
+
+    def add(self, grams: float, timestamp: float) -> None:
+        self._raw.append(grams)
+        median = statistics.median(self._raw)
+        self.value = median if self.value is None else self.value + _EMA_ALPHA * (median - self.value)
+        self._history.append((timestamp, self.value))
+        while timestamp - self._history[0][0] > _STABLE_WINDOW_S:
+            self._history.popleft()
+
+    @property
+    def stable(self) -> bool:
+        if len(self._history) < _MEDIAN_SAMPLES:
+            return False
+        # only stable once the history covers (nearly) the full window
+        if self._history[-1][0] - self._history[0][0] < _STABLE_WINDOW_S / 2:
+            return False
+        values = [x for _, x in self._history]
+        return max(values) - min(values) <= _STABLE_SPREAD_G
+
+    def reset(self) -> None:
+        self._raw.clear()
+        self._history.clear()
+        self.value = None
+
+
+class ScaleStream:
+    """One shared acquisition loop reading the scale for any number of live viewers.
+
+    Viewers register a named callback and get the smoothed weight at most ``rate`` times
+    per second, only when it (or its stability) changed. The scale is read while at least
+    one callback is registered. Each read takes the bus lock of the scale without waiting,
+    so a running dispenser or calibration always has priority, the stream reports itself
+    as paused meanwhile. Callbacks run on the stream thread and should only hand the
+    reading over to their own thread or event loop.
+    """
+
+    def __init__(self, scale: ScaleInterface, rate: float) -> None:
+        self.scale = scale
+        self.rate = rate
+        self.latest: ScaleReading | None = None
+        self._callbacks: dict[str, ReadingCallback] = {}
+        self._lock = threading.Lock()
+        self._smoother = _Smoother()
+        self._generation = 0
+        """Bumped by each reset, readings taken before are dropped."""
+        self._smoothed_generation = 0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_callback(self, name: str, callback: ReadingCallback) -> None:
+        """Add a named callback, the first one starts the acquisition."""
+        with self._lock:
+            self._callbacks[name] = callback
+            if self._thread is None:
+                # each run gets its own event, so a stopping run never sees the event of the next one
+                self._stop_event = threading.Event()
+                # readings of a former run may be long outdated
+                self.reset()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop_event,), daemon=True, name="scale_stream"
+                )
+                self._thread.start()
+
+    def remove_callback(self, name: str) -> None:
+        """Remove the callback, the acquisition stops with the last one.
+
+        Does not wait for the thread, it ends after its current read.
+        """
+        with self._lock:
+            self._callbacks.pop(name, None)
+            if not self._callbacks:
+                self._thread = None
+                self._stop_event.set()
+
+    def reset(self) -> None:
+        """Drop the filter state and the latest reading, e.g. after a tare the old readings are meaningless."""
+        self._generation += 1
+        self.latest = None
+
+    def stop(self) -> None:
+        """Stop the acquisition and wait for the thread, the callbacks are kept."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            self._stop_event.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=_STOP_TIMEOUT_S)
+
+    def poll(self) -> ScaleReading:
+        """Take one reading if the scale is free and return the new smoothed reading.
+
+        Returns a paused reading with the last weight if the scale is in use.
+        """
+        if self._smoothed_generation != self._generation:
+            self._smoothed_generation = self._generation
+            self._smoother.reset()
+        if not self.scale.bus_lock.acquire(blocking=False):
+            last = self._smoother.value or 0.0
+            return ScaleReading(grams=round(last, 1), stable=False, paused=True)
+        try:
+            grams = self.scale.read_grams()
+        finally:
+            self.scale.bus_lock.release()
+        self._smoother.add(grams, time.monotonic())
+        return ScaleReading(grams=round(self._smoother.value or 0.0, 1), stable=self._smoother.stable)
+
+    def _publish(self, reading: ScaleReading) -> None:
+        self.latest = reading
+        with self._lock:
+            callbacks = list(self._callbacks.values())
+        for callback in callbacks:
+            try:
+                callback(reading)
+            except Exception as e:
+                _logger.error(f"Error in scale stream callback: {e}")
+
+    def _run(self, stop: threading.Event) -> None:
+        next_publish = 0.0
+        while not stop.is_set():
+            start = time.monotonic()
+            generation = self._generation
+            try:
+                reading = self.poll()
+            except Exception as e:
+                _logger.error(f"Could not read the scale: {e}")
+                stop.wait(_ERROR_RETRY_S)
+                continue
+            now = time.monotonic()
+            if generation != self._generation:
+                # reset while reading, e.g. tared right after this read
+                continue
+            if reading != self.latest and now >= next_publish:
+                self._publish(reading)
+                next_publish = now + 1 / self.rate
+            if reading.paused:
+                stop.wait(_BUSY_RETRY_S)
+                continue
+            # drivers returning without waiting for the ADC must not spin the thread
+            remaining = _MIN_SAMPLE_INTERVAL_S - (now - start)
+            if remaining > 0:
+                stop.wait(remaining)
@@ -65,9 +65,16 @@ def _try_execute_db_commands(commands: list[str]) -> None:
 
 
 def _create_db_backup() -> None:
-    """Create a backup of the current database."""
+    """Create a backup of the current database.
+
+    Uses the SQLite backup API, a file copy would miss the commits still in the write ahead log.
+    """
     backup_path = BACKUP_FOLDER / f"database_backup_{datetime.now().strftime('%Y%m%d%H%M%S')}.db"
-    shutil.copy(DATABASE_PATH, backup_path)
+    with (
+        contextlib.closing(sqlite3.connect(DATABASE_PATH)) as connection,
+        contextlib.closing(sqlite3.connect(backup_path)) as backup_connection,
+    ):
+        connection.backup(backup_connection)
     _logger.log_event("INFO", f"Created backup of database at {backup_path}")
 
 
@@ -1,8 +1,9 @@
 import copy
 import functools
 import math
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum, StrEnum
+from operator import attrgetter
 from typing import Any
 
 from pydantic import BaseModel, computed_field, field_validator
@@ -26,6 +27,7 @@ class PrepareResult(Enum):
     WAITING_FOR_PAYMENT = "WAITING_FOR_PAYMENT"
     NO_WAITER_LOGGED_IN = "NO_WAITER_LOGGED_IN"
     NO_GLASS_DETECTED = "NO_GLASS_DETECTED"
+    QUEUED = "QUEUED"
 
 
 class EventType(StrEnum):
@@ -76,12 +78,18 @@ class CocktailStatus:
     message: str | None = None
     status: PrepareResult = PrepareResult.FINISHED
     hand_adds: list[HandAddMeasure] = field(default_factory=list)
+    predicted_finish: float | None = None
+    """Unix timestamp when the running preparation is planned to finish."""
 
 
 @functools.total_ordering
-@pydantic_dataclass
+@dataclass(slots=True)
 class Ingredient:
-    """Class to represent one ingredient."""
+    """Class to represent one ingredient.
+
+    Plain slotted dataclass without validation, it is built for every recipe of the catalog.
+    All fields are immutable values, so ``copy.copy`` gives an independent copy.
+    """
 
     id: int
     name: str
@@ -103,6 +111,10 @@ class Ingredient:
         # limit fill level to [0, bottle_volume]
         self.fill_level = max(0, min(self.fill_level, self.bottle_volume))
 
+    def __copy__(self) -> "Ingredient":
+        # passing the values to the constructor is several times faster than the generic slot copy
+        return Ingredient(*_ingredient_values(self))
+
     def __lt__(self, other: "Ingredient") -> bool:
         """Sort machine first, then highest amount and longest name."""
         self_compare = (int(self.bottle is None), -self.amount, -len(self.name))
@@ -110,6 +122,32 @@ class Ingredient:
         return self_compare < other_compare
 
 
+_ingredient_values = attrgetter(*(x.name for x in fields(Ingredient)))
+
+
+@dataclass
+class PourRecord:
+    """Outcome of one scale-based pour, used to learn the overshoot of the slot."""
+
+    slot: int
+    ingredient_id: int | None
+    target: float
+    cutoff: float
+    """Weight when the pump was stopped."""
+    settled: float
+    """Weight after all in-flight liquid landed."""
+    lead: float | None
+    """Stop lead in seconds the predictor used, None if it never armed."""
+    gradient: float | None
+    """Flow in ml/s at the cutoff, None if it could not be measured."""
+    pump_speed: int
+
+    @property
+    def in_flight(self) -> float:
+        """Liquid that still landed after the pump was stopped."""
+        return self.settled - self.cutoff
+
+
 @dataclass
 class PreparationResult:
     """Result of a cocktail/ingredient preparation run."""
@@ -131,9 +169,14 @@ class PreparationResult:
         return round(sum(i.consumption for i in self.ingredients))
 
 
-@pydantic_dataclass
+@dataclass(slots=True)
 class Cocktail:
-    """Class to represent one cocktail."""
+    """Class to represent one cocktail.
+
+    Plain slotted dataclass without validation, the API maps it into its own pydantic models.
+    The adjusted (scaled) ingredients are only copied from the recipe when they are accessed
+    or scaled, read-only checks like ``is_possible`` use the recipe directly until then.
+    """
 
     id: int
     name: str
@@ -147,15 +190,38 @@ class Cocktail:
     only_virgin: bool = False
     adjusted_alcohol: float = 0
     adjusted_amount: int = 0
-    adjusted_ingredients: list[Ingredient] = field(default_factory=list, init=False)
+    _adjusted_ingredients: list[Ingredient] | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.ingredients.sort()
-        # shallow copy will keep same Ingredients as references
-        self.adjusted_ingredients = copy.deepcopy(self.ingredients)
         self.adjusted_alcohol = self.alcohol
         self.adjusted_amount = self.amount
 
+    @property
+    def adjusted_ingredients(self) -> list[Ingredient]:
+        """Ingredients scaled to the adjusted amount and alcohol, independent of the recipe ingredients."""
+        if self._adjusted_ingredients is None:
+            self._adjusted_ingredients = [copy.copy(x) for x in self.ingredients]
+        return self._adjusted_ingredients
+
+    @adjusted_ingredients.setter
+    def adjusted_ingredients(self, ingredients: list[Ingredient]) -> None:
+        self._adjusted_ingredients = ingredients
+
+    def _adjusted_view(self) -> list[Ingredient]:
+        """Return the adjusted ingredients for read-only checks, the unscaled recipe is not copied for them."""
+        if self._adjusted_ingredients is None:
+            return self.ingredients
+        return self._adjusted_ingredients
+
+    def copy(self) -> "Cocktail":
+        """Return an independent copy, much cheaper than ``copy.deepcopy``."""
+        new_cocktail = copy.copy(self)
+        new_cocktail.ingredients = [copy.copy(x) for x in self.ingredients]
+        if self._adjusted_ingredients is not None:
+            new_cocktail._adjusted_ingredients = [copy.copy(x) for x in self._adjusted_ingredients]
+        return new_cocktail
+
     @property
     def display_name(self) -> str:
         """Display name for the cocktail, including virgin tag if applicable."""
@@ -252,23 +318,18 @@ class Cocktail:
         hand_id = {x.id for x in hand_adds}
         return not hand_id - set(hand_available)
 
+    def _split_adds(self, virgin: bool) -> tuple[list[Ingredient], list[Ingredient]]:
+        """Return the machine and hand adds (only non-alcoholic ones for virgin) for read-only checks."""
+        used = [x for x in self._adjusted_view() if x.amount > 0 and not (virgin and x.alcohol)]
+        return [x for x in used if x.bottle is not None], [x for x in used if x.bottle is None]
+
     def _is_normal_cocktail_possible(self, hand_available: list[int], max_hand_ingredients: int) -> bool:
         """Check if the normal (alcoholic) cocktail is possible."""
-        return self._has_all_ingredients(
-            hand_available,
-            max_hand_ingredients,
-            self.machineadds,
-            self.handadds,
-        )
+        return self._has_all_ingredients(hand_available, max_hand_ingredients, *self._split_adds(virgin=False))
 
     def _is_virgin_cocktail_possible(self, hand_available: list[int], max_hand_ingredients: int) -> bool:
         """Check if the virgin cocktail is possible."""
-        return self._has_all_ingredients(
-            hand_available,
-            max_hand_ingredients,
-            self.virgin_machineadds,
-            self.virgin_handadds,
-        )
+        return self._has_all_ingredients(hand_available, max_hand_ingredients, *self._split_adds(virgin=True))
 
     def enough_fill_level(self) -> Ingredient | None:
         """Check if the needed volume is there.
@@ -276,7 +337,8 @@ class Cocktail:
         Accepts if there is at least 80% of needed volume
         to be more efficient with the remainder volume in the bottle.
         """
-        for ing in self.machineadds:
+        machine_adds, _ = self._split_adds(virgin=False)
+        for ing in machine_adds:
             if ing.amount * 0.8 > ing.fill_level:
                 return ing
         return None
@@ -289,7 +351,7 @@ class Cocktail:
         scaled_amount = 0
         concentration = 0
         # reset adjusted to recipe values
-        self.adjusted_ingredients = copy.deepcopy(self.ingredients)
+        self.adjusted_ingredients = [copy.copy(x) for x in self.ingredients]
         # scale alcoholic ingredients with factor
         for ing in self.adjusted_ingredients:
             factor = alcohol_factor if bool(ing.alcohol) else 1
@@ -366,6 +428,74 @@ class ResourceInfo:
     start_time: str
 
 
+@pydantic_dataclass
+class OutboxDestinationMetrics:
+    """State of the outbox for one destination (team api or webhook)."""
+
+    pending: int
+    sent: int
+    dropped: int
+    """Items removed without delivery, rejected by the destination or by the retention limits."""
+    failures: int
+    """Consecutive failed attempts, reset with the next delivered item."""
+    retry_in: float
+    """Seconds until the next attempt, 0 if not backing off."""
+    last_error: str | None = None
+
+
+@pydantic_dataclass
+class OutboxMetrics:
+    running: bool
+    destinations: dict[str, OutboxDestinationMetrics]
+
+
+@pydantic_dataclass
+class RouteLatencyMetrics:
+    """Response times of one API route, as a histogram in milliseconds."""
+
+    method: str
+    route: str
+    count: int
+    total_ms: float
+    max_ms: float
+    buckets: dict[str, int]
+    """Requests per upper bucket bound in ms (not cumulative), the last bucket is "inf"."""
+
+
+@pydantic_dataclass
+class WorkerPoolMetrics:
+    """Load of one thread pool running the blocking work of the API."""
+
+    name: str
+    max_workers: int
+    running: int
+    queued: int
+    completed: int
+
+
+@pydantic_dataclass
+class ApiMetrics:
+    routes: list[RouteLatencyMetrics]
+    pools: list[WorkerPoolMetrics]
+
+
+@pydantic_dataclass
+class DatabaseStats:
+    """Active tuning and size of the SQLite database."""
+
+    profile: str
+    journal_mode: str
+    synchronous: str
+    mmap_size: int
+    page_size: int
+    page_count: int
+    freelist_count: int
+    """Unused pages, they are reused before the file grows."""
+    database_bytes: int
+    wal_bytes: int
+    """Size of the write ahead log, it is reset by a truncating checkpoint."""
+
+
 @pydantic_dataclass
 class Event:
     """Class representing a tracked system event."""
@@ -1,36 +1,129 @@
-import copy
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
 
 from src.config.config_manager import CONFIG as cfg
+from src.database_commander import DatabaseCommander
 from src.models import Cocktail
 from src.service.nfc_payment_service import User
 
+RECIPE_VOLUME = 0
+"""Volume key of the prices at the own recipe amount of each cocktail."""
+
+
+def _to_mask(cocktail_ids: Iterable[int]) -> int:
+    mask = 0
+    for cocktail_id in cocktail_ids:
+        mask |= 1 << cocktail_id
+    return mask
+
+
+class _PriceLadder:
+    """Cocktails sorted by price, with the bitset of the n cheapest ones for each n.
+
+    The affordable cocktails for a balance are a binary search instead of a price comparison per cocktail.
+    """
+
+    def __init__(self, prices: dict[int, float]) -> None:
+        ordered = sorted(prices.items(), key=lambda x: x[1])
+        self.prices = [price for _, price in ordered]
+        self.masks = [0]
+        for cocktail_id, _ in ordered:
+            self.masks.append(self.masks[-1] | 1 << cocktail_id)
+
+    def affordable(self, balance: float) -> int:
+        """Return the bitset of all cocktails with a price up to the balance."""
+        return self.masks[bisect_right(self.prices, balance)]
+
+
+@dataclass(frozen=True)
+class UserSelection:
+    """Bitsets over the cocktail ids, which cocktails a user may order and which only as virgin."""
+
+    allowed: int
+    only_virgin: int
+
+    def is_allowed(self, cocktail_id: int) -> bool:
+        return bool(self.allowed >> cocktail_id & 1)
+
+    def is_only_virgin(self, cocktail_id: int) -> bool:
+        return bool(self.only_virgin >> cocktail_id & 1)
+
+
+def _price_settings() -> Hashable:
+    return (
+        tuple(cfg.MAKER_PREPARE_VOLUME),
+        cfg.MAKER_USE_RECIPE_VOLUME,
+        cfg.PAYMENT_PRICE_ROUNDING,
+        cfg.PAYMENT_VIRGIN_MULTIPLIER,
+    )
+
+
+class PriceIndex:
+    """Prices of the cocktails for the payment users, normal and virgin, at each prepare volume.
+
+    Users are charged at the smallest prepare volume (or the recipe volume, if configured),
+    users without alcohol permission only get cocktails with a virgin version at the virgin price.
+    Built once per catalog and config, the selection of a user then only needs two binary searches.
+    """
+
+    def __init__(self, cocktails: Iterable[Cocktail]) -> None:
+        self.settings = _price_settings()
+        cocktails = list(cocktails)
+        rounding = cfg.PAYMENT_PRICE_ROUNDING
+        virgin_multiplier = cfg.PAYMENT_VIRGIN_MULTIPLIER / 100
+        self.volumes = sorted(set(cfg.MAKER_PREPARE_VOLUME))
+        self.charged_volume = RECIPE_VOLUME
+        if not cfg.MAKER_USE_RECIPE_VOLUME and self.volumes:
+            self.charged_volume = self.volumes[0]
+        self.normal: dict[int, dict[int, float]] = {}
+        self.virgin: dict[int, dict[int, float]] = {}
+        for volume in [RECIPE_VOLUME, *self.volumes]:
+            self.normal[volume] = {x.id: x.current_price(rounding, volume or x.amount) for x in cocktails}
+            self.virgin[volume] = {
+                x.id: x.current_price(rounding, volume or x.amount, price_multiplier=virgin_multiplier)
+                for x in cocktails
+                if x.virgin_available
+            }
+        self._normal_ladder = _PriceLadder(self.normal[self.charged_volume])
+        self._virgin_ladder = _PriceLadder(self.virgin[self.charged_volume])
+        self._virgin_mask = _to_mask(self.virgin[self.charged_volume])
+
+    def price(self, cocktail_id: int, volume: int = RECIPE_VOLUME, virgin: bool = False) -> float | None:
+        """Return the price of the cocktail at a prepare volume, None if not indexed."""
+        prices = self.virgin if virgin else self.normal
+        return prices.get(volume, {}).get(cocktail_id)
+
+    def select(self, user: User) -> UserSelection:
+        """Return which cocktails the user can afford and may order."""
+        if user.is_adult:
+            return UserSelection(allowed=self._normal_ladder.affordable(user.balance), only_virgin=0)
+        return UserSelection(allowed=self._virgin_ladder.affordable(user.balance), only_virgin=self._virgin_mask)
+
+
+def get_price_index() -> PriceIndex:
+    """Return the price index of the whole catalog, rebuilt when the catalog or the payment config changes."""
+    return DatabaseCommander().get_cocktail_index(("price_index", _price_settings()), PriceIndex)
+
+
+def filter_cocktails_by_user(
+    user: User | None, cocktails: list[Cocktail], index: PriceIndex | None = None
+) -> list[Cocktail]:
+    """Set the allowed and only virgin flag of the cocktails for the user, the cocktails are changed in place.
 
-def filter_cocktails_by_user(user: User | None, cocktails: list[Cocktail]) -> list[Cocktail]:
+    Uses the given price index (e.g. the one of the catalog), otherwise the prices of the given cocktails.
+    """
     # if operator wants to have implicit filtering, they should use lock screen
     # since this will enforce a user at cocktail view
     if user is None:
         return cocktails
-    filtered = []
-    lowest_amount = min(cfg.MAKER_PREPARE_VOLUME) if cfg.MAKER_PREPARE_VOLUME else None
+    if index is None or index.settings != _price_settings():
+        index = PriceIndex(cocktails)
+    selection = index.select(user)
     for cocktail in cocktails:
-        cocktail_amount = cocktail.amount
-        if not cfg.MAKER_USE_RECIPE_VOLUME and lowest_amount is not None:
-            cocktail_amount = lowest_amount
-        # if user not allowed alcohol, only disallow the cocktail if it's virgin available, set only virgin flag
-        # otherwise disallow the cocktail
-        # for other users, just use the regular price calculation
-        cocktail.is_allowed = True
-        if not user.is_adult and not cocktail.virgin_available:
-            cocktail.is_allowed = False
-            filtered.append(copy.deepcopy(cocktail))
-            continue
-        price = cocktail.current_price(cfg.PAYMENT_PRICE_ROUNDING, cocktail_amount)
-        if not user.is_adult and cocktail.virgin_available:
+        cocktail.is_allowed = selection.is_allowed(cocktail.id)
+        if selection.is_only_virgin(cocktail.id):
             cocktail.only_virgin = True
-            price = cocktail.current_price(
-                cfg.PAYMENT_PRICE_ROUNDING, cocktail_amount, price_multiplier=cfg.PAYMENT_VIRGIN_MULTIPLIER / 100
-            )
-        if user.balance < price:
-            cocktail.is_allowed = False
-        filtered.append(copy.deepcopy(cocktail))
-    return filtered
+    return cocktails
@@ -8,6 +8,7 @@ from src.api.api import run_api
 from src.config.config_manager import CONFIG as cfg
 from src.config.config_manager import shared, show_start_message, version_callback
 from src.config.errors import ConfigError
+from src.database_commander import start_database_maintenance
 from src.filepath import CUSTOM_CONFIG_FILE
 from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
@@ -17,6 +18,7 @@ from src.programs.cocktailberry import run_cocktailberry
 from src.programs.common_cli import register_common_commands
 from src.programs.config_window import run_config_window
 from src.resource_stats import start_resource_tracker
+from src.service_handler import SERVICE_HANDLER
 from src.utils import generate_custom_style_file, time_print
 
 _logger = LoggerHandler("cocktailberry")
@@ -43,6 +45,7 @@ def main(
     if not quiet:
         show_start_message(displayed_name)
     start_resource_tracker()
+    start_database_maintenance()
     initialize_addon_configs()
     # Load the config file and check for errors, update the config (sync new values if not present)
     try:
@@ -62,6 +65,7 @@ def main(
     mc = MachineController()
     mc.init_machine()
     ADDONS.setup_addons()
+    SERVICE_HANDLER.outbox.start()
     run_cocktailberry()
 
 
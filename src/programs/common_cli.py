@@ -79,6 +79,7 @@ def register_common_commands(cli: typer.Typer) -> None:  # noqa: C901, PLR0915
 
         If the units are not in ml, please provide the conversion factor into ml.
         The file should contain the cocktail name, followed by ingredient data (amount, name).
+        JSON, JSON lines and CSV files are recognized by their file ending.
         For further information regarding the file structure,
         please see https://docs.cocktailberry.org/commands/#importing-recipes-from-file.
         """
@@ -1,13 +1,16 @@
+import csv
+import json
 import re
+import time
 from collections import Counter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import NoReturn
+from typing import Any, NoReturn, TextIO
 
 import typer
 
-from src.database_commander import DB_COMMANDER
-from src.models import Ingredient
+from src.database_commander import DB_COMMANDER, DatabaseTransactionError, RecipeImport
 
 
 @dataclass
@@ -29,14 +32,16 @@ class _RecipeInformation:
 
 
 def importer(file_path: Path, factor: float = 1.0, no_unit: bool = False, sep: str = "\n") -> None:
-    """Import the recipe data from the file into the database."""
+    """Import the recipe data from the file into the database.
+
+    The format is chosen by the file suffix: .json, .jsonl/.ndjson, .csv or plain text otherwise.
+    """
     _check_file(file_path)
     print(f"Loading data from: {file_path.absolute()}\nUsing factor: {factor}, data got no unit: {no_unit}\n")
-    recipe_text = file_path.read_text()
-    recipes = _parse_recipe_text(recipe_text, factor, no_unit, sep)
+    recipes = _read_recipes(file_path, factor, no_unit, sep)
     distinct_ingredients = _data_inspection(recipes)
-    _insert_not_existing_ingredients(distinct_ingredients)
-    _insert_recipes(recipes)
+    new_ingredients = _confirm_not_existing_ingredients(distinct_ingredients)
+    _insert_recipes(recipes, new_ingredients)
 
 
 def _check_file(file_path: Path) -> None:
@@ -47,12 +52,25 @@ def _check_file(file_path: Path) -> None:
         _abort("ERROR: The path does not lead to a file!")
 
 
-def _parse_recipe_text(
-    recipe_text: str, factor: float, no_unit: bool = False, sep: str = "\n"
-) -> list[_RecipeInformation]:
-    """Extract the recipe information out of the given text."""
-    # split by newline, remove empty lines
-    line_list = [x.strip() for x in recipe_text.split(sep) if x.strip()]
+def _read_recipes(file_path: Path, factor: float, no_unit: bool = False, sep: str = "\n") -> list[_RecipeInformation]:
+    """Parse the recipes of the file, reading it incrementally where the format allows it."""
+    suffix = file_path.suffix.lower()
+    with file_path.open(encoding="utf-8", newline="" if suffix == ".csv" else None) as file:
+        if suffix in (".jsonl", ".ndjson"):
+            return list(_parse_recipe_json_lines(file, factor))
+        if suffix == ".json":
+            return list(_parse_recipe_json(file, factor))
+        if suffix == ".csv":
+            return list(_parse_recipe_csv(file, factor))
+        # the separator may be anything, only newline separated text can be read line by line
+        lines: Iterable[str] = file if sep == "\n" else file.read().split(sep)
+        return _parse_recipe_text(lines, factor, no_unit)
+
+
+def _parse_recipe_text(lines: Iterable[str], factor: float, no_unit: bool = False) -> list[_RecipeInformation]:
+    """Extract the recipe information out of the given text lines."""
+    # remove empty lines
+    line_list = (x.strip() for x in lines if x.strip())
     # Define regex for recipes and ingredients
     # Usually a recipe name should contain one or more words
     # A ingredient line should contain an amount, the unit and a name consisting of one or more words
@@ -80,6 +98,69 @@ def _parse_recipe_text(
     return recipe_data
 
 
+def _recipe_from_json(data: Any, factor: float, position: str) -> _RecipeInformation:
+    """Build the recipe out of one json object: {"name": ..., "ingredients": [{"name": ..., "amount": ...}]}."""
+    try:
+        recipe = _RecipeInformation(str(data["name"]).strip())
+        for ingredient in data["ingredients"]:
+            volume = int(factor * float(ingredient["amount"]))
+            recipe.ingredients.append(_IngredientInformation(str(ingredient["name"]).strip(), volume))
+    except (KeyError, TypeError, ValueError) as e:
+        _abort(f"Invalid recipe at {position}: {e!r}")
+    return recipe
+
+
+def _parse_recipe_json_lines(file: TextIO, factor: float) -> Iterator[_RecipeInformation]:
+    """Yield the recipes of a json lines file, one recipe object per line."""
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            _abort(f"Invalid json in line {number}: {e}")
+        yield _recipe_from_json(data, factor, f"line {number}")
+
+
+def _parse_recipe_json(file: TextIO, factor: float) -> Iterator[_RecipeInformation]:
+    """Yield the recipes of a json file containing a list of recipe objects."""
+    try:
+        data = json.load(file)
+    except json.JSONDecodeError as e:
+        _abort(f"Invalid json: {e}")
+    if not isinstance(data, list):
+        _abort("The json file needs to contain a list of recipes")
+    for number, recipe in enumerate(data, start=1):
+        yield _recipe_from_json(recipe, factor, f"recipe {number}")
+
+
+def _parse_recipe_csv(file: TextIO, factor: float) -> Iterator[_RecipeInformation]:
+    """Yield the recipes of a csv file with the columns recipe, ingredient and amount.
+
+    The rows of one recipe need to follow each other, a header row is skipped.
+    """
+    recipe: _RecipeInformation | None = None
+    for number, row in enumerate(csv.reader(file), start=1):
+        if not any(x.strip() for x in row):
+            continue
+        if len(row) != 3:  # noqa: PLR2004
+            _abort(f"Expected the columns recipe, ingredient and amount in line {number}")
+        recipe_name, ingredient_name, amount = (x.strip() for x in row)
+        try:
+            volume = int(factor * float(amount))
+        except ValueError:
+            if number == 1:
+                continue
+            _abort(f"Invalid amount {amount!r} in line {number}")
+        if recipe is None or recipe.name != recipe_name:
+            if recipe is not None:
+                yield recipe
+            recipe = _RecipeInformation(recipe_name)
+        recipe.ingredients.append(_IngredientInformation(ingredient_name, volume))
+    if recipe is not None:
+        yield recipe
+
+
 def _data_inspection(recipes: list[_RecipeInformation]) -> list[str]:
     """Print some information of the data.
 
@@ -148,49 +229,45 @@ def _check_intersection(recipes: list[_RecipeInformation], unique_recipes: set[s
         print([r.name for r in recipes], "\n")
 
 
-def _insert_not_existing_ingredients(ingredients: list[str]) -> None:
-    """Check the given ingredients with the DB and insert missing ones."""
+def _confirm_not_existing_ingredients(ingredients: list[str]) -> list[str]:
+    """Check the given ingredients with the DB and let the user confirm the missing ones."""
     existing_ingredients = DB_COMMANDER.get_all_ingredients()
     existing_names = [x.name for x in existing_ingredients]
-    not_existing_names = list(set(ingredients).difference(set(existing_names)))
+    not_existing_names = sorted(set(ingredients).difference(set(existing_names)))
     typer.echo(typer.style("Ingredients, that will be added to the DB:", fg=typer.colors.GREEN, bold=True))
-    print(sorted(not_existing_names), "\n")
+    print(not_existing_names, "\n")
     print("Please note that a default alcohol of 0, bottle volume of 1000 ml and no handadd will be used.")
     print("This can be changed later over the CocktailBerry program")
     typer.confirm("Does everything looks all right? If so, continue?", abort=True)
-    print("Inserting ingredients:", end=" ")
-    for ingredient in not_existing_names:
-        print(ingredient, end=", ")
-        DB_COMMANDER.insert_new_ingredient(ingredient, 0, 1000, False, 100, 0, "ml")
-    print("")
+    return not_existing_names
 
 
-def _insert_recipes(recipes: list[_RecipeInformation]) -> None:
-    """Use the given recipe information to insert the data into the DB.
+def _insert_recipes(recipes: list[_RecipeInformation], new_ingredients: list[str]) -> None:
+    """Insert the new ingredients and the recipes into the DB.
 
-    Gets missing ingredient data from the database.
-    Only using handadd at recipe data if ingredient is handadd only.
+    Everything is inserted within one transaction, so a failing import leaves the DB untouched.
     """
-    # first get all ingredient data and map them for later fast access to a dict
-    ingredients = DB_COMMANDER.get_all_ingredients()
-    ingredient_mapping: dict[str, Ingredient] = {}
-    for ingredient in ingredients:
-        ingredient_mapping[ingredient.name] = ingredient
-    print("Inserting recipe:", end=" ")
-    for rec in recipes:
-        print(rec.name, end=", ")
-        volume = int(sum(x.volume for x in rec.ingredients))
-        ingredient_data = [(ingredient_mapping[i.name].id, i.volume, 1) for i in rec.ingredients]
-        DB_COMMANDER.insert_new_recipe(
-            name=rec.name,
-            alcohol_level=0,
-            volume=volume,
-            price=0.0,
-            enabled=True,
-            virgin=False,
-            ingredient_data=ingredient_data,
+    recipe_imports = [RecipeImport(r.name, [(i.name, i.volume) for i in r.ingredients]) for r in recipes]
+    total = len(recipe_imports)
+    start = time.perf_counter()
+
+    def report(inserted: int) -> None:
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        print(f"Inserted {inserted}/{total} recipes ({inserted / elapsed:.0f} recipes/s)")
+
+    print(f"Inserting {len(new_ingredients)} ingredients and {total} recipes")
+    try:
+        DB_COMMANDER.insert_recipes_bulk(recipe_imports, new_ingredients, progress=report)
+    except DatabaseTransactionError as e:
+        _abort(f"Nothing was imported: {e}")
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    typer.echo(
+        typer.style(
+            f"Import finished! {total} recipes in {elapsed:.2f} s ({total / elapsed:.0f} recipes/s)",
+            fg=typer.colors.GREEN,
+            bold=True,
         )
-    print("\nImport finished!")
+    )
 
 
 def _abort(msg: str) -> NoReturn:
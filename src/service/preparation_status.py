@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable
+from threading import Lock
+from typing import Self
+
+from src.config.config_manager import shared
+from src.logger_handler import LoggerHandler
+from src.models import CocktailStatus
+
+_logger = LoggerHandler("PreparationStatusService")
+
+StatusCallback = Callable[[CocktailStatus], None]
+"""Callback signature: (status_snapshot) -> None"""
+
+
+class PreparationStatusService:
+    """Singleton service pushing changes of ``shared.cocktail_status`` to named callbacks.
+
+    Everyone changing the preparation status calls ``notify`` afterwards, so listeners
+    (e.g. the status websocket) do not need to poll. Callbacks run on the notifying thread
+    (often a dispenser or scheduler thread), get an independent snapshot of the status,
+    and should only hand the snapshot over to their own thread or event loop.
+    """
+
+    _instance: Self | None = None
+
+    def __new__(cls) -> Self:
+        if not isinstance(cls._instance, cls):
+            cls._instance = object.__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._callbacks: dict[str, StatusCallback] = {}
+        self._lock = Lock()
+        self._last_state: tuple | None = None
+        self._initialized = True
+
+    def add_callback(self, name: str, callback: StatusCallback) -> None:
+        """Add a named callback invoked when the preparation status changes."""
+        with self._lock:
+            if name in self._callbacks:
+                return
+            _logger.debug(f"Adding callback: {name}")
+            self._callbacks[name] = callback
+
+    def remove_callback(self, name: str) -> None:
+        """Remove a specific callback by name."""
+        _logger.debug(f"Removing callback: {name}")
+        with self._lock:
+            self._callbacks.pop(name, None)
+
+    def notify(self) -> None:
+        """Push the current status to all callbacks, if it changed since the last notification."""
+        status = shared.cocktail_status
+        state = (status.progress, status.message, status.status, status.predicted_finish, len(status.hand_adds))
+        with self._lock:
+            if state == self._last_state:
+                return
+            self._last_state = state
+            callbacks = list(self._callbacks.values())
+        if not callbacks:
+            return
+        snapshot = copy.copy(status)
+        snapshot.hand_adds = list(status.hand_adds)
+        for callback in callbacks:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                _logger.error(f"Error in preparation status callback: {e}")
+
+
+def notify_preparation_status() -> None:
+    """Notify all listeners that ``shared.cocktail_status`` was changed."""
+    PreparationStatusService().notify()
@@ -1,14 +1,20 @@
+import datetime as dt
 import json
 import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.config.config_manager import CONFIG as cfg
 from src.database_commander import DatabaseCommander
 from src.logger_handler import LogFiles, LoggerHandler
-from src.models import Cocktail
+from src.models import Cocktail, OutboxDestinationMetrics, OutboxMetrics
 
 
 class PostType(Enum):
@@ -19,6 +25,183 @@ class PostType(Enum):
 
 logger = LoggerHandler("microservice", LogFiles.SERVICE)
 
+_OUTBOX_DESTINATIONS = (PostType.TEAMDATA, PostType.COCKTAIL)
+_OUTBOX_BATCH_SIZE = 50
+"""Items loaded and deleted together, a full batch is followed by the next one right away."""
+_OUTBOX_BACKOFF_START = 5.0
+_OUTBOX_BACKOFF_MAX = 600.0
+"""Seconds to wait after a failed post, doubled with each failure up to the maximum."""
+_OUTBOX_IDLE_INTERVAL = 60.0
+_OUTBOX_MAX_ITEMS = 5000
+"""Items kept per destination, the oldest ones are dropped above it."""
+_OUTBOX_MAX_AGE = dt.timedelta(days=30)
+_RETRY_STATUS_CODES = (408, 429)
+"""Client errors worth a retry, other 4xx responses are dropped since they will not succeed later."""
+
+_HTTP_POOL_SIZE = 4
+
+
+@dataclass
+class _DestinationState:
+    sent: int = 0
+    dropped: int = 0
+    failures: int = 0
+    next_attempt: float = 0.0
+    last_error: str | None = None
+
+
+class ServiceOutbox:
+    """Durable outbox sending the team and webhook posts in the background.
+
+    Posts are saved to the database first, so they survive a missing connection and restarts.
+    A worker thread sends them in order with an exponential backoff per destination, so an offline
+    team api does not hold back the webhooks. Items are loaded and deleted in batches, but each one
+    is still posted on its own, the destinations only take single items. Old items are pruned to
+    bound the table.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[PostType, str], int | None],
+        db_commander: DatabaseCommander | None = None,
+        batch_size: int = _OUTBOX_BATCH_SIZE,
+        backoff_start: float = _OUTBOX_BACKOFF_START,
+        backoff_max: float = _OUTBOX_BACKOFF_MAX,
+        max_items: int = _OUTBOX_MAX_ITEMS,
+        max_age: dt.timedelta = _OUTBOX_MAX_AGE,
+    ) -> None:
+        """Create the outbox, send posts the payload and returns the status code or None if not reachable."""
+        self._send = send
+        self._db_commander = db_commander
+        self.batch_size = batch_size
+        self.backoff_start = backoff_start
+        self.backoff_max = backoff_max
+        self.max_items = max_items
+        self.max_age = max_age
+        self._states = {destination: _DestinationState() for destination in _OUTBOX_DESTINATIONS}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def dbc(self) -> DatabaseCommander:
+        if self._db_commander is None:
+            self._db_commander = DatabaseCommander()
+        return self._db_commander
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread, sending leftovers of earlier runs."""
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="service_outbox", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the worker thread, waiting items stay in the database."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def put(self, destination: PostType, payload: str) -> None:
+        """Save the payload for the destination and wake the worker."""
+        self.dbc.add_outbox_item(destination.value, payload)
+        self.start()
+        self._wakeup.set()
+
+    def metrics(self) -> OutboxMetrics:
+        """Return the pending items and the delivery state of each destination."""
+        pending = self.dbc.count_outbox_items()
+        now = time.monotonic()
+        with self._lock:
+            destinations = {
+                destination.value: OutboxDestinationMetrics(
+                    pending=pending.get(destination.value, 0),
+                    sent=state.sent,
+                    dropped=state.dropped,
+                    failures=state.failures,
+                    retry_in=round(max(state.next_attempt - now, 0.0), 1),
+                    last_error=state.last_error,
+                )
+                for destination, state in self._states.items()
+            }
+        return OutboxMetrics(running=self.running, destinations=destinations)
+
+    def flush(self) -> float:
+        """Send everything due, return the seconds until the next work is due."""
+        self._prune()
+        wait = _OUTBOX_IDLE_INTERVAL
+        for destination in _OUTBOX_DESTINATIONS:
+            wait = min(wait, self._flush_destination(destination))
+        return wait
+
+    def _run(self) -> None:
+        moved = self.dbc.move_failed_teamdata_to_outbox(PostType.TEAMDATA.value)
+        if moved:
+            logger.log_event("INFO", f"Moved {moved} failed {PostType.TEAMDATA.value} items to the outbox")
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                wait = self.flush()
+            except Exception as e:
+                logger.log_event("ERROR", f"Error in service outbox: {e}")
+                wait = self.backoff_start
+            self._wakeup.wait(wait)
+
+    def _prune(self) -> None:
+        for destination, removed in self.dbc.prune_outbox(self.max_items, self.max_age).items():
+            logger.log_event("WARNING", f"Dropped {removed} {destination} items from the outbox, retention exceeded")
+            with self._lock:
+                self._states[PostType(destination)].dropped += removed
+
+    def _flush_destination(self, destination: PostType) -> float:
+        """Send the next batch of the destination item by item, return the seconds until it needs attention again."""
+        state = self._states[destination]
+        remaining = state.next_attempt - time.monotonic()
+        if remaining > 0:
+            return remaining
+        items = self.dbc.get_outbox_items(destination.value, self.batch_size)
+        done: list[int] = []
+        delay: float | None = None
+        for item_id, payload in items:
+            try:
+                status = self._send(destination, payload)
+                error = None if status is None else f"Status {status}"
+            except Exception as e:
+                status, error = None, str(e)
+            if status is None or status >= 500 or status in _RETRY_STATUS_CODES:  # noqa: PLR2004
+                delay = self._register_failure(state, error or "Not reachable")
+                break
+            with self._lock:
+                state.failures = 0
+                if status >= 400:  # noqa: PLR2004
+                    state.dropped += 1
+                    logger.log_event("ERROR", f"Dropped {destination.value} item, rejected with status {status}")
+                else:
+                    state.sent += 1
+            done.append(item_id)
+        if done:
+            self.dbc.delete_outbox_items(done)
+        if delay is not None:
+            logger.log_event("WARNING", f"Could not send {destination.value}, next attempt in {delay:.0f} s")
+            return delay
+        return 0.0 if len(items) == self.batch_size else _OUTBOX_IDLE_INTERVAL
+
+    def _register_failure(self, state: _DestinationState, error: str) -> float:
+        with self._lock:
+            state.failures += 1
+            state.last_error = error
+            delay = min(self.backoff_start * 2 ** (state.failures - 1), self.backoff_max)
+            state.next_attempt = time.monotonic() + delay
+        return delay
+
 
 class ServiceHandler:
     """Class to handle all calls to the microservice within the docker."""
@@ -27,23 +210,23 @@ class ServiceHandler:
         super().__init__()
         self.base_url = cfg.MICROSERVICE_BASE_URL
         self.headers = {"content-type": "application/json"}
+        self.session = _new_session()
+        # the outbox thread gets its own session, sessions are not safe to share between threads
+        self._outbox_session = _new_session()
+        self.outbox = ServiceOutbox(self._send_outbox_item)
 
-    def post_cocktail_to_hook(self, cocktail: Cocktail, prepared_volume: int) -> dict:
-        """Post the given cocktail data to the microservice handling internet traffic to send to defined webhook."""
+    def queue_cocktail_to_hook(self, cocktail: Cocktail, prepared_volume: int) -> None:
+        """Save the cocktail data to the outbox, it is posted to the webhook in the background."""
         if not cfg.MICROSERVICE_ACTIVE:
-            return _service_disabled()
-        # Extracts the volume and name from the ingredient objects
-        ingredient_data = [{"name": i.name, "volume": i.amount} for i in cocktail.adjusted_ingredients]
-        data = {
-            "cocktailname": cocktail.display_name,
-            "volume": prepared_volume,
-            "machinename": cfg.MAKER_NAME,
-            "countrycode": cfg.UI_LANGUAGE,
-            "ingredients": ingredient_data,
-        }
-        payload = json.dumps(data)
-        endpoint = self._decide_debug_endpoint(f"{self.base_url}/hookhandler/cocktail")
-        return self._try_to_send(endpoint, PostType.COCKTAIL, payload=payload)
+            return
+        # build the payload now, the cocktail object may change until the post is sent
+        self.outbox.put(PostType.COCKTAIL, _cocktail_payload(cocktail, prepared_volume))
+
+    def queue_team_data(self, team_name: str, cocktail_volume: int, person: str | None = None) -> None:
+        """Save the team data to the outbox, it is posted to the team api in the background."""
+        if not cfg.TEAMS_ACTIVE:
+            return
+        self.outbox.put(PostType.TEAMDATA, _team_payload(team_name, cocktail_volume, person))
 
     def send_export_data(self, file_name: str, binary_file: Any, is_disabled: bool = True) -> dict:
         """Post the given file to the microservice handling internet traffic to send data to external source."""
@@ -61,17 +244,6 @@ class ServiceHandler:
             return _service_disabled()
         return self._try_to_send(endpoint, PostType.FILE, files=files)
 
-    def post_team_data(self, team_name: str, cocktail_volume: int, person: str | None = None) -> dict:
-        """Post the given team name to the team api if activated."""
-        if not cfg.TEAMS_ACTIVE:
-            return _team_disabled()
-        data = {"team": team_name, "volume": cocktail_volume}
-        if person is not None:
-            data["person"] = person
-        payload = json.dumps(data)
-        endpoint = self._decide_debug_endpoint(f"{cfg.TEAM_API_URL}/cocktail")
-        return self._try_to_send(endpoint, PostType.TEAMDATA, payload=payload)
-
     def get_team_data(self) -> dict[str, int]:
         """Get the current team data from the team api if activated."""
         if not cfg.TEAMS_ACTIVE:
@@ -80,7 +252,7 @@ class ServiceHandler:
         headers = {"content-type": "application/json"}
         payload = {"limit": 100, "hour_range": 24}
         try:
-            req = requests.get(endpoint, params=payload, headers=headers, timeout=2)
+            req = self.session.get(endpoint, params=payload, headers=headers, timeout=2)
             try:
                 return json.loads(req.text)
             except json.JSONDecodeError:
@@ -97,8 +269,24 @@ class ServiceHandler:
             return f"{self.base_url}/debug"
         return endpoint
 
+    def _outbox_endpoint(self, destination: PostType) -> str:
+        """Return the endpoint for the outbox destination, resolved on sending so config changes apply."""
+        if destination is PostType.TEAMDATA:
+            return self._decide_debug_endpoint(f"{cfg.TEAM_API_URL}/cocktail")
+        return self._decide_debug_endpoint(f"{self.base_url}/hookhandler/cocktail")
+
+    def _send_outbox_item(self, destination: PostType, payload: str) -> int | None:
+        """Send one outbox item, return the status code or None if not reachable."""
+        endpoint = self._outbox_endpoint(destination)
+        return self._try_to_send(endpoint, destination, payload=payload, session=self._outbox_session).get("status")
+
     def _try_to_send(
-        self, endpoint: str, post_type: PostType, payload: str | None = None, files: dict | None = None
+        self,
+        endpoint: str,
+        post_type: PostType,
+        payload: str | None = None,
+        files: dict | None = None,
+        session: requests.Session | None = None,
     ) -> dict:
         """Try to send the data to the given endpoint.
 
@@ -111,6 +299,7 @@ class ServiceHandler:
             post_type (PostType): Additional info for logger what was posted.
             payload (str, optional): JSON data for payload. Defaults to None.
             files (dict, optional): dict with key 'upload_file' + filename and binary data as tuple. Defaults to None.
+            session (requests.Session, optional): Session to post with. Defaults to the session of the callers.
 
         Raises:
         ------
@@ -121,15 +310,12 @@ class ServiceHandler:
             Dict: Status code and message, or empty if cannot reach service
 
         """
-        DBC = DatabaseCommander()
+        session = session or self.session
         try:
             if payload is not None:
-                req = requests.post(endpoint, data=payload, headers=self.headers, timeout=2)
-                # if successfully send to teams, see if there are other to send.
-                if post_type is PostType.TEAMDATA:
-                    self._check_failed_data()
+                req = session.post(endpoint, data=payload, headers=self.headers, timeout=2)
             elif files is not None:
-                req = requests.post(endpoint, files=files, timeout=2)
+                req = session.post(endpoint, files=files, timeout=2)
             else:
                 raise ValueError("Neither payload nor files given!")
             message = str(req.text).replace("\n", "")
@@ -140,39 +326,48 @@ class ServiceHandler:
             }
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
             self._log_connection_error(endpoint, post_type)
-            # only save failed team data for now
-            if post_type is PostType.TEAMDATA and payload is not None:
-                DBC.save_failed_teamdata(payload)
             return {}
 
     def _log_connection_error(self, endpoint: str, post_type: PostType) -> None:
         logger.log_event("ERROR", f"Could not connect to: '{endpoint}' for {post_type.value}")
 
-    def _check_failed_data(self) -> None:
-        """Get one failed teamdata and sends it."""
-        endpoint = f"{cfg.TEAM_API_URL}/cocktail"
-        DBC = DatabaseCommander()
-        failed_data = DBC.get_failed_teamdata()
-        if failed_data is not None:
-            msg_id, payload = failed_data
-            # Delete the old thing before recursion hell comes live
-            DBC.delete_failed_teamdata(msg_id)
-            self._try_to_send(endpoint, PostType.TEAMDATA, payload)
 
+def _new_session() -> requests.Session:
+    """Return a session keeping the connections alive, a backlog is sent over a few connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-def _service_disabled() -> dict:
-    """Return that microservice is disabled."""
-    return {
-        "status": 503,
-        "message": "Microservice disabled",
+
+def _cocktail_payload(cocktail: Cocktail, prepared_volume: int) -> str:
+    """Build the webhook payload of the prepared cocktail."""
+    # Extracts the volume and name from the ingredient objects
+    ingredient_data = [{"name": i.name, "volume": i.amount} for i in cocktail.adjusted_ingredients]
+    data = {
+        "cocktailname": cocktail.display_name,
+        "volume": prepared_volume,
+        "machinename": cfg.MAKER_NAME,
+        "countrycode": cfg.UI_LANGUAGE,
+        "ingredients": ingredient_data,
     }
+    return json.dumps(data)
 
 
-def _team_disabled() -> dict:
-    """Return that teams is disabled."""
+def _team_payload(team_name: str, cocktail_volume: int, person: str | None = None) -> str:
+    """Build the team api payload of the prepared cocktail."""
+    data: dict[str, Any] = {"team": team_name, "volume": cocktail_volume}
+    if person is not None:
+        data["person"] = person
+    return json.dumps(data)
+
+
+def _service_disabled() -> dict:
+    """Return that microservice is disabled."""
     return {
         "status": 503,
-        "message": "Teams disabled",
+        "message": "Microservice disabled",
     }
 
 
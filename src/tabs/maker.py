@@ -16,6 +16,7 @@ from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
 from src.models import Cocktail, CocktailStatus, EventType, HandAddMeasure, Ingredient, PrepareResult
 from src.programs.addons.addons import ADDONS
+from src.service.preparation_status import notify_preparation_status
 from src.service.waiter_service import WaiterService
 from src.service_handler import SERVICE_HANDLER
 
@@ -40,6 +41,7 @@ def prepare_cocktail(
     # Capture current waiter at preparation start (immune to logout during prep)
     waiter_nfc_id = shared.current_waiter_nfc_id
     shared.cocktail_status = CocktailStatus(status=PrepareResult.IN_PROGRESS)
+    notify_preparation_status()
     addon_data: dict[str, Any] = {"cocktail": cocktail}
 
     # only selects the positions where amount is not 0, if virgin this will remove alcohol from the recipe
@@ -68,43 +70,42 @@ def prepare_cocktail(
         hand_adds=hand_adds,
     )
 
-    DBC = DatabaseCommander()
-    # single ingredient got represented as a cocktail with one ingredient, but no id, skip recipe increment
-    if cocktail.id != 0:
-        DBC.increment_recipe_counter(cocktail.name, cocktail.is_virgin)
-
     # Set hand-add consumption before addon call so all data is available, always set hand add to recipe level
     cocktail.set_handadd_consumption()
-    # Persist all ingredient consumption
-    consumption_names = [x.name for x in cocktail.adjusted_ingredients]
-    consumption_amount = [round(x.consumption) for x in cocktail.adjusted_ingredients]
-    DBC.set_multiple_ingredient_consumption(consumption_names, consumption_amount)
+    canceled = shared.cocktail_status.status == PrepareResult.CANCELED
+    # Persist counter, consumption, event and waiter log of this preparation in one transaction
+    DatabaseCommander().save_preparation(
+        # single ingredient got represented as a cocktail with one ingredient, but no id, skip recipe increment
+        recipe_name=cocktail.name if cocktail.id != 0 else None,
+        virgin=cocktail.is_virgin,
+        ingredient_name_list=[x.name for x in cocktail.adjusted_ingredients],
+        ingredient_consumption_list=[round(x.consumption) for x in cocktail.adjusted_ingredients],
+        event_type=EventType.COCKTAIL_CANCELED if canceled else EventType.COCKTAIL_PREPARATION,
+        event_info=cocktail.display_name,
+        waiter_log=(waiter_nfc_id, cocktail.id, cocktail.produced_volume) if waiter_nfc_id is not None else None,
+    )
 
     # Need to be called after the consumption is set, so the addon can access the real data from DB
     ADDONS.after_cocktail(addon_data)
 
-    # only post if cocktail was made over 50%
+    # only post if cocktail was made over 50%, the posts are sent in the background
     minimum_cocktail_progress = 0.5
     if result.completion_ratio >= minimum_cocktail_progress:
-        SERVICE_HANDLER.post_team_data(shared.selected_team, cocktail.produced_volume, shared.team_member_name)
-        SERVICE_HANDLER.post_cocktail_to_hook(cocktail, cocktail.produced_volume)
+        SERVICE_HANDLER.queue_team_data(shared.selected_team, cocktail.produced_volume, shared.team_member_name)
+        SERVICE_HANDLER.queue_cocktail_to_hook(cocktail, cocktail.produced_volume)
 
-    if waiter_nfc_id is not None:
-        DBC.log_waiter_cocktail(waiter_nfc_id, cocktail.id, cocktail.produced_volume, cocktail.is_virgin)
     if cfg.WAITER_LOGOUT_AFTER_COCKTAIL and cfg.waiter_mode_active:
         WaiterService().logout_waiter()
 
-    if shared.cocktail_status.status == PrepareResult.CANCELED:
-        DBC.save_event(EventType.COCKTAIL_CANCELED, f"{cocktail.display_name}")
+    if canceled:
         return PrepareResult.CANCELED, DH.get_translation("cocktail_canceled")
-
-    DBC.save_event(EventType.COCKTAIL_PREPARATION, f"{cocktail.display_name}")
     return PrepareResult.FINISHED, additional_message
 
 
 def interrupt_cocktail() -> None:
     """Interrupts the cocktail preparation."""
     shared.cocktail_status.status = PrepareResult.CANCELED
+    notify_preparation_status()
     _logger.info("Canceling the cocktail over GUI!")
 
 
@@ -150,6 +151,7 @@ def calibrate(bottle_number: int, amount: int, w: MainScreen | None = None) -> P
     the spent volume into the auto-calibration target (FINISHED) or discard it (CANCELED).
     """
     shared.cocktail_status = CocktailStatus(status=PrepareResult.IN_PROGRESS)
+    notify_preparation_status()
     _logger.info(f"Calibrating pump #{bottle_number} with {amount} ml")
     display_name = UI_LANGUAGE._choose_language(
         "calibration_label", "progress_screen", amount=amount, pump=bottle_number
@@ -181,6 +183,7 @@ def calibrate(bottle_number: int, amount: int, w: MainScreen | None = None) -> P
 def prepare_ingredient(ingredient: Ingredient, w: MainScreen | None = None) -> None:
     """Prepare an ingredient."""
     shared.cocktail_status = CocktailStatus(status=PrepareResult.IN_PROGRESS)
+    notify_preparation_status()
     _logger.info(f"Spending {ingredient.amount} ml {ingredient.name}")
     mc = MachineController()
     mc.make_cocktail(w, [ingredient], ingredient.name, False)
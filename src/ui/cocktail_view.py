@@ -4,7 +4,6 @@ import contextlib
 from typing import TYPE_CHECKING
 
 from PyQt6.QtCore import QSize, Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QFrame, QGridLayout, QSizePolicy, QVBoxLayout, QWidget
 
 from src.config.config_manager import CONFIG as cfg
@@ -15,10 +14,11 @@ from src.filepath import INGREDIENT_IMAGE
 from src.image_utils import RANDOM_IMAGE_NAME, find_cocktail_image
 from src.logger_handler import LoggerHandler
 from src.models import Cocktail
-from src.payment_utils import filter_cocktails_by_user
+from src.payment_utils import filter_cocktails_by_user, get_price_index
 from src.service.nfc_payment_service import UserLookup, UserLookupResult
 from src.ui.creation_utils import create_button, create_label
 from src.ui.icons import IconSetter, PresetIcon
+from src.ui.pixmap_cache import PIXMAP_CACHE
 from src.ui_elements.clickable_label import ClickableLabel
 from src.ui_elements.touch_scroll_area import TouchScrollArea
 
@@ -65,7 +65,7 @@ def generate_random_image_block(cocktails: list[Cocktail], mainscreen: MainScree
     )
     label = ClickableLabel(random_label)
     label.setProperty("cssClass", "cocktail-picture-view")
-    pixmap = QPixmap(str(find_cocktail_image(RANDOM_IMAGE_NAME)))
+    pixmap = PIXMAP_CACHE.get(find_cocktail_image(RANDOM_IMAGE_NAME), square_size)
     label.setPixmap(pixmap)
     label.setScaledContents(True)
     label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
@@ -105,7 +105,7 @@ def generate_image_block(cocktail: Cocktail | None, mainscreen: MainScreen) -> Q
     label = ClickableLabel(name_label)
     label.setProperty("cssClass", "cocktail-picture-view")
     cocktail_image = INGREDIENT_IMAGE if cocktail is None else find_cocktail_image(cocktail.id)
-    pixmap = QPixmap(str(cocktail_image))
+    pixmap = PIXMAP_CACHE.get(cocktail_image, square_size)
     label.setPixmap(pixmap)
     label.setScaledContents(True)
     label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
@@ -224,7 +224,7 @@ class CocktailView(QWidget):
         cocktails = DB_COMMANDER.get_possible_cocktails(cfg.MAKER_MAX_HAND_INGREDIENTS)
         # filter cocktails based on user criteria if payment is active
         if cfg.cocktailberry_payment:
-            cocktails = filter_cocktails_by_user(self._last_known_user, cocktails)
+            cocktails = filter_cocktails_by_user(self._last_known_user, cocktails, get_price_index())
             # remove if machine owner do not want to show not possible cocktails
             if not cfg.PAYMENT_SHOW_NOT_POSSIBLE:
                 cocktails = [c for c in cocktails if c.is_allowed]
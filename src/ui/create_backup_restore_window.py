@@ -15,8 +15,10 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from src.database_commander import DatabaseCommander
 from src.dialog_handler import UI_LANGUAGE
 from src.display_controller import DP_CONTROLLER
+from src.filepath import DATABASE_PATH
 from src.migration.backup import FILE_SELECTION_MAPPER, NEEDED_BACKUP_FILES
 from src.ui.creation_utils import HEADER_FONT, LARGE_FONT, adjust_font, create_button, create_label, create_spacer
 from src.utils import restart_v1
@@ -96,6 +98,10 @@ class BackupRestoreWindow(QMainWindow):
         if not DP_CONTROLLER.ask_backup_overwrite(description_string):
             return
         for _file in to_backup + NEEDED_BACKUP_FILES:
+            # replacing the file under the open connections would mix it with the old write ahead log
+            if _file == DATABASE_PATH:
+                DatabaseCommander().restore_database(self.backup_path / _file.name)
+                continue
             # needs to differentiate between files and folders
             # this will also not throw an error if the file does not exist
             if _file.is_file():
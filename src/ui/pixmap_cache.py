@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap
+
+from src.image_utils import IMAGE_INDEX
+
+_MAX_PIXMAPS = 256
+
+
+class PixmapCache:
+    """LRU cache of decoded pixmaps, already scaled to the size they are shown with.
+
+    Decoding the full size images is the slowest part of building the cocktail grid.
+    Entries are keyed on path, modification time and size, so a changed image or tile size
+    gets a new entry, the outdated ones drop out of the cache over time.
+    Only use it from the GUI thread.
+    """
+
+    def __init__(self, max_size: int = _MAX_PIXMAPS) -> None:
+        self.max_size = max_size
+        self._pixmaps: OrderedDict[tuple[str, int, int], QPixmap] = OrderedDict()
+
+    def get(self, image_path: Path, size: int) -> QPixmap:
+        """Return the image as square pixmap of the given size."""
+        key = (str(image_path), IMAGE_INDEX.mtime(image_path) or 0, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        pixmap = QPixmap(str(image_path))
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(
+                size,
+                size,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        self._pixmaps[key] = pixmap
+        if len(self._pixmaps) > self.max_size:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+
+
+PIXMAP_CACHE = PixmapCache()
@@ -5,7 +5,7 @@ from __future__ import annotations
 import contextlib
 from collections.abc import Callable
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QEventLoop, QThread, pyqtSignal
 from PyQt6.QtWidgets import QWidget
 
 from src.ui.icons import IconSetter
@@ -55,6 +55,62 @@ class CallableWorker[T](QThread):
         self.finished.emit(result)
 
 
+class ProgressWorker[T](QThread):
+    """Worker thread that executes a long running callable reporting its progress.
+
+    The callable gets a report function as only argument, each reported value is
+    emitted via the `progress` signal, so receivers run on their own (GUI) thread.
+    Errors of the callable are kept and not emitted, see `run_blocking_with_progress`.
+    """
+
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object)
+
+    def __init__(self, func: Callable[[Callable[[int], None]], T]) -> None:
+        super().__init__()
+        self._func = func
+        self.result: T | None = None
+        self.error: Exception | None = None
+
+    def run(self) -> None:
+        """Execute the callable and emit the result."""
+        try:
+            self.result = self._func(self.progress.emit)
+        except Exception as e:
+            self.error = e
+        self.finished.emit(self.result)
+
+
+def run_blocking_with_progress[T](
+    func: Callable[[Callable[[int], None]], T],
+    on_progress: Callable[[int], None],
+) -> T:
+    """Run a callable in a background thread and wait for it, while the Qt event loop keeps running.
+
+    Used for synchronous flows started on the GUI thread, like the cocktail preparation.
+    The work runs undisturbed by repaints, while the GUI stays responsive and gets the
+    progress by signal. Errors of the callable are raised again in the calling thread.
+
+    Args:
+        func: A callable getting a report function for the progress (int), returning a value of type T.
+        on_progress: Callback for the reported progress, runs on the calling (GUI) thread.
+
+    Returns:
+        The result of the callable.
+
+    """
+    worker: ProgressWorker[T] = ProgressWorker(func)
+    loop = QEventLoop()
+    worker.progress.connect(on_progress)
+    worker.finished.connect(lambda _: loop.quit())
+    worker.start()
+    loop.exec()
+    worker.wait()
+    if worker.error is not None:
+        raise worker.error
+    return worker.result  # type: ignore[return-value]
+
+
 def run_with_spinner[T](
     func: Callable[[], T],
     parent: QWidget,
@@ -12,6 +12,7 @@ from src.database_commander import DB_COMMANDER
 from src.dialog_handler import UI_LANGUAGE
 from src.display_controller import DP_CONTROLLER
 from src.image_utils import RANDOM_IMAGE_NAME, find_cocktail_image
+from src.machine.controller import MachineController
 from src.models import Cocktail, Ingredient
 from src.ui.creation_utils import (
     LARGE_FONT,
@@ -242,7 +243,7 @@ class CocktailSelection(QDialog, Ui_CocktailSelection):
         # overwrite the amount if the cocktail has a fixed volume
         if cfg.MAKER_USE_RECIPE_VOLUME:
             amount = self.cocktail.amount
-        self.cocktail.scale_cocktail(amount, self.alcohol_factor * (cfg.MAKER_ALCOHOL_FACTOR / 100))
+        MachineController().plan_cocktail(self.cocktail, amount, self.alcohol_factor * (cfg.MAKER_ALCOHOL_FACTOR / 100))
 
     def update_cocktail_data(self) -> None:
         """Update the cocktail data in the selection view."""
@@ -376,7 +376,7 @@ class MainScreen(QMainWindow, Ui_MainWindow):
     def run_preparation_finalization(self, cocktail: Cocktail, message: str = "") -> None:
         """Show the finalize window (hand-adds and/or the message) until finished or timed out.
 
-        The cocktail is already finalized, so this is pure guidance. Like ``make_cocktail`` it runs a
+        The cocktail is already finalized, so this is pure guidance. It runs a
         synchronous loop on the main thread that pumps Qt events and polls the scale via ``tick``; a
         walk-away timeout auto-closes it. ``message`` (e.g. payment balance) shows in the completion view.
         """
@@ -13,6 +13,7 @@ from src.config.config_manager import CONFIG as cfg
 from src.database_commander import DatabaseCommander
 from src.dialog_handler import UI_LANGUAGE
 from src.display_controller import DP_CONTROLLER
+from src.filepath import DATABASE_PATH
 from src.logger_handler import LoggerHandler
 from src.machine.controller import MachineController
 from src.migration.backup import BACKUP_FILES, NEEDED_BACKUP_FILES
@@ -248,6 +249,10 @@ class OptionWindow(QMainWindow, Ui_Optionwindow):
 
         # copy all files to the backup folder
         for _file in BACKUP_FILES:
+            # the database may have recent changes in its write ahead log, which a file copy would miss
+            if _file == DATABASE_PATH:
+                DatabaseCommander().backup_database(backup_folder / _file.name)
+                continue
             # needs to differentiate between files and folders
             if _file.is_file():
                 shutil.copy(_file, backup_folder)
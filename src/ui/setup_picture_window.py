@@ -9,7 +9,13 @@ from PyQt6.QtWidgets import QMainWindow
 
 from src.dialog_handler import UI_LANGUAGE
 from src.display_controller import DP_CONTROLLER
-from src.image_utils import find_default_cocktail_image, find_user_cocktail_image, process_image, save_image
+from src.image_utils import (
+    delete_user_image,
+    find_default_cocktail_image,
+    find_user_cocktail_image,
+    process_image,
+    save_image,
+)
 from src.ui.creation_utils import apply_responsive_layouts
 from src.ui.icons import IconSetter
 from src.ui_elements import Ui_PictureWindow
@@ -79,7 +85,7 @@ class PictureWindow(QMainWindow, Ui_PictureWindow):
         # remove the pixmap from picture_user
         self.picture_user.clear()
         # remove the file from the user folder
-        self.user_image_path.unlink()
+        delete_user_image(self.identifier)
         self.picture_user.setText("No Image\nAvailable")
         self.refresh_cocktail_view()
 
@@ -3,11 +3,15 @@ from __future__ import annotations
 from unittest.mock import patch
 
 from src.database_commander import DatabaseCommander
+from src.filepath import DATABASE_PATH, HOME_PATH
 
 
 class TestBackup:
     def test_create_backup(self, db_commander: DatabaseCommander):
         """Test the create_backup method."""
-        with patch("shutil.copy") as mock_shutil_copy:
+        with patch.object(DatabaseCommander, "backup_database") as mock_backup:
             db_commander.create_backup()
-            mock_shutil_copy.assert_called_once()
+            mock_backup.assert_called_once()
+        backup_path = mock_backup.call_args.args[0]
+        assert backup_path.parent == HOME_PATH
+        assert backup_path.name.startswith(f"{DATABASE_PATH.stem}_backup-")
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+
+from src.database_commander import DatabaseCommander
+
+
+class TestCatalogCache:
+    def test_cached_read_does_not_touch_database(
+        self, db_commander: DatabaseCommander, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Test that a second catalog read is served from memory."""
+        db_commander.get_possible_cocktails(max_hand_ingredients=1)
+
+        def fail(*_: object) -> None:
+            raise AssertionError("database was queried")
+
+        monkeypatch.setattr(db_commander, "_get_db_cocktails", fail)
+        monkeypatch.setattr(db_commander, "_load_available_ids", fail)
+        assert len(db_commander.get_possible_cocktails(max_hand_ingredients=1)) == 3
+
+    def test_readers_get_independent_copies(self, db_commander: DatabaseCommander):
+        """Test that changing a returned cocktail does not change the cached one."""
+        cocktail = db_commander.get_cocktail(1)
+        assert cocktail is not None
+        cocktail.scale_cocktail(100, 2.0)
+        cocktail.ingredients[0].amount = 999
+        cocktail.only_virgin = True
+        fresh = db_commander.get_cocktail(1)
+        assert fresh is not None
+        assert fresh.adjusted_amount == 290
+        assert fresh.ingredients[0].amount == 210
+        assert fresh.only_virgin is False
+
+    def test_set_recipe_invalidates(self, db_commander: DatabaseCommander):
+        """Test that a recipe update is visible in the next read."""
+        db_commander.get_all_cocktails()
+        db_commander.set_recipe(1, "Cuba Libre 2", 11, 290, 1.0, True, False, [(1, 80, 1), (2, 210, 2)])
+        names = [c.name for c in db_commander.get_all_cocktails()]
+        assert "Cuba Libre 2" in names
+        assert "Cuba Libre" not in names
+
+    def test_bottle_change_invalidates(self, db_commander: DatabaseCommander):
+        """Test that changing bottles updates the possible cocktails."""
+        assert len(db_commander.get_possible_cocktails(max_hand_ingredients=1)) == 3
+        db_commander.set_bottle_at_slot("", 2)
+        names = [c.name for c in db_commander.get_possible_cocktails(max_hand_ingredients=1)]
+        assert "Cuba Libre" not in names
+
+    def test_available_change_invalidates(self, db_commander: DatabaseCommander):
+        """Test that changing the available hand-adds updates the possible cocktails."""
+        assert len(db_commander.get_possible_cocktails(max_hand_ingredients=1)) == 3
+        db_commander.delete_existing_handadd_ingredient()
+        assert db_commander.get_available_ids() == []
+        names = [c.name for c in db_commander.get_possible_cocktails(max_hand_ingredients=1)]
+        assert "With Handadd" not in names
+
+    def test_consumption_patches_fill_level(self, db_commander: DatabaseCommander):
+        """Test that consumption updates the cached fill level without a reload."""
+        db_commander.get_all_cocktails()
+        db_commander.increment_ingredient_consumption("White Rum", 100)
+        cocktail = db_commander.get_cocktail("Cuba Libre")
+        assert cocktail is not None
+        rum = next(x for x in cocktail.ingredients if x.name == "White Rum")
+        assert rum.fill_level == 900
+        ingredient = db_commander.get_ingredient(1)
+        assert ingredient is not None
+        assert ingredient.fill_level == 900
+
+
+class TestPossibilityIndex:
+    @pytest.mark.parametrize("max_hand", [0, 1, 2, 3])
+    def test_index_matches_is_possible(self, db_commander: DatabaseCommander, max_hand: int):
+        """Test that the index gives the same result as checking each cocktail."""
+        available = db_commander.get_available_ids()
+        expected = {}
+        for cocktail in db_commander.get_all_cocktails(status="enabled"):
+            if cocktail.is_possible(available, max_hand):
+                expected[cocktail.id] = cocktail.only_virgin
+        possible = db_commander.get_possible_cocktails(max_hand)
+        assert {c.id: c.only_virgin for c in possible} == expected
+
+    def test_index_is_reused_until_availability_changes(self, db_commander: DatabaseCommander):
+        """Test that the index is only rebuilt when bottles or available hand-adds change."""
+        db_commander.get_possible_cocktails(1)
+        index = db_commander.catalog._possibility
+        db_commander.get_possible_cocktails(2)
+        db_commander.increment_ingredient_consumption("Cola", 10)
+        assert db_commander.catalog._possibility is index
+        db_commander.insert_multiple_existing_handadd_ingredients(["Vodka"])
+        assert db_commander.catalog._possibility is None
+        possible = {c.name: c.only_virgin for c in db_commander.get_possible_cocktails(1)}
+        assert possible["Virgin Only Possible"] is False
+
+
+class TestDerivedIndex:
+    def test_index_is_kept_until_recipes_change(self, db_commander: DatabaseCommander):
+        """Test that a derived index survives fill level updates but not recipe changes."""
+        builds: list[int] = []
+
+        def build(cocktails: list) -> dict[int, str]:
+            builds.append(len(cocktails))
+            return {x.id: x.name for x in cocktails}
+
+        first = db_commander.get_cocktail_index("names", build)
+        db_commander.increment_ingredient_consumption("Cola", 10)
+        assert db_commander.get_cocktail_index("names", build) is first
+        db_commander.set_recipe(1, "Cuba Libre 2", 11, 290, 1.0, True, False, [(1, 80, 1), (2, 210, 2)])
+        assert db_commander.get_cocktail_index("names", build)[1] == "Cuba Libre 2"
+        assert len(builds) == 2
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from src.database_commander import (
@@ -8,8 +9,10 @@ from src.database_commander import (
     DatabaseTransactionError,
     ElementAlreadyExistsError,
     ElementNotFoundError,
+    count_statements,
 )
-from src.db_models import DbRecipe
+from src.db_models import DbEvent, DbIngredient, DbRecipe
+from src.models import EventType
 
 
 class TestCocktail:
@@ -99,6 +102,39 @@ class TestCocktail:
         assert recipe.counter == 0
         assert recipe.counter_virgin == 1
 
+    def test_save_preparation(self, db_commander: DatabaseCommander):
+        """Counter, consumption and event of a preparation are booked together."""
+        db_commander.save_preparation(
+            "Cuba Libre", False, ["White Rum", "Cola"], [80, 210], EventType.COCKTAIL_PREPARATION, "Cuba Libre"
+        )
+        session = Session(db_commander.engine)
+        recipe = session.query(DbRecipe).filter_by(name="Cuba Libre").one()
+        rum = session.query(DbIngredient).filter_by(name="White Rum").one()
+        events = session.query(DbEvent).all()
+        session.close()
+        assert recipe.counter == 1
+        assert rum.consumption == 80
+        assert rum.fill_level == 1000 - 80
+        assert [x.additional_info for x in events] == ["Cuba Libre"]
+        ingredient = db_commander.get_ingredient(rum.id)
+        assert ingredient is not None
+        assert ingredient.fill_level == 1000 - 80
+
+    def test_save_preparation_is_atomic(self, db_commander: DatabaseCommander):
+        """An unknown ingredient rolls back the whole preparation booking."""
+        with pytest.raises(ElementNotFoundError):
+            db_commander.save_preparation(
+                "Cuba Libre", False, ["White Rum", "Unknown"], [80, 10], EventType.COCKTAIL_PREPARATION
+            )
+        session = Session(db_commander.engine)
+        recipe = session.query(DbRecipe).filter_by(name="Cuba Libre").one()
+        rum = session.query(DbIngredient).filter_by(name="White Rum").one()
+        event_count = session.query(DbEvent).count()
+        session.close()
+        assert recipe.counter == 0
+        assert rum.consumption == 0
+        assert event_count == 0
+
     def test_set_recipe(self, db_commander: DatabaseCommander):
         """Test the set_recipe method."""
         db_commander.set_recipe(1, "Cuba Libre 2", 11, 290, 1.0, True, False, [(1, 80, 1), (2, 210, 2)])
@@ -107,6 +143,37 @@ class TestCocktail:
         assert cocktail.name == "Cuba Libre 2"
         assert cocktail.price_per_100_ml == pytest.approx(1.0)
 
+    def test_set_recipe_diffs_ingredient_data(self, db_commander: DatabaseCommander):
+        """Test that set_recipe only touches changed rows, in one transaction, and returns the new state."""
+        commits: list[bool] = []
+        event.listen(db_commander.engine, "commit", lambda _: commits.append(True))
+        with count_statements(db_commander.engine) as statements:
+            cocktail = db_commander.set_recipe(
+                1, "Cuba Libre", 11, 300, 5.0, True, False, [(1, 80, 1), (3, 100, 2), (3, 20, 2)]
+            )
+        assert len(commits) == 1
+        # rum is unchanged, only the recipe update, the cola delete and the orange juice insert are written
+        writes = [x.split()[0] for x in statements if not x.lstrip().upper().startswith("SELECT")]
+        assert sorted(writes) == ["DELETE", "INSERT", "UPDATE"]
+        assert cocktail.amount == 300
+        assert sorted((x.id, x.amount, x.recipe_order) for x in cocktail.ingredients) == [(1, 80, 1), (3, 120, 2)]
+        orange = next(x for x in cocktail.ingredients if x.id == 3)
+        assert orange.name == "Orange Juice"
+        assert orange.bottle == 3
+        assert db_commander.get_cocktail(1) == cocktail
+
+    def test_set_recipe_failure_keeps_old_state(self, db_commander: DatabaseCommander):
+        """Test that a failing update does not leave a partially written recipe."""
+        other = db_commander.insert_new_recipe("Screwdriver", 10, 200, 5.0, True, False, [(3, 200, 1)])
+        with pytest.raises(ElementAlreadyExistsError):
+            db_commander.set_recipe(other.id, "Cuba Libre", 10, 200, 5.0, True, False, [(1, 50, 1)])
+        with pytest.raises(ElementNotFoundError):
+            db_commander.set_recipe(other.id, "Screwdriver", 10, 200, 5.0, True, False, [(999, 50, 1)])
+        cocktail = db_commander.get_cocktail(other.id)
+        assert cocktail is not None
+        assert cocktail.name == "Screwdriver"
+        assert [(x.id, x.amount) for x in cocktail.ingredients] == [(3, 200)]
+
     def test_insert_new_recipe(self, db_commander: DatabaseCommander):
         """Test the insert_new_recipe method."""
         db_commander.insert_new_recipe("New Recipe", 0, 1000, 8.5, True, False, [(1, 80, 1)])
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Generator
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from src.database_commander import DatabaseCommander, dispose_engines, get_shared_database
+from src.database_tuning import PROFILE_ENV, PROFILES, selected_profile
+
+
+@pytest.fixture
+def db_url(tmp_path: Path) -> Generator[str]:
+    yield f"sqlite:///{tmp_path / 'tuning.db'}"
+    dispose_engines()
+
+
+class TestProfile:
+    def test_tuned_profile_is_applied_on_connect(self, db_url: str):
+        get_shared_database(db_url, PROFILES["tuned"])
+        dbc = DatabaseCommander(db_url=db_url)
+        dbc.insert_new_ingredient("Rum", 40, 1000, False, 100, 100, "ml")
+        stats = dbc.get_database_stats()
+        assert stats.profile == "tuned"
+        assert stats.journal_mode == "wal"
+        assert stats.synchronous == "NORMAL"
+        assert stats.mmap_size == PROFILES["tuned"].mmap_size
+        assert stats.wal_bytes > 0
+
+        dbc.checkpoint("TRUNCATE")
+        assert dbc.get_database_stats().wal_bytes == 0
+        assert dbc.get_ingredient("Rum") is not None
+
+    def test_safe_profile_keeps_rollback_journal(self, db_url: str):
+        get_shared_database(db_url, PROFILES["safe"])
+        stats = DatabaseCommander(db_url=db_url).get_database_stats()
+        assert stats.profile == "safe"
+        assert stats.journal_mode == "delete"
+        assert stats.synchronous == "FULL"
+        assert stats.wal_bytes == 0
+
+    def test_profile_is_selected_by_environment(self, monkeypatch: pytest.MonkeyPatch):
+        assert selected_profile().name == "tuned"
+        monkeypatch.setenv(PROFILE_ENV, "SAFE")
+        assert selected_profile().name == "safe"
+        monkeypatch.setenv(PROFILE_ENV, "fastest")
+        assert selected_profile().name == "tuned"
+
+
+class TestBackupRestore:
+    def test_backup_contains_changes_of_write_ahead_log(self, db_url: str, tmp_path: Path):
+        """Test that a backup taken without checkpoint still contains the latest commit."""
+        get_shared_database(db_url, PROFILES["tuned"])
+        dbc = DatabaseCommander(db_url=db_url)
+        dbc.insert_new_ingredient("Rum", 40, 1000, False, 100, 100, "ml")
+        backup = tmp_path / "backup.db"
+        dbc.backup_database(backup)
+        with closing(sqlite3.connect(backup)) as connection:
+            names = [x[0] for x in connection.execute("SELECT Name FROM Ingredients")]
+        assert names == ["Rum"]
+
+    def test_restore_with_other_page_size(self, db_url: str, tmp_path: Path):
+        """Test that a backup with another page size is restored into the open WAL database."""
+        get_shared_database(db_url, PROFILES["tuned"])
+        dbc = DatabaseCommander(db_url=db_url)
+        dbc.insert_new_ingredient("Rum", 40, 1000, False, 100, 100, "ml")
+        backup = tmp_path / "backup.db"
+        dbc.backup_database(backup)
+        with closing(sqlite3.connect(backup)) as connection:
+            connection.execute("PRAGMA journal_mode=DELETE")
+            connection.execute("PRAGMA page_size=1024")
+            connection.execute("VACUUM")
+            connection.execute("UPDATE Ingredients SET Name = 'Restored Rum'")
+            connection.commit()
+            assert connection.execute("PRAGMA page_size").fetchone()[0] == 1024
+        # keep a pooled connection around, it has to see the restored data
+        assert dbc.get_ingredient("Rum") is not None
+
+        dbc.restore_database(backup)
+        assert dbc.get_ingredient("Rum") is None
+        assert DatabaseCommander(db_url=db_url).get_ingredient("Restored Rum") is not None
+        assert dbc.get_database_stats().journal_mode == "wal"
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.database_commander import DatabaseCommander, dispose_engines, get_shared_database
+
+
+class TestEngineRegistry:
+    def test_file_database_shares_engine(self, tmp_path: Path):
+        """Test that commanders for the same file database reuse one engine and session factory."""
+        db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+        first = DatabaseCommander(db_url=db_url)
+        second = DatabaseCommander(db_url=db_url)
+        assert first.engine is second.engine
+        assert get_shared_database(db_url).catalog is get_shared_database(db_url).catalog
+        dispose_engines()
+
+    def test_shared_engine_sees_data_of_other_commander(self, tmp_path: Path):
+        """Test that data written by one commander is readable by another one."""
+        db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+        DatabaseCommander(db_url=db_url).insert_new_ingredient("Rum", 40, 1000, False, 100, 100, "ml")
+        ingredient = DatabaseCommander(db_url=db_url).get_ingredient("Rum")
+        assert ingredient is not None
+        dispose_engines()
+
+    def test_dispose_engines_creates_new_engine(self, tmp_path: Path):
+        """Test that disposing the registry results in a fresh engine on next access."""
+        db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+        engine = get_shared_database(db_url).engine
+        dispose_engines()
+        assert get_shared_database(db_url).engine is not engine
+        dispose_engines()
+
+    def test_memory_database_is_not_shared(self):
+        """Test that in-memory databases stay private to each commander."""
+        first = DatabaseCommander(db_url="sqlite:///:memory:")
+        second = DatabaseCommander(db_url="sqlite:///:memory:")
+        assert first.engine is not second.engine
+        first.insert_new_ingredient("Rum", 40, 1000, False, 100, 100, "ml")
+        assert second.get_ingredient("Rum") is None
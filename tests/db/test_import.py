@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+
+from src.database_commander import (
+    DatabaseCommander,
+    ElementAlreadyExistsError,
+    ElementNotFoundError,
+    RecipeImport,
+)
+
+
+class TestBulkImport:
+    def test_insert_recipes_bulk(self, db_commander: DatabaseCommander):
+        """Recipes and new ingredients are inserted, progress is reported per batch."""
+        recipes = [RecipeImport(f"Import {i}", [("White Rum", 40), ("Lime", 20)]) for i in range(5)]
+        progress: list[int] = []
+        db_commander.insert_recipes_bulk(recipes, ["Lime"], batch_size=2, progress=progress.append)
+        assert progress == [2, 4, 5]
+        lime = db_commander.get_ingredient("Lime")
+        assert lime is not None
+        assert lime.bottle_volume == 1000
+        assert lime.hand is False
+        cocktail = db_commander.get_cocktail("Import 4")
+        assert cocktail is not None
+        assert cocktail.amount == 60
+        assert cocktail.enabled
+        assert sorted((x.name, x.amount) for x in cocktail.ingredients) == [("Lime", 20), ("White Rum", 40)]
+
+    def test_insert_recipes_bulk_sums_duplicate_ingredients(self, db_commander: DatabaseCommander):
+        db_commander.insert_recipes_bulk([RecipeImport("Double Cola", [("Cola", 100), ("Cola", 50)])])
+        cocktail = db_commander.get_cocktail("Double Cola")
+        assert cocktail is not None
+        assert [(x.name, x.amount) for x in cocktail.ingredients] == [("Cola", 150)]
+
+    def test_insert_recipes_bulk_existing_name_inserts_nothing(self, db_commander: DatabaseCommander):
+        existing = db_commander.get_all_cocktails()[0].name
+        recipes = [RecipeImport("Brand New", [("Cola", 100), ("Lime", 10)]), RecipeImport(existing, [("Cola", 100)])]
+        with pytest.raises(ElementAlreadyExistsError):
+            db_commander.insert_recipes_bulk(recipes, ["Lime"])
+        assert db_commander.get_cocktail("Brand New") is None
+        assert db_commander.get_ingredient("Lime") is None
+
+    def test_insert_recipes_bulk_unknown_ingredient(self, db_commander: DatabaseCommander):
+        with pytest.raises(ElementNotFoundError):
+            db_commander.insert_recipes_bulk([RecipeImport("Mystery", [("Unknown Juice", 100)])])
+        assert db_commander.get_cocktail("Mystery") is None
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from src.database_commander import DatabaseCommander
+from src.models import PourRecord
+
+
+def _pour(slot: int, target: float) -> PourRecord:
+    return PourRecord(
+        slot=slot,
+        ingredient_id=1,
+        target=target,
+        cutoff=target - 5,
+        settled=target,
+        lead=0.3,
+        gradient=20.0,
+        pump_speed=100,
+    )
+
+
+class TestPourHistory:
+    def test_save_and_get_pour_history(self, db_commander: DatabaseCommander):
+        """Saved pours come back oldest first with all values."""
+        pours = [_pour(1, 10), _pour(2, 20), _pour(1, 30)]
+        db_commander.save_pour_history(pours, max_items=10)
+        assert db_commander.get_pour_history() == pours
+
+    def test_pour_history_is_limited_per_slot(self, db_commander: DatabaseCommander):
+        """Only the newest pours of each slot are kept."""
+        db_commander.save_pour_history([_pour(1, x) for x in range(5)], max_items=3)
+        db_commander.save_pour_history([_pour(2, 50), _pour(1, 60)], max_items=3)
+        history = db_commander.get_pour_history()
+        assert [(x.slot, x.target) for x in history] == [(1, 3), (1, 4), (2, 50), (1, 60)]
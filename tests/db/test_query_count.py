@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from src.database_commander import DatabaseCommander, count_statements
+
+
+class TestQueryCount:
+    def test_cocktail_load_has_fixed_statement_count(self, db_commander: DatabaseCommander):
+        """Test that loading the catalog does not lazy load ingredients or bottles per recipe."""
+        with count_statements(db_commander.engine) as statements:
+            db_commander._load_cocktails()
+        base_count = len(statements)
+        assert base_count == 2
+
+        for i in range(20):
+            db_commander.insert_new_recipe(f"Recipe {i}", 10, 250, 5.0, True, False, [(1, 50, 1), (2, 200, 2)])
+        with count_statements(db_commander.engine) as statements:
+            cocktails = db_commander._load_cocktails()
+        assert len(cocktails) == 25
+        assert len(statements) == base_count
+
+    def test_ingredient_load_is_single_statement(self, db_commander: DatabaseCommander):
+        """Test that loading all ingredients also loads their bottles in the same query."""
+        with count_statements(db_commander.engine) as statements:
+            ingredients = db_commander._load_ingredients()
+        assert len(statements) == 1
+        assert any(x.bottle == 1 for x in ingredients)
+
+    def test_bottle_reads_are_single_statement(self, db_commander: DatabaseCommander):
+        """Test that bottle fill levels and ingredients at bottles use one query each."""
+        with count_statements(db_commander.engine) as statements:
+            levels = db_commander.get_bottle_fill_levels()
+        assert len(statements) == 1
+        assert levels[0] == 100
+
+        with count_statements(db_commander.engine) as statements:
+            ingredients = db_commander.get_ingredients_at_bottles()
+        assert len(statements) == 1
+        assert ingredients[0].name == "White Rum"
+        assert ingredients[0].bottle == 1
+        assert ingredients[3].name == ""
+
+    def test_cached_catalog_read_issues_no_statement(self, db_commander: DatabaseCommander):
+        """Test that a warm catalog read does not hit the database at all."""
+        db_commander.get_possible_cocktails(max_hand_ingredients=1)
+        with count_statements(db_commander.engine) as statements:
+            db_commander.get_possible_cocktails(max_hand_ingredients=1)
+        assert statements == []
@@ -8,12 +8,18 @@ flow * fall_time.
 
 from __future__ import annotations
 
-from threading import Event
+from threading import Event, RLock
 
 import pytest
 
 import src.machine.dispensers.base as dispenser_base
+import src.machine.scale.sampler as scale_sampler
+from src.machine.dispensers import weighing
 from src.machine.dispensers.base import BaseDispenser
+from src.machine.dispensers.pour_model import PourModel
+from src.machine.dispensers.weighing import WeighingSession
+from src.machine.scale.sampler import ScaleSample, ScaleSampler
+from src.models import PourRecord
 
 
 class FakeClock:
@@ -35,39 +41,87 @@ class FakeScale:
 
     Weight on the scale at time t is all liquid that left the pump before
     t - fall_time. Each read advances the clock by the ADC sample interval,
-    like a real rate-limited load cell amplifier.
+    like a real rate-limited load cell amplifier. Finished pours stay on the
+    scale, taring zeroes the current weight.
     """
 
-    def __init__(self, clock: FakeClock, flow_ml_s: float, fall_time_s: float, sample_interval_s: float = 0.08) -> None:
+    def __init__(
+        self,
+        clock: FakeClock,
+        flow_ml_s: float,
+        fall_time_s: float,
+        sample_interval_s: float = 0.08,
+        prime_time_s: float = 0.0,
+    ) -> None:
         self.clock = clock
         self.flow = flow_ml_s
         self.fall_time = fall_time_s
         self.sample_interval = sample_interval_s
+        self.prime_time = prime_time_s
+        """Time the pump needs until liquid leaves the outlet, only at the start of the pour."""
         self.pump_started_at: float | None = None
         self.pump_stopped_at: float | None = None
+        self.finished_pours: list[tuple[float, float]] = []
+        self.tare_count = 0
         self.noise_g = 0.0
         self._noise_sign = 1
+        self._tare_offset = 0.0
+        self.bus_lock = RLock()
+
+    def start_pump(self) -> None:
+        if self.pump_started_at is not None and self.pump_stopped_at is not None:
+            self.finished_pours.append((self.pump_started_at, self.pump_stopped_at))
+        self.pump_started_at = self.clock.monotonic()
+        self.pump_stopped_at = None
+
+    def total_weight(self, now: float) -> float:
+        """Absolute weight of all liquid landed until now, without tare and noise."""
+        pours = list(self.finished_pours)
+        if self.pump_started_at is not None:
+            pump_end = self.pump_stopped_at if self.pump_stopped_at is not None else now
+            pours.append((self.pump_started_at, pump_end))
+        weight = 0.0
+        for start, end in pours:
+            landed_until = min(now - self.fall_time, end)
+            weight += self.flow * max(0.0, landed_until - start - self.prime_time)
+        return weight
 
     def tare(self, samples: int = 3) -> int:
+        self.tare_count += 1
+        self._tare_offset = self.total_weight(self.clock.monotonic())
         return 0
 
     def read_grams(self) -> float:
         self.clock.sleep(self.sample_interval)
-        now = self.clock.monotonic()
-        weight = 0.0
-        if self.pump_started_at is not None:
-            pump_end = self.pump_stopped_at if self.pump_stopped_at is not None else now
-            landed_until = min(now - self.fall_time, pump_end)
-            weight = self.flow * max(0.0, landed_until - self.pump_started_at)
+        weight = self.total_weight(self.clock.monotonic()) - self._tare_offset
         self._noise_sign = -self._noise_sign
         return weight + self.noise_g * self._noise_sign
 
 
+class InlineSampler(ScaleSampler):
+    """Sampler reading the scale on access instead of in a thread, keeps the fake clock deterministic.
+
+    A new reading is only taken once time passed since the last one, like a real sampler
+    returns the same sample until the ADC delivers the next conversion.
+    """
+
+    def start(self) -> None:
+        self._samples.clear()
+
+    def stop(self) -> None:
+        pass
+
+    def latest(self) -> ScaleSample:
+        if self._samples and self._samples[-1].timestamp >= scale_sampler.time.monotonic():
+            return self._samples[-1]
+        return self.poll()
+
+
 class DummyDispenser(BaseDispenser):
     """Minimal concrete dispenser wired directly to the fake scale, no hardware."""
 
-    def __init__(self, scale: FakeScale) -> None:
-        self.slot = 1
+    def __init__(self, scale: FakeScale, slot: int = 1) -> None:
+        self.slot = slot
         self.volume_flow = scale.flow
         self._stop_event = Event()
         self._scale = scale
@@ -75,13 +129,15 @@ class DummyDispenser(BaseDispenser):
 
     def _dispense_steps(self, amount_ml: float, pump_speed: int):
         self.pump_on = True
-        self._scale.pump_started_at = self._scale.clock.monotonic()  # ty:ignore[unresolved-attribute, invalid-assignment]
+        self._scale.start_pump()  # ty:ignore[unresolved-attribute]
         try:
             while True:
                 consumption = self._get_consumption(0.0)
                 yield consumption
                 if consumption >= amount_ml:
                     return
+                # loop interval like the real dispensers, the sampler picks up a new reading meanwhile
+                self._scale.clock.sleep(0.01)  # ty:ignore[unresolved-attribute]
         finally:
             self.pump_on = False
             self._scale.pump_stopped_at = self._scale.clock.monotonic()  # ty:ignore[unresolved-attribute, invalid-assignment]
@@ -91,6 +147,10 @@ class DummyDispenser(BaseDispenser):
 def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
     fake = FakeClock()
     monkeypatch.setattr(dispenser_base, "time", fake)
+    monkeypatch.setattr(scale_sampler, "time", fake)
+    monkeypatch.setattr(dispenser_base, "ScaleSampler", InlineSampler)
+    monkeypatch.setattr(weighing, "ScaleSampler", InlineSampler)
+    monkeypatch.setattr(dispenser_base, "POUR_MODEL", PourModel())
     return fake
 
 
@@ -234,3 +294,59 @@ def test_cleaning_ignores_scale(clock: FakeClock) -> None:
     assert not dispenser.last_dispense_stalled  # ran well past the stall timeout without tripping
     assert clock.now > 8.0
     assert result == 0.0  # time-based estimate from the dummy, not a scale value
+
+
+def test_learned_lead_corrects_start_latency(clock: FakeClock) -> None:
+    # priming delays the first weight, the measured start latency overstates the in-flight time
+    # and the pour stops too early; the lead learned from the settled pours fixes this
+    scale = FakeScale(clock, flow_ml_s=25.0, fall_time_s=0.3, prime_time_s=0.4)
+    dispenser = DummyDispenser(scale)
+    _, callback = _collect_progress()
+
+    first = dispenser.dispense(60.0, 100, revert=False, callback=callback, ingredient_id=3)
+    for _ in range(3):
+        dispenser.dispense(60.0, 100, revert=False, callback=callback, ingredient_id=3)
+    learned = dispenser.dispense(60.0, 100, revert=False, callback=callback, ingredient_id=3)
+
+    assert first < 60.0 - 3.0
+    assert learned == pytest.approx(60.0, abs=2.0)
+    assert dispenser.last_pour is not None
+    assert dispenser.last_pour.ingredient_id == 3
+    assert dispenser.last_pour.in_flight == pytest.approx(25.0 * 0.3, abs=2.5)
+
+
+def test_continuous_weighing_pipelines_learned_pours(clock: FakeClock) -> None:
+    # with a learned lead the first pour is attributed without waiting for the settle,
+    # the next pump starts while its liquid is still in the air; the scale is tared once
+    scale = FakeScale(clock, flow_ml_s=25.0, fall_time_s=0.3)
+    first, second = DummyDispenser(scale, slot=1), DummyDispenser(scale, slot=2)
+    for slot in (1, 2):
+        for _ in range(3):
+            dispenser_base.POUR_MODEL.record(
+                PourRecord(
+                    slot=slot,
+                    ingredient_id=None,
+                    target=50.0,
+                    cutoff=42.5,
+                    settled=50.0,
+                    lead=0.3,
+                    gradient=25.0,
+                    pump_speed=100,
+                )
+            )
+    _, callback = _collect_progress()
+    session = WeighingSession(scale)  # ty:ignore[invalid-argument-type]
+
+    session.can_pipeline = True
+    first_result = first.dispense(40.0, 100, revert=False, callback=callback, weighing=session)
+    first_stopped_at = scale.pump_stopped_at
+    session.can_pipeline = False
+    second_result = second.dispense(30.0, 100, revert=False, callback=callback, weighing=session)
+    session.close()
+
+    assert scale.tare_count == 1
+    assert first.last_pour is None  # attributed pours carry no settled weight to learn from
+    assert scale.finished_pours[0][0] < scale.pump_started_at < first_stopped_at + scale.fall_time  # ty:ignore[unsupported-operator]
+    assert first_result == pytest.approx(40.0, abs=2.0)
+    assert second_result == pytest.approx(30.0, abs=2.0)
+    assert first_result + second_result == pytest.approx(scale.total_weight(clock.now), abs=0.5)
@@ -0,0 +1,67 @@
+"""The dispenser pool keeps its worker threads across preparations and reports its load."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import MagicMock
+
+from src.machine.dispensers.pool import DispenserPool
+from src.machine.dispensers.scheduler import DispenserScheduler, PreparationItem
+
+
+def _dispenser(slot: int, thread_names: list[str]) -> MagicMock:
+    dispenser = MagicMock()
+    dispenser.slot = slot
+    dispenser.volume_flow = 10.0
+    dispenser.needs_exclusive = False
+    dispenser.last_dispense_stalled = False
+
+    def dispense(amount_ml: float, **_kwargs: object) -> float:
+        thread_names.append(threading.current_thread().name)
+        return amount_ml
+
+    dispenser.dispense.side_effect = dispense
+    return dispenser
+
+
+def test_metrics_track_queue_and_start_delay():
+    pool = DispenserPool(1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(1)
+
+    first = pool.submit(blocking)
+    started.wait(1)
+    second = pool.submit(lambda: None)
+    metrics = pool.metrics()
+    assert metrics.active_workers == 1
+    assert metrics.queue_depth == 1
+    release.set()
+    first.result(1)
+    second.result(1)
+    metrics = pool.metrics()
+    assert metrics.active_workers == 0
+    assert metrics.queue_depth == 0
+    assert metrics.completed == 2
+    assert metrics.max_start_delay >= metrics.last_start_delay >= 0
+    pool.shutdown()
+
+
+def test_scheduler_reuses_pool_threads_between_runs():
+    """Consecutive preparations run on the same long-lived worker threads."""
+    pool = DispenserPool(2)
+    thread_names: list[str] = []
+    for _ in range(3):
+        items = [
+            PreparationItem(dispenser=_dispenser(slot, thread_names), amount_ml=10, pump_speed=100) for slot in (1, 2)
+        ]
+        DispenserScheduler(max_concurrent=2, pool=pool).run(items, lambda _p: None, lambda: False)
+        assert all(item.done for item in items)
+    assert len(thread_names) == 6
+    assert len(set(thread_names)) <= 2
+    assert all(name.startswith("dispenser") for name in thread_names)
+    assert pool.metrics().completed == 6
+    pool.shutdown()
@@ -0,0 +1,114 @@
+"""Tests for the memoized cocktail plans."""
+
+from __future__ import annotations
+
+from src.machine.plan_cache import PlanCache
+from src.models import Cocktail, Ingredient
+
+
+def _ingredient(_id: int, name: str, *, alcohol: int, amount: int, bottle: int | None = 1) -> Ingredient:
+    return Ingredient(
+        id=_id,
+        name=name,
+        alcohol=alcohol,
+        bottle_volume=1000,
+        fill_level=1000,
+        hand=bottle is None,
+        pump_speed=100,
+        amount=amount,
+        bottle=bottle,
+    )
+
+
+def _cocktail(cocktail_id: int = 1) -> Cocktail:
+    ingredients = [
+        _ingredient(1, "Rum", alcohol=40, amount=50, bottle=1),
+        _ingredient(2, "Cola", alcohol=0, amount=150, bottle=2),
+        _ingredient(3, "Lime", alcohol=0, amount=10, bottle=None),
+    ]
+    return Cocktail(
+        id=cocktail_id,
+        name="Cuba Libre",
+        alcohol=10,
+        amount=210,
+        enabled=True,
+        price_per_100_ml=0,
+        virgin_available=True,
+        ingredients=ingredients,
+    )
+
+
+class CountingEstimate:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, ingredients: list[Ingredient]) -> float:
+        self.calls.append([x.name for x in ingredients])
+        return sum(x.amount for x in ingredients) / 10
+
+
+def test_plan_matches_scale_cocktail_and_is_reused() -> None:
+    cache = PlanCache()
+    estimate = CountingEstimate()
+    reference = _cocktail()
+    reference.scale_cocktail(300, 1.2)
+
+    first = _cocktail()
+    plan = cache.plan(first, 300, 1.2, 0, estimate)
+    second = _cocktail()
+    cached = cache.plan(second, 300, 1.2, 0, estimate)
+
+    assert cached is plan
+    assert len(estimate.calls) == 1
+    assert estimate.calls[0] == ["Cola", "Rum"]  # only machine ingredients, in scaled order
+    for cocktail in (first, second):
+        assert [(x.name, x.amount) for x in cocktail.adjusted_ingredients] == [
+            (x.name, x.amount) for x in reference.adjusted_ingredients
+        ]
+        assert cocktail.adjusted_alcohol == reference.adjusted_alcohol
+        assert cocktail.adjusted_amount == 300
+    assert plan.estimated_time == sum(x.amount for x in first.machineadds) / 10
+
+
+def test_applied_plan_is_independent_of_the_cache() -> None:
+    # preparations write the consumption into the ingredients, this must not leak into the cache
+    cache = PlanCache()
+    first = _cocktail()
+    cache.plan(first, 250, 1.0, 0, CountingEstimate())
+    for ing in first.adjusted_ingredients:
+        ing.consumption = 99.0
+        ing.amount = 0
+    second = _cocktail()
+    cache.plan(second, 250, 1.0, 0, CountingEstimate())
+
+    assert all(x.consumption == 0 for x in second.adjusted_ingredients)
+    assert all(x.amount > 0 for x in second.adjusted_ingredients)
+
+
+def test_new_key_is_planned_again() -> None:
+    cache = PlanCache(max_plans=2)
+    estimate = CountingEstimate()
+    cache.plan(_cocktail(), 250, 1.0, 0, estimate)
+    virgin = _cocktail()
+    cache.plan(virgin, 250, 0, 0, estimate)
+    cache.plan(_cocktail(), 250, 1.0, 1, estimate)  # setup changed
+    cache.plan(_cocktail(0), 250, 1.0, 1, estimate)  # no id, never cached
+
+    assert len(estimate.calls) == 4
+    assert virgin.adjusted_alcohol == 0
+    assert len(cache) == 2
+
+
+def test_cached_plan_uses_current_fill_level() -> None:
+    # fill levels do not change the setup version, a cached plan must still see the new level
+    cache = PlanCache()
+    cache.plan(_cocktail(), 250, 1.0, 0, CountingEstimate())
+    empty = _cocktail()
+    rum = next(x for x in empty.ingredients if x.name == "Rum")
+    rum.fill_level = 10
+    cache.plan(empty, 250, 1.0, 0, CountingEstimate())
+
+    assert next(x for x in empty.adjusted_ingredients if x.name == "Rum").fill_level == 10
+    missing = empty.enough_fill_level()
+    assert missing is not None
+    assert missing.name == "Rum"
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from src.machine.dispensers.pour_model import PourModel
+from src.models import PourRecord
+
+
+def _pour(in_flight: float, gradient: float = 20.0, slot: int = 1, ingredient_id: int | None = 1) -> PourRecord:
+    return PourRecord(
+        slot=slot,
+        ingredient_id=ingredient_id,
+        target=50.0,
+        cutoff=40.0,
+        settled=40.0 + in_flight,
+        lead=0.5,
+        gradient=gradient,
+        pump_speed=100,
+    )
+
+
+def test_estimate_needs_enough_pours() -> None:
+    model = PourModel()
+    model.record(_pour(6.0))
+    model.record(_pour(6.0))
+    assert model.estimate(1, 1) is None
+    model.record(_pour(6.0))
+    estimate = model.estimate(1, 1)
+    assert estimate is not None
+    assert estimate.lead_s == pytest.approx(0.3)
+    assert estimate.in_flight(10.0) == pytest.approx(3.0)
+
+
+def test_estimate_follows_changes() -> None:
+    """The fit weights recent pours higher, a changed setup is picked up after a few pours."""
+    model = PourModel()
+    for _ in range(10):
+        model.record(_pour(6.0))
+    for _ in range(10):
+        model.record(_pour(2.0))
+    estimate = model.estimate(1, 1)
+    assert estimate is not None
+    assert estimate.lead_s == pytest.approx(0.1, abs=0.02)
+
+
+def test_unknown_ingredient_uses_slot_estimate() -> None:
+    model = PourModel()
+    for _ in range(3):
+        model.record(_pour(6.0, ingredient_id=1))
+    for ingredient_id in (2, None):
+        estimate = model.estimate(1, ingredient_id)
+        assert estimate is not None
+        assert estimate.lead_s == pytest.approx(0.3)
+    assert model.estimate(2, 1) is None
+
+
+def test_seed_and_pending() -> None:
+    """Seeding replays the saved history, only new pours are pending for saving."""
+    model = PourModel()
+    model.seed([_pour(4.0, gradient=10.0) for _ in range(3)])
+    assert model.take_pending() == []
+    estimate = model.estimate(1, 1)
+    assert estimate is not None
+    assert estimate.lead_s == pytest.approx(0.4)
+    # pours without usable flow do not count, but are still saved
+    model.record(_pour(5.0, gradient=0.0))
+    assert len(model.take_pending()) == 1
+    assert model.take_pending() == []
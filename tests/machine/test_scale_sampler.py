@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+from itertools import pairwise
+
+import pytest
+
+from src.machine.scale.sampler import ScaleSample, ScaleSampler
+
+
+class RampScale:
+    """Scale whose weight rises by a fixed rate, each read blocks like a rate limited ADC."""
+
+    def __init__(self, grams_per_s: float = 100.0, sample_interval_s: float = 0.005) -> None:
+        self.grams_per_s = grams_per_s
+        self.sample_interval = sample_interval_s
+        self.start = time.monotonic()
+        self.fail = False
+        self.bus_lock = threading.RLock()
+
+    def read_grams(self) -> float:
+        time.sleep(self.sample_interval)
+        if self.fail:
+            raise OSError("bus error")
+        return (time.monotonic() - self.start) * self.grams_per_s
+
+
+def _wait_for_samples(sampler: ScaleSampler, count: int) -> None:
+    end = time.monotonic() + 2.0
+    while len(sampler.window(10.0)) < count:
+        assert time.monotonic() < end, "sampler did not collect enough samples"
+        time.sleep(0.01)
+
+
+def test_samples_in_background() -> None:
+    """Readings arrive in order with their timestamps while the consumer never touches the scale."""
+    scale = RampScale()
+    with ScaleSampler(scale) as sampler:  # ty:ignore[invalid-argument-type]
+        _wait_for_samples(sampler, 20)
+        samples = sampler.window(10.0)
+        latest = sampler.latest()
+    assert latest.timestamp >= samples[-1].timestamp
+    assert all(a.timestamp < b.timestamp for a, b in pairwise(samples))
+    assert all(a.grams <= b.grams for a, b in pairwise(samples))
+
+
+def test_window_and_slope() -> None:
+    """The window covers at least the span from the newest sample, the slope is the weight change per second."""
+    sampler = ScaleSampler(RampScale())  # ty:ignore[invalid-argument-type]
+    for i in range(11):
+        sampler._samples.append(ScaleSample(i * 0.1, i * 2.0))
+    window = sampler.window(0.5)
+    assert [x.timestamp for x in window] == pytest.approx([0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+    assert sampler.slope(0.5) == pytest.approx(20.0)
+    assert sampler.slope(0.5, since=0.7) is None
+    assert sampler.slope(0.5, min_samples=10) is None
+    assert sampler.window(0.5, since=2.0) == []
+
+
+def test_read_error_reaches_consumer() -> None:
+    """A failing scale stops the sampling, the error is raised on the next access."""
+    scale = RampScale()
+    sampler = ScaleSampler(scale)  # ty:ignore[invalid-argument-type]
+    scale.fail = True
+    sampler.start()
+    with pytest.raises(OSError, match="bus error"):
+        sampler.latest()
+    sampler.stop()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+from itertools import pairwise
+
+import pytest
+
+from src.machine.scale.stream import ScaleReading, ScaleStream
+
+
+class SequenceScale:
+    """Scale returning the given readings, then repeating the last one."""
+
+    def __init__(self, readings: list[float], sample_interval_s: float = 0.0) -> None:
+        self.readings = list(readings)
+        self.sample_interval = sample_interval_s
+        self.bus_lock = threading.RLock()
+        self.reads = 0
+
+    def read_grams(self) -> float:
+        time.sleep(self.sample_interval)
+        self.reads += 1
+        if len(self.readings) > 1:
+            return self.readings.pop(0)
+        return self.readings[0]
+
+
+def _stream(readings: list[float], rate: float = 1000, sample_interval_s: float = 0.0) -> ScaleStream:
+    return ScaleStream(SequenceScale(readings, sample_interval_s), rate)  # ty:ignore[invalid-argument-type]
+
+
+def test_median_removes_spikes_and_ema_smooths() -> None:
+    stream = _stream([100.0, 100.0, 5000.0, 100.0, 100.0, 120.0])
+    values = [stream.poll().grams for _ in range(6)]
+    assert max(values) == pytest.approx(100.0)
+    # a lasting step moves the average once it is the median
+    assert 100.0 < stream.poll().grams < 120.0
+
+
+def test_stable_only_after_a_still_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr("src.machine.scale.stream.time.monotonic", lambda: now[0])
+    stream = _stream([50.0])
+    readings = []
+    for _ in range(10):
+        readings.append(stream.poll())
+        now[0] += 0.1
+    assert not readings[0].stable
+    assert readings[-1].stable
+    assert readings[-1].grams == pytest.approx(50.0)
+
+
+def test_paused_while_the_scale_is_used() -> None:
+    stream = _stream([42.0])
+    stream.poll()
+    holder_ready = threading.Event()
+    release = threading.Event()
+
+    def use_scale() -> None:
+        with stream.scale.bus_lock:
+            holder_ready.set()
+            release.wait(2.0)
+
+    holder = threading.Thread(target=use_scale)
+    holder.start()
+    holder_ready.wait(2.0)
+    reads = stream.scale.reads  # ty:ignore[unresolved-attribute]
+    reading = stream.poll()
+    release.set()
+    holder.join()
+    assert reading == ScaleReading(grams=42.0, stable=False, paused=True)
+    assert stream.scale.reads == reads  # ty:ignore[unresolved-attribute]
+
+
+def test_shared_loop_publishes_changes_and_stops_without_viewers() -> None:
+    stream = _stream([10.0, 20.0, 30.0], sample_interval_s=0.005)
+    first: list[ScaleReading] = []
+    second: list[ScaleReading] = []
+    stream.add_callback("first", first.append)
+    stream.add_callback("second", second.append)
+    end = time.monotonic() + 2.0
+    while (not second or second[-1].grams < 29.0) and time.monotonic() < end:
+        time.sleep(0.01)
+    stream.remove_callback("first")
+    stream.remove_callback("second")
+    assert first
+    assert first == second
+    # unchanged readings are not published again
+    assert all(a != b for a, b in pairwise(first))
+    time.sleep(0.05)
+    reads = stream.scale.reads  # ty:ignore[unresolved-attribute]
+    time.sleep(0.05)
+    assert stream.scale.reads == reads  # ty:ignore[unresolved-attribute]
+
+
+def test_reset_drops_the_old_weight() -> None:
+    stream = _stream([300.0, 300.0, 0.0])
+    stream.poll()
+    stream.poll()
+    stream.latest = ScaleReading(grams=300.0, stable=True)
+    stream.reset()
+    assert stream.latest is None
+    assert stream.poll().grams == pytest.approx(0.0)
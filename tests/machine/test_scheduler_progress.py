@@ -10,7 +10,12 @@ from __future__ import annotations
 from typing import cast
 
 from src.machine.dispensers.base import BaseDispenser, ProgressCallback
-from src.machine.dispensers.scheduler import DispenserScheduler, PreparationItem, _dispense_item
+from src.machine.dispensers.scheduler import (
+    DispenserScheduler,
+    PreparationItem,
+    PreparationProgress,
+    _dispense_item,
+)
 
 
 def _item(amount_ml: float) -> PreparationItem:
@@ -22,11 +27,12 @@ def _item(amount_ml: float) -> PreparationItem:
 def test_progress_is_monotonic_and_never_negative():
     scheduler = DispenserScheduler(max_concurrent=2)
     item = _item(100)
+    scheduler._progress = PreparationProgress([item])
     emitted: list[int] = []
     # simulated scale readings: pour, glass lifted (negative), put back, finish
     for consumption in [-5.0, 30.0, 60.0, -180.0, 20.0, 70.0, 100.0]:
-        item.consumption = consumption
-        scheduler._emit_progress([item], emitted.append)
+        scheduler._progress.update(item, consumption)
+        scheduler._emit_progress(emitted.append)
     assert emitted == [0, 30, 60, 60, 60, 70, 100]
 
 
@@ -46,6 +52,8 @@ def test_dispense_item_forwards_use_scale():
             revert: bool,
             callback: ProgressCallback,
             use_scale: bool = True,
+            ingredient_id: int | None = None,
+            weighing: object = None,
         ) -> float:
             seen.append(use_scale)
             return amount_ml
@@ -54,3 +62,13 @@ def test_dispense_item_forwards_use_scale():
     _dispense_item(PreparationItem(dispenser=dispenser, amount_ml=50, pump_speed=100, use_scale=False))
     _dispense_item(PreparationItem(dispenser=dispenser, amount_ml=50, pump_speed=100))
     assert seen == [False, True]
+
+
+def test_progress_total_follows_consumption_deltas():
+    """The running total must match the summed item consumption after any sequence of updates."""
+    items = [_item(100), _item(50)]
+    progress = PreparationProgress(items)
+    for item, consumption in [(items[0], 40.0), (items[1], 10.0), (items[0], 25.0), (items[1], 50.0)]:
+        progress.update(item, consumption)
+    assert progress.consumed == sum(x.consumption for x in items) == 75.0
+    assert progress.percent == 50
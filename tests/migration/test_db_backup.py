@@ -0,0 +1,35 @@
+"""The database backup before migrations has to contain the commits still in the write ahead log."""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.migration import update_data
+
+
+def test_backup_contains_write_ahead_log(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db_path = tmp_path / "wal.db"
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    monkeypatch.setattr(update_data, "DATABASE_PATH", db_path)
+    monkeypatch.setattr(update_data, "BACKUP_FOLDER", backup_dir)
+
+    # keep the connection open, so the commit is not checkpointed into the database file
+    with contextlib.closing(sqlite3.connect(db_path)) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA wal_autocheckpoint=0")
+        connection.execute("CREATE TABLE Recipes (Name TEXT)")
+        connection.execute("INSERT INTO Recipes VALUES ('Cuba Libre')")
+        connection.commit()
+        assert Path(f"{db_path}-wal").stat().st_size > 0
+
+        update_data._create_db_backup()
+
+    backups = list(backup_dir.iterdir())
+    assert len(backups) == 1
+    with contextlib.closing(sqlite3.connect(backups[0])) as backup:
+        assert backup.execute("SELECT Name FROM Recipes").fetchall() == [("Cuba Libre",)]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import typer
+
+from src.programs.data_import import _read_recipes
+
+
+def _as_tuples(path: Path, factor: float = 1.0) -> list[tuple[str, list[tuple[str, int]]]]:
+    return [(r.name, [(i.name, i.volume) for i in r.ingredients]) for r in _read_recipes(path, factor)]
+
+
+EXPECTED = [("Cuba Libre", [("White Rum", 40), ("Cola", 120)]), ("Screwdriver", [("Vodka", 50), ("Orange Juice", 100)])]
+
+
+class TestReadRecipes:
+    def test_text(self, tmp_path: Path):
+        path = tmp_path / "recipes.txt"
+        path.write_text("Cuba Libre\n4 cl White Rum\n12 cl Cola\n\nScrewdriver\n5 cl Vodka\n10 cl Orange Juice\n")
+        assert _as_tuples(path, factor=10) == EXPECTED
+
+    def test_json(self, tmp_path: Path):
+        data = [
+            {"name": name, "ingredients": [{"name": i, "amount": a} for i, a in ingredients]}
+            for name, ingredients in EXPECTED
+        ]
+        path = tmp_path / "recipes.json"
+        path.write_text(json.dumps(data))
+        assert _as_tuples(path) == EXPECTED
+
+    def test_json_lines(self, tmp_path: Path):
+        lines = [
+            json.dumps({"name": name, "ingredients": [{"name": i, "amount": a} for i, a in ingredients]})
+            for name, ingredients in EXPECTED
+        ]
+        path = tmp_path / "recipes.jsonl"
+        path.write_text("\n".join(lines) + "\n\n")
+        assert _as_tuples(path) == EXPECTED
+
+    def test_csv_with_header(self, tmp_path: Path):
+        rows = ["recipe,ingredient,amount"]
+        rows.extend(f"{name},{i},{a / 10}" for name, ingredients in EXPECTED for i, a in ingredients)
+        path = tmp_path / "recipes.csv"
+        path.write_text("\n".join(rows))
+        assert _as_tuples(path, factor=10) == EXPECTED
+
+    def test_invalid_json_line_aborts(self, tmp_path: Path):
+        path = tmp_path / "recipes.jsonl"
+        path.write_text('{"name": "Broken", "ingredients": []}\n{"name": \n')
+        with pytest.raises(typer.Exit):
+            _read_recipes(path, 1.0)
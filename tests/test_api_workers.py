@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Annotated
+
+import pytest
+from fastapi import BackgroundTasks, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.internal.latency import ROUTE_LATENCY, LatencyHistogram, LatencyMiddleware
+from src.api.internal.workers import WorkerPool, blocking, pool_metrics, shutdown_pools
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    ROUTE_LATENCY.clear()
+    yield
+    ROUTE_LATENCY.clear()
+    shutdown_pools()
+
+
+def _offset() -> int:
+    return 10
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LatencyMiddleware)
+
+    @app.get("/items/{item_id}")
+    @blocking()
+    def get_item(item_id: int, offset: Annotated[int, Depends(_offset)], name: str = "x") -> dict[str, str | int]:
+        return {"id": item_id + offset, "name": name, "thread": threading.current_thread().name}
+
+    @app.get("/scale")
+    @blocking(WorkerPool.HARDWARE)
+    def read_scale() -> str:
+        return threading.current_thread().name
+
+    @app.post("/job")
+    def start_job(background_tasks: BackgroundTasks) -> str:
+        background_tasks.add_task(time.sleep, 0.3)
+        return "started"
+
+    return app
+
+
+class TestBlockingHandlers:
+    def test_handler_runs_on_named_pool_with_resolved_parameters(self):
+        """Path, query and dependency parameters still reach the plain function running on the pool."""
+        with TestClient(_build_app()) as client:
+            response = client.get("/items/5", params={"name": "rum"})
+            scale = client.get("/scale")
+        data = response.json()
+        assert data["id"] == 15
+        assert data["name"] == "rum"
+        assert data["thread"].startswith(WorkerPool.DEFAULT.value)
+        assert scale.json().startswith(WorkerPool.HARDWARE.value)
+
+    def test_pool_metrics_count_completed_calls(self):
+        with TestClient(_build_app()) as client:
+            for _ in range(3):
+                client.get("/items/1")
+        metrics = {x.name: x for x in pool_metrics()}
+        default = metrics[WorkerPool.DEFAULT.value]
+        assert default.completed == 3
+        assert default.running == 0
+        assert default.queued == 0
+
+    def test_latency_is_recorded_per_route_template(self):
+        with TestClient(_build_app()) as client:
+            client.get("/items/1")
+            client.get("/items/2")
+            client.get("/unknown")
+        metrics = ROUTE_LATENCY.metrics()
+        assert [(x.method, x.route, x.count) for x in metrics] == [("GET", "/items/{item_id}", 2)]
+        assert sum(metrics[0].buckets.values()) == 2
+
+    def test_background_task_is_not_part_of_the_latency(self):
+        """The response is done once its body is sent, a background task runs afterwards."""
+        with TestClient(_build_app()) as client:
+            client.post("/job")
+        metrics = ROUTE_LATENCY.metrics()
+        assert [(x.route, x.count) for x in metrics] == [("/job", 1)]
+        assert metrics[0].max_ms < 250
+
+
+class TestLatencyHistogram:
+    def test_bucket_bounds_are_inclusive(self):
+        histogram = LatencyHistogram()
+        for duration in (1, 5, 5.1, 20_000):
+            histogram.record(duration)
+        buckets = histogram.buckets()
+        assert buckets["5"] == 2
+        assert buckets["10"] == 1
+        assert buckets["inf"] == 1
+        assert histogram.count == 4
+        assert histogram.max_ms == 20_000
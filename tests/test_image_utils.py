@@ -3,8 +3,9 @@ from pathlib import Path
 import pytest
 from PIL import Image
 
-from src import image_utils
+from src import image_store, image_utils
 from src.filepath import DEFAULT_COCKTAIL_IMAGE
+from src.image_store import IMAGE_SIZES, VARIANT_URL_PREFIX, ImageStore
 from src.image_utils import (
     RANDOM_IMAGE_NAME,
     find_cocktail_image,
@@ -33,3 +34,53 @@ def test_user_image_wins_for_id_and_random(tmp_path: Path, monkeypatch: pytest.M
         expected = tmp_path / f"{identifier}.jpg"
         assert expected.exists()
         assert find_cocktail_image(identifier) == expected
+
+
+def test_image_index_follows_save_and_delete(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Lookups are answered from the index, saving and deleting over image_utils keeps it current."""
+    monkeypatch.setattr(image_utils, "USER_IMAGE_FOLDER", tmp_path)
+    assert find_user_cocktail_image(3) is None
+    # files changed outside of image_utils are only seen after a refresh
+    Image.new("RGB", (10, 10)).save(tmp_path / "4.jpg")
+    assert find_user_cocktail_image(4) is None
+    image_utils.refresh_image_index()
+    assert find_user_cocktail_image(4) == tmp_path / "4.jpg"
+    save_image(Image.new("RGB", (10, 10)), 3)
+    assert find_user_cocktail_image(3) == tmp_path / "3.jpg"
+    assert image_utils.IMAGE_INDEX.mtime(tmp_path / "3.jpg") == (tmp_path / "3.jpg").stat().st_mtime_ns
+    image_utils.delete_user_image(3)
+    assert find_user_cocktail_image(3) is None
+
+
+def test_image_store_variants(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Variants are resized WebP files under content hashed names, outdated and removed ones are cleaned up."""
+    user_folder = tmp_path / "display_images_user"
+    user_folder.mkdir()
+    monkeypatch.setattr(image_utils, "USER_IMAGE_FOLDER", user_folder)
+    monkeypatch.setattr(image_store, "USER_IMAGE_FOLDER", user_folder)
+    monkeypatch.setattr(image_store, "DEFAULT_IMAGE_FOLDER", tmp_path / "missing")
+    store = ImageStore(tmp_path / "web")
+    image_path = user_folder / "7.jpg"
+    save_image(Image.new("RGB", (800, 600), "red"), 7)
+    # not created yet, the caller falls back to the original image
+    assert store.url(image_path) is None
+    store.create_variants(image_path)
+    thumbnail_url = store.url(image_path, "thumbnail")
+    assert thumbnail_url is not None
+    assert thumbnail_url.startswith(f"{VARIANT_URL_PREFIX}/display_images_user-7-")
+    with Image.open(tmp_path / "web" / thumbnail_url.rsplit("/", 1)[1]) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (IMAGE_SIZES["thumbnail"], IMAGE_SIZES["thumbnail"] * 3 // 4)
+    # the manifest is persisted, a new store resolves the url without creating anything
+    assert ImageStore(tmp_path / "web").url(image_path, "thumbnail") == thumbnail_url
+    # a changed image gets a new url, the warm up removes all not needed files
+    save_image(Image.new("RGB", (800, 600), "blue"), 7)
+    assert store.url(image_path, "thumbnail") is None
+    (tmp_path / "web" / "orphan-1-abc-detail.webp").touch()
+    store.warm_up()
+    new_url = store.url(image_path, "thumbnail")
+    assert new_url not in (None, thumbnail_url)
+    assert len(list((tmp_path / "web").glob("*.webp"))) == len(IMAGE_SIZES)
+    image_utils.delete_user_image(7)
+    store.remove_variants(image_path)
+    assert list((tmp_path / "web").glob("*.webp")) == []
@@ -1,8 +1,11 @@
+import sys
+import types
+from collections.abc import Callable
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.config.config_manager import CONFIG
+from src.config.config_manager import CONFIG, shared
 from src.config.config_types import DCGPIOPumpConfig
 from src.machine.controller import MachineController
 from src.machine.dispensers.base import BaseDispenser
@@ -21,7 +24,7 @@ from src.machine.dispensers.scheduler import (
     estimate_carriage_time,
     estimate_total_time,
 )
-from src.models import Ingredient
+from src.models import CocktailStatus, Ingredient, PrepareResult
 
 
 def _mock_dispenser(slot: int, volume_flow: float = 10.0, carriage_position: float = 0) -> MagicMock:
@@ -183,7 +186,15 @@ class TestController:
         """Exclusive path passes on_step to emit aggregate progress per update."""
         mock_disp = _mock_dispenser(1)
 
-        def fake_dispense(amount_ml: float, pump_speed: int, revert: bool, callback, use_scale: bool = True) -> float:  # noqa: ANN001
+        def fake_dispense(
+            amount_ml: float,
+            pump_speed: int,
+            revert: bool,
+            callback,  # noqa: ANN001
+            use_scale: bool = True,
+            ingredient_id: int | None = None,
+            weighing: object = None,
+        ) -> float:
             callback(50.0, False)
             callback(100.0, True)
             return 100.0
@@ -263,6 +274,33 @@ class TestController:
         assert events[0] == "progress=0"
         assert events.index("progress=0") < events.index("move")
 
+    def test_v1_dispensing_runs_on_worker(self, monkeypatch: pytest.MonkeyPatch):
+        """With a main window, the dispensing runs on the Qt worker, the window gets the progress by signal."""
+        gui_progress: list[int] = []
+        worker_calls: list[str] = []
+
+        def run_blocking_with_progress(func, on_progress):  # noqa: ANN001
+            worker_calls.append("run")
+            # the fake worker delivers the signal directly to the gui callback
+            return func(on_progress)
+
+        fake_qt_worker = types.ModuleType("src.ui.qt_worker")
+        fake_qt_worker.run_blocking_with_progress = run_blocking_with_progress  # type: ignore[attr-defined]
+        monkeypatch.setitem(sys.modules, "src.ui.qt_worker", fake_qt_worker)
+        window = MagicMock()
+        window.change_progression_window.side_effect = gui_progress.append
+        shared.cocktail_status = CocktailStatus(0, status=PrepareResult.IN_PROGRESS)
+
+        def run(on_progress: Callable[[int], None]) -> None:
+            for progress in (0, 50, 100):
+                on_progress(progress)
+
+        MachineController()._run_with_progress(window, run)
+        assert worker_calls == ["run"]
+        assert gui_progress == [0, 50, 100]
+        assert shared.cocktail_status.progress == 100
+        shared.cocktail_status = CocktailStatus()
+
 
 class TestCarriageOrdering:
     def test_order_ascending_from_home_zero(self):
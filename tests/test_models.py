@@ -69,3 +69,29 @@ def test_display_name_has_virgin_tag_for_virginized_cocktail() -> None:
     cocktail.scale_cocktail(200, 0.0)
     assert cocktail.is_virgin is True
     assert cocktail.display_name == "Test (Virgin)"
+
+
+def test_adjusted_ingredients_are_independent_of_the_recipe() -> None:
+    cocktail = _cocktail([_ingredient(1, "Cola", alcohol=0), _ingredient(2, "Rum", alcohol=40, bottle=None)])
+    assert cocktail.is_possible(hand_available=[2], max_hand_ingredients=1) is True
+    for ing in cocktail.adjusted_ingredients:
+        ing.amount = 0
+        ing.consumption = 50.0
+    assert [x.amount for x in cocktail.ingredients] == [100, 100]
+    assert all(x.consumption == 0 for x in cocktail.ingredients)
+    # the checks see the changed adjusted ingredients, not the recipe
+    assert cocktail.is_possible(hand_available=[2], max_hand_ingredients=1) is False
+
+
+def test_copy_is_independent() -> None:
+    cocktail = _cocktail([_ingredient(1, "Cola", alcohol=0), _ingredient(2, "Rum", alcohol=40)], virgin_available=True)
+    cocktail.scale_cocktail(300, 0.0)
+    copied = cocktail.copy()
+    copied.ingredients[0].amount = 1
+    copied.adjusted_ingredients[0].consumption = 20.0
+    copied.only_virgin = True
+    assert copied.adjusted_amount == 300
+    assert copied.adjusted_alcohol == 0
+    assert cocktail.ingredients[0].amount == 100
+    assert cocktail.adjusted_ingredients[0].consumption == 0
+    assert cocktail.only_virgin is False
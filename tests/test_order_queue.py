@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.api.internal.order_queue import OrderQueue, PreparationOrder
+from src.api.routers.cocktails import _order_status
+from src.config.config_manager import shared
+from src.dialog_handler import DIALOG_HANDLER as DH
+from src.models import Cocktail, CocktailStatus, PrepareResult
+
+
+@pytest.fixture
+def prepared() -> list[str]:
+    """Patch the machine side of the queue, return the names of the prepared cocktails."""
+    names: list[str] = []
+
+    def prepare_cocktail(cocktail: Cocktail) -> None:
+        shared.cocktail_status = CocktailStatus(status=PrepareResult.IN_PROGRESS)
+        time.sleep(0.05)
+        names.append(cocktail.name)
+        shared.cocktail_status.status = PrepareResult.FINISHED
+
+    mc = MagicMock()
+    mc.can_detect_glass = False
+    shared.cocktail_status = CocktailStatus()
+    with (
+        patch("src.api.internal.order_queue.maker.prepare_cocktail", side_effect=prepare_cocktail),
+        patch(
+            "src.api.internal.order_queue.maker.validate_cocktail", return_value=(PrepareResult.VALIDATION_OK, "", None)
+        ),
+        patch("src.api.internal.order_queue.MachineController", return_value=mc),
+    ):
+        yield names
+    shared.cocktail_status = CocktailStatus()
+
+
+def _order(name: str, estimated_time: float = 10.0, validated: bool = False) -> PreparationOrder:
+    cocktail = MagicMock(spec=Cocktail)
+    cocktail.name = name
+    return PreparationOrder(cocktail=cocktail, estimated_time=estimated_time, validated=validated)
+
+
+async def _wait_until(condition, timeout: float = 2.0) -> None:  # noqa: ANN001
+    end = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < end, "condition not reached in time"
+        await asyncio.sleep(0.01)
+
+
+class TestOrderQueue:
+    def test_orders_run_in_sequence_after_glass_swap(self, prepared: list[str]):
+        """The second order waits for the first and the confirmed glass swap, position and eta follow the queue."""
+
+        async def run() -> None:
+            queue = OrderQueue()
+            first = queue.enqueue(_order("First", validated=True))
+            second = queue.enqueue(_order("Second", estimated_time=5.0))
+            assert queue.position(second) == 2
+            assert queue.eta(second) == pytest.approx(15.0)
+            await _wait_until(lambda: first.done)
+            assert first.status == PrepareResult.FINISHED
+            await asyncio.sleep(0.1)
+            # no glass detection: the next order waits for the operator
+            assert second.status == PrepareResult.QUEUED
+            assert queue.position(second) == 0
+            queue.confirm_glass_swap()
+            await _wait_until(lambda: second.done)
+            assert second.status == PrepareResult.FINISHED
+
+        asyncio.run(run())
+        assert prepared == ["First", "Second"]
+
+    def test_swap_confirmation_is_reported_without_glass_detection(self, prepared: list[str]):
+        """The waiting order reports the needed confirmation and its own message, not the one of the last cocktail."""
+
+        async def run() -> None:
+            queue = OrderQueue()
+            first = queue.enqueue(_order("First", validated=True))
+            second = queue.enqueue(_order("Second"))
+            await _wait_until(lambda: first.done)
+            shared.cocktail_status.message = "Enjoy"
+            with patch("src.api.routers.cocktails.ORDER_QUEUE", queue):
+                await _wait_until(lambda: _order_status(second).needs_swap_confirmation)
+                status = _order_status(second)
+                assert status.status == PrepareResult.QUEUED.value
+                assert status.position == 0
+                assert status.message == DH.get_translation("waiting_for_glass_swap")
+                queue.confirm_glass_swap()
+                await _wait_until(lambda: second.done)
+                assert not _order_status(second).needs_swap_confirmation
+
+        asyncio.run(run())
+        assert prepared == ["First", "Second"]
+
+    def test_cancel_queued_order_keeps_others(self, prepared: list[str]):
+        """Canceling a waiting order removes only this one, the running order is not stopped."""
+
+        async def run() -> None:
+            queue = OrderQueue()
+            first = queue.enqueue(_order("First", validated=True))
+            second = queue.enqueue(_order("Second"))
+            third = queue.enqueue(_order("Third"))
+            await _wait_until(lambda: first.status == PrepareResult.IN_PROGRESS)
+            queue.cancel(second.id)
+            assert second.status == PrepareResult.CANCELED
+            assert queue.position(third) == 1
+            await _wait_until(lambda: first.done)
+            assert first.status == PrepareResult.FINISHED
+            queue.confirm_glass_swap()
+            await _wait_until(lambda: third.done)
+
+        asyncio.run(run())
+        assert prepared == ["First", "Third"]
+
+    def test_failed_validation_cancels_only_this_order(self, prepared: list[str]):
+        """An order failing its validation at dispatch is canceled with the validation message."""
+
+        async def run() -> PreparationOrder:
+            queue = OrderQueue()
+            order = queue.enqueue(_order("Empty"))
+            await _wait_until(lambda: order.done)
+            return order
+
+        with patch(
+            "src.api.internal.order_queue.maker.validate_cocktail",
+            return_value=(PrepareResult.NOT_ENOUGH_INGREDIENTS, "Not enough", None),
+        ):
+            order = asyncio.run(run())
+        assert order.status == PrepareResult.CANCELED
+        assert order.message == "Not enough"
+        assert prepared == []
@@ -8,7 +8,7 @@ from unittest.mock import patch
 import pytest
 
 from src.models import Cocktail
-from src.payment_utils import filter_cocktails_by_user
+from src.payment_utils import PriceIndex, filter_cocktails_by_user
 from src.service.nfc_payment_service import User
 
 # Type alias for the patch_cfg fixture return type
@@ -427,3 +427,50 @@ class TestFilterCocktailsEdgeCases:
             result = filter_cocktails_by_user(user, cocktails)
         assert [c.name for c in result] == ["C", "A", "B"]
         assert all(c.is_allowed for c in result)
+
+
+class TestPriceIndex:
+    """Tests for the precomputed prices and the user selection."""
+
+    def test_prices_at_each_volume(self, patch_cfg: PatchCfgType) -> None:
+        """Normal and virgin prices are indexed for every prepare volume and the recipe volume."""
+        cocktails = [
+            create_test_cocktail(cocktail_id=1, price_per_100_ml=5.0, amount=300, virgin_available=True),
+            create_test_cocktail(cocktail_id=2, price_per_100_ml=4.0, amount=200),
+        ]
+        with patch_cfg(MAKER_PREPARE_VOLUME=[250, 150], PAYMENT_PRICE_ROUNDING=0.5):
+            index = PriceIndex(cocktails)
+        assert index.volumes == [150, 250]
+        assert index.price(1) == 15.0
+        assert index.price(1, 150) == 7.5
+        assert index.price(1, 250, virgin=True) == 10.0  # 12.5 * 0.8
+        assert index.price(2, 250) == 10.0
+        assert index.price(2, 250, virgin=True) is None
+
+    def test_selection_matches_price_comparison(self, patch_cfg: PatchCfgType) -> None:
+        """The selection from the index equals comparing each price with the balance."""
+        cocktails = [
+            create_test_cocktail(cocktail_id=i, price_per_100_ml=i * 1.5, virgin_available=i % 2 == 0)
+            for i in range(1, 20)
+        ]
+        with patch_cfg(MAKER_USE_RECIPE_VOLUME=False):
+            index = PriceIndex(cocktails)
+            for balance in [0.0, 4.0, 7.5, 12.0, 30.0, 100.0]:
+                for is_adult in (True, False):
+                    selection = index.select(create_test_user(balance=balance, can_get_alcohol=is_adult))
+                    for cocktail in cocktails:
+                        multiplier = 1.0 if is_adult else 0.8
+                        price = cocktail.current_price(1, 150, price_multiplier=multiplier)
+                        may_order = is_adult or cocktail.virgin_available
+                        assert selection.is_allowed(cocktail.id) == (may_order and price <= balance)
+                        assert selection.is_only_virgin(cocktail.id) == (not is_adult and cocktail.virgin_available)
+
+    def test_outdated_index_is_not_used(self, patch_cfg: PatchCfgType) -> None:
+        """An index built with other payment settings is replaced by the current prices."""
+        user = create_test_user(balance=10.0, can_get_alcohol=True)
+        cocktails = [create_test_cocktail(price_per_100_ml=5.0, amount=300)]
+        with patch_cfg(MAKER_USE_RECIPE_VOLUME=True):
+            index = PriceIndex(cocktails)
+        with patch_cfg(MAKER_USE_RECIPE_VOLUME=False, MAKER_PREPARE_VOLUME=[150]):
+            result = filter_cocktails_by_user(user, cocktails, index)
+        assert result[0].is_allowed is True
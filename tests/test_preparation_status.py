@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.api.internal.broadcast import LoopBroadcaster
+from src.api.internal.preparation import status_payload
+from src.config.config_manager import shared
+from src.models import Cocktail, CocktailStatus, Ingredient, PreparationResult, PrepareResult
+from src.service.preparation_status import PreparationStatusService, notify_preparation_status
+from src.tabs import maker
+
+
+@pytest.fixture(autouse=True)
+def reset_status():
+    """Start every test with a fresh status and no remembered notification."""
+    shared.cocktail_status = CocktailStatus()
+    service = PreparationStatusService()
+    service._last_state = None
+    yield
+    shared.cocktail_status = CocktailStatus()
+    service._callbacks.clear()
+
+
+class TestPreparationStatusService:
+    def test_notify_only_on_change(self):
+        """Repeated notifications with the same status are dropped."""
+        received: list[CocktailStatus] = []
+        PreparationStatusService().add_callback("test", received.append)
+        shared.cocktail_status = CocktailStatus(0, status=PrepareResult.IN_PROGRESS)
+        notify_preparation_status()
+        notify_preparation_status()
+        shared.cocktail_status.progress = 40
+        notify_preparation_status()
+        notify_preparation_status()
+        assert [x.progress for x in received] == [0, 40]
+
+    def test_callback_gets_snapshot(self):
+        """Later changes of the shared status must not leak into an already pushed snapshot."""
+        received: list[CocktailStatus] = []
+        PreparationStatusService().add_callback("test", received.append)
+        shared.cocktail_status = CocktailStatus(10, status=PrepareResult.IN_PROGRESS)
+        notify_preparation_status()
+        shared.cocktail_status.progress = 90
+        shared.cocktail_status.status = PrepareResult.FINISHED
+        assert received[0].progress == 10
+        assert received[0].status == PrepareResult.IN_PROGRESS
+
+    def test_failing_callback_does_not_block_others(self):
+        """An error in one listener is logged, the remaining listeners still get the status."""
+        received: list[CocktailStatus] = []
+
+        def broken(_status: CocktailStatus) -> None:
+            raise RuntimeError("boom")
+
+        service = PreparationStatusService()
+        service.add_callback("broken", broken)
+        service.add_callback("test", received.append)
+        shared.cocktail_status.status = PrepareResult.CANCELED
+        notify_preparation_status()
+        assert len(received) == 1
+
+    def test_preparation_start_is_notified(self):
+        """Listeners see the start of a preparation before the machine reports any progress."""
+        received: list[CocktailStatus] = []
+        PreparationStatusService().add_callback("test", received.append)
+        seen_at_start: list[PrepareResult] = []
+        mc = MagicMock()
+        mc.has_scale = False
+
+        def make_cocktail(*_args: Any, **_kwargs: Any) -> PreparationResult:
+            seen_at_start.extend(x.status for x in received)
+            return PreparationResult(ingredients=[])
+
+        mc.make_cocktail.side_effect = make_cocktail
+        rum = Ingredient(1, "Rum", 40, 1000, 1000, False, 100, amount=40, bottle=1)
+        cocktail = Cocktail(1, "Test", 40, 40, True, 0, False, [rum])
+        with (
+            patch("src.tabs.maker.MachineController", return_value=mc),
+            patch("src.tabs.maker.DatabaseCommander"),
+            patch("src.tabs.maker.ADDONS"),
+            patch("src.tabs.maker.SERVICE_HANDLER"),
+        ):
+            maker.prepare_cocktail(cocktail)
+        assert seen_at_start == [PrepareResult.IN_PROGRESS]
+
+
+class TestLoopBroadcaster:
+    def test_pushes_changes_from_other_threads(self):
+        """Changes notified by a worker thread reach every subscriber on the event loop."""
+
+        async def run() -> list[dict]:
+            service = PreparationStatusService()
+            broadcaster = LoopBroadcaster(status_payload)
+            first = broadcaster.subscribe(service.add_callback, service.remove_callback)
+            second = broadcaster.subscribe(service.add_callback, service.remove_callback)
+
+            def worker() -> None:
+                shared.cocktail_status = CocktailStatus(55, status=PrepareResult.IN_PROGRESS)
+                notify_preparation_status()
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            payloads = [await asyncio.wait_for(first.get(), 1), await asyncio.wait_for(second.get(), 1)]
+            broadcaster.unsubscribe(first)
+            broadcaster.unsubscribe(second)
+            return payloads
+
+        payloads = asyncio.run(run())
+        assert (
+            payloads
+            == [{"progress": 55, "message": None, "status": "IN_PROGRESS", "predicted_finish": None, "hand_adds": []}]
+            * 2
+        )
+        assert "websocket_broadcaster" not in PreparationStatusService()._callbacks
+
+    def test_slow_subscriber_keeps_latest(self):
+        """A subscriber not reading in time only gets the most recent status."""
+
+        async def run() -> tuple[dict, bool]:
+            service = PreparationStatusService()
+            broadcaster = LoopBroadcaster(status_payload)
+            queue = broadcaster.subscribe(service.add_callback, service.remove_callback)
+            for progress in (10, 20, 30):
+                shared.cocktail_status = CocktailStatus(progress, status=PrepareResult.IN_PROGRESS)
+                notify_preparation_status()
+            await asyncio.sleep(0)
+            payload = await asyncio.wait_for(queue.get(), 1)
+            broadcaster.unsubscribe(queue)
+            return payload, queue.empty()
+
+        payload, empty = asyncio.run(run())
+        assert payload["progress"] == 30
+        assert empty
+
+    def test_starts_with_latest_value(self):
+        """A given latest value is the first payload, the callback only exists while subscribed."""
+        callbacks: dict[str, object] = {}
+
+        async def run() -> dict:
+            broadcaster = LoopBroadcaster(status_payload)
+            queue = broadcaster.subscribe(
+                callbacks.__setitem__, callbacks.pop, CocktailStatus(40, status=PrepareResult.IN_PROGRESS)
+            )
+            assert "websocket_broadcaster" in callbacks
+            payload = await asyncio.wait_for(queue.get(), 1)
+            broadcaster.unsubscribe(queue)
+            return payload
+
+        assert asyncio.run(run())["progress"] == 40
+        assert callbacks == {}
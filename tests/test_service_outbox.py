@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import datetime as dt
+from unittest.mock import patch
+
+from src.database_commander import DatabaseCommander
+from src.db_models import DbOutbox, DbTeamdata
+from src.service_handler import PostType, ServiceHandler, ServiceOutbox
+
+
+class _Destination:
+    """Fake destination answering with the given status codes, then with 200."""
+
+    def __init__(self, *status: int | None) -> None:
+        self.status = list(status)
+        self.received: list[tuple[PostType, str]] = []
+
+    def __call__(self, destination: PostType, payload: str) -> int | None:
+        status = self.status.pop(0) if self.status else 200
+        if status is not None and status < 500:
+            self.received.append((destination, payload))
+        return status
+
+
+class TestServiceOutbox:
+    def test_drains_backlog_in_batches(self, db_commander: DatabaseCommander):
+        """All waiting items are sent in order, each batch is deleted at once."""
+        for i in range(7):
+            db_commander.add_outbox_item(PostType.TEAMDATA.value, f"team {i}")
+        destination = _Destination()
+        outbox = ServiceOutbox(destination, db_commander, batch_size=3)
+        with patch.object(db_commander, "delete_outbox_items", wraps=db_commander.delete_outbox_items) as delete:
+            while outbox.flush() == 0:
+                pass
+        assert [x[1] for x in destination.received] == [f"team {i}" for i in range(7)]
+        assert delete.call_count == 3
+        assert db_commander.count_outbox_items() == {}
+        assert outbox.metrics().destinations["teamdata"].sent == 7
+
+    def test_backoff_per_destination(self, db_commander: DatabaseCommander):
+        """An unreachable team api backs off, the webhook items are still sent."""
+        db_commander.add_outbox_item(PostType.TEAMDATA.value, "team")
+        db_commander.add_outbox_item(PostType.COCKTAIL.value, "cocktail")
+        db_commander.add_outbox_item(PostType.TEAMDATA.value, "team 2")
+        destination = _Destination(None, 200, None)
+        outbox = ServiceOutbox(destination, db_commander, backoff_start=0)
+        outbox.flush()
+        team = outbox.metrics().destinations["teamdata"]
+        assert destination.received == [(PostType.COCKTAIL, "cocktail")]
+        assert team.pending == 2
+        assert team.failures == 1
+        # second failure doubles the delay, the backlog is kept in order
+        outbox.backoff_start = 10
+        outbox.flush()
+        assert outbox.metrics().destinations["teamdata"].retry_in > 10
+        outbox._states[PostType.TEAMDATA].next_attempt = 0
+        outbox.flush()
+        assert [x[1] for x in destination.received] == ["cocktail", "team", "team 2"]
+        assert outbox.metrics().destinations["teamdata"].failures == 0
+
+    def test_rejected_items_are_dropped(self, db_commander: DatabaseCommander):
+        """Client errors will not succeed later, the item is removed, rate limits are retried."""
+        db_commander.add_outbox_item(PostType.COCKTAIL.value, "invalid")
+        db_commander.add_outbox_item(PostType.COCKTAIL.value, "limited")
+        destination = _Destination(422, 429)
+        outbox = ServiceOutbox(destination, db_commander, backoff_start=0)
+        outbox.flush()
+        metrics = outbox.metrics().destinations["cocktail"]
+        assert metrics.dropped == 1
+        assert metrics.pending == 1
+        outbox.flush()
+        assert outbox.metrics().destinations["cocktail"].pending == 0
+
+    def test_retention(self, db_commander: DatabaseCommander):
+        """Too old items and the oldest items above the limit are pruned."""
+        with db_commander.session_scope() as session:
+            old = dt.datetime.now() - dt.timedelta(days=40)
+            session.add(DbOutbox(PostType.TEAMDATA.value, "old", created=old))
+        for i in range(4):
+            db_commander.add_outbox_item(PostType.TEAMDATA.value, f"team {i}")
+        removed = db_commander.prune_outbox(max_items=3, max_age=dt.timedelta(days=30))
+        assert removed == {"teamdata": 2}
+        items = db_commander.get_outbox_items(PostType.TEAMDATA.value, limit=10)
+        assert [x[1] for x in items] == ["team 1", "team 2", "team 3"]
+
+    def test_legacy_failed_teamdata_is_moved(self, db_commander: DatabaseCommander):
+        """Failed team data of former versions ends up in the outbox."""
+        with db_commander.session_scope() as session:
+            session.add(DbTeamdata(payload="legacy"))
+        assert db_commander.move_failed_teamdata_to_outbox(PostType.TEAMDATA.value) == 1
+        with db_commander.session_scope() as session:
+            assert session.query(DbTeamdata).count() == 0
+        assert db_commander.get_outbox_items(PostType.TEAMDATA.value, limit=10)[0][1] == "legacy"
+
+    def test_queued_team_data_goes_to_outbox(self, db_commander: DatabaseCommander):
+        """Team data is saved to the outbox and sent from there."""
+        handler = ServiceHandler()
+        handler.outbox = ServiceOutbox(handler._send_outbox_item, db_commander)
+        with (
+            patch("src.service_handler.cfg") as cfg,
+            patch.object(handler.outbox, "start"),
+        ):
+            cfg.TEAMS_ACTIVE = True
+            handler.queue_team_data("Team A", 200, "Alice")
+        items = db_commander.get_outbox_items(PostType.TEAMDATA.value, limit=10)
+        assert [x[1] for x in items] == ['{"team": "Team A", "volume": 200, "person": "Alice"}']
+
+    def test_outbox_thread_has_own_session(self, db_commander: DatabaseCommander):
+        """The worker thread does not post over the session used by the callers."""
+        handler = ServiceHandler()
+        with (
+            patch.object(handler.session, "post") as caller_post,
+            patch.object(handler._outbox_session, "post") as outbox_post,
+        ):
+            outbox_post.return_value.status_code = 200
+            outbox_post.return_value.text = "ok"
+            assert handler._send_outbox_item(PostType.TEAMDATA, "team") == 200
+        outbox_post.assert_called_once()
+        caller_post.assert_not_called()
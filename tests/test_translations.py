@@ -1,8 +1,31 @@
+from pathlib import Path
 from typing import get_args
+from unittest.mock import patch
 
-from src.dialog_handler import DIALOG_HANDLER, allowed_keys
+import pytest
+
+from src import dialog_handler
+from src.database_commander import ElementNotFoundError
+from src.dialog_handler import DIALOG_HANDLER, allowed_keys, load_language_file
 
 
 def test_all_allowed_keys_have_translations() -> None:
     missing = set(get_args(allowed_keys)) - DIALOG_HANDLER.dialogs.keys()
     assert not missing, f"Keys allowed in get_translation but missing in language.yaml: {sorted(missing)}"
+
+
+def test_language_file_is_parsed_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The parsed language file is shared and snapshotted, later loads skip the yaml parsing."""
+    monkeypatch.setattr(dialog_handler, "LANGUAGE_CACHE_FILE", tmp_path / "language.cache")
+    load_language_file.cache_clear()
+    try:
+        content = load_language_file()
+        assert load_language_file() is content
+        assert (tmp_path / "language.cache").exists()
+        load_language_file.cache_clear()
+        with patch.object(dialog_handler.yaml, "load") as yaml_load:
+            assert load_language_file() == content
+            ElementNotFoundError("Some Ingredient")
+        yaml_load.assert_not_called()
+    finally:
+        load_language_file.cache_clear()
@@ -1,5 +1,12 @@
 import { type UseQueryResult, useQuery } from 'react-query';
-import type { Cocktail, CocktailInput, CocktailStatus, Ingredient } from '../types/models';
+import type {
+  Cocktail,
+  CocktailInput,
+  CocktailStatus,
+  Ingredient,
+  PreparationEstimate,
+  PreparationOrderStatus,
+} from '../types/models';
 import { axiosInstance } from './common';
 
 const cocktail_url = '/cocktails';
@@ -34,14 +41,49 @@ export const useCocktails = (
   );
 };
 
+export const fetchPreparationEstimate = async (
+  cocktail: Cocktail,
+  volume: number,
+  alcohol_factor: number,
+  is_virgin: boolean = false,
+): Promise<PreparationEstimate> => {
+  return axiosInstance
+    .get<PreparationEstimate>(`${cocktail_url}/${cocktail.id}/estimate`, {
+      params: {
+        volume,
+        alcohol_factor,
+        is_virgin,
+      },
+    })
+    .then((res) => res.data);
+};
+
+// predicted preparation time per serving size, from the plan the machine would follow
+export const usePreparationEstimates = (
+  cocktail: Cocktail,
+  servingSizes: number[],
+  alcohol_factor: number,
+  is_virgin: boolean,
+): UseQueryResult<Record<number, number>, Error> => {
+  return useQuery<Record<number, number>, Error>(
+    ['preparationEstimates', cocktail.id, servingSizes, alcohol_factor, is_virgin],
+    async () => {
+      const estimates = await Promise.all(
+        servingSizes.map((volume) => fetchPreparationEstimate(cocktail, volume, alcohol_factor, is_virgin)),
+      );
+      return Object.fromEntries(servingSizes.map((volume, index) => [volume, estimates[index].estimated_time]));
+    },
+  );
+};
+
 export const prepareCocktail = async (
   cocktail: Cocktail,
   volume: number,
   alcohol_factor: number,
   teamName?: string,
-): Promise<CocktailStatus> => {
+): Promise<PreparationOrderStatus> => {
   return axiosInstance
-    .post<CocktailStatus>(`${cocktail_url}/prepare/${cocktail.id}`, {
+    .post<PreparationOrderStatus>(`${cocktail_url}/prepare/${cocktail.id}`, {
       volume,
       alcohol_factor,
       selected_team: teamName,
@@ -49,6 +91,22 @@ export const prepareCocktail = async (
     .then((res) => res.data);
 };
 
+export const getOrderStatus = async (orderId: string): Promise<PreparationOrderStatus> => {
+  return axiosInstance.get<PreparationOrderStatus>(`${cocktail_url}/prepare/queue/${orderId}`).then((res) => res.data);
+};
+
+export const cancelOrder = async (orderId: string): Promise<PreparationOrderStatus> => {
+  return axiosInstance
+    .delete<PreparationOrderStatus>(`${cocktail_url}/prepare/queue/${orderId}`)
+    .then((res) => res.data);
+};
+
+export const confirmGlassSwap = async (): Promise<{ message: string }> => {
+  return axiosInstance
+    .post<{ message: string }>(`${cocktail_url}/prepare/queue/confirm-swap`)
+    .then((res) => res.data);
+};
+
 export const getCocktailStatus = async (): Promise<CocktailStatus> => {
   return axiosInstance
     .get<CocktailStatus>(`${cocktail_url}/prepare/status`)
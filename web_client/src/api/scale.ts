@@ -1,5 +1,7 @@
+import { useState } from 'react';
 import { type UseQueryResult, useQuery } from 'react-query';
 import { axiosInstance } from './common';
+import { useReconnectingWebSocket } from './useReconnectingWebSocket';
 
 const scale_url = '/scale';
 
@@ -13,6 +15,14 @@ interface ScaleReading {
   data: number;
 }
 
+export interface ScaleStreamReading {
+  /** Filtered weight in grams relative to the last tare. */
+  grams: number;
+  stable: boolean;
+  /** The scale is used by a preparation or calibration, grams is the last value before. */
+  paused: boolean;
+}
+
 export const getScaleStatus = async (): Promise<ScaleStatus> => {
   return axiosInstance.get<ScaleStatus>(`${scale_url}/status`).then((response) => response.data);
 };
@@ -38,3 +48,19 @@ export const calibrateScale = async (knownWeightGrams: number, zeroRawOffset: nu
     })
     .then((response) => response.data);
 };
+
+// WebSocket for the live weight, all viewers share one acquisition loop on the backend
+
+export const useScaleStream = (enabled: boolean, rate?: number) => {
+  const [reading, setReading] = useState<ScaleStreamReading | null>(null);
+
+  const { isConnected } = useReconnectingWebSocket<ScaleStreamReading>({
+    enabled,
+    path: rate ? `${scale_url}/ws?rate=${rate}` : `${scale_url}/ws`,
+    label: 'Scale',
+    onMessage: setReading,
+    onReset: () => setReading(null),
+  });
+
+  return { reading, isConnected };
+};
@@ -173,7 +173,7 @@ const CocktailList: React.FC = () => {
                 </p>
                 <div className='relative w-full' style={{ paddingTop: '100%' }}>
                   <img
-                    src={`${API_URL}${cocktail.image}`}
+                    src={`${API_URL}${cocktail.image_thumbnail}`}
                     alt={cocktail.name}
                     className='absolute top-0 left-0 w-full h-full object-cover'
                   />
@@ -1,14 +1,15 @@
 import type React from 'react';
 import { useEffect, useState } from 'react';
+import { useTranslation } from 'react-i18next';
 import { FaSkullCrossbones } from 'react-icons/fa';
 import { GrFormNextLink, GrFormPreviousLink } from 'react-icons/gr';
 import { IoIosHappy } from 'react-icons/io';
 import { MdNoDrinks } from 'react-icons/md';
-import { prepareCocktail } from '../../api/cocktails';
+import { prepareCocktail, usePreparationEstimates } from '../../api/cocktails';
 import { API_URL } from '../../api/common';
 import { Tabs } from '../../constants/tabs';
 import { useConfig } from '../../providers/ConfigProvider';
-import type { Cocktail, PrepareResult } from '../../types/models';
+import type { Cocktail, PreparationOrderStatus, PrepareResult } from '../../types/models';
 import { errorToast, scaleCocktail } from '../../utils';
 import CloseButton from '../common/CloseButton';
 import ProgressModal from '../common/ProgressModal';
@@ -43,6 +44,7 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
   const [alcohol, setAlcohol] = useState<alcoholState>('normal');
   const [displayCocktail, setDisplayCocktail] = useState<Cocktail>(selectedCocktail);
   const [isProgressModalOpen, setIsProgressModalOpen] = useState(false);
+  const [preparationOrder, setPreparationOrder] = useState<PreparationOrderStatus | null>(null);
   // Refill state
   const [isRefillOpen, setIsRefillOpen] = useState(false);
   const [refillMessage, setRefillMessage] = useState('');
@@ -54,6 +56,13 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
   const possibleServingSizes = config.MAKER_USE_RECIPE_VOLUME
     ? [displayCocktail.amount]
     : (config.MAKER_PREPARE_VOLUME ?? FALLBACK_SERVING_SIZES);
+  const { t } = useTranslation();
+  const { data: estimates } = usePreparationEstimates(
+    selectedCocktail,
+    possibleServingSizes,
+    alcoholFactor[alcohol],
+    alcohol === 'virgin',
+  );
 
   useEffect(() => {
     const initialAlcoholState = selectedCocktail.only_virgin ? 'virgin' : 'normal';
@@ -90,7 +99,8 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
   const handlePrepareCocktail = async (amount: number, teamName: string | undefined = undefined) => {
     const factor = alcoholFactor[alcohol];
     prepareCocktail(displayCocktail, amount, factor, teamName)
-      .then(() => {
+      .then((order) => {
+        setPreparationOrder(order);
         setIsProgressModalOpen(true);
       })
       .catch((error) => {
@@ -129,6 +139,12 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
     return `: ${formatted}€`;
   };
 
+  const formatEstimate = (amount: number): string => {
+    const seconds = estimates?.[amount];
+    if (seconds === undefined) return '';
+    return ` · ${t('cocktails.estimate', { seconds: Math.max(1, Math.round(seconds)) })}`;
+  };
+
   return (
     <>
       <div className='flex flex-col sm:flex-row items-center md:items-start justify-center w-full h-full'>
@@ -234,7 +250,9 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
           <ServingSizeButtons
             servingSizes={possibleServingSizes}
             onSelect={prepareCocktailClick}
-            getLabel={(amount) => amount + calculateDisplayPrice(amount, displayCocktail.price_per_100_ml)}
+            getLabel={(amount) =>
+              amount + calculateDisplayPrice(amount, displayCocktail.price_per_100_ml) + formatEstimate(amount)
+            }
           />
         </div>
       </div>
@@ -247,6 +265,7 @@ const CocktailSelection: React.FC<CocktailModalProps> = ({
       <ProgressModal
         isOpen={isProgressModalOpen}
         onRequestClose={() => setIsProgressModalOpen(false)}
+        order={preparationOrder}
         progress={0}
         displayName={`${alcohol === 'virgin' && !displayCocktail.is_naturally_virgin ? 'Virgin ' : ''}${displayCocktail.name}`}
         triggerOnClose={handleCloseModal}
@@ -3,7 +3,7 @@ import { Fragment, useCallback, useEffect, useRef, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import { FaCheck, FaTimes } from 'react-icons/fa';
 import { FaRegCircle, FaScaleUnbalanced } from 'react-icons/fa6';
-import { readScale, tareScale } from '../../../api/scale';
+import { tareScale, useScaleStream } from '../../../api/scale';
 import type { HandAddMeasure as HandAddItem } from '../../../types/models';
 import Button from '../../common/Button';
 import ProgressBar from '../../common/ProgressBar';
@@ -25,7 +25,7 @@ interface PreparationFinalizeProps {
   expUnit?: string;
   /** Tare the scale. Injectable for tests/storybook; defaults to the real API call. */
   tare?: () => Promise<unknown>;
-  /** Read the current weight in grams. Injectable for tests/storybook. */
+  /** Read the current weight in grams. Injectable for tests/storybook; defaults to the live scale stream. */
   read?: () => Promise<number>;
   pollIntervalMs?: number;
 }
@@ -87,7 +87,7 @@ const PreparationFinalize: React.FC<PreparationFinalizeProps> = ({
   expFactor = 1,
   expUnit = 'ml',
   tare = tareScale,
-  read = async () => (await readScale()).data,
+  read,
   pollIntervalMs = 250,
 }) => {
   const { t } = useTranslation();
@@ -95,9 +95,18 @@ const PreparationFinalize: React.FC<PreparationFinalizeProps> = ({
   const [activeIndex, setActiveIndex] = useState<number | null>(null);
   const [grams, setGrams] = useState(0);
   const finishedRef = useRef(false);
+  // without an injected reader the weight comes from the shared scale stream, only open while measuring
+  const { reading: streamReading } = useScaleStream(read === undefined && activeIndex !== null);
+  const streamRef = useRef(streamReading);
+  streamRef.current = streamReading;
+  const readStream = async () => {
+    const current = streamRef.current;
+    if (!current || current.paused) throw new Error('No live scale reading');
+    return current.grams;
+  };
   // refs so the timeout/poll effects don't resubscribe each render (read/onFinish are fresh closures)
-  const readRef = useRef(read);
-  readRef.current = read;
+  const readRef = useRef(read ?? readStream);
+  readRef.current = read ?? readStream;
   const onFinishRef = useRef(onFinish);
   onFinishRef.current = onFinish;
 
@@ -7,7 +7,7 @@ import { prepareCocktail } from '../../api/cocktails';
 import { API_URL } from '../../api/common';
 import { Tabs } from '../../constants/tabs';
 import { useConfig } from '../../providers/ConfigProvider';
-import type { Cocktail, PrepareResult } from '../../types/models';
+import type { Cocktail, PreparationOrderStatus, PrepareResult } from '../../types/models';
 import { errorToast } from '../../utils';
 import CloseButton from '../common/CloseButton';
 import ProgressModal from '../common/ProgressModal';
@@ -24,6 +24,7 @@ interface RandomCocktailSelectionProps {
 const RandomCocktailSelection: React.FC<RandomCocktailSelectionProps> = ({ handleCloseModal, cocktails }) => {
   const [isVirgin, setIsVirgin] = useState(false);
   const [isProgressModalOpen, setIsProgressModalOpen] = useState(false);
+  const [preparationOrder, setPreparationOrder] = useState<PreparationOrderStatus | null>(null);
   const [chosenCocktailName, setChosenCocktailName] = useState('');
   const [isRefillOpen, setIsRefillOpen] = useState(false);
   const [refillMessage, setRefillMessage] = useState('');
@@ -50,7 +51,8 @@ const RandomCocktailSelection: React.FC<RandomCocktailSelectionProps> = ({ handl
     const displayPrefix = isVirgin && !chosen.is_naturally_virgin ? 'Virgin ' : '';
     setChosenCocktailName(`${displayPrefix}${chosen.name}`);
     prepareCocktail(chosen, prepareAmount, factor, teamName)
-      .then(() => {
+      .then((order) => {
+        setPreparationOrder(order);
         setIsProgressModalOpen(true);
       })
       .catch((error) => {
@@ -131,6 +133,7 @@ const RandomCocktailSelection: React.FC<RandomCocktailSelectionProps> = ({ handl
       <ProgressModal
         isOpen={isProgressModalOpen}
         onRequestClose={() => setIsProgressModalOpen(false)}
+        order={preparationOrder}
         progress={0}
         displayName={chosenCocktailName}
         triggerOnClose={handleCloseModal}
@@ -0,0 +1,40 @@
+import type { Meta, StoryObj } from '@storybook/react-vite';
+import OrderQueueWaiting from '.';
+
+const meta: Meta<typeof OrderQueueWaiting> = {
+  title: 'Preparation/OrderQueueWaiting',
+  component: OrderQueueWaiting,
+  parameters: {
+    layout: 'centered',
+  },
+  tags: ['autodocs'],
+  args: {
+    position: 2,
+    eta: 95,
+  },
+  decorators: [
+    (Story) => (
+      // fixed-size flex box so the component's `grow` fills it like inside ProgressModal
+      <div style={{ width: 480, height: 360 }} className='flex border-2 border-neutral rounded-lg p-4 bg-background'>
+        <Story />
+      </div>
+    ),
+  ],
+};
+
+export default meta;
+type Story = StoryObj<typeof meta>;
+
+export const Default: Story = {};
+
+export const NextInLine: Story = {
+  args: { position: 1, eta: 30 },
+};
+
+export const WaitingForGlassSwap: Story = {
+  args: {
+    position: 0,
+    eta: 40,
+    message: 'Please replace the glass of the previous order and confirm the swap',
+  },
+};
@@ -0,0 +1,27 @@
+import type React from 'react';
+import { useTranslation } from 'react-i18next';
+import { MdHourglassEmpty } from 'react-icons/md';
+
+interface OrderQueueWaitingProps {
+  position: number;
+  eta: number;
+  message?: string | null;
+}
+
+/** QUEUED view shown in ProgressModal while other orders are prepared before this one. */
+const OrderQueueWaiting: React.FC<OrderQueueWaitingProps> = ({ position, eta, message }) => {
+  const { t } = useTranslation();
+  const minutes = Math.max(1, Math.ceil(eta / 60));
+  return (
+    <div className='flex flex-col items-center justify-center grow gap-8'>
+      <MdHourglassEmpty className='text-primary animate-pulse' size={120} />
+      <div className='text-center'>
+        <p className='text-2xl text-neutral font-bold mb-4'>{t('cocktails.queue.position', { position })}</p>
+        <p className='text-lg text-text'>{t('cocktails.queue.eta', { minutes })}</p>
+        {message && <p className='text-lg text-secondary mt-4'>{message}</p>}
+      </div>
+    </div>
+  );
+};
+
+export default OrderQueueWaiting;
@@ -1,20 +1,35 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useTranslation } from 'react-i18next';
 import Modal from 'react-modal';
-import { cancelPayment, getCocktailStatus, stopCocktail } from '../../api/cocktails';
+import {
+  cancelOrder,
+  cancelPayment,
+  confirmGlassSwap,
+  getCocktailStatus,
+  getOrderStatus,
+  stopCocktail,
+} from '../../api/cocktails';
+import { useReconnectingWebSocket } from '../../api/useReconnectingWebSocket';
 import { useConfig } from '../../providers/ConfigProvider';
-import type { HandAddMeasure as HandAddItem, PrepareResult } from '../../types/models';
+import type {
+  CocktailStatus,
+  HandAddMeasure as HandAddItem,
+  PreparationOrderStatus,
+  PrepareResult,
+} from '../../types/models';
 import { errorToast } from '../../utils';
 import PreparationFinalize from '../cocktail/PreparationFinalize';
+import OrderQueueWaiting from './OrderQueueWaiting';
 import PaymentWaiting from './PaymentWaiting';
 import ProgressBar from './ProgressBar';
 import TextHeader from './TextHeader';
 
 // what the modal is currently doing; the body content and its footer button are picked from this
-type ModalPhase = 'payment' | 'completion' | 'inProgress' | 'closing';
+type ModalPhase = 'queued' | 'payment' | 'completion' | 'inProgress' | 'closing';
 
 // single source of truth for what the modal is doing; both the body and the footer button derive from it
 function getPhase(status: PrepareResult, handAdds: HandAddItem[], message: string | null): ModalPhase {
+  if (status === 'QUEUED') return 'queued';
   if (status === 'WAITING_FOR_PAYMENT') return 'payment';
   if (status === 'IN_PROGRESS') return 'inProgress';
   if (handAdds.length > 0 || message !== null) return 'completion';
@@ -44,6 +59,8 @@ interface ProgressModalProps {
   progress: number;
   displayName: string;
   triggerOnClose?: (status: string) => void;
+  // the order returned by the prepare request; while it is queued, its queue status is shown instead
+  order?: PreparationOrderStatus | null;
 }
 
 const ProgressModal: React.FC<ProgressModalProps> = ({
@@ -52,6 +69,7 @@ const ProgressModal: React.FC<ProgressModalProps> = ({
   progress,
   displayName,
   triggerOnClose,
+  order,
 }) => {
   const { config } = useConfig();
   const [currentProgress, setCurrentProgress] = useState(progress);
@@ -60,13 +78,28 @@ const ProgressModal: React.FC<ProgressModalProps> = ({
   );
   const [message, setMessage] = useState<string | null>(null);
   const [handAdds, setHandAdds] = useState<HandAddItem[]>([]);
+  const [queuedOrder, setQueuedOrder] = useState<PreparationOrderStatus | null>(
+    order?.status === 'QUEUED' ? order : null,
+  );
+  const [isFinal, setIsFinal] = useState(false);
+  // until the preparation started, the machine still reports the end of the former one
+  const sawBusyRef = useRef(false);
   const { t } = useTranslation();
+  const isQueued = queuedOrder?.status === 'QUEUED';
+  // the machine status is only the one of this order once the order is running
+  const followsMachine = queuedOrder === null;
+
+  useEffect(() => {
+    // eslint-disable-next-line react-hooks/set-state-in-effect
+    setQueuedOrder(isOpen && order?.status === 'QUEUED' ? order : null);
+  }, [isOpen, order]);
 
   const closeWindow = React.useCallback(
     (finalStatus?: string) => {
       setCurrentProgress(0);
       setMessage(null);
       setHandAdds([]);
+      setQueuedOrder(null);
       onRequestClose();
       if (triggerOnClose) {
         triggerOnClose(finalStatus ?? 'CANCELED');
@@ -84,49 +117,137 @@ const ProgressModal: React.FC<ProgressModalProps> = ({
     }
   };
 
-  useEffect(() => {
-    let intervalId: ReturnType<typeof setInterval> | null = null;
+  const handleCancelOrder = async () => {
+    if (!queuedOrder) return;
+    try {
+      await cancelOrder(queuedOrder.order_id);
+      closeWindow('CANCELED');
+    } catch (error) {
+      errorToast(error);
+    }
+  };
+
+  // without glass detection the operator confirms that the glass of the previous order was swapped
+  const handleConfirmSwap = async () => {
+    if (!queuedOrder) return;
+    try {
+      await confirmGlassSwap();
+      setQueuedOrder({ ...queuedOrder, needs_swap_confirmation: false, message: null });
+    } catch (error) {
+      errorToast(error);
+    }
+  };
 
-    const cancelInterval = () => {
-      if (intervalId) {
+  // while queued, only follow the own order; the machine status belongs to someone else's cocktail
+  const queuedOrderId = queuedOrder?.order_id;
+  useEffect(() => {
+    if (!isOpen || !queuedOrderId || !isQueued) return undefined;
+    const intervalId = setInterval(async () => {
+      let orderStatus: PreparationOrderStatus;
+      try {
+        orderStatus = await getOrderStatus(queuedOrderId);
+      } catch (error) {
         clearInterval(intervalId);
-        intervalId = null;
+        errorToast(error);
+        closeWindow('CANCELED');
+        return;
       }
-    };
+      if (orderStatus.status === 'QUEUED') {
+        setQueuedOrder(orderStatus);
+        return;
+      }
+      clearInterval(intervalId);
+      // running (or just finished): the machine status is the one of this order now
+      if (orderStatus.position === 0 || orderStatus.status === 'FINISHED') {
+        // finished while queued: the machine status already is the end of this order
+        sawBusyRef.current = orderStatus.status === 'FINISHED';
+        setCurrentStatus(orderStatus.status);
+        setQueuedOrder(null);
+        return;
+      }
+      // never started, e.g. canceled or not possible anymore once it was its turn
+      setQueuedOrder(orderStatus);
+      setCurrentStatus(orderStatus.status);
+      if (orderStatus.message) {
+        setMessage(orderStatus.message.replaceAll('\n', '<br />'));
+      } else {
+        closeWindow(orderStatus.status);
+      }
+    }, 1000);
+    return () => clearInterval(intervalId);
+  }, [isOpen, queuedOrderId, isQueued, closeWindow]);
+
+  // the machine status of this preparation is followed over the websocket, polling is the fallback while disconnected
+  const applyStatus = React.useCallback(
+    (cocktailStatus: CocktailStatus) => {
+      const isBusy = cocktailStatus.status === 'IN_PROGRESS' || cocktailStatus.status === 'WAITING_FOR_PAYMENT';
+      if (isBusy) {
+        sawBusyRef.current = true;
+      } else if (!sawBusyRef.current) {
+        return;
+      }
+      setCurrentStatus(cocktailStatus.status);
+      setCurrentProgress(cocktailStatus.progress);
+      if (isBusy) return;
+      // terminal: show hand-adds and/or message in PreparationFinalize, else close
+      setIsFinal(true);
+      const adds = cocktailStatus.hand_adds ?? [];
+      const msg = cocktailStatus.message ? cocktailStatus.message.replaceAll('\n', '<br />') : null;
+      if (adds.length > 0) {
+        setHandAdds(adds);
+        setMessage(msg);
+      } else if (msg) {
+        setMessage(msg);
+      } else {
+        closeWindow(cocktailStatus.status);
+      }
+    },
+    [closeWindow],
+  );
 
+  useEffect(() => {
     if (isOpen) {
-      intervalId = setInterval(async () => {
-        const cocktailStatus = await getCocktailStatus();
-        setCurrentStatus(cocktailStatus.status);
-        setCurrentProgress(cocktailStatus.progress);
-        if (cocktailStatus.status === 'IN_PROGRESS' || cocktailStatus.status === 'WAITING_FOR_PAYMENT') {
-          return;
-        }
-        // terminal: show hand-adds and/or message in PreparationFinalize, else close
-        cancelInterval();
-        const adds = cocktailStatus.hand_adds ?? [];
-        const msg = cocktailStatus.message ? cocktailStatus.message.replaceAll('\n', '<br />') : null;
-        if (adds.length > 0) {
-          setHandAdds(adds);
-          setMessage(msg);
-        } else if (msg) {
-          setMessage(msg);
-        } else {
-          closeWindow(cocktailStatus.status);
-        }
-      }, 250);
+      // eslint-disable-next-line react-hooks/set-state-in-effect
+      setIsFinal(false);
+      sawBusyRef.current = false;
     }
+  }, [isOpen]);
+
+  const followsStatus = isOpen && followsMachine && !isFinal;
+  const { isConnected } = useReconnectingWebSocket<CocktailStatus>({
+    enabled: followsStatus,
+    path: '/cocktails/ws/prepare/status',
+    label: 'Preparation status',
+    onMessage: applyStatus,
+  });
 
-    return () => {
-      cancelInterval();
-    };
-  }, [isOpen, closeWindow]);
+  useEffect(() => {
+    if (!followsStatus || isConnected) return undefined;
+    const intervalId = setInterval(async () => {
+      applyStatus(await getCocktailStatus());
+    }, 250);
+    return () => clearInterval(intervalId);
+  }, [followsStatus, isConnected, applyStatus]);
 
-  const phase = getPhase(currentStatus, handAdds, message);
+  const phase = getPhase(isQueued ? 'QUEUED' : currentStatus, handAdds, message);
 
   // one switch over the phase renders the body and its footer button together
   const renderPhase = () => {
     switch (phase) {
+      case 'queued':
+        return (
+          <>
+            <OrderQueueWaiting
+              position={queuedOrder?.position ?? 0}
+              eta={queuedOrder?.eta ?? 0}
+              message={queuedOrder?.message}
+            />
+            {queuedOrder?.needs_swap_confirmation && (
+              <FooterButton onClick={handleConfirmSwap} label={t('cocktails.queue.confirmSwap')} filled />
+            )}
+            <FooterButton onClick={handleCancelOrder} label={t('cancel')} />
+          </>
+        );
       case 'payment':
         return (
           <>
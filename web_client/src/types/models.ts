@@ -21,6 +21,7 @@ export interface Cocktail {
   is_naturally_virgin: boolean;
   ingredients: CocktailIngredient[];
   image: string;
+  image_thumbnail: string;
   default_image: string;
 }
 
@@ -78,6 +79,7 @@ export type PrepareResult =
   | 'WAITING_FOR_PAYMENT'
   | 'NO_WAITER_LOGGED_IN'
   | 'NO_GLASS_DETECTED'
+  | 'QUEUED'
   | 'UNDEFINED';
 
 export interface HandAddMeasure {
@@ -99,6 +101,29 @@ export interface CocktailStatus {
   message?: string;
   status: PrepareResult;
   hand_adds?: HandAddMeasure[];
+  predicted_finish?: number | null;
+}
+
+export interface PreparationOrderStatus {
+  order_id: string;
+  cocktail_id: number;
+  cocktail_name: string;
+  status: PrepareResult;
+  message?: string | null;
+  progress: number;
+  // 0 for the running order, -1 once the order is done
+  position: number;
+  // estimated seconds until the order is finished
+  eta: number;
+  // the order waits for the operator to confirm the glass swap, the machine cannot detect it
+  needs_swap_confirmation?: boolean;
+}
+
+export interface PreparationEstimate {
+  cocktail_id: number;
+  amount: number;
+  alcohol: number;
+  estimated_time: number;
 }
 
 export interface ApiError {